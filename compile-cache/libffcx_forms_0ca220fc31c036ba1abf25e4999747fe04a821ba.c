@@ -0,0 +1,2464 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+// This code conforms with the UFC specification version 2018.2.0.dev0
+// and was automatically generated by FFCX version 2019.2.0.dev0.
+//
+// This code was generated with the following parameters:
+//
+//  {'alignas': 32,
+//   'assume_aligned': -1,
+//   'batch_size': 0,
+//   'block_gemm': 'none',
+//   'compute_type': '',
+//   'enable_preintegration': False,
+//   'enable_premultiplication': False,
+//   'epsilon': 1e-14,
+//   'gemm_threshold': 4096,
+//   'ir_cache_dir': '',
+//   'padlen': 1,
+//   'precision': -1,
+//   'quadrature_degree': -1,
+//   'quadrature_rule': 'default',
+//   'scalar_type': 'double',
+//   'simd_width': 0,
+//   'sparse_element_tensor': False,
+//   'sum_factorization': False,
+//   'table_atol': 1e-09,
+//   'table_rtol': 1e-06,
+//   'tabulate_action': False,
+//   'tabulate_tensor_void': False,
+//   'tile_size': 0}
+
+
+typedef double ufc_scalar_t;
+#include <math.h>
+#include <stdalign.h>
+#include <stdbool.h>
+#include <stdlib.h>
+#include <string.h>
+#include <ufc.h>
+
+// Code for element element_7b9349003d250ec7fa2df50263e639134b88ac62
+
+int value_dimension_element_7b9349003d250ec7fa2df50263e639134b88ac62(int i)
+{
+  return 1;
+}
+
+int reference_value_dimension_element_7b9349003d250ec7fa2df50263e639134b88ac62(int i)
+{
+  return 1;
+}
+
+int evaluate_reference_basis_element_7b9349003d250ec7fa2df50263e639134b88ac62(double* restrict reference_values,
+                                            int num_points,
+                                            const double* restrict X)
+{
+  static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+for (int k = 0; k < num_points * 3; ++k)
+    reference_values[k] = 0.0;
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Accumulate products of coefficients and basisvalues
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip] += coefficients0[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 1] += coefficients1[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 2] += coefficients2[0][r] * basisvalues1[r];
+}
+return 0;
+}
+
+int evaluate_reference_basis_derivatives_element_7b9349003d250ec7fa2df50263e639134b88ac62(double * restrict reference_values,
+                                          int order, int num_points,
+                                          const double * restrict X)
+{
+  if (order == 0)
+    return evaluate_reference_basis_element_7b9349003d250ec7fa2df50263e639134b88ac62(reference_values, num_points, X);
+const int num_derivatives = pow(2, order);
+for (int l0 = 0; l0 < (num_points * 3) * num_derivatives; ++l0)
+    reference_values[l0] = 0.0;
+if (order > 1)
+    return 0;
+// Tables of derivatives of the polynomial base (transpose).
+alignas(32) static const double dmats0[2][3][3] =
+    { { { 0.0, 0.0, 0.0 },
+        { 4.8989794855663495, 0.0, 0.0 },
+        { 0.0, 0.0, 0.0 } },
+      { { 0.0, 0.0, 0.0 },
+        { 2.449489742783182, 0.0, 0.0 },
+        { 4.242640687119285, 0.0, 0.0 } } };
+static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+const int reference_offset[3] = { 0 };
+const int num_components[3] = { 1, 1, 1 };
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Loop over all dofs
+    for (int i = 0; i < 3; ++i)
+    {
+        double derivatives[2] = { 0 };
+        switch (i)
+        {
+        case 0:
+            // Compute reference derivatives for dof 0.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients0[0][s] * aux[s];
+            }
+            break;
+        case 1:
+            // Compute reference derivatives for dof 1.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients1[0][s] * aux[s];
+            }
+            break;
+        case 2:
+            // Compute reference derivatives for dof 2.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients2[0][s] * aux[s];
+            }
+            break;
+        }
+        for (int r = 0; r < num_derivatives; ++r)
+            for (int c = 0; c < num_components[i]; ++c)
+                reference_values[(((3 * num_derivatives) * ip + num_derivatives * i) + r) + (reference_offset[i] + c)] = derivatives[num_derivatives * c + r];
+    }
+}
+return 0;
+}
+
+int transform_reference_basis_derivatives_element_7b9349003d250ec7fa2df50263e639134b88ac62(
+    double * restrict values, int order, int num_points,
+    const double * restrict reference_values,
+    const double * restrict X, const double * restrict J,
+    const double * restrict detJ, const double * restrict K,
+    const uint32_t cell_permutation)
+{
+  const int num_derivatives = pow(2, order);
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int l = 0; l < (num_points * 3) * num_derivatives; ++l)
+    values[l] = 0.0;
+const int reference_offsets[3] = { 0 };
+const int physical_offsets[3] = { 0 };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    double transform[2][2];
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            transform[r][s] = 1.0;
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            for (int k = 0; k < order; ++k)
+                transform[r][s] *= K[((2 * 2) * ip + 2 * combinations[order - 1][s][k]) + combinations[order - 1][r][k]];
+    for (int d = 0; d < 3; ++d)
+    {
+        for (int s = 0; s < num_derivatives; ++s)
+        {
+            for (int i = 0; i < 1; ++i)
+            {
+                // Using affine transform to map values back to the physical element.
+                const double mapped_value = reference_values[(((3 * num_derivatives) * ip + num_derivatives * d) + s) + reference_offsets[d]];
+                // Mapping derivatives back to the physical element
+                for (int r = 0; r < num_derivatives; ++r)
+                    values[(((3 * num_derivatives) * ip + num_derivatives * d) + r) + (physical_offsets[d] + i)] += transform[r][s] * mapped_value;
+            }
+        }
+    }
+}
+// Using affine transform to map values back to the physical element.
+return 0;
+}
+
+int transform_values_element_7b9349003d250ec7fa2df50263e639134b88ac62(
+     ufc_scalar_t* restrict reference_values,
+     const ufc_scalar_t* restrict physical_values,
+     const double* restrict coordinate_dofs,
+     const ufc_coordinate_mapping* restrict cm)
+{
+  reference_values[0] = physical_values[0];
+reference_values[1] = physical_values[1];
+reference_values[2] = physical_values[2];
+return 0;
+}
+
+int tabulate_reference_dof_coordinates_element_7b9349003d250ec7fa2df50263e639134b88ac62(double* restrict reference_dof_coordinates)
+{
+  static const double dof_X[6] = { 0.0, 0.0, 1.0, 0.0, 0.0, 1.0 };
+memcpy(reference_dof_coordinates, dof_X, 6*sizeof(double));
+return 0;
+}
+
+
+ufc_finite_element* create_sub_element_element_7b9349003d250ec7fa2df50263e639134b88ac62(int i)
+{
+  return NULL;
+}
+
+ufc_finite_element* create_element_7b9349003d250ec7fa2df50263e639134b88ac62(void)
+{
+  ufc_finite_element* element = (ufc_finite_element*)malloc(sizeof(*element));
+
+  element->signature = "FiniteElement('Lagrange', triangle, 1)";
+  element->cell_shape = triangle;
+  element->topological_dimension = 2;
+  element->geometric_dimension = 2;
+  element->space_dimension = 3;
+  element->value_rank = 0;
+  element->value_dimension = value_dimension_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->value_size = 1;
+  element->reference_value_rank = 0;
+  element->reference_value_dimension = reference_value_dimension_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->reference_value_size = 1;
+  element->degree = 1;
+  element->family = "Lagrange";
+  element->block_size = 1;
+  element->evaluate_reference_basis = evaluate_reference_basis_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->evaluate_reference_basis_derivatives = evaluate_reference_basis_derivatives_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->transform_reference_basis_derivatives = transform_reference_basis_derivatives_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->transform_values = transform_values_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->tabulate_reference_dof_coordinates = tabulate_reference_dof_coordinates_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->num_sub_elements = 0;
+  element->create_sub_element = create_sub_element_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  element->create = create_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+
+  return element;
+}
+
+// End of code for element element_7b9349003d250ec7fa2df50263e639134b88ac62
+
+// Code for element element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e
+
+int value_dimension_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(int i)
+{
+  static const int return_values[1] = { 2 };
+if (i >= 1)
+    return 1;
+return return_values[i];
+}
+
+int reference_value_dimension_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(int i)
+{
+  static const int return_values[1] = { 2 };
+if (i >= 1)
+    return 1;
+return return_values[i];
+}
+
+int evaluate_reference_basis_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(double* restrict reference_values,
+                                            int num_points,
+                                            const double* restrict X)
+{
+  static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+for (int k = 0; k < num_points * 3; ++k)
+    reference_values[k] = 0.0;
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Accumulate products of coefficients and basisvalues
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip] += coefficients0[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 1] += coefficients1[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 2] += coefficients2[0][r] * basisvalues1[r];
+}
+return 0;
+}
+
+int evaluate_reference_basis_derivatives_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(double * restrict reference_values,
+                                          int order, int num_points,
+                                          const double * restrict X)
+{
+  if (order == 0)
+    return evaluate_reference_basis_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(reference_values, num_points, X);
+const int num_derivatives = pow(2, order);
+for (int l0 = 0; l0 < (num_points * 3) * num_derivatives; ++l0)
+    reference_values[l0] = 0.0;
+if (order > 1)
+    return 0;
+// Tables of derivatives of the polynomial base (transpose).
+alignas(32) static const double dmats0[2][3][3] =
+    { { { 0.0, 0.0, 0.0 },
+        { 4.8989794855663495, 0.0, 0.0 },
+        { 0.0, 0.0, 0.0 } },
+      { { 0.0, 0.0, 0.0 },
+        { 2.449489742783182, 0.0, 0.0 },
+        { 4.242640687119285, 0.0, 0.0 } } };
+static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+const int reference_offset[3] = { 0 };
+const int num_components[3] = { 1, 1, 1 };
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Loop over all dofs
+    for (int i = 0; i < 3; ++i)
+    {
+        double derivatives[2] = { 0 };
+        switch (i)
+        {
+        case 0:
+            // Compute reference derivatives for dof 0.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients0[0][s] * aux[s];
+            }
+            break;
+        case 1:
+            // Compute reference derivatives for dof 1.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients1[0][s] * aux[s];
+            }
+            break;
+        case 2:
+            // Compute reference derivatives for dof 2.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients2[0][s] * aux[s];
+            }
+            break;
+        }
+        for (int r = 0; r < num_derivatives; ++r)
+            for (int c = 0; c < num_components[i]; ++c)
+                reference_values[(((3 * num_derivatives) * ip + num_derivatives * i) + r) + (reference_offset[i] + c)] = derivatives[num_derivatives * c + r];
+    }
+}
+return 0;
+}
+
+int transform_reference_basis_derivatives_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(
+    double * restrict values, int order, int num_points,
+    const double * restrict reference_values,
+    const double * restrict X, const double * restrict J,
+    const double * restrict detJ, const double * restrict K,
+    const uint32_t cell_permutation)
+{
+  const int num_derivatives = pow(2, order);
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int l = 0; l < (num_points * 3) * num_derivatives; ++l)
+    values[l] = 0.0;
+const int reference_offsets[3] = { 0 };
+const int physical_offsets[3] = { 0 };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    double transform[2][2];
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            transform[r][s] = 1.0;
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            for (int k = 0; k < order; ++k)
+                transform[r][s] *= K[((2 * 2) * ip + 2 * combinations[order - 1][s][k]) + combinations[order - 1][r][k]];
+    for (int d = 0; d < 3; ++d)
+    {
+        for (int s = 0; s < num_derivatives; ++s)
+        {
+            for (int i = 0; i < 1; ++i)
+            {
+                // Using affine transform to map values back to the physical element.
+                const double mapped_value = reference_values[(((3 * num_derivatives) * ip + num_derivatives * d) + s) + reference_offsets[d]];
+                // Mapping derivatives back to the physical element
+                for (int r = 0; r < num_derivatives; ++r)
+                    values[(((3 * num_derivatives) * ip + num_derivatives * d) + r) + (physical_offsets[d] + i)] += transform[r][s] * mapped_value;
+            }
+        }
+    }
+}
+// Using affine transform to map values back to the physical element.
+return 0;
+}
+
+int transform_values_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(
+     ufc_scalar_t* restrict reference_values,
+     const ufc_scalar_t* restrict physical_values,
+     const double* restrict coordinate_dofs,
+     const ufc_coordinate_mapping* restrict cm)
+{
+  reference_values[0] = physical_values[0];
+reference_values[1] = physical_values[2];
+reference_values[2] = physical_values[4];
+reference_values[3] = physical_values[7];
+reference_values[4] = physical_values[9];
+reference_values[5] = physical_values[11];
+return 0;
+}
+
+int tabulate_reference_dof_coordinates_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(double* restrict reference_dof_coordinates)
+{
+  static const double dof_X[6] = { 0.0, 0.0, 1.0, 0.0, 0.0, 1.0 };
+memcpy(reference_dof_coordinates, dof_X, 6*sizeof(double));
+return 0;
+}
+
+ufc_finite_element* create_element_7b9349003d250ec7fa2df50263e639134b88ac62(void);
+
+ufc_finite_element* create_sub_element_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(int i)
+{
+  switch (i)
+{
+case 0:
+    return create_element_7b9349003d250ec7fa2df50263e639134b88ac62();
+case 1:
+    return create_element_7b9349003d250ec7fa2df50263e639134b88ac62();
+default:
+    return NULL;
+}
+}
+
+ufc_finite_element* create_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(void)
+{
+  ufc_finite_element* element = (ufc_finite_element*)malloc(sizeof(*element));
+
+  element->signature = "VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  element->cell_shape = triangle;
+  element->topological_dimension = 2;
+  element->geometric_dimension = 2;
+  element->space_dimension = 6;
+  element->value_rank = 1;
+  element->value_dimension = value_dimension_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->value_size = 2;
+  element->reference_value_rank = 1;
+  element->reference_value_dimension = reference_value_dimension_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->reference_value_size = 2;
+  element->degree = 1;
+  element->family = "Lagrange";
+  element->block_size = 2;
+  element->evaluate_reference_basis = evaluate_reference_basis_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->evaluate_reference_basis_derivatives = evaluate_reference_basis_derivatives_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->transform_reference_basis_derivatives = transform_reference_basis_derivatives_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->transform_values = transform_values_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->tabulate_reference_dof_coordinates = tabulate_reference_dof_coordinates_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->num_sub_elements = 2;
+  element->create_sub_element = create_sub_element_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  element->create = create_element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+
+  return element;
+}
+
+// End of code for element element_fd416d4eaa41d7a9b72d84bc029879af0c2c680e
+
+// Code for dofmap dofmap_7b9349003d250ec7fa2df50263e639134b88ac62
+
+void tabulate_entity_dofs_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62(int* restrict dofs, int d, int i)
+{
+switch (d)
+{
+case 0:
+    switch (i)
+    {
+    case 0:
+        dofs[0] = 0;
+        break;
+    case 1:
+        dofs[0] = 1;
+        break;
+    case 2:
+        dofs[0] = 2;
+        break;
+    }
+    break;
+}
+}
+
+
+ufc_dofmap* create_sub_dofmap_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62(int i)
+{
+return NULL;
+}
+
+ufc_dofmap* create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62(void)
+{
+  ufc_dofmap* dofmap = (ufc_dofmap*)malloc(sizeof(*dofmap));
+  dofmap->signature = "FFCX dofmap for FiniteElement('Lagrange', triangle, 1)";
+  dofmap->block_size = 1;
+  dofmap->num_global_support_dofs = 0;
+  dofmap->num_element_support_dofs = 3;
+  dofmap->num_entity_dofs[0] = 1;
+  dofmap->num_entity_dofs[1] = 0;
+  dofmap->num_entity_dofs[2] = 0;
+  dofmap->num_entity_dofs[3] = 0;
+  dofmap->tabulate_entity_dofs = tabulate_entity_dofs_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+  dofmap->num_sub_dofmaps = 0;
+  dofmap->create_sub_dofmap = create_sub_dofmap_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+  dofmap->create = create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+
+  dofmap->size_base_permutations = 9;
+  static const int bp[9] = {0,1,2,0,1,2,0,1,2};
+  dofmap->base_permutations = bp;
+
+
+  return dofmap;
+}
+
+// End of code for dofmap dofmap_7b9349003d250ec7fa2df50263e639134b88ac62
+
+// Code for dofmap dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e
+
+void tabulate_entity_dofs_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(int* restrict dofs, int d, int i)
+{
+switch (d)
+{
+case 0:
+    switch (i)
+    {
+    case 0:
+        dofs[0] = 0;
+        break;
+    case 1:
+        dofs[0] = 1;
+        break;
+    case 2:
+        dofs[0] = 2;
+        break;
+    }
+    break;
+}
+}
+
+ufc_dofmap* create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62(void);
+
+ufc_dofmap* create_sub_dofmap_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(int i)
+{
+switch (i)
+{
+case 0:
+    return create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62();
+case 1:
+    return create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62();
+default:
+    return NULL;
+}
+}
+
+ufc_dofmap* create_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e(void)
+{
+  ufc_dofmap* dofmap = (ufc_dofmap*)malloc(sizeof(*dofmap));
+  dofmap->signature = "FFCX dofmap for VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  dofmap->block_size = 2;
+  dofmap->num_global_support_dofs = 0;
+  dofmap->num_element_support_dofs = 3;
+  dofmap->num_entity_dofs[0] = 1;
+  dofmap->num_entity_dofs[1] = 0;
+  dofmap->num_entity_dofs[2] = 0;
+  dofmap->num_entity_dofs[3] = 0;
+  dofmap->tabulate_entity_dofs = tabulate_entity_dofs_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  dofmap->num_sub_dofmaps = 2;
+  dofmap->create_sub_dofmap = create_sub_dofmap_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+  dofmap->create = create_dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e;
+
+  dofmap->size_base_permutations = 9;
+  static const int bp[9] = {0,1,2,0,1,2,0,1,2};
+  dofmap->base_permutations = bp;
+
+
+  return dofmap;
+}
+
+// End of code for dofmap dofmap_fd416d4eaa41d7a9b72d84bc029879af0c2c680e
+
+// Code for coordinate mapping coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec
+
+ufc_coordinate_mapping* create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec(void)
+{
+  ufc_coordinate_mapping* cmap = (ufc_coordinate_mapping*)malloc(sizeof(*cmap));
+  cmap->signature = "FFCX coordinate_mapping from VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  cmap->create = create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec;
+  cmap->geometric_dimension = 2;
+  cmap->topological_dimension = 2;
+  cmap->is_affine = 1;
+  cmap->cell_shape = triangle;
+  cmap->create_scalar_dofmap = create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+  cmap->evaluate_basis_derivatives = evaluate_reference_basis_derivatives_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+  return cmap;
+}
+
+ufc_coordinate_mapping* create_coordinate_map_JIT(void)
+{
+  return create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec();
+}
+
+
+// End of code for coordinate mapping coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec
+
+// Code for integral integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394
+
+
+void tabulate_tensor_integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394(ufc_scalar_t* restrict A,
+                                    const ufc_scalar_t* restrict w,
+                                    const ufc_scalar_t* restrict c,
+                                    const double* restrict coordinate_dofs,
+                                    const int* restrict unused_local_index,
+                                    const uint8_t* restrict quadrature_permutation,
+                                    const uint32_t cell_permutation)
+{
+    // Quadrature rules
+    alignas(32) static const double weights_083[1] = { 0.5 };
+    // Precomputed values of basis functions and precomputations
+    // FE* dimensions: [permutation][entities][points][dofs]
+    alignas(32) static const double FE3_C0_D01_Q083[1][1][1][2] = { { { { -1.0, 1.0 } } } };
+    // Quadrature loop independent computations for quadrature rule 083
+    const double J_c0 = coordinate_dofs[0] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[2] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c3 = coordinate_dofs[1] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[5] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c1 = coordinate_dofs[0] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[4] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c2 = coordinate_dofs[1] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[3] * FE3_C0_D01_Q083[0][0][0][1];
+    alignas(32) ufc_scalar_t sp_083[20];
+    sp_083[0] = J_c0 * J_c3;
+    sp_083[1] = J_c1 * J_c2;
+    sp_083[2] = sp_083[0] + -1 * sp_083[1];
+    sp_083[3] = J_c0 / sp_083[2];
+    sp_083[4] = (-1 * J_c1) / sp_083[2];
+    sp_083[5] = sp_083[3] * sp_083[3];
+    sp_083[6] = sp_083[3] * sp_083[4];
+    sp_083[7] = sp_083[4] * sp_083[4];
+    sp_083[8] = J_c3 / sp_083[2];
+    sp_083[9] = (-1 * J_c2) / sp_083[2];
+    sp_083[10] = sp_083[9] * sp_083[9];
+    sp_083[11] = sp_083[8] * sp_083[9];
+    sp_083[12] = sp_083[8] * sp_083[8];
+    sp_083[13] = sp_083[5] + sp_083[10];
+    sp_083[14] = sp_083[6] + sp_083[11];
+    sp_083[15] = sp_083[12] + sp_083[7];
+    sp_083[16] = fabs(sp_083[2]);
+    sp_083[17] = sp_083[13] * sp_083[16];
+    sp_083[18] = sp_083[14] * sp_083[16];
+    sp_083[19] = sp_083[15] * sp_083[16];
+    for (int iq = 0; iq < 1; ++iq)
+    {
+        const ufc_scalar_t fw0 = sp_083[19] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * i + j] += fw0 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        const ufc_scalar_t fw1 = sp_083[18] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * i + 2 * j] += fw1 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * (2 * i) + j] += fw1 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        const ufc_scalar_t fw2 = sp_083[17] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * (2 * i) + 2 * j] += fw2 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+    }
+}
+
+
+ufc_integral* create_integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+  static const bool enabled[1] = {false};  /* No coefficients, but C does not permit zero-sized arrays */
+  ufc_integral* integral = (ufc_integral*)malloc(sizeof(*integral));
+  integral->enabled_coefficients = enabled;
+  integral->tabulate_tensor = tabulate_tensor_integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  integral->needs_permutation_data = 1;
+  integral->tabulate_tensor_batch = NULL;
+  integral->batch_size = 0;
+  integral->tabulate_action = NULL;
+  static const int nonzero_blocks[1][2][2] =
+      { { { 0, 3 },
+          { 0, 3 } } };
+  integral->num_nonzero_blocks = 1;
+  integral->nonzero_blocks = &nonzero_blocks[0][0][0];
+  integral->sets_nonzero_blocks = false;
+  return integral;
+}
+
+// End of code for integral integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394
+
+// Code for form form_e34cd329aa5f6dab6250eec121c11fe9dc45f394
+
+int original_coefficient_position_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int i)
+{
+// Invalid original coefficient index.
+return -1;
+}
+
+// Return a list of the coefficient names.
+const char** coefficient_name_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+return NULL;
+}
+
+// Return a list of the constant names.
+const char** constant_name_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+return NULL;
+}
+
+ufc_coordinate_mapping* create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec(void);
+
+ufc_coordinate_mapping* create_coordinate_mapping_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+return create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec();
+}
+
+ufc_finite_element* create_element_7b9349003d250ec7fa2df50263e639134b88ac62(void);
+
+ufc_finite_element* create_finite_element_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int i)
+{
+switch (i)
+{
+case 0:
+    return create_element_7b9349003d250ec7fa2df50263e639134b88ac62();
+case 1:
+    return create_element_7b9349003d250ec7fa2df50263e639134b88ac62();
+default:
+    return NULL;
+}
+}
+
+ufc_dofmap* create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62(void);
+
+ufc_dofmap* create_dofmap_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int i)
+{
+switch (i)
+{
+case 0:
+    return create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62();
+case 1:
+    return create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62();
+default:
+    return NULL;
+}
+}
+
+ufc_integral* create_cell_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int subdomain_id)
+{
+  switch (subdomain_id)
+{
+case -1:
+    return create_integral_cell_otherwise_e34cd329aa5f6dab6250eec121c11fe9dc45f394();
+default:
+    return NULL;
+}
+}
+
+void get_cell_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int *ids)
+{
+  ids[0] = -1;
+return;
+}
+
+ufc_integral* create_exterior_facet_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int subdomain_id)
+{
+  return NULL;
+}
+
+void get_exterior_facet_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int *ids)
+{
+  return;
+}
+
+ufc_integral* create_interior_facet_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int subdomain_id)
+{
+return NULL;
+}
+
+void get_interior_facet_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int *ids)
+{
+  return;
+}
+
+ufc_integral* create_vertex_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int subdomain_id)
+{
+return NULL;
+}
+
+void get_vertex_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int *ids)
+{
+  return;
+}
+
+ufc_custom_integral* create_custom_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int subdomain_id)
+{
+return NULL;
+}
+
+void get_custom_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(int *ids)
+{
+  return;
+}
+
+ufc_form* create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+  ufc_form* form = (ufc_form*)malloc(sizeof(*form));
+
+  form->signature = "69dad397d7c053c8954688c506b7889f881f0bc42e1aeb8caa238ed3d847835b6042e9e23a436af68d469ff4eb21c6cf74d45bcf9d8b3f1c7a250901a9e7f7e7";
+  form->rank = 2;
+  form->num_coefficients = 0;
+  form->num_constants = 0;
+  form->original_coefficient_position = original_coefficient_position_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+
+  form->coefficient_name_map = coefficient_name_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->constant_name_map = constant_name_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+
+  form->create_coordinate_mapping = create_coordinate_mapping_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_finite_element = create_finite_element_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_dofmap = create_dofmap_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+
+  form->get_cell_integral_ids = get_cell_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->get_exterior_facet_integral_ids = get_exterior_facet_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->get_interior_facet_integral_ids = get_interior_facet_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->get_vertex_integral_ids = get_vertex_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->get_custom_integral_ids = get_custom_integral_ids_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+
+  form->num_cell_integrals = 1;
+  form->num_exterior_facet_integrals = 0;
+  form->num_interior_facet_integrals = 0;
+  form->num_vertex_integrals = 0;
+  form->num_custom_integrals = 0;
+
+  form->create_cell_integral = create_cell_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_exterior_facet_integral = create_exterior_facet_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_interior_facet_integral = create_interior_facet_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_vertex_integral = create_vertex_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+  form->create_custom_integral = create_custom_integral_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394;
+
+  return form;
+}
+
+ufc_form* create_form_JIT_0(void)
+{
+  return create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394();
+}
+
+ufc_function_space* create_functionspace_form_JIT_0(const char* function_name)
+{
+  if (strcmp(function_name, "v_0") == 0)
+{
+    ufc_function_space* space = (ufc_function_space*)malloc(sizeof(*space));
+    space->create_element = create_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+    space->create_dofmap = create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+    space->create_coordinate_mapping = create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec;
+    return space;
+}
+else if (strcmp(function_name, "v_1") == 0)
+{
+    ufc_function_space* space = (ufc_function_space*)malloc(sizeof(*space));
+    space->create_element = create_element_7b9349003d250ec7fa2df50263e639134b88ac62;
+    space->create_dofmap = create_dofmap_7b9349003d250ec7fa2df50263e639134b88ac62;
+    space->create_coordinate_mapping = create_coordinate_mapping_9ec2a828bf9a798cedee2c731b349039e6107eec;
+    return space;
+}
+return NULL;
+
+}
+
+// End of code for form form_e34cd329aa5f6dab6250eec121c11fe9dc45f394
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 109), // char const * *()(void)
+/*  1 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  2 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *)
+/*  3 */ _CFFI_OP(_CFFI_OP_POINTER, 112), // double *
+/*  4 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  5 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, double const *, double const *, ufc_coordinate_mapping const *)
+/*  6 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/*  7 */ _CFFI_OP(_CFFI_OP_POINTER, 112), // double const *
+/*  8 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/*  9 */ _CFFI_OP(_CFFI_OP_POINTER, 123), // ufc_coordinate_mapping const *
+/* 10 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, double const *)
+/* 12 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 13 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/* 14 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 15 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 16 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, int, double const *)
+/* 17 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 18 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 19 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 20 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 21 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 22 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t)
+/* 23 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 24 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 25 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 26 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 27 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 28 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 29 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 30 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 31 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22), // uint32_t
+/* 32 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 33 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(int)
+/* 34 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 35 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 36 */ _CFFI_OP(_CFFI_OP_FUNCTION, 122), // ufc_coordinate_mapping *()(void)
+/* 37 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 38 */ _CFFI_OP(_CFFI_OP_FUNCTION, 125), // ufc_custom_integral *()(int)
+/* 39 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 40 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 41 */ _CFFI_OP(_CFFI_OP_FUNCTION, 129), // ufc_dofmap *()(int)
+/* 42 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 43 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 44 */ _CFFI_OP(_CFFI_OP_FUNCTION, 129), // ufc_dofmap *()(void)
+/* 45 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 46 */ _CFFI_OP(_CFFI_OP_FUNCTION, 134), // ufc_finite_element *()(int)
+/* 47 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 48 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 49 */ _CFFI_OP(_CFFI_OP_FUNCTION, 134), // ufc_finite_element *()(void)
+/* 50 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 51 */ _CFFI_OP(_CFFI_OP_FUNCTION, 136), // ufc_form *()(void)
+/* 52 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 53 */ _CFFI_OP(_CFFI_OP_FUNCTION, 139), // ufc_integral *()(int)
+/* 54 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 55 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 56 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 57 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 58 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 59 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 60 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 61 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 62 */ _CFFI_OP(_CFFI_OP_POINTER, 13), // int const *
+/* 63 */ _CFFI_OP(_CFFI_OP_POINTER, 142), // uint8_t const *
+/* 64 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 65 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 66 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 67 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 68 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 69 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 70 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 71 */ _CFFI_OP(_CFFI_OP_NOOP, 62),
+/* 72 */ _CFFI_OP(_CFFI_OP_NOOP, 63),
+/* 73 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 74 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 75 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(double *, double const *, double const *, double const *, int, double const *, double const *, double const *)
+/* 76 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 77 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 78 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 79 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 80 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 81 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 82 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 83 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 84 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 85 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(int *)
+/* 86 */ _CFFI_OP(_CFFI_OP_POINTER, 13), // int *
+/* 87 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 88 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(int *, int, int)
+/* 89 */ _CFFI_OP(_CFFI_OP_NOOP, 86),
+/* 90 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 91 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 92 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 93 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *)
+/* 94 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 95 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 96 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 97 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 98 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 99 */ _CFFI_OP(_CFFI_OP_NOOP, 62),
+/* 100 */ _CFFI_OP(_CFFI_OP_NOOP, 63),
+/* 101 */ _CFFI_OP(_CFFI_OP_POINTER, 31), // uint32_t const *
+/* 102 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 103 */ _CFFI_OP(_CFFI_OP_FUNCTION, 149), // void()(void *)
+/* 104 */ _CFFI_OP(_CFFI_OP_POINTER, 149), // void *
+/* 105 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 106 */ _CFFI_OP(_CFFI_OP_POINTER, 107), // _Bool const *
+/* 107 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 1), // _Bool
+/* 108 */ _CFFI_OP(_CFFI_OP_POINTER, 0), // char const * *(*)(void)
+/* 109 */ _CFFI_OP(_CFFI_OP_POINTER, 110), // char const * *
+/* 110 */ _CFFI_OP(_CFFI_OP_POINTER, 111), // char const *
+/* 111 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 112 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14), // double
+/* 113 */ _CFFI_OP(_CFFI_OP_POINTER, 2), // int(*)(double *)
+/* 114 */ _CFFI_OP(_CFFI_OP_POINTER, 5), // int(*)(double *, double const *, double const *, ufc_coordinate_mapping const *)
+/* 115 */ _CFFI_OP(_CFFI_OP_POINTER, 11), // int(*)(double *, int, double const *)
+/* 116 */ _CFFI_OP(_CFFI_OP_POINTER, 16), // int(*)(double *, int, int, double const *)
+/* 117 */ _CFFI_OP(_CFFI_OP_POINTER, 22), // int(*)(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t)
+/* 118 */ _CFFI_OP(_CFFI_OP_POINTER, 33), // int(*)(int)
+/* 119 */ _CFFI_OP(_CFFI_OP_ARRAY, 13), // int[4]
+/* 120 */ (_cffi_opcode_t)(4),
+/* 121 */ _CFFI_OP(_CFFI_OP_POINTER, 36), // ufc_coordinate_mapping *(*)(void)
+/* 122 */ _CFFI_OP(_CFFI_OP_POINTER, 123), // ufc_coordinate_mapping *
+/* 123 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // ufc_coordinate_mapping
+/* 124 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // ufc_custom_integral *(*)(int)
+/* 125 */ _CFFI_OP(_CFFI_OP_POINTER, 126), // ufc_custom_integral *
+/* 126 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // ufc_custom_integral
+/* 127 */ _CFFI_OP(_CFFI_OP_POINTER, 41), // ufc_dofmap *(*)(int)
+/* 128 */ _CFFI_OP(_CFFI_OP_POINTER, 44), // ufc_dofmap *(*)(void)
+/* 129 */ _CFFI_OP(_CFFI_OP_POINTER, 130), // ufc_dofmap *
+/* 130 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // ufc_dofmap
+/* 131 */ _CFFI_OP(_CFFI_OP_ENUM, 0), // ufc_doftype
+/* 132 */ _CFFI_OP(_CFFI_OP_POINTER, 46), // ufc_finite_element *(*)(int)
+/* 133 */ _CFFI_OP(_CFFI_OP_POINTER, 49), // ufc_finite_element *(*)(void)
+/* 134 */ _CFFI_OP(_CFFI_OP_POINTER, 135), // ufc_finite_element *
+/* 135 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 3), // ufc_finite_element
+/* 136 */ _CFFI_OP(_CFFI_OP_POINTER, 137), // ufc_form *
+/* 137 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 4), // ufc_form
+/* 138 */ _CFFI_OP(_CFFI_OP_POINTER, 53), // ufc_integral *(*)(int)
+/* 139 */ _CFFI_OP(_CFFI_OP_POINTER, 140), // ufc_integral *
+/* 140 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 5), // ufc_integral
+/* 141 */ _CFFI_OP(_CFFI_OP_ENUM, 1), // ufc_shape
+/* 142 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 18), // uint8_t
+/* 143 */ _CFFI_OP(_CFFI_OP_POINTER, 56), // void(*)(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 144 */ _CFFI_OP(_CFFI_OP_POINTER, 66), // void(*)(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 145 */ _CFFI_OP(_CFFI_OP_POINTER, 75), // void(*)(double *, double const *, double const *, double const *, int, double const *, double const *, double const *)
+/* 146 */ _CFFI_OP(_CFFI_OP_POINTER, 85), // void(*)(int *)
+/* 147 */ _CFFI_OP(_CFFI_OP_POINTER, 88), // void(*)(int *, int, int)
+/* 148 */ _CFFI_OP(_CFFI_OP_POINTER, 93), // void(*)(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *)
+/* 149 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static int _cffi_const_PointEval(unsigned long long *o)
+{
+  int n = (PointEval) <= 0;
+  *o = (unsigned long long)((PointEval) | 0);  /* check that PointEval is an integer */
+  return n;
+}
+
+static int _cffi_const_ComponentPointEval(unsigned long long *o)
+{
+  int n = (ComponentPointEval) <= 0;
+  *o = (unsigned long long)((ComponentPointEval) | 0);  /* check that ComponentPointEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointNormalDeriv(unsigned long long *o)
+{
+  int n = (PointNormalDeriv) <= 0;
+  *o = (unsigned long long)((PointNormalDeriv) | 0);  /* check that PointNormalDeriv is an integer */
+  return n;
+}
+
+static int _cffi_const_IntegralMoment(unsigned long long *o)
+{
+  int n = (IntegralMoment) <= 0;
+  *o = (unsigned long long)((IntegralMoment) | 0);  /* check that IntegralMoment is an integer */
+  return n;
+}
+
+static int _cffi_const_FrobeniusIntegralMoment(unsigned long long *o)
+{
+  int n = (FrobeniusIntegralMoment) <= 0;
+  *o = (unsigned long long)((FrobeniusIntegralMoment) | 0);  /* check that FrobeniusIntegralMoment is an integer */
+  return n;
+}
+
+static int _cffi_const_PointEdgeTangent(unsigned long long *o)
+{
+  int n = (PointEdgeTangent) <= 0;
+  *o = (unsigned long long)((PointEdgeTangent) | 0);  /* check that PointEdgeTangent is an integer */
+  return n;
+}
+
+static int _cffi_const_PointFaceTangent(unsigned long long *o)
+{
+  int n = (PointFaceTangent) <= 0;
+  *o = (unsigned long long)((PointFaceTangent) | 0);  /* check that PointFaceTangent is an integer */
+  return n;
+}
+
+static int _cffi_const_PointScaledNormalEval(unsigned long long *o)
+{
+  int n = (PointScaledNormalEval) <= 0;
+  *o = (unsigned long long)((PointScaledNormalEval) | 0);  /* check that PointScaledNormalEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointDeriv(unsigned long long *o)
+{
+  int n = (PointDeriv) <= 0;
+  *o = (unsigned long long)((PointDeriv) | 0);  /* check that PointDeriv is an integer */
+  return n;
+}
+
+static int _cffi_const_IntegralMomentOfNormalDerivative(unsigned long long *o)
+{
+  int n = (IntegralMomentOfNormalDerivative) <= 0;
+  *o = (unsigned long long)((IntegralMomentOfNormalDerivative) | 0);  /* check that IntegralMomentOfNormalDerivative is an integer */
+  return n;
+}
+
+static int _cffi_const_PointNormalEval(unsigned long long *o)
+{
+  int n = (PointNormalEval) <= 0;
+  *o = (unsigned long long)((PointNormalEval) | 0);  /* check that PointNormalEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointwiseInnerProductEval(unsigned long long *o)
+{
+  int n = (PointwiseInnerProductEval) <= 0;
+  *o = (unsigned long long)((PointwiseInnerProductEval) | 0);  /* check that PointwiseInnerProductEval is an integer */
+  return n;
+}
+
+static int _cffi_const_interval(unsigned long long *o)
+{
+  int n = (interval) <= 0;
+  *o = (unsigned long long)((interval) | 0);  /* check that interval is an integer */
+  return n;
+}
+
+static int _cffi_const_triangle(unsigned long long *o)
+{
+  int n = (triangle) <= 0;
+  *o = (unsigned long long)((triangle) | 0);  /* check that triangle is an integer */
+  return n;
+}
+
+static int _cffi_const_quadrilateral(unsigned long long *o)
+{
+  int n = (quadrilateral) <= 0;
+  *o = (unsigned long long)((quadrilateral) | 0);  /* check that quadrilateral is an integer */
+  return n;
+}
+
+static int _cffi_const_tetrahedron(unsigned long long *o)
+{
+  int n = (tetrahedron) <= 0;
+  *o = (unsigned long long)((tetrahedron) | 0);  /* check that tetrahedron is an integer */
+  return n;
+}
+
+static int _cffi_const_hexahedron(unsigned long long *o)
+{
+  int n = (hexahedron) <= 0;
+  *o = (unsigned long long)((hexahedron) | 0);  /* check that hexahedron is an integer */
+  return n;
+}
+
+static int _cffi_const_vertex(unsigned long long *o)
+{
+  int n = (vertex) <= 0;
+  *o = (unsigned long long)((vertex) | 0);  /* check that vertex is an integer */
+  return n;
+}
+
+static ufc_form * _cffi_d_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(void)
+{
+  return create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394();
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(PyObject *self, PyObject *noarg)
+{
+  ufc_form * result;
+  PyObject *pyresult;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394(); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  (void)noarg; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(136));
+  return pyresult;
+}
+#else
+#  define _cffi_f_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394 _cffi_d_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394
+#endif
+
+static void _cffi_d_free(void * x0)
+{
+  free(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_free(PyObject *self, PyObject *arg0)
+{
+  void * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(104), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (void *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(104), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { free(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_free _cffi_d_free
+#endif
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_coordinate_mapping(ufc_coordinate_mapping *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { ufc_coordinate_mapping *(* *tmp)(void) = &p->create; (void)tmp; }
+  (void)((p->geometric_dimension) | 0);  /* check that 'ufc_coordinate_mapping.geometric_dimension' is an integer */
+  (void)((p->topological_dimension) | 0);  /* check that 'ufc_coordinate_mapping.topological_dimension' is an integer */
+  (void)((p->is_affine) | 0);  /* check that 'ufc_coordinate_mapping.is_affine' is an integer */
+  { ufc_shape *tmp = &p->cell_shape; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(void) = &p->create_scalar_dofmap; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *) = &p->evaluate_basis_derivatives; (void)tmp; }
+}
+struct _cffi_align__ufc_coordinate_mapping { char x; ufc_coordinate_mapping y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_custom_integral(ufc_custom_integral *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { _Bool const * *tmp = &p->enabled_coefficients; (void)tmp; }
+  { void(* *tmp)(double *, double const *, double const *, double const *, int, double const *, double const *, double const *) = &p->tabulate_tensor; (void)tmp; }
+  (void)((p->needs_permutation_data) | 0);  /* check that 'ufc_custom_integral.needs_permutation_data' is an integer */
+}
+struct _cffi_align__ufc_custom_integral { char x; ufc_custom_integral y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_dofmap(ufc_dofmap *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { int const * *tmp = &p->base_permutations; (void)tmp; }
+  (void)((p->size_base_permutations) | 0);  /* check that 'ufc_dofmap.size_base_permutations' is an integer */
+  (void)((p->num_global_support_dofs) | 0);  /* check that 'ufc_dofmap.num_global_support_dofs' is an integer */
+  (void)((p->num_element_support_dofs) | 0);  /* check that 'ufc_dofmap.num_element_support_dofs' is an integer */
+  (void)((p->block_size) | 0);  /* check that 'ufc_dofmap.block_size' is an integer */
+  { int(*tmp)[4] = &p->num_entity_dofs; (void)tmp; }
+  { void(* *tmp)(int *, int, int) = &p->tabulate_entity_dofs; (void)tmp; }
+  (void)((p->num_sub_dofmaps) | 0);  /* check that 'ufc_dofmap.num_sub_dofmaps' is an integer */
+  { ufc_dofmap *(* *tmp)(int) = &p->create_sub_dofmap; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(void) = &p->create; (void)tmp; }
+}
+struct _cffi_align__ufc_dofmap { char x; ufc_dofmap y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_finite_element(ufc_finite_element *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { ufc_shape *tmp = &p->cell_shape; (void)tmp; }
+  (void)((p->topological_dimension) | 0);  /* check that 'ufc_finite_element.topological_dimension' is an integer */
+  (void)((p->geometric_dimension) | 0);  /* check that 'ufc_finite_element.geometric_dimension' is an integer */
+  (void)((p->space_dimension) | 0);  /* check that 'ufc_finite_element.space_dimension' is an integer */
+  (void)((p->value_rank) | 0);  /* check that 'ufc_finite_element.value_rank' is an integer */
+  { int(* *tmp)(int) = &p->value_dimension; (void)tmp; }
+  (void)((p->value_size) | 0);  /* check that 'ufc_finite_element.value_size' is an integer */
+  (void)((p->reference_value_rank) | 0);  /* check that 'ufc_finite_element.reference_value_rank' is an integer */
+  { int(* *tmp)(int) = &p->reference_value_dimension; (void)tmp; }
+  (void)((p->reference_value_size) | 0);  /* check that 'ufc_finite_element.reference_value_size' is an integer */
+  (void)((p->degree) | 0);  /* check that 'ufc_finite_element.degree' is an integer */
+  (void)((p->block_size) | 0);  /* check that 'ufc_finite_element.block_size' is an integer */
+  { char const * *tmp = &p->family; (void)tmp; }
+  { int(* *tmp)(double *, int, double const *) = &p->evaluate_reference_basis; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *) = &p->evaluate_reference_basis_derivatives; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t) = &p->transform_reference_basis_derivatives; (void)tmp; }
+  { int(* *tmp)(double *, double const *, double const *, ufc_coordinate_mapping const *) = &p->transform_values; (void)tmp; }
+  { int(* *tmp)(double *) = &p->tabulate_reference_dof_coordinates; (void)tmp; }
+  (void)((p->num_sub_elements) | 0);  /* check that 'ufc_finite_element.num_sub_elements' is an integer */
+  { ufc_finite_element *(* *tmp)(int) = &p->create_sub_element; (void)tmp; }
+  { ufc_finite_element *(* *tmp)(void) = &p->create; (void)tmp; }
+}
+struct _cffi_align__ufc_finite_element { char x; ufc_finite_element y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_form(ufc_form *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  (void)((p->rank) | 0);  /* check that 'ufc_form.rank' is an integer */
+  (void)((p->num_coefficients) | 0);  /* check that 'ufc_form.num_coefficients' is an integer */
+  (void)((p->num_constants) | 0);  /* check that 'ufc_form.num_constants' is an integer */
+  { int(* *tmp)(int) = &p->original_coefficient_position; (void)tmp; }
+  { char const * *(* *tmp)(void) = &p->coefficient_name_map; (void)tmp; }
+  { char const * *(* *tmp)(void) = &p->constant_name_map; (void)tmp; }
+  { ufc_coordinate_mapping *(* *tmp)(void) = &p->create_coordinate_mapping; (void)tmp; }
+  { ufc_finite_element *(* *tmp)(int) = &p->create_finite_element; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(int) = &p->create_dofmap; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_cell_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_exterior_facet_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_interior_facet_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_vertex_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_custom_integral_ids; (void)tmp; }
+  (void)((p->num_cell_integrals) | 0);  /* check that 'ufc_form.num_cell_integrals' is an integer */
+  (void)((p->num_exterior_facet_integrals) | 0);  /* check that 'ufc_form.num_exterior_facet_integrals' is an integer */
+  (void)((p->num_interior_facet_integrals) | 0);  /* check that 'ufc_form.num_interior_facet_integrals' is an integer */
+  (void)((p->num_vertex_integrals) | 0);  /* check that 'ufc_form.num_vertex_integrals' is an integer */
+  (void)((p->num_custom_integrals) | 0);  /* check that 'ufc_form.num_custom_integrals' is an integer */
+  { ufc_integral *(* *tmp)(int) = &p->create_cell_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_exterior_facet_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_interior_facet_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_vertex_integral; (void)tmp; }
+  { ufc_custom_integral *(* *tmp)(int) = &p->create_custom_integral; (void)tmp; }
+}
+struct _cffi_align__ufc_form { char x; ufc_form y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_integral(ufc_integral *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { _Bool const * *tmp = &p->enabled_coefficients; (void)tmp; }
+  { void(* *tmp)(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_tensor; (void)tmp; }
+  (void)((p->needs_permutation_data) | 0);  /* check that 'ufc_integral.needs_permutation_data' is an integer */
+  { void(* *tmp)(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *) = &p->tabulate_tensor_batch; (void)tmp; }
+  (void)((p->batch_size) | 0);  /* check that 'ufc_integral.batch_size' is an integer */
+  { void(* *tmp)(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_action; (void)tmp; }
+  (void)((p->num_nonzero_blocks) | 0);  /* check that 'ufc_integral.num_nonzero_blocks' is an integer */
+  { int const * *tmp = &p->nonzero_blocks; (void)tmp; }
+  (void)((p->sets_nonzero_blocks) | 0);  /* check that 'ufc_integral.sets_nonzero_blocks' is an integer */
+}
+struct _cffi_align__ufc_integral { char x; ufc_integral y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "ComponentPointEval", (void *)_cffi_const_ComponentPointEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "FrobeniusIntegralMoment", (void *)_cffi_const_FrobeniusIntegralMoment, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "IntegralMoment", (void *)_cffi_const_IntegralMoment, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "IntegralMomentOfNormalDerivative", (void *)_cffi_const_IntegralMomentOfNormalDerivative, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointDeriv", (void *)_cffi_const_PointDeriv, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointEdgeTangent", (void *)_cffi_const_PointEdgeTangent, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointEval", (void *)_cffi_const_PointEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointFaceTangent", (void *)_cffi_const_PointFaceTangent, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointNormalDeriv", (void *)_cffi_const_PointNormalDeriv, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointNormalEval", (void *)_cffi_const_PointNormalEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointScaledNormalEval", (void *)_cffi_const_PointScaledNormalEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointwiseInnerProductEval", (void *)_cffi_const_PointwiseInnerProductEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394", (void *)_cffi_f_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_N, 51), (void *)_cffi_d_create_form_e34cd329aa5f6dab6250eec121c11fe9dc45f394 },
+  { "free", (void *)_cffi_f_free, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 103), (void *)_cffi_d_free },
+  { "hexahedron", (void *)_cffi_const_hexahedron, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "interval", (void *)_cffi_const_interval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "quadrilateral", (void *)_cffi_const_quadrilateral, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "tetrahedron", (void *)_cffi_const_tetrahedron, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "triangle", (void *)_cffi_const_triangle, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "vertex", (void *)_cffi_const_vertex, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "signature", offsetof(ufc_coordinate_mapping, signature),
+                 sizeof(((ufc_coordinate_mapping *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 110) },
+  { "create", offsetof(ufc_coordinate_mapping, create),
+              sizeof(((ufc_coordinate_mapping *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 121) },
+  { "geometric_dimension", offsetof(ufc_coordinate_mapping, geometric_dimension),
+                           sizeof(((ufc_coordinate_mapping *)0)->geometric_dimension),
+                           _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "topological_dimension", offsetof(ufc_coordinate_mapping, topological_dimension),
+                             sizeof(((ufc_coordinate_mapping *)0)->topological_dimension),
+                             _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "is_affine", offsetof(ufc_coordinate_mapping, is_affine),
+                 sizeof(((ufc_coordinate_mapping *)0)->is_affine),
+                 _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "cell_shape", offsetof(ufc_coordinate_mapping, cell_shape),
+                  sizeof(((ufc_coordinate_mapping *)0)->cell_shape),
+                  _CFFI_OP(_CFFI_OP_NOOP, 141) },
+  { "create_scalar_dofmap", offsetof(ufc_coordinate_mapping, create_scalar_dofmap),
+                            sizeof(((ufc_coordinate_mapping *)0)->create_scalar_dofmap),
+                            _CFFI_OP(_CFFI_OP_NOOP, 128) },
+  { "evaluate_basis_derivatives", offsetof(ufc_coordinate_mapping, evaluate_basis_derivatives),
+                                  sizeof(((ufc_coordinate_mapping *)0)->evaluate_basis_derivatives),
+                                  _CFFI_OP(_CFFI_OP_NOOP, 116) },
+  { "enabled_coefficients", offsetof(ufc_custom_integral, enabled_coefficients),
+                            sizeof(((ufc_custom_integral *)0)->enabled_coefficients),
+                            _CFFI_OP(_CFFI_OP_NOOP, 106) },
+  { "tabulate_tensor", offsetof(ufc_custom_integral, tabulate_tensor),
+                       sizeof(((ufc_custom_integral *)0)->tabulate_tensor),
+                       _CFFI_OP(_CFFI_OP_NOOP, 145) },
+  { "needs_permutation_data", offsetof(ufc_custom_integral, needs_permutation_data),
+                              sizeof(((ufc_custom_integral *)0)->needs_permutation_data),
+                              _CFFI_OP(_CFFI_OP_NOOP, 107) },
+  { "signature", offsetof(ufc_dofmap, signature),
+                 sizeof(((ufc_dofmap *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 110) },
+  { "base_permutations", offsetof(ufc_dofmap, base_permutations),
+                         sizeof(((ufc_dofmap *)0)->base_permutations),
+                         _CFFI_OP(_CFFI_OP_NOOP, 62) },
+  { "size_base_permutations", offsetof(ufc_dofmap, size_base_permutations),
+                              sizeof(((ufc_dofmap *)0)->size_base_permutations),
+                              _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_global_support_dofs", offsetof(ufc_dofmap, num_global_support_dofs),
+                               sizeof(((ufc_dofmap *)0)->num_global_support_dofs),
+                               _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_element_support_dofs", offsetof(ufc_dofmap, num_element_support_dofs),
+                                sizeof(((ufc_dofmap *)0)->num_element_support_dofs),
+                                _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "block_size", offsetof(ufc_dofmap, block_size),
+                  sizeof(((ufc_dofmap *)0)->block_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_entity_dofs", offsetof(ufc_dofmap, num_entity_dofs),
+                       sizeof(((ufc_dofmap *)0)->num_entity_dofs),
+                       _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "tabulate_entity_dofs", offsetof(ufc_dofmap, tabulate_entity_dofs),
+                            sizeof(((ufc_dofmap *)0)->tabulate_entity_dofs),
+                            _CFFI_OP(_CFFI_OP_NOOP, 147) },
+  { "num_sub_dofmaps", offsetof(ufc_dofmap, num_sub_dofmaps),
+                       sizeof(((ufc_dofmap *)0)->num_sub_dofmaps),
+                       _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_sub_dofmap", offsetof(ufc_dofmap, create_sub_dofmap),
+                         sizeof(((ufc_dofmap *)0)->create_sub_dofmap),
+                         _CFFI_OP(_CFFI_OP_NOOP, 127) },
+  { "create", offsetof(ufc_dofmap, create),
+              sizeof(((ufc_dofmap *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 128) },
+  { "signature", offsetof(ufc_finite_element, signature),
+                 sizeof(((ufc_finite_element *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 110) },
+  { "cell_shape", offsetof(ufc_finite_element, cell_shape),
+                  sizeof(((ufc_finite_element *)0)->cell_shape),
+                  _CFFI_OP(_CFFI_OP_NOOP, 141) },
+  { "topological_dimension", offsetof(ufc_finite_element, topological_dimension),
+                             sizeof(((ufc_finite_element *)0)->topological_dimension),
+                             _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "geometric_dimension", offsetof(ufc_finite_element, geometric_dimension),
+                           sizeof(((ufc_finite_element *)0)->geometric_dimension),
+                           _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "space_dimension", offsetof(ufc_finite_element, space_dimension),
+                       sizeof(((ufc_finite_element *)0)->space_dimension),
+                       _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "value_rank", offsetof(ufc_finite_element, value_rank),
+                  sizeof(((ufc_finite_element *)0)->value_rank),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "value_dimension", offsetof(ufc_finite_element, value_dimension),
+                       sizeof(((ufc_finite_element *)0)->value_dimension),
+                       _CFFI_OP(_CFFI_OP_NOOP, 118) },
+  { "value_size", offsetof(ufc_finite_element, value_size),
+                  sizeof(((ufc_finite_element *)0)->value_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "reference_value_rank", offsetof(ufc_finite_element, reference_value_rank),
+                            sizeof(((ufc_finite_element *)0)->reference_value_rank),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "reference_value_dimension", offsetof(ufc_finite_element, reference_value_dimension),
+                                 sizeof(((ufc_finite_element *)0)->reference_value_dimension),
+                                 _CFFI_OP(_CFFI_OP_NOOP, 118) },
+  { "reference_value_size", offsetof(ufc_finite_element, reference_value_size),
+                            sizeof(((ufc_finite_element *)0)->reference_value_size),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "degree", offsetof(ufc_finite_element, degree),
+              sizeof(((ufc_finite_element *)0)->degree),
+              _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "block_size", offsetof(ufc_finite_element, block_size),
+                  sizeof(((ufc_finite_element *)0)->block_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "family", offsetof(ufc_finite_element, family),
+              sizeof(((ufc_finite_element *)0)->family),
+              _CFFI_OP(_CFFI_OP_NOOP, 110) },
+  { "evaluate_reference_basis", offsetof(ufc_finite_element, evaluate_reference_basis),
+                                sizeof(((ufc_finite_element *)0)->evaluate_reference_basis),
+                                _CFFI_OP(_CFFI_OP_NOOP, 115) },
+  { "evaluate_reference_basis_derivatives", offsetof(ufc_finite_element, evaluate_reference_basis_derivatives),
+                                            sizeof(((ufc_finite_element *)0)->evaluate_reference_basis_derivatives),
+                                            _CFFI_OP(_CFFI_OP_NOOP, 116) },
+  { "transform_reference_basis_derivatives", offsetof(ufc_finite_element, transform_reference_basis_derivatives),
+                                             sizeof(((ufc_finite_element *)0)->transform_reference_basis_derivatives),
+                                             _CFFI_OP(_CFFI_OP_NOOP, 117) },
+  { "transform_values", offsetof(ufc_finite_element, transform_values),
+                        sizeof(((ufc_finite_element *)0)->transform_values),
+                        _CFFI_OP(_CFFI_OP_NOOP, 114) },
+  { "tabulate_reference_dof_coordinates", offsetof(ufc_finite_element, tabulate_reference_dof_coordinates),
+                                          sizeof(((ufc_finite_element *)0)->tabulate_reference_dof_coordinates),
+                                          _CFFI_OP(_CFFI_OP_NOOP, 113) },
+  { "num_sub_elements", offsetof(ufc_finite_element, num_sub_elements),
+                        sizeof(((ufc_finite_element *)0)->num_sub_elements),
+                        _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_sub_element", offsetof(ufc_finite_element, create_sub_element),
+                          sizeof(((ufc_finite_element *)0)->create_sub_element),
+                          _CFFI_OP(_CFFI_OP_NOOP, 132) },
+  { "create", offsetof(ufc_finite_element, create),
+              sizeof(((ufc_finite_element *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 133) },
+  { "signature", offsetof(ufc_form, signature),
+                 sizeof(((ufc_form *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 110) },
+  { "rank", offsetof(ufc_form, rank),
+            sizeof(((ufc_form *)0)->rank),
+            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_coefficients", offsetof(ufc_form, num_coefficients),
+                        sizeof(((ufc_form *)0)->num_coefficients),
+                        _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_constants", offsetof(ufc_form, num_constants),
+                     sizeof(((ufc_form *)0)->num_constants),
+                     _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "original_coefficient_position", offsetof(ufc_form, original_coefficient_position),
+                                     sizeof(((ufc_form *)0)->original_coefficient_position),
+                                     _CFFI_OP(_CFFI_OP_NOOP, 118) },
+  { "coefficient_name_map", offsetof(ufc_form, coefficient_name_map),
+                            sizeof(((ufc_form *)0)->coefficient_name_map),
+                            _CFFI_OP(_CFFI_OP_NOOP, 108) },
+  { "constant_name_map", offsetof(ufc_form, constant_name_map),
+                         sizeof(((ufc_form *)0)->constant_name_map),
+                         _CFFI_OP(_CFFI_OP_NOOP, 108) },
+  { "create_coordinate_mapping", offsetof(ufc_form, create_coordinate_mapping),
+                                 sizeof(((ufc_form *)0)->create_coordinate_mapping),
+                                 _CFFI_OP(_CFFI_OP_NOOP, 121) },
+  { "create_finite_element", offsetof(ufc_form, create_finite_element),
+                             sizeof(((ufc_form *)0)->create_finite_element),
+                             _CFFI_OP(_CFFI_OP_NOOP, 132) },
+  { "create_dofmap", offsetof(ufc_form, create_dofmap),
+                     sizeof(((ufc_form *)0)->create_dofmap),
+                     _CFFI_OP(_CFFI_OP_NOOP, 127) },
+  { "get_cell_integral_ids", offsetof(ufc_form, get_cell_integral_ids),
+                             sizeof(((ufc_form *)0)->get_cell_integral_ids),
+                             _CFFI_OP(_CFFI_OP_NOOP, 146) },
+  { "get_exterior_facet_integral_ids", offsetof(ufc_form, get_exterior_facet_integral_ids),
+                                       sizeof(((ufc_form *)0)->get_exterior_facet_integral_ids),
+                                       _CFFI_OP(_CFFI_OP_NOOP, 146) },
+  { "get_interior_facet_integral_ids", offsetof(ufc_form, get_interior_facet_integral_ids),
+                                       sizeof(((ufc_form *)0)->get_interior_facet_integral_ids),
+                                       _CFFI_OP(_CFFI_OP_NOOP, 146) },
+  { "get_vertex_integral_ids", offsetof(ufc_form, get_vertex_integral_ids),
+                               sizeof(((ufc_form *)0)->get_vertex_integral_ids),
+                               _CFFI_OP(_CFFI_OP_NOOP, 146) },
+  { "get_custom_integral_ids", offsetof(ufc_form, get_custom_integral_ids),
+                               sizeof(((ufc_form *)0)->get_custom_integral_ids),
+                               _CFFI_OP(_CFFI_OP_NOOP, 146) },
+  { "num_cell_integrals", offsetof(ufc_form, num_cell_integrals),
+                          sizeof(((ufc_form *)0)->num_cell_integrals),
+                          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_exterior_facet_integrals", offsetof(ufc_form, num_exterior_facet_integrals),
+                                    sizeof(((ufc_form *)0)->num_exterior_facet_integrals),
+                                    _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_interior_facet_integrals", offsetof(ufc_form, num_interior_facet_integrals),
+                                    sizeof(((ufc_form *)0)->num_interior_facet_integrals),
+                                    _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_vertex_integrals", offsetof(ufc_form, num_vertex_integrals),
+                            sizeof(((ufc_form *)0)->num_vertex_integrals),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_custom_integrals", offsetof(ufc_form, num_custom_integrals),
+                            sizeof(((ufc_form *)0)->num_custom_integrals),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_cell_integral", offsetof(ufc_form, create_cell_integral),
+                            sizeof(((ufc_form *)0)->create_cell_integral),
+                            _CFFI_OP(_CFFI_OP_NOOP, 138) },
+  { "create_exterior_facet_integral", offsetof(ufc_form, create_exterior_facet_integral),
+                                      sizeof(((ufc_form *)0)->create_exterior_facet_integral),
+                                      _CFFI_OP(_CFFI_OP_NOOP, 138) },
+  { "create_interior_facet_integral", offsetof(ufc_form, create_interior_facet_integral),
+                                      sizeof(((ufc_form *)0)->create_interior_facet_integral),
+                                      _CFFI_OP(_CFFI_OP_NOOP, 138) },
+  { "create_vertex_integral", offsetof(ufc_form, create_vertex_integral),
+                              sizeof(((ufc_form *)0)->create_vertex_integral),
+                              _CFFI_OP(_CFFI_OP_NOOP, 138) },
+  { "create_custom_integral", offsetof(ufc_form, create_custom_integral),
+                              sizeof(((ufc_form *)0)->create_custom_integral),
+                              _CFFI_OP(_CFFI_OP_NOOP, 124) },
+  { "enabled_coefficients", offsetof(ufc_integral, enabled_coefficients),
+                            sizeof(((ufc_integral *)0)->enabled_coefficients),
+                            _CFFI_OP(_CFFI_OP_NOOP, 106) },
+  { "tabulate_tensor", offsetof(ufc_integral, tabulate_tensor),
+                       sizeof(((ufc_integral *)0)->tabulate_tensor),
+                       _CFFI_OP(_CFFI_OP_NOOP, 144) },
+  { "needs_permutation_data", offsetof(ufc_integral, needs_permutation_data),
+                              sizeof(((ufc_integral *)0)->needs_permutation_data),
+                              _CFFI_OP(_CFFI_OP_NOOP, 107) },
+  { "tabulate_tensor_batch", offsetof(ufc_integral, tabulate_tensor_batch),
+                             sizeof(((ufc_integral *)0)->tabulate_tensor_batch),
+                             _CFFI_OP(_CFFI_OP_NOOP, 148) },
+  { "batch_size", offsetof(ufc_integral, batch_size),
+                  sizeof(((ufc_integral *)0)->batch_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "tabulate_action", offsetof(ufc_integral, tabulate_action),
+                       sizeof(((ufc_integral *)0)->tabulate_action),
+                       _CFFI_OP(_CFFI_OP_NOOP, 143) },
+  { "num_nonzero_blocks", offsetof(ufc_integral, num_nonzero_blocks),
+                          sizeof(((ufc_integral *)0)->num_nonzero_blocks),
+                          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "nonzero_blocks", offsetof(ufc_integral, nonzero_blocks),
+                      sizeof(((ufc_integral *)0)->nonzero_blocks),
+                      _CFFI_OP(_CFFI_OP_NOOP, 62) },
+  { "sets_nonzero_blocks", offsetof(ufc_integral, sets_nonzero_blocks),
+                           sizeof(((ufc_integral *)0)->sets_nonzero_blocks),
+                           _CFFI_OP(_CFFI_OP_NOOP, 107) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "ufc_coordinate_mapping", 123, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_coordinate_mapping), offsetof(struct _cffi_align__ufc_coordinate_mapping, y), 0, 8 },
+  { "ufc_custom_integral", 126, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_custom_integral), offsetof(struct _cffi_align__ufc_custom_integral, y), 8, 3 },
+  { "ufc_dofmap", 130, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_dofmap), offsetof(struct _cffi_align__ufc_dofmap, y), 11, 11 },
+  { "ufc_finite_element", 135, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_finite_element), offsetof(struct _cffi_align__ufc_finite_element, y), 22, 22 },
+  { "ufc_form", 137, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_form), offsetof(struct _cffi_align__ufc_form, y), 44, 25 },
+  { "ufc_integral", 140, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_integral), offsetof(struct _cffi_align__ufc_integral, y), 69, 9 },
+};
+
+static const struct _cffi_enum_s _cffi_enums[] = {
+  { "$ufc_doftype", 131, _cffi_prim_int(sizeof(ufc_doftype), ((ufc_doftype)-1) <= 0),
+    "PointEval,ComponentPointEval,PointNormalDeriv,IntegralMoment,FrobeniusIntegralMoment,PointEdgeTangent,"
+    "PointFaceTangent,PointScaledNormalEval,PointDeriv,IntegralMomentOfNormalDerivative,PointNormalEval,PointwiseInnerProductEval" },
+  { "$ufc_shape", 141, _cffi_prim_int(sizeof(ufc_shape), ((ufc_shape)-1) <= 0),
+    "interval,triangle,quadrilateral,tetrahedron,hexahedron,vertex" },
+};
+
+static const struct _cffi_typename_s _cffi_typenames[] = {
+  { "ufc_coordinate_mapping", 123 },
+  { "ufc_custom_integral", 126 },
+  { "ufc_dofmap", 130 },
+  { "ufc_doftype", 131 },
+  { "ufc_finite_element", 135 },
+  { "ufc_form", 137 },
+  { "ufc_integral", 140 },
+  { "ufc_scalar_t", 112 },
+  { "ufc_shape", 141 },
+  { "ufc_tabulate_action", 56 },
+  { "ufc_tabulate_tensor", 66 },
+  { "ufc_tabulate_tensor_batch", 93 },
+  { "ufc_tabulate_tensor_custom", 75 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  _cffi_enums,
+  _cffi_typenames,
+  20,  /* num_globals */
+  6,  /* num_struct_unions */
+  2,  /* num_enums */
+  13,  /* num_typenames */
+  NULL,  /* no includes */
+  150,  /* num_types */
+  0,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit_libffcx_forms_0ca220fc31c036ba1abf25e4999747fe04a821ba(const void *p[])
+{
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit_libffcx_forms_0ca220fc31c036ba1abf25e4999747fe04a821ba(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit_libffcx_forms_0ca220fc31c036ba1abf25e4999747fe04a821ba(void)
+{
+  return _cffi_init("libffcx_forms_0ca220fc31c036ba1abf25e4999747fe04a821ba", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
@@ -0,0 +1,1413 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+#include "libffcx_forms_445aec51d9c8e21f095454262f717a4beb1785b4_code.c"
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 118), // char const * *()(void)
+/*  1 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  2 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *)
+/*  3 */ _CFFI_OP(_CFFI_OP_POINTER, 121), // double *
+/*  4 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  5 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, double const *, double const *, ufc_coordinate_mapping const *)
+/*  6 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/*  7 */ _CFFI_OP(_CFFI_OP_POINTER, 121), // double const *
+/*  8 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/*  9 */ _CFFI_OP(_CFFI_OP_POINTER, 132), // ufc_coordinate_mapping const *
+/* 10 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, double const *)
+/* 12 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 13 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/* 14 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 15 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 16 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, int, double const *)
+/* 17 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 18 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 19 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 20 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 21 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 22 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t)
+/* 23 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 24 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 25 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 26 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 27 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 28 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 29 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 30 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 31 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22), // uint32_t
+/* 32 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 33 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // int()(int)
+/* 34 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 35 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 36 */ _CFFI_OP(_CFFI_OP_FUNCTION, 131), // ufc_coordinate_mapping *()(void)
+/* 37 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 38 */ _CFFI_OP(_CFFI_OP_FUNCTION, 134), // ufc_custom_integral *()(int)
+/* 39 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 40 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 41 */ _CFFI_OP(_CFFI_OP_FUNCTION, 138), // ufc_dofmap *()(int)
+/* 42 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 43 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 44 */ _CFFI_OP(_CFFI_OP_FUNCTION, 138), // ufc_dofmap *()(void)
+/* 45 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 46 */ _CFFI_OP(_CFFI_OP_FUNCTION, 143), // ufc_finite_element *()(int)
+/* 47 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 48 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 49 */ _CFFI_OP(_CFFI_OP_FUNCTION, 143), // ufc_finite_element *()(void)
+/* 50 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 51 */ _CFFI_OP(_CFFI_OP_FUNCTION, 145), // ufc_form *()(void)
+/* 52 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 53 */ _CFFI_OP(_CFFI_OP_FUNCTION, 148), // ufc_integral *()(int)
+/* 54 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 55 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 56 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(double * __restrict *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 57 */ _CFFI_OP(_CFFI_OP_POINTER, 3), // double * __restrict *
+/* 58 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 59 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 60 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 61 */ _CFFI_OP(_CFFI_OP_POINTER, 13), // int const *
+/* 62 */ _CFFI_OP(_CFFI_OP_POINTER, 151), // uint8_t const *
+/* 63 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 64 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 65 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 66 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 67 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 68 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 69 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 70 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 71 */ _CFFI_OP(_CFFI_OP_NOOP, 61),
+/* 72 */ _CFFI_OP(_CFFI_OP_NOOP, 62),
+/* 73 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 74 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 75 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 76 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 77 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 78 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 79 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 80 */ _CFFI_OP(_CFFI_OP_NOOP, 61),
+/* 81 */ _CFFI_OP(_CFFI_OP_NOOP, 62),
+/* 82 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 83 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 84 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(double *, double const *, double const *, double const *, int, double const *, double const *, double const *)
+/* 85 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 86 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 87 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 88 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 89 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 90 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 91 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 92 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 93 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 94 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(int *)
+/* 95 */ _CFFI_OP(_CFFI_OP_POINTER, 13), // int *
+/* 96 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 97 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(int *, int, int)
+/* 98 */ _CFFI_OP(_CFFI_OP_NOOP, 95),
+/* 99 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 100 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 101 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 102 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *)
+/* 103 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 104 */ _CFFI_OP(_CFFI_OP_NOOP, 3),
+/* 105 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 106 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 107 */ _CFFI_OP(_CFFI_OP_NOOP, 7),
+/* 108 */ _CFFI_OP(_CFFI_OP_NOOP, 61),
+/* 109 */ _CFFI_OP(_CFFI_OP_NOOP, 62),
+/* 110 */ _CFFI_OP(_CFFI_OP_POINTER, 31), // uint32_t const *
+/* 111 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 112 */ _CFFI_OP(_CFFI_OP_FUNCTION, 159), // void()(void *)
+/* 113 */ _CFFI_OP(_CFFI_OP_POINTER, 159), // void *
+/* 114 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 115 */ _CFFI_OP(_CFFI_OP_POINTER, 116), // _Bool const *
+/* 116 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 1), // _Bool
+/* 117 */ _CFFI_OP(_CFFI_OP_POINTER, 0), // char const * *(*)(void)
+/* 118 */ _CFFI_OP(_CFFI_OP_POINTER, 119), // char const * *
+/* 119 */ _CFFI_OP(_CFFI_OP_POINTER, 120), // char const *
+/* 120 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 121 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14), // double
+/* 122 */ _CFFI_OP(_CFFI_OP_POINTER, 2), // int(*)(double *)
+/* 123 */ _CFFI_OP(_CFFI_OP_POINTER, 5), // int(*)(double *, double const *, double const *, ufc_coordinate_mapping const *)
+/* 124 */ _CFFI_OP(_CFFI_OP_POINTER, 11), // int(*)(double *, int, double const *)
+/* 125 */ _CFFI_OP(_CFFI_OP_POINTER, 16), // int(*)(double *, int, int, double const *)
+/* 126 */ _CFFI_OP(_CFFI_OP_POINTER, 22), // int(*)(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t)
+/* 127 */ _CFFI_OP(_CFFI_OP_POINTER, 33), // int(*)(int)
+/* 128 */ _CFFI_OP(_CFFI_OP_ARRAY, 13), // int[4]
+/* 129 */ (_cffi_opcode_t)(4),
+/* 130 */ _CFFI_OP(_CFFI_OP_POINTER, 36), // ufc_coordinate_mapping *(*)(void)
+/* 131 */ _CFFI_OP(_CFFI_OP_POINTER, 132), // ufc_coordinate_mapping *
+/* 132 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // ufc_coordinate_mapping
+/* 133 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // ufc_custom_integral *(*)(int)
+/* 134 */ _CFFI_OP(_CFFI_OP_POINTER, 135), // ufc_custom_integral *
+/* 135 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // ufc_custom_integral
+/* 136 */ _CFFI_OP(_CFFI_OP_POINTER, 41), // ufc_dofmap *(*)(int)
+/* 137 */ _CFFI_OP(_CFFI_OP_POINTER, 44), // ufc_dofmap *(*)(void)
+/* 138 */ _CFFI_OP(_CFFI_OP_POINTER, 139), // ufc_dofmap *
+/* 139 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // ufc_dofmap
+/* 140 */ _CFFI_OP(_CFFI_OP_ENUM, 0), // ufc_doftype
+/* 141 */ _CFFI_OP(_CFFI_OP_POINTER, 46), // ufc_finite_element *(*)(int)
+/* 142 */ _CFFI_OP(_CFFI_OP_POINTER, 49), // ufc_finite_element *(*)(void)
+/* 143 */ _CFFI_OP(_CFFI_OP_POINTER, 144), // ufc_finite_element *
+/* 144 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 3), // ufc_finite_element
+/* 145 */ _CFFI_OP(_CFFI_OP_POINTER, 146), // ufc_form *
+/* 146 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 4), // ufc_form
+/* 147 */ _CFFI_OP(_CFFI_OP_POINTER, 53), // ufc_integral *(*)(int)
+/* 148 */ _CFFI_OP(_CFFI_OP_POINTER, 149), // ufc_integral *
+/* 149 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 5), // ufc_integral
+/* 150 */ _CFFI_OP(_CFFI_OP_ENUM, 1), // ufc_shape
+/* 151 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 18), // uint8_t
+/* 152 */ _CFFI_OP(_CFFI_OP_POINTER, 56), // void(*)(double * __restrict *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 153 */ _CFFI_OP(_CFFI_OP_POINTER, 65), // void(*)(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 154 */ _CFFI_OP(_CFFI_OP_POINTER, 75), // void(*)(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t)
+/* 155 */ _CFFI_OP(_CFFI_OP_POINTER, 84), // void(*)(double *, double const *, double const *, double const *, int, double const *, double const *, double const *)
+/* 156 */ _CFFI_OP(_CFFI_OP_POINTER, 94), // void(*)(int *)
+/* 157 */ _CFFI_OP(_CFFI_OP_POINTER, 97), // void(*)(int *, int, int)
+/* 158 */ _CFFI_OP(_CFFI_OP_POINTER, 102), // void(*)(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *)
+/* 159 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static int _cffi_const_PointEval(unsigned long long *o)
+{
+  int n = (PointEval) <= 0;
+  *o = (unsigned long long)((PointEval) | 0);  /* check that PointEval is an integer */
+  return n;
+}
+
+static int _cffi_const_ComponentPointEval(unsigned long long *o)
+{
+  int n = (ComponentPointEval) <= 0;
+  *o = (unsigned long long)((ComponentPointEval) | 0);  /* check that ComponentPointEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointNormalDeriv(unsigned long long *o)
+{
+  int n = (PointNormalDeriv) <= 0;
+  *o = (unsigned long long)((PointNormalDeriv) | 0);  /* check that PointNormalDeriv is an integer */
+  return n;
+}
+
+static int _cffi_const_IntegralMoment(unsigned long long *o)
+{
+  int n = (IntegralMoment) <= 0;
+  *o = (unsigned long long)((IntegralMoment) | 0);  /* check that IntegralMoment is an integer */
+  return n;
+}
+
+static int _cffi_const_FrobeniusIntegralMoment(unsigned long long *o)
+{
+  int n = (FrobeniusIntegralMoment) <= 0;
+  *o = (unsigned long long)((FrobeniusIntegralMoment) | 0);  /* check that FrobeniusIntegralMoment is an integer */
+  return n;
+}
+
+static int _cffi_const_PointEdgeTangent(unsigned long long *o)
+{
+  int n = (PointEdgeTangent) <= 0;
+  *o = (unsigned long long)((PointEdgeTangent) | 0);  /* check that PointEdgeTangent is an integer */
+  return n;
+}
+
+static int _cffi_const_PointFaceTangent(unsigned long long *o)
+{
+  int n = (PointFaceTangent) <= 0;
+  *o = (unsigned long long)((PointFaceTangent) | 0);  /* check that PointFaceTangent is an integer */
+  return n;
+}
+
+static int _cffi_const_PointScaledNormalEval(unsigned long long *o)
+{
+  int n = (PointScaledNormalEval) <= 0;
+  *o = (unsigned long long)((PointScaledNormalEval) | 0);  /* check that PointScaledNormalEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointDeriv(unsigned long long *o)
+{
+  int n = (PointDeriv) <= 0;
+  *o = (unsigned long long)((PointDeriv) | 0);  /* check that PointDeriv is an integer */
+  return n;
+}
+
+static int _cffi_const_IntegralMomentOfNormalDerivative(unsigned long long *o)
+{
+  int n = (IntegralMomentOfNormalDerivative) <= 0;
+  *o = (unsigned long long)((IntegralMomentOfNormalDerivative) | 0);  /* check that IntegralMomentOfNormalDerivative is an integer */
+  return n;
+}
+
+static int _cffi_const_PointNormalEval(unsigned long long *o)
+{
+  int n = (PointNormalEval) <= 0;
+  *o = (unsigned long long)((PointNormalEval) | 0);  /* check that PointNormalEval is an integer */
+  return n;
+}
+
+static int _cffi_const_PointwiseInnerProductEval(unsigned long long *o)
+{
+  int n = (PointwiseInnerProductEval) <= 0;
+  *o = (unsigned long long)((PointwiseInnerProductEval) | 0);  /* check that PointwiseInnerProductEval is an integer */
+  return n;
+}
+
+static int _cffi_const_interval(unsigned long long *o)
+{
+  int n = (interval) <= 0;
+  *o = (unsigned long long)((interval) | 0);  /* check that interval is an integer */
+  return n;
+}
+
+static int _cffi_const_triangle(unsigned long long *o)
+{
+  int n = (triangle) <= 0;
+  *o = (unsigned long long)((triangle) | 0);  /* check that triangle is an integer */
+  return n;
+}
+
+static int _cffi_const_quadrilateral(unsigned long long *o)
+{
+  int n = (quadrilateral) <= 0;
+  *o = (unsigned long long)((quadrilateral) | 0);  /* check that quadrilateral is an integer */
+  return n;
+}
+
+static int _cffi_const_tetrahedron(unsigned long long *o)
+{
+  int n = (tetrahedron) <= 0;
+  *o = (unsigned long long)((tetrahedron) | 0);  /* check that tetrahedron is an integer */
+  return n;
+}
+
+static int _cffi_const_hexahedron(unsigned long long *o)
+{
+  int n = (hexahedron) <= 0;
+  *o = (unsigned long long)((hexahedron) | 0);  /* check that hexahedron is an integer */
+  return n;
+}
+
+static int _cffi_const_vertex(unsigned long long *o)
+{
+  int n = (vertex) <= 0;
+  *o = (unsigned long long)((vertex) | 0);  /* check that vertex is an integer */
+  return n;
+}
+
+static ufc_form * _cffi_d_create_form_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+  return create_form_22773257fd423ef95a7ca891908ca60725ac5284();
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_create_form_22773257fd423ef95a7ca891908ca60725ac5284(PyObject *self, PyObject *noarg)
+{
+  ufc_form * result;
+  PyObject *pyresult;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = create_form_22773257fd423ef95a7ca891908ca60725ac5284(); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  (void)noarg; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(145));
+  return pyresult;
+}
+#else
+#  define _cffi_f_create_form_22773257fd423ef95a7ca891908ca60725ac5284 _cffi_d_create_form_22773257fd423ef95a7ca891908ca60725ac5284
+#endif
+
+static void _cffi_d_free(void * x0)
+{
+  free(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_free(PyObject *self, PyObject *arg0)
+{
+  void * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(113), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (void *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(113), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { free(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_free _cffi_d_free
+#endif
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_coordinate_mapping(ufc_coordinate_mapping *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { ufc_coordinate_mapping *(* *tmp)(void) = &p->create; (void)tmp; }
+  (void)((p->geometric_dimension) | 0);  /* check that 'ufc_coordinate_mapping.geometric_dimension' is an integer */
+  (void)((p->topological_dimension) | 0);  /* check that 'ufc_coordinate_mapping.topological_dimension' is an integer */
+  (void)((p->is_affine) | 0);  /* check that 'ufc_coordinate_mapping.is_affine' is an integer */
+  { ufc_shape *tmp = &p->cell_shape; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(void) = &p->create_scalar_dofmap; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *) = &p->evaluate_basis_derivatives; (void)tmp; }
+}
+struct _cffi_align__ufc_coordinate_mapping { char x; ufc_coordinate_mapping y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_custom_integral(ufc_custom_integral *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { _Bool const * *tmp = &p->enabled_coefficients; (void)tmp; }
+  { void(* *tmp)(double *, double const *, double const *, double const *, int, double const *, double const *, double const *) = &p->tabulate_tensor; (void)tmp; }
+  (void)((p->needs_permutation_data) | 0);  /* check that 'ufc_custom_integral.needs_permutation_data' is an integer */
+}
+struct _cffi_align__ufc_custom_integral { char x; ufc_custom_integral y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_dofmap(ufc_dofmap *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { int const * *tmp = &p->base_permutations; (void)tmp; }
+  (void)((p->size_base_permutations) | 0);  /* check that 'ufc_dofmap.size_base_permutations' is an integer */
+  (void)((p->num_global_support_dofs) | 0);  /* check that 'ufc_dofmap.num_global_support_dofs' is an integer */
+  (void)((p->num_element_support_dofs) | 0);  /* check that 'ufc_dofmap.num_element_support_dofs' is an integer */
+  (void)((p->block_size) | 0);  /* check that 'ufc_dofmap.block_size' is an integer */
+  { int(*tmp)[4] = &p->num_entity_dofs; (void)tmp; }
+  { void(* *tmp)(int *, int, int) = &p->tabulate_entity_dofs; (void)tmp; }
+  (void)((p->num_sub_dofmaps) | 0);  /* check that 'ufc_dofmap.num_sub_dofmaps' is an integer */
+  { ufc_dofmap *(* *tmp)(int) = &p->create_sub_dofmap; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(void) = &p->create; (void)tmp; }
+}
+struct _cffi_align__ufc_dofmap { char x; ufc_dofmap y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_finite_element(ufc_finite_element *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  { ufc_shape *tmp = &p->cell_shape; (void)tmp; }
+  (void)((p->topological_dimension) | 0);  /* check that 'ufc_finite_element.topological_dimension' is an integer */
+  (void)((p->geometric_dimension) | 0);  /* check that 'ufc_finite_element.geometric_dimension' is an integer */
+  (void)((p->space_dimension) | 0);  /* check that 'ufc_finite_element.space_dimension' is an integer */
+  (void)((p->value_rank) | 0);  /* check that 'ufc_finite_element.value_rank' is an integer */
+  { int(* *tmp)(int) = &p->value_dimension; (void)tmp; }
+  (void)((p->value_size) | 0);  /* check that 'ufc_finite_element.value_size' is an integer */
+  (void)((p->reference_value_rank) | 0);  /* check that 'ufc_finite_element.reference_value_rank' is an integer */
+  { int(* *tmp)(int) = &p->reference_value_dimension; (void)tmp; }
+  (void)((p->reference_value_size) | 0);  /* check that 'ufc_finite_element.reference_value_size' is an integer */
+  (void)((p->degree) | 0);  /* check that 'ufc_finite_element.degree' is an integer */
+  (void)((p->block_size) | 0);  /* check that 'ufc_finite_element.block_size' is an integer */
+  { char const * *tmp = &p->family; (void)tmp; }
+  { int(* *tmp)(double *, int, double const *) = &p->evaluate_reference_basis; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *) = &p->evaluate_reference_basis_derivatives; (void)tmp; }
+  { int(* *tmp)(double *, int, int, double const *, double const *, double const *, double const *, double const *, uint32_t) = &p->transform_reference_basis_derivatives; (void)tmp; }
+  { int(* *tmp)(double *, double const *, double const *, ufc_coordinate_mapping const *) = &p->transform_values; (void)tmp; }
+  { int(* *tmp)(double *) = &p->tabulate_reference_dof_coordinates; (void)tmp; }
+  (void)((p->num_sub_elements) | 0);  /* check that 'ufc_finite_element.num_sub_elements' is an integer */
+  { ufc_finite_element *(* *tmp)(int) = &p->create_sub_element; (void)tmp; }
+  { ufc_finite_element *(* *tmp)(void) = &p->create; (void)tmp; }
+}
+struct _cffi_align__ufc_finite_element { char x; ufc_finite_element y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_form(ufc_form *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { char const * *tmp = &p->signature; (void)tmp; }
+  (void)((p->rank) | 0);  /* check that 'ufc_form.rank' is an integer */
+  (void)((p->num_coefficients) | 0);  /* check that 'ufc_form.num_coefficients' is an integer */
+  (void)((p->num_constants) | 0);  /* check that 'ufc_form.num_constants' is an integer */
+  { int(* *tmp)(int) = &p->original_coefficient_position; (void)tmp; }
+  { char const * *(* *tmp)(void) = &p->coefficient_name_map; (void)tmp; }
+  { char const * *(* *tmp)(void) = &p->constant_name_map; (void)tmp; }
+  { ufc_coordinate_mapping *(* *tmp)(void) = &p->create_coordinate_mapping; (void)tmp; }
+  { ufc_finite_element *(* *tmp)(int) = &p->create_finite_element; (void)tmp; }
+  { ufc_dofmap *(* *tmp)(int) = &p->create_dofmap; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_cell_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_exterior_facet_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_interior_facet_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_vertex_integral_ids; (void)tmp; }
+  { void(* *tmp)(int *) = &p->get_custom_integral_ids; (void)tmp; }
+  (void)((p->num_cell_integrals) | 0);  /* check that 'ufc_form.num_cell_integrals' is an integer */
+  (void)((p->num_exterior_facet_integrals) | 0);  /* check that 'ufc_form.num_exterior_facet_integrals' is an integer */
+  (void)((p->num_interior_facet_integrals) | 0);  /* check that 'ufc_form.num_interior_facet_integrals' is an integer */
+  (void)((p->num_vertex_integrals) | 0);  /* check that 'ufc_form.num_vertex_integrals' is an integer */
+  (void)((p->num_custom_integrals) | 0);  /* check that 'ufc_form.num_custom_integrals' is an integer */
+  { ufc_integral *(* *tmp)(int) = &p->create_cell_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_exterior_facet_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_interior_facet_integral; (void)tmp; }
+  { ufc_integral *(* *tmp)(int) = &p->create_vertex_integral; (void)tmp; }
+  { ufc_custom_integral *(* *tmp)(int) = &p->create_custom_integral; (void)tmp; }
+  { void(* *tmp)(double * __restrict *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_cell_integrals; (void)tmp; }
+}
+struct _cffi_align__ufc_form { char x; ufc_form y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld__ufc_integral(ufc_integral *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { _Bool const * *tmp = &p->enabled_coefficients; (void)tmp; }
+  { void(* *tmp)(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_tensor; (void)tmp; }
+  (void)((p->needs_permutation_data) | 0);  /* check that 'ufc_integral.needs_permutation_data' is an integer */
+  { void(* *tmp)(int, double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t const *) = &p->tabulate_tensor_batch; (void)tmp; }
+  (void)((p->batch_size) | 0);  /* check that 'ufc_integral.batch_size' is an integer */
+  { void(* *tmp)(double *, double const *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_action; (void)tmp; }
+  { void(* *tmp)(double *, double const *, double const *, double const *, int const *, uint8_t const *, uint32_t) = &p->tabulate_diagonal; (void)tmp; }
+  (void)((p->num_nonzero_blocks) | 0);  /* check that 'ufc_integral.num_nonzero_blocks' is an integer */
+  { int const * *tmp = &p->nonzero_blocks; (void)tmp; }
+  (void)((p->sets_nonzero_blocks) | 0);  /* check that 'ufc_integral.sets_nonzero_blocks' is an integer */
+}
+struct _cffi_align__ufc_integral { char x; ufc_integral y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "ComponentPointEval", (void *)_cffi_const_ComponentPointEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "FrobeniusIntegralMoment", (void *)_cffi_const_FrobeniusIntegralMoment, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "IntegralMoment", (void *)_cffi_const_IntegralMoment, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "IntegralMomentOfNormalDerivative", (void *)_cffi_const_IntegralMomentOfNormalDerivative, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointDeriv", (void *)_cffi_const_PointDeriv, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointEdgeTangent", (void *)_cffi_const_PointEdgeTangent, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointEval", (void *)_cffi_const_PointEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointFaceTangent", (void *)_cffi_const_PointFaceTangent, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointNormalDeriv", (void *)_cffi_const_PointNormalDeriv, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointNormalEval", (void *)_cffi_const_PointNormalEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointScaledNormalEval", (void *)_cffi_const_PointScaledNormalEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "PointwiseInnerProductEval", (void *)_cffi_const_PointwiseInnerProductEval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "create_form_22773257fd423ef95a7ca891908ca60725ac5284", (void *)_cffi_f_create_form_22773257fd423ef95a7ca891908ca60725ac5284, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_N, 51), (void *)_cffi_d_create_form_22773257fd423ef95a7ca891908ca60725ac5284 },
+  { "free", (void *)_cffi_f_free, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 112), (void *)_cffi_d_free },
+  { "hexahedron", (void *)_cffi_const_hexahedron, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "interval", (void *)_cffi_const_interval, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "quadrilateral", (void *)_cffi_const_quadrilateral, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "tetrahedron", (void *)_cffi_const_tetrahedron, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "triangle", (void *)_cffi_const_triangle, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+  { "vertex", (void *)_cffi_const_vertex, _CFFI_OP(_CFFI_OP_ENUM, -1), (void *)0 },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "signature", offsetof(ufc_coordinate_mapping, signature),
+                 sizeof(((ufc_coordinate_mapping *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "create", offsetof(ufc_coordinate_mapping, create),
+              sizeof(((ufc_coordinate_mapping *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 130) },
+  { "geometric_dimension", offsetof(ufc_coordinate_mapping, geometric_dimension),
+                           sizeof(((ufc_coordinate_mapping *)0)->geometric_dimension),
+                           _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "topological_dimension", offsetof(ufc_coordinate_mapping, topological_dimension),
+                             sizeof(((ufc_coordinate_mapping *)0)->topological_dimension),
+                             _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "is_affine", offsetof(ufc_coordinate_mapping, is_affine),
+                 sizeof(((ufc_coordinate_mapping *)0)->is_affine),
+                 _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "cell_shape", offsetof(ufc_coordinate_mapping, cell_shape),
+                  sizeof(((ufc_coordinate_mapping *)0)->cell_shape),
+                  _CFFI_OP(_CFFI_OP_NOOP, 150) },
+  { "create_scalar_dofmap", offsetof(ufc_coordinate_mapping, create_scalar_dofmap),
+                            sizeof(((ufc_coordinate_mapping *)0)->create_scalar_dofmap),
+                            _CFFI_OP(_CFFI_OP_NOOP, 137) },
+  { "evaluate_basis_derivatives", offsetof(ufc_coordinate_mapping, evaluate_basis_derivatives),
+                                  sizeof(((ufc_coordinate_mapping *)0)->evaluate_basis_derivatives),
+                                  _CFFI_OP(_CFFI_OP_NOOP, 125) },
+  { "enabled_coefficients", offsetof(ufc_custom_integral, enabled_coefficients),
+                            sizeof(((ufc_custom_integral *)0)->enabled_coefficients),
+                            _CFFI_OP(_CFFI_OP_NOOP, 115) },
+  { "tabulate_tensor", offsetof(ufc_custom_integral, tabulate_tensor),
+                       sizeof(((ufc_custom_integral *)0)->tabulate_tensor),
+                       _CFFI_OP(_CFFI_OP_NOOP, 155) },
+  { "needs_permutation_data", offsetof(ufc_custom_integral, needs_permutation_data),
+                              sizeof(((ufc_custom_integral *)0)->needs_permutation_data),
+                              _CFFI_OP(_CFFI_OP_NOOP, 116) },
+  { "signature", offsetof(ufc_dofmap, signature),
+                 sizeof(((ufc_dofmap *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "base_permutations", offsetof(ufc_dofmap, base_permutations),
+                         sizeof(((ufc_dofmap *)0)->base_permutations),
+                         _CFFI_OP(_CFFI_OP_NOOP, 61) },
+  { "size_base_permutations", offsetof(ufc_dofmap, size_base_permutations),
+                              sizeof(((ufc_dofmap *)0)->size_base_permutations),
+                              _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_global_support_dofs", offsetof(ufc_dofmap, num_global_support_dofs),
+                               sizeof(((ufc_dofmap *)0)->num_global_support_dofs),
+                               _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_element_support_dofs", offsetof(ufc_dofmap, num_element_support_dofs),
+                                sizeof(((ufc_dofmap *)0)->num_element_support_dofs),
+                                _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "block_size", offsetof(ufc_dofmap, block_size),
+                  sizeof(((ufc_dofmap *)0)->block_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_entity_dofs", offsetof(ufc_dofmap, num_entity_dofs),
+                       sizeof(((ufc_dofmap *)0)->num_entity_dofs),
+                       _CFFI_OP(_CFFI_OP_NOOP, 128) },
+  { "tabulate_entity_dofs", offsetof(ufc_dofmap, tabulate_entity_dofs),
+                            sizeof(((ufc_dofmap *)0)->tabulate_entity_dofs),
+                            _CFFI_OP(_CFFI_OP_NOOP, 157) },
+  { "num_sub_dofmaps", offsetof(ufc_dofmap, num_sub_dofmaps),
+                       sizeof(((ufc_dofmap *)0)->num_sub_dofmaps),
+                       _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_sub_dofmap", offsetof(ufc_dofmap, create_sub_dofmap),
+                         sizeof(((ufc_dofmap *)0)->create_sub_dofmap),
+                         _CFFI_OP(_CFFI_OP_NOOP, 136) },
+  { "create", offsetof(ufc_dofmap, create),
+              sizeof(((ufc_dofmap *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 137) },
+  { "signature", offsetof(ufc_finite_element, signature),
+                 sizeof(((ufc_finite_element *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "cell_shape", offsetof(ufc_finite_element, cell_shape),
+                  sizeof(((ufc_finite_element *)0)->cell_shape),
+                  _CFFI_OP(_CFFI_OP_NOOP, 150) },
+  { "topological_dimension", offsetof(ufc_finite_element, topological_dimension),
+                             sizeof(((ufc_finite_element *)0)->topological_dimension),
+                             _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "geometric_dimension", offsetof(ufc_finite_element, geometric_dimension),
+                           sizeof(((ufc_finite_element *)0)->geometric_dimension),
+                           _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "space_dimension", offsetof(ufc_finite_element, space_dimension),
+                       sizeof(((ufc_finite_element *)0)->space_dimension),
+                       _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "value_rank", offsetof(ufc_finite_element, value_rank),
+                  sizeof(((ufc_finite_element *)0)->value_rank),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "value_dimension", offsetof(ufc_finite_element, value_dimension),
+                       sizeof(((ufc_finite_element *)0)->value_dimension),
+                       _CFFI_OP(_CFFI_OP_NOOP, 127) },
+  { "value_size", offsetof(ufc_finite_element, value_size),
+                  sizeof(((ufc_finite_element *)0)->value_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "reference_value_rank", offsetof(ufc_finite_element, reference_value_rank),
+                            sizeof(((ufc_finite_element *)0)->reference_value_rank),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "reference_value_dimension", offsetof(ufc_finite_element, reference_value_dimension),
+                                 sizeof(((ufc_finite_element *)0)->reference_value_dimension),
+                                 _CFFI_OP(_CFFI_OP_NOOP, 127) },
+  { "reference_value_size", offsetof(ufc_finite_element, reference_value_size),
+                            sizeof(((ufc_finite_element *)0)->reference_value_size),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "degree", offsetof(ufc_finite_element, degree),
+              sizeof(((ufc_finite_element *)0)->degree),
+              _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "block_size", offsetof(ufc_finite_element, block_size),
+                  sizeof(((ufc_finite_element *)0)->block_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "family", offsetof(ufc_finite_element, family),
+              sizeof(((ufc_finite_element *)0)->family),
+              _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "evaluate_reference_basis", offsetof(ufc_finite_element, evaluate_reference_basis),
+                                sizeof(((ufc_finite_element *)0)->evaluate_reference_basis),
+                                _CFFI_OP(_CFFI_OP_NOOP, 124) },
+  { "evaluate_reference_basis_derivatives", offsetof(ufc_finite_element, evaluate_reference_basis_derivatives),
+                                            sizeof(((ufc_finite_element *)0)->evaluate_reference_basis_derivatives),
+                                            _CFFI_OP(_CFFI_OP_NOOP, 125) },
+  { "transform_reference_basis_derivatives", offsetof(ufc_finite_element, transform_reference_basis_derivatives),
+                                             sizeof(((ufc_finite_element *)0)->transform_reference_basis_derivatives),
+                                             _CFFI_OP(_CFFI_OP_NOOP, 126) },
+  { "transform_values", offsetof(ufc_finite_element, transform_values),
+                        sizeof(((ufc_finite_element *)0)->transform_values),
+                        _CFFI_OP(_CFFI_OP_NOOP, 123) },
+  { "tabulate_reference_dof_coordinates", offsetof(ufc_finite_element, tabulate_reference_dof_coordinates),
+                                          sizeof(((ufc_finite_element *)0)->tabulate_reference_dof_coordinates),
+                                          _CFFI_OP(_CFFI_OP_NOOP, 122) },
+  { "num_sub_elements", offsetof(ufc_finite_element, num_sub_elements),
+                        sizeof(((ufc_finite_element *)0)->num_sub_elements),
+                        _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_sub_element", offsetof(ufc_finite_element, create_sub_element),
+                          sizeof(((ufc_finite_element *)0)->create_sub_element),
+                          _CFFI_OP(_CFFI_OP_NOOP, 141) },
+  { "create", offsetof(ufc_finite_element, create),
+              sizeof(((ufc_finite_element *)0)->create),
+              _CFFI_OP(_CFFI_OP_NOOP, 142) },
+  { "signature", offsetof(ufc_form, signature),
+                 sizeof(((ufc_form *)0)->signature),
+                 _CFFI_OP(_CFFI_OP_NOOP, 119) },
+  { "rank", offsetof(ufc_form, rank),
+            sizeof(((ufc_form *)0)->rank),
+            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_coefficients", offsetof(ufc_form, num_coefficients),
+                        sizeof(((ufc_form *)0)->num_coefficients),
+                        _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_constants", offsetof(ufc_form, num_constants),
+                     sizeof(((ufc_form *)0)->num_constants),
+                     _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "original_coefficient_position", offsetof(ufc_form, original_coefficient_position),
+                                     sizeof(((ufc_form *)0)->original_coefficient_position),
+                                     _CFFI_OP(_CFFI_OP_NOOP, 127) },
+  { "coefficient_name_map", offsetof(ufc_form, coefficient_name_map),
+                            sizeof(((ufc_form *)0)->coefficient_name_map),
+                            _CFFI_OP(_CFFI_OP_NOOP, 117) },
+  { "constant_name_map", offsetof(ufc_form, constant_name_map),
+                         sizeof(((ufc_form *)0)->constant_name_map),
+                         _CFFI_OP(_CFFI_OP_NOOP, 117) },
+  { "create_coordinate_mapping", offsetof(ufc_form, create_coordinate_mapping),
+                                 sizeof(((ufc_form *)0)->create_coordinate_mapping),
+                                 _CFFI_OP(_CFFI_OP_NOOP, 130) },
+  { "create_finite_element", offsetof(ufc_form, create_finite_element),
+                             sizeof(((ufc_form *)0)->create_finite_element),
+                             _CFFI_OP(_CFFI_OP_NOOP, 141) },
+  { "create_dofmap", offsetof(ufc_form, create_dofmap),
+                     sizeof(((ufc_form *)0)->create_dofmap),
+                     _CFFI_OP(_CFFI_OP_NOOP, 136) },
+  { "get_cell_integral_ids", offsetof(ufc_form, get_cell_integral_ids),
+                             sizeof(((ufc_form *)0)->get_cell_integral_ids),
+                             _CFFI_OP(_CFFI_OP_NOOP, 156) },
+  { "get_exterior_facet_integral_ids", offsetof(ufc_form, get_exterior_facet_integral_ids),
+                                       sizeof(((ufc_form *)0)->get_exterior_facet_integral_ids),
+                                       _CFFI_OP(_CFFI_OP_NOOP, 156) },
+  { "get_interior_facet_integral_ids", offsetof(ufc_form, get_interior_facet_integral_ids),
+                                       sizeof(((ufc_form *)0)->get_interior_facet_integral_ids),
+                                       _CFFI_OP(_CFFI_OP_NOOP, 156) },
+  { "get_vertex_integral_ids", offsetof(ufc_form, get_vertex_integral_ids),
+                               sizeof(((ufc_form *)0)->get_vertex_integral_ids),
+                               _CFFI_OP(_CFFI_OP_NOOP, 156) },
+  { "get_custom_integral_ids", offsetof(ufc_form, get_custom_integral_ids),
+                               sizeof(((ufc_form *)0)->get_custom_integral_ids),
+                               _CFFI_OP(_CFFI_OP_NOOP, 156) },
+  { "num_cell_integrals", offsetof(ufc_form, num_cell_integrals),
+                          sizeof(((ufc_form *)0)->num_cell_integrals),
+                          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_exterior_facet_integrals", offsetof(ufc_form, num_exterior_facet_integrals),
+                                    sizeof(((ufc_form *)0)->num_exterior_facet_integrals),
+                                    _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_interior_facet_integrals", offsetof(ufc_form, num_interior_facet_integrals),
+                                    sizeof(((ufc_form *)0)->num_interior_facet_integrals),
+                                    _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_vertex_integrals", offsetof(ufc_form, num_vertex_integrals),
+                            sizeof(((ufc_form *)0)->num_vertex_integrals),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "num_custom_integrals", offsetof(ufc_form, num_custom_integrals),
+                            sizeof(((ufc_form *)0)->num_custom_integrals),
+                            _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "create_cell_integral", offsetof(ufc_form, create_cell_integral),
+                            sizeof(((ufc_form *)0)->create_cell_integral),
+                            _CFFI_OP(_CFFI_OP_NOOP, 147) },
+  { "create_exterior_facet_integral", offsetof(ufc_form, create_exterior_facet_integral),
+                                      sizeof(((ufc_form *)0)->create_exterior_facet_integral),
+                                      _CFFI_OP(_CFFI_OP_NOOP, 147) },
+  { "create_interior_facet_integral", offsetof(ufc_form, create_interior_facet_integral),
+                                      sizeof(((ufc_form *)0)->create_interior_facet_integral),
+                                      _CFFI_OP(_CFFI_OP_NOOP, 147) },
+  { "create_vertex_integral", offsetof(ufc_form, create_vertex_integral),
+                              sizeof(((ufc_form *)0)->create_vertex_integral),
+                              _CFFI_OP(_CFFI_OP_NOOP, 147) },
+  { "create_custom_integral", offsetof(ufc_form, create_custom_integral),
+                              sizeof(((ufc_form *)0)->create_custom_integral),
+                              _CFFI_OP(_CFFI_OP_NOOP, 133) },
+  { "tabulate_cell_integrals", offsetof(ufc_form, tabulate_cell_integrals),
+                               sizeof(((ufc_form *)0)->tabulate_cell_integrals),
+                               _CFFI_OP(_CFFI_OP_NOOP, 152) },
+  { "enabled_coefficients", offsetof(ufc_integral, enabled_coefficients),
+                            sizeof(((ufc_integral *)0)->enabled_coefficients),
+                            _CFFI_OP(_CFFI_OP_NOOP, 115) },
+  { "tabulate_tensor", offsetof(ufc_integral, tabulate_tensor),
+                       sizeof(((ufc_integral *)0)->tabulate_tensor),
+                       _CFFI_OP(_CFFI_OP_NOOP, 154) },
+  { "needs_permutation_data", offsetof(ufc_integral, needs_permutation_data),
+                              sizeof(((ufc_integral *)0)->needs_permutation_data),
+                              _CFFI_OP(_CFFI_OP_NOOP, 116) },
+  { "tabulate_tensor_batch", offsetof(ufc_integral, tabulate_tensor_batch),
+                             sizeof(((ufc_integral *)0)->tabulate_tensor_batch),
+                             _CFFI_OP(_CFFI_OP_NOOP, 158) },
+  { "batch_size", offsetof(ufc_integral, batch_size),
+                  sizeof(((ufc_integral *)0)->batch_size),
+                  _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "tabulate_action", offsetof(ufc_integral, tabulate_action),
+                       sizeof(((ufc_integral *)0)->tabulate_action),
+                       _CFFI_OP(_CFFI_OP_NOOP, 153) },
+  { "tabulate_diagonal", offsetof(ufc_integral, tabulate_diagonal),
+                         sizeof(((ufc_integral *)0)->tabulate_diagonal),
+                         _CFFI_OP(_CFFI_OP_NOOP, 154) },
+  { "num_nonzero_blocks", offsetof(ufc_integral, num_nonzero_blocks),
+                          sizeof(((ufc_integral *)0)->num_nonzero_blocks),
+                          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "nonzero_blocks", offsetof(ufc_integral, nonzero_blocks),
+                      sizeof(((ufc_integral *)0)->nonzero_blocks),
+                      _CFFI_OP(_CFFI_OP_NOOP, 61) },
+  { "sets_nonzero_blocks", offsetof(ufc_integral, sets_nonzero_blocks),
+                           sizeof(((ufc_integral *)0)->sets_nonzero_blocks),
+                           _CFFI_OP(_CFFI_OP_NOOP, 116) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "ufc_coordinate_mapping", 132, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_coordinate_mapping), offsetof(struct _cffi_align__ufc_coordinate_mapping, y), 0, 8 },
+  { "ufc_custom_integral", 135, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_custom_integral), offsetof(struct _cffi_align__ufc_custom_integral, y), 8, 3 },
+  { "ufc_dofmap", 139, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_dofmap), offsetof(struct _cffi_align__ufc_dofmap, y), 11, 11 },
+  { "ufc_finite_element", 144, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_finite_element), offsetof(struct _cffi_align__ufc_finite_element, y), 22, 22 },
+  { "ufc_form", 146, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_form), offsetof(struct _cffi_align__ufc_form, y), 44, 26 },
+  { "ufc_integral", 149, _CFFI_F_CHECK_FIELDS,
+    sizeof(ufc_integral), offsetof(struct _cffi_align__ufc_integral, y), 70, 10 },
+};
+
+static const struct _cffi_enum_s _cffi_enums[] = {
+  { "$ufc_doftype", 140, _cffi_prim_int(sizeof(ufc_doftype), ((ufc_doftype)-1) <= 0),
+    "PointEval,ComponentPointEval,PointNormalDeriv,IntegralMoment,FrobeniusIntegralMoment,PointEdgeTangent,"
+    "PointFaceTangent,PointScaledNormalEval,PointDeriv,IntegralMomentOfNormalDerivative,PointNormalEval,PointwiseInnerProductEval" },
+  { "$ufc_shape", 150, _cffi_prim_int(sizeof(ufc_shape), ((ufc_shape)-1) <= 0),
+    "interval,triangle,quadrilateral,tetrahedron,hexahedron,vertex" },
+};
+
+static const struct _cffi_typename_s _cffi_typenames[] = {
+  { "ufc_coordinate_mapping", 132 },
+  { "ufc_custom_integral", 135 },
+  { "ufc_dofmap", 139 },
+  { "ufc_doftype", 140 },
+  { "ufc_finite_element", 144 },
+  { "ufc_form", 146 },
+  { "ufc_integral", 149 },
+  { "ufc_scalar_t", 121 },
+  { "ufc_shape", 150 },
+  { "ufc_tabulate_action", 65 },
+  { "ufc_tabulate_cell_integrals", 56 },
+  { "ufc_tabulate_tensor", 75 },
+  { "ufc_tabulate_tensor_batch", 102 },
+  { "ufc_tabulate_tensor_custom", 84 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  _cffi_enums,
+  _cffi_typenames,
+  20,  /* num_globals */
+  6,  /* num_struct_unions */
+  2,  /* num_enums */
+  14,  /* num_typenames */
+  NULL,  /* no includes */
+  160,  /* num_types */
+  0,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit_libffcx_forms_445aec51d9c8e21f095454262f717a4beb1785b4(const void *p[])
+{
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit_libffcx_forms_445aec51d9c8e21f095454262f717a4beb1785b4(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit_libffcx_forms_445aec51d9c8e21f095454262f717a4beb1785b4(void)
+{
+  return _cffi_init("libffcx_forms_445aec51d9c8e21f095454262f717a4beb1785b4", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
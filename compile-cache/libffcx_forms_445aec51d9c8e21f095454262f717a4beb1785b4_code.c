@@ -0,0 +1,1078 @@
+// This code conforms with the UFC specification version 2018.2.0.dev0
+// and was automatically generated by FFCX version 2019.2.0.dev0.
+//
+// This code was generated with the following parameters:
+//
+//  {'alignas': 32,
+//   'assume_aligned': -1,
+//   'batch_size': 0,
+//   'block_gemm': 'none',
+//   'code_cache_dir': '',
+//   'compute_type': '',
+//   'enable_preintegration': False,
+//   'enable_premultiplication': False,
+//   'epsilon': 1e-14,
+//   'fused_cell_integrals': False,
+//   'gemm_threshold': 4096,
+//   'hexfloat_tables': False,
+//   'ir_cache_dir': '',
+//   'padlen': 1,
+//   'precision': -1,
+//   'quadrature_degree': -1,
+//   'quadrature_rule': 'default',
+//   'scalar_type': 'double',
+//   'simd_width': 0,
+//   'sparse_element_tensor': False,
+//   'sum_factorization': False,
+//   'table_atol': 1e-09,
+//   'table_rtol': 1e-06,
+//   'tabulate_action': False,
+//   'tabulate_diagonal': False,
+//   'tabulate_tensor_void': False,
+//   'tile_size': 0}
+
+
+typedef double ufc_scalar_t;
+#include <math.h>
+#include <stdalign.h>
+#include <stdbool.h>
+#include <stdlib.h>
+#include <string.h>
+#include <ufc.h>
+
+// Code for element element_bcfd4ddbff8c762ffd230166cb1499f5959c487d
+
+int value_dimension_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(int i)
+{
+  return 1;
+}
+
+int reference_value_dimension_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(int i)
+{
+  return 1;
+}
+
+int evaluate_reference_basis_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(double* restrict reference_values,
+                                            int num_points,
+                                            const double* restrict X)
+{
+  static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+for (int k = 0; k < num_points * 3; ++k)
+    reference_values[k] = 0.0;
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Accumulate products of coefficients and basisvalues
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip] += coefficients0[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 1] += coefficients1[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 2] += coefficients2[0][r] * basisvalues1[r];
+}
+return 0;
+}
+
+int evaluate_reference_basis_derivatives_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(double * restrict reference_values,
+                                          int order, int num_points,
+                                          const double * restrict X)
+{
+  if (order == 0)
+    return evaluate_reference_basis_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(reference_values, num_points, X);
+const int num_derivatives = pow(2, order);
+for (int l0 = 0; l0 < (num_points * 3) * num_derivatives; ++l0)
+    reference_values[l0] = 0.0;
+if (order > 1)
+    return 0;
+// Tables of derivatives of the polynomial base (transpose).
+alignas(32) static const double dmats0[2][3][3] =
+    { { { 0.0, 0.0, 0.0 },
+        { 4.8989794855663495, 0.0, 0.0 },
+        { 0.0, 0.0, 0.0 } },
+      { { 0.0, 0.0, 0.0 },
+        { 2.449489742783182, 0.0, 0.0 },
+        { 4.242640687119285, 0.0, 0.0 } } };
+static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+const int reference_offset[3] = { 0 };
+const int num_components[3] = { 1, 1, 1 };
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Loop over all dofs
+    for (int i = 0; i < 3; ++i)
+    {
+        double derivatives[2] = { 0 };
+        switch (i)
+        {
+        case 0:
+            // Compute reference derivatives for dof 0.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients0[0][s] * aux[s];
+            }
+            break;
+        case 1:
+            // Compute reference derivatives for dof 1.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients1[0][s] * aux[s];
+            }
+            break;
+        case 2:
+            // Compute reference derivatives for dof 2.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients2[0][s] * aux[s];
+            }
+            break;
+        }
+        for (int r = 0; r < num_derivatives; ++r)
+            for (int c = 0; c < num_components[i]; ++c)
+                reference_values[(((3 * num_derivatives) * ip + num_derivatives * i) + r) + (reference_offset[i] + c)] = derivatives[num_derivatives * c + r];
+    }
+}
+return 0;
+}
+
+int transform_reference_basis_derivatives_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(
+    double * restrict values, int order, int num_points,
+    const double * restrict reference_values,
+    const double * restrict X, const double * restrict J,
+    const double * restrict detJ, const double * restrict K,
+    const uint32_t cell_permutation)
+{
+  const int num_derivatives = pow(2, order);
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int l = 0; l < (num_points * 3) * num_derivatives; ++l)
+    values[l] = 0.0;
+const int reference_offsets[3] = { 0 };
+const int physical_offsets[3] = { 0 };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    double transform[2][2];
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            transform[r][s] = 1.0;
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            for (int k = 0; k < order; ++k)
+                transform[r][s] *= K[((2 * 2) * ip + 2 * combinations[order - 1][s][k]) + combinations[order - 1][r][k]];
+    for (int d = 0; d < 3; ++d)
+    {
+        for (int s = 0; s < num_derivatives; ++s)
+        {
+            for (int i = 0; i < 1; ++i)
+            {
+                // Using affine transform to map values back to the physical element.
+                const double mapped_value = reference_values[(((3 * num_derivatives) * ip + num_derivatives * d) + s) + reference_offsets[d]];
+                // Mapping derivatives back to the physical element
+                for (int r = 0; r < num_derivatives; ++r)
+                    values[(((3 * num_derivatives) * ip + num_derivatives * d) + r) + (physical_offsets[d] + i)] += transform[r][s] * mapped_value;
+            }
+        }
+    }
+}
+// Using affine transform to map values back to the physical element.
+return 0;
+}
+
+int transform_values_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(
+     ufc_scalar_t* restrict reference_values,
+     const ufc_scalar_t* restrict physical_values,
+     const double* restrict coordinate_dofs,
+     const ufc_coordinate_mapping* restrict cm)
+{
+  reference_values[0] = physical_values[0];
+reference_values[1] = physical_values[1];
+reference_values[2] = physical_values[2];
+return 0;
+}
+
+int tabulate_reference_dof_coordinates_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(double* restrict reference_dof_coordinates)
+{
+  static const double dof_X[6] = { 0.0, 0.0, 1.0, 0.0, 0.0, 1.0 };
+memcpy(reference_dof_coordinates, dof_X, 6*sizeof(double));
+return 0;
+}
+
+
+ufc_finite_element* create_sub_element_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(int i)
+{
+  return NULL;
+}
+
+ufc_finite_element* create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void)
+{
+  ufc_finite_element* element = (ufc_finite_element*)malloc(sizeof(*element));
+
+  element->signature = "FiniteElement('Lagrange', triangle, 1)";
+  element->cell_shape = triangle;
+  element->topological_dimension = 2;
+  element->geometric_dimension = 2;
+  element->space_dimension = 3;
+  element->value_rank = 0;
+  element->value_dimension = value_dimension_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->value_size = 1;
+  element->reference_value_rank = 0;
+  element->reference_value_dimension = reference_value_dimension_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->reference_value_size = 1;
+  element->degree = 1;
+  element->family = "Lagrange";
+  element->block_size = 1;
+  element->evaluate_reference_basis = evaluate_reference_basis_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->evaluate_reference_basis_derivatives = evaluate_reference_basis_derivatives_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->transform_reference_basis_derivatives = transform_reference_basis_derivatives_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->transform_values = transform_values_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->tabulate_reference_dof_coordinates = tabulate_reference_dof_coordinates_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->num_sub_elements = 0;
+  element->create_sub_element = create_sub_element_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  element->create = create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+
+  return element;
+}
+
+// End of code for element element_bcfd4ddbff8c762ffd230166cb1499f5959c487d
+
+// Code for element element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e
+
+int value_dimension_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(int i)
+{
+  static const int return_values[1] = { 2 };
+if (i >= 1)
+    return 1;
+return return_values[i];
+}
+
+int reference_value_dimension_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(int i)
+{
+  static const int return_values[1] = { 2 };
+if (i >= 1)
+    return 1;
+return return_values[i];
+}
+
+int evaluate_reference_basis_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(double* restrict reference_values,
+                                            int num_points,
+                                            const double* restrict X)
+{
+  static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+for (int k = 0; k < num_points * 3; ++k)
+    reference_values[k] = 0.0;
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Accumulate products of coefficients and basisvalues
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip] += coefficients0[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 1] += coefficients1[0][r] * basisvalues1[r];
+    for (int r = 0; r < 3; ++r)
+        reference_values[3 * ip + 2] += coefficients2[0][r] * basisvalues1[r];
+}
+return 0;
+}
+
+int evaluate_reference_basis_derivatives_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(double * restrict reference_values,
+                                          int order, int num_points,
+                                          const double * restrict X)
+{
+  if (order == 0)
+    return evaluate_reference_basis_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(reference_values, num_points, X);
+const int num_derivatives = pow(2, order);
+for (int l0 = 0; l0 < (num_points * 3) * num_derivatives; ++l0)
+    reference_values[l0] = 0.0;
+if (order > 1)
+    return 0;
+// Tables of derivatives of the polynomial base (transpose).
+alignas(32) static const double dmats0[2][3][3] =
+    { { { 0.0, 0.0, 0.0 },
+        { 4.8989794855663495, 0.0, 0.0 },
+        { 0.0, 0.0, 0.0 } },
+      { { 0.0, 0.0, 0.0 },
+        { 2.449489742783182, 0.0, 0.0 },
+        { 4.242640687119285, 0.0, 0.0 } } };
+static const double coefficients0[1][3] = { { 0.4714045207910317, -0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients1[1][3] = { { 0.4714045207910317, 0.2886751345948129, -0.16666666666666666 } };
+static const double coefficients2[1][3] = { { 0.4714045207910316, 0.0, 0.3333333333333333 } };
+const int reference_offset[3] = { 0 };
+const int num_components[3] = { 1, 1, 1 };
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    // Compute basisvalues for each relevant embedded degree
+    double basisvalues1[3] = { 0 };
+    basisvalues1[0] = 1.0;
+    const double tmp1_1 = ((1.0 + 2.0 * (2 * X[ip * 2] - 1)) + (2 * X[ip * 2 + 1] - 1)) / 2.0;
+    basisvalues1[1] = tmp1_1;
+    basisvalues1[2] = (0.5 + 1.5 * (2 * X[ip * 2 + 1] - 1)) * basisvalues1[0];
+    basisvalues1[0] *= sqrt(0.5);
+    basisvalues1[2] *= sqrt(1.0);
+    basisvalues1[1] *= sqrt(3.0);
+    // Loop over all dofs
+    for (int i = 0; i < 3; ++i)
+    {
+        double derivatives[2] = { 0 };
+        switch (i)
+        {
+        case 0:
+            // Compute reference derivatives for dof 0.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients0[0][s] * aux[s];
+            }
+            break;
+        case 1:
+            // Compute reference derivatives for dof 1.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients1[0][s] * aux[s];
+            }
+            break;
+        case 2:
+            // Compute reference derivatives for dof 2.
+            for (int r = 0; r < num_derivatives; ++r)
+            {
+                double aux[3] = { 0 };
+                // Declare derivative matrix (of polynomial basis).
+                double dmats[3][3] = {{ 0 }};
+                // Initialize dmats.
+                int comb = combinations[order - 1][r][0];
+                memcpy(&dmats[0][0], &dmats0[comb][0][0], 9*sizeof(double));
+                // Looping derivative order to generate dmats.
+                for (int s = 1; s < order; ++s)
+                {
+                    // Store previous dmats matrix.
+                    double dmats_old[3][3];
+                    memcpy(&dmats_old[0][0], &dmats[0][0], 9*sizeof(double));
+                    // Resetting dmats.
+                    for (int l0 = 0; l0 < 3; ++l0)
+                        for (int l1 = 0; l1 < 3; ++l1)
+                            dmats[l0][l1] = 0.0;
+                    // Update dmats using an inner product.
+                    comb = combinations[order - 1][r][s];
+                    for (int t = 0; t < 3; ++t)
+                        for (int u = 0; u < 3; ++u)
+                            for (int tu = 0; tu < 3; ++tu)
+                                dmats[t][u] += dmats0[comb][t][tu] * dmats_old[tu][u];
+                }
+                for (int s = 0; s < 3; ++s)
+                    for (int t = 0; t < 3; ++t)
+                        aux[s] += dmats[s][t] * basisvalues1[t];
+                derivatives[r] = 0.0;
+                for (int s = 0; s < 3; ++s)
+                    derivatives[r] += coefficients2[0][s] * aux[s];
+            }
+            break;
+        }
+        for (int r = 0; r < num_derivatives; ++r)
+            for (int c = 0; c < num_components[i]; ++c)
+                reference_values[(((3 * num_derivatives) * ip + num_derivatives * i) + r) + (reference_offset[i] + c)] = derivatives[num_derivatives * c + r];
+    }
+}
+return 0;
+}
+
+int transform_reference_basis_derivatives_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(
+    double * restrict values, int order, int num_points,
+    const double * restrict reference_values,
+    const double * restrict X, const double * restrict J,
+    const double * restrict detJ, const double * restrict K,
+    const uint32_t cell_permutation)
+{
+  const int num_derivatives = pow(2, order);
+// Precomputed combinations
+const int combinations[1][2][1] =
+    { { { 0 },
+        { 1 } } };
+for (int l = 0; l < (num_points * 3) * num_derivatives; ++l)
+    values[l] = 0.0;
+const int reference_offsets[3] = { 0 };
+const int physical_offsets[3] = { 0 };
+for (int ip = 0; ip < num_points; ++ip)
+{
+    double transform[2][2];
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            transform[r][s] = 1.0;
+    for (int r = 0; r < num_derivatives; ++r)
+        for (int s = 0; s < num_derivatives; ++s)
+            for (int k = 0; k < order; ++k)
+                transform[r][s] *= K[((2 * 2) * ip + 2 * combinations[order - 1][s][k]) + combinations[order - 1][r][k]];
+    for (int d = 0; d < 3; ++d)
+    {
+        for (int s = 0; s < num_derivatives; ++s)
+        {
+            for (int i = 0; i < 1; ++i)
+            {
+                // Using affine transform to map values back to the physical element.
+                const double mapped_value = reference_values[(((3 * num_derivatives) * ip + num_derivatives * d) + s) + reference_offsets[d]];
+                // Mapping derivatives back to the physical element
+                for (int r = 0; r < num_derivatives; ++r)
+                    values[(((3 * num_derivatives) * ip + num_derivatives * d) + r) + (physical_offsets[d] + i)] += transform[r][s] * mapped_value;
+            }
+        }
+    }
+}
+// Using affine transform to map values back to the physical element.
+return 0;
+}
+
+int transform_values_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(
+     ufc_scalar_t* restrict reference_values,
+     const ufc_scalar_t* restrict physical_values,
+     const double* restrict coordinate_dofs,
+     const ufc_coordinate_mapping* restrict cm)
+{
+  reference_values[0] = physical_values[0];
+reference_values[1] = physical_values[2];
+reference_values[2] = physical_values[4];
+reference_values[3] = physical_values[7];
+reference_values[4] = physical_values[9];
+reference_values[5] = physical_values[11];
+return 0;
+}
+
+int tabulate_reference_dof_coordinates_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(double* restrict reference_dof_coordinates)
+{
+  static const double dof_X[6] = { 0.0, 0.0, 1.0, 0.0, 0.0, 1.0 };
+memcpy(reference_dof_coordinates, dof_X, 6*sizeof(double));
+return 0;
+}
+
+ufc_finite_element* create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void);
+
+ufc_finite_element* create_sub_element_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(int i)
+{
+  switch (i)
+{
+case 0:
+    return create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+case 1:
+    return create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+default:
+    return NULL;
+}
+}
+
+ufc_finite_element* create_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(void)
+{
+  ufc_finite_element* element = (ufc_finite_element*)malloc(sizeof(*element));
+
+  element->signature = "VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  element->cell_shape = triangle;
+  element->topological_dimension = 2;
+  element->geometric_dimension = 2;
+  element->space_dimension = 6;
+  element->value_rank = 1;
+  element->value_dimension = value_dimension_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->value_size = 2;
+  element->reference_value_rank = 1;
+  element->reference_value_dimension = reference_value_dimension_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->reference_value_size = 2;
+  element->degree = 1;
+  element->family = "Lagrange";
+  element->block_size = 2;
+  element->evaluate_reference_basis = evaluate_reference_basis_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->evaluate_reference_basis_derivatives = evaluate_reference_basis_derivatives_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->transform_reference_basis_derivatives = transform_reference_basis_derivatives_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->transform_values = transform_values_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->tabulate_reference_dof_coordinates = tabulate_reference_dof_coordinates_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->num_sub_elements = 2;
+  element->create_sub_element = create_sub_element_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  element->create = create_element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+
+  return element;
+}
+
+// End of code for element element_7d8fa77eaac1107fece82f1ce4c0d8968700e97e
+
+// Code for dofmap dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d
+
+void tabulate_entity_dofs_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d(int* restrict dofs, int d, int i)
+{
+switch (d)
+{
+case 0:
+    switch (i)
+    {
+    case 0:
+        dofs[0] = 0;
+        break;
+    case 1:
+        dofs[0] = 1;
+        break;
+    case 2:
+        dofs[0] = 2;
+        break;
+    }
+    break;
+}
+}
+
+
+ufc_dofmap* create_sub_dofmap_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d(int i)
+{
+return NULL;
+}
+
+ufc_dofmap* create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void)
+{
+  ufc_dofmap* dofmap = (ufc_dofmap*)malloc(sizeof(*dofmap));
+  dofmap->signature = "FFCX dofmap for FiniteElement('Lagrange', triangle, 1)";
+  dofmap->block_size = 1;
+  dofmap->num_global_support_dofs = 0;
+  dofmap->num_element_support_dofs = 3;
+  dofmap->num_entity_dofs[0] = 1;
+  dofmap->num_entity_dofs[1] = 0;
+  dofmap->num_entity_dofs[2] = 0;
+  dofmap->num_entity_dofs[3] = 0;
+  dofmap->tabulate_entity_dofs = tabulate_entity_dofs_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  dofmap->num_sub_dofmaps = 0;
+  dofmap->create_sub_dofmap = create_sub_dofmap_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  dofmap->create = create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+
+  dofmap->size_base_permutations = 9;
+  static const int bp[9] = {0,1,2,0,1,2,0,1,2};
+  dofmap->base_permutations = bp;
+
+
+  return dofmap;
+}
+
+// End of code for dofmap dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d
+
+// Code for dofmap dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e
+
+void tabulate_entity_dofs_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(int* restrict dofs, int d, int i)
+{
+switch (d)
+{
+case 0:
+    switch (i)
+    {
+    case 0:
+        dofs[0] = 0;
+        break;
+    case 1:
+        dofs[0] = 1;
+        break;
+    case 2:
+        dofs[0] = 2;
+        break;
+    }
+    break;
+}
+}
+
+ufc_dofmap* create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void);
+
+ufc_dofmap* create_sub_dofmap_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(int i)
+{
+switch (i)
+{
+case 0:
+    return create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+case 1:
+    return create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+default:
+    return NULL;
+}
+}
+
+ufc_dofmap* create_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e(void)
+{
+  ufc_dofmap* dofmap = (ufc_dofmap*)malloc(sizeof(*dofmap));
+  dofmap->signature = "FFCX dofmap for VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  dofmap->block_size = 2;
+  dofmap->num_global_support_dofs = 0;
+  dofmap->num_element_support_dofs = 3;
+  dofmap->num_entity_dofs[0] = 1;
+  dofmap->num_entity_dofs[1] = 0;
+  dofmap->num_entity_dofs[2] = 0;
+  dofmap->num_entity_dofs[3] = 0;
+  dofmap->tabulate_entity_dofs = tabulate_entity_dofs_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  dofmap->num_sub_dofmaps = 2;
+  dofmap->create_sub_dofmap = create_sub_dofmap_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+  dofmap->create = create_dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e;
+
+  dofmap->size_base_permutations = 9;
+  static const int bp[9] = {0,1,2,0,1,2,0,1,2};
+  dofmap->base_permutations = bp;
+
+
+  return dofmap;
+}
+
+// End of code for dofmap dofmap_7d8fa77eaac1107fece82f1ce4c0d8968700e97e
+
+// Code for coordinate mapping coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645
+
+ufc_coordinate_mapping* create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645(void)
+{
+  ufc_coordinate_mapping* cmap = (ufc_coordinate_mapping*)malloc(sizeof(*cmap));
+  cmap->signature = "FFCX coordinate_mapping from VectorElement(FiniteElement('Lagrange', triangle, 1), dim=2)";
+  cmap->create = create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645;
+  cmap->geometric_dimension = 2;
+  cmap->topological_dimension = 2;
+  cmap->is_affine = 1;
+  cmap->cell_shape = triangle;
+  cmap->create_scalar_dofmap = create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  cmap->evaluate_basis_derivatives = evaluate_reference_basis_derivatives_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+  return cmap;
+}
+
+ufc_coordinate_mapping* create_coordinate_map_JIT(void)
+{
+  return create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645();
+}
+
+
+// End of code for coordinate mapping coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645
+
+// Code for integral integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284
+
+
+void tabulate_tensor_integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284(ufc_scalar_t* restrict A,
+                                    const ufc_scalar_t* restrict w,
+                                    const ufc_scalar_t* restrict c,
+                                    const double* restrict coordinate_dofs,
+                                    const int* restrict unused_local_index,
+                                    const uint8_t* restrict quadrature_permutation,
+                                    const uint32_t cell_permutation)
+{
+    // Quadrature rules
+    alignas(32) static const double weights_083[1] = { 0.5 };
+    // Precomputed values of basis functions and precomputations
+    // FE* dimensions: [permutation][entities][points][dofs]
+    alignas(32) static const double FE3_C0_D01_Q083[1][1][1][2] = { { { { -1.0, 1.0 } } } };
+    // Quadrature loop independent computations for quadrature rule 083
+    const double J_c0 = coordinate_dofs[0] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[2] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c3 = coordinate_dofs[1] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[5] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c1 = coordinate_dofs[0] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[4] * FE3_C0_D01_Q083[0][0][0][1];
+    const double J_c2 = coordinate_dofs[1] * FE3_C0_D01_Q083[0][0][0][0] + coordinate_dofs[3] * FE3_C0_D01_Q083[0][0][0][1];
+    alignas(32) ufc_scalar_t sp_083[20];
+    sp_083[0] = J_c0 * J_c3;
+    sp_083[1] = J_c1 * J_c2;
+    sp_083[2] = sp_083[0] + -1 * sp_083[1];
+    sp_083[3] = J_c0 / sp_083[2];
+    sp_083[4] = (-1 * J_c1) / sp_083[2];
+    sp_083[5] = sp_083[3] * sp_083[3];
+    sp_083[6] = sp_083[3] * sp_083[4];
+    sp_083[7] = sp_083[4] * sp_083[4];
+    sp_083[8] = J_c3 / sp_083[2];
+    sp_083[9] = (-1 * J_c2) / sp_083[2];
+    sp_083[10] = sp_083[9] * sp_083[9];
+    sp_083[11] = sp_083[8] * sp_083[9];
+    sp_083[12] = sp_083[8] * sp_083[8];
+    sp_083[13] = sp_083[5] + sp_083[10];
+    sp_083[14] = sp_083[6] + sp_083[11];
+    sp_083[15] = sp_083[12] + sp_083[7];
+    sp_083[16] = fabs(sp_083[2]);
+    sp_083[17] = sp_083[13] * sp_083[16];
+    sp_083[18] = sp_083[14] * sp_083[16];
+    sp_083[19] = sp_083[15] * sp_083[16];
+    for (int iq = 0; iq < 1; ++iq)
+    {
+        const ufc_scalar_t fw0 = sp_083[19] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * i + j] += fw0 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        const ufc_scalar_t fw1 = sp_083[18] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * i + 2 * j] += fw1 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * (2 * i) + j] += fw1 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+        const ufc_scalar_t fw2 = sp_083[17] * weights_083[iq];
+        for (int i = 0; i < 2; ++i)
+            for (int j = 0; j < 2; ++j)
+                A[3 * (2 * i) + 2 * j] += fw2 * FE3_C0_D01_Q083[0][0][0][i] * FE3_C0_D01_Q083[0][0][0][j];
+    }
+}
+
+
+ufc_integral* create_integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+  static const bool enabled[1] = {false};  /* No coefficients, but C does not permit zero-sized arrays */
+  ufc_integral* integral = (ufc_integral*)malloc(sizeof(*integral));
+  integral->enabled_coefficients = enabled;
+  integral->tabulate_tensor = tabulate_tensor_integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284;
+  integral->needs_permutation_data = 1;
+  integral->tabulate_tensor_batch = NULL;
+  integral->batch_size = 0;
+  integral->tabulate_action = NULL;
+  integral->tabulate_diagonal = NULL;
+  static const int nonzero_blocks[1][2][2] =
+      { { { 0, 3 },
+          { 0, 3 } } };
+  integral->num_nonzero_blocks = 1;
+  integral->nonzero_blocks = &nonzero_blocks[0][0][0];
+  integral->sets_nonzero_blocks = false;
+  return integral;
+}
+
+// End of code for integral integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284
+
+// Code for form form_22773257fd423ef95a7ca891908ca60725ac5284
+
+int original_coefficient_position_form_22773257fd423ef95a7ca891908ca60725ac5284(int i)
+{
+// Invalid original coefficient index.
+return -1;
+}
+
+// Return a list of the coefficient names.
+const char** coefficient_name_form_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+return NULL;
+}
+
+// Return a list of the constant names.
+const char** constant_name_form_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+return NULL;
+}
+
+ufc_coordinate_mapping* create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645(void);
+
+ufc_coordinate_mapping* create_coordinate_mapping_form_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+return create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645();
+}
+
+ufc_finite_element* create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void);
+
+ufc_finite_element* create_finite_element_form_22773257fd423ef95a7ca891908ca60725ac5284(int i)
+{
+switch (i)
+{
+case 0:
+    return create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+case 1:
+    return create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+default:
+    return NULL;
+}
+}
+
+ufc_dofmap* create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d(void);
+
+ufc_dofmap* create_dofmap_form_22773257fd423ef95a7ca891908ca60725ac5284(int i)
+{
+switch (i)
+{
+case 0:
+    return create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+case 1:
+    return create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d();
+default:
+    return NULL;
+}
+}
+
+ufc_integral* create_cell_integral_form_22773257fd423ef95a7ca891908ca60725ac5284(int subdomain_id)
+{
+  switch (subdomain_id)
+{
+case -1:
+    return create_integral_cell_otherwise_22773257fd423ef95a7ca891908ca60725ac5284();
+default:
+    return NULL;
+}
+}
+
+void get_cell_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284(int *ids)
+{
+  ids[0] = -1;
+return;
+}
+
+ufc_integral* create_exterior_facet_integral_form_22773257fd423ef95a7ca891908ca60725ac5284(int subdomain_id)
+{
+  return NULL;
+}
+
+void get_exterior_facet_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284(int *ids)
+{
+  return;
+}
+
+ufc_integral* create_interior_facet_integral_form_22773257fd423ef95a7ca891908ca60725ac5284(int subdomain_id)
+{
+return NULL;
+}
+
+void get_interior_facet_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284(int *ids)
+{
+  return;
+}
+
+ufc_integral* create_vertex_integral_form_22773257fd423ef95a7ca891908ca60725ac5284(int subdomain_id)
+{
+return NULL;
+}
+
+void get_vertex_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284(int *ids)
+{
+  return;
+}
+
+ufc_custom_integral* create_custom_integral_form_22773257fd423ef95a7ca891908ca60725ac5284(int subdomain_id)
+{
+return NULL;
+}
+
+void get_custom_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284(int *ids)
+{
+  return;
+}
+
+ufc_form* create_form_22773257fd423ef95a7ca891908ca60725ac5284(void)
+{
+  ufc_form* form = (ufc_form*)malloc(sizeof(*form));
+
+  form->signature = "69dad397d7c053c8954688c506b7889f881f0bc42e1aeb8caa238ed3d847835b6042e9e23a436af68d469ff4eb21c6cf74d45bcf9d8b3f1c7a250901a9e7f7e7";
+  form->rank = 2;
+  form->num_coefficients = 0;
+  form->num_constants = 0;
+  form->original_coefficient_position = original_coefficient_position_form_22773257fd423ef95a7ca891908ca60725ac5284;
+
+  form->coefficient_name_map = coefficient_name_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->constant_name_map = constant_name_form_22773257fd423ef95a7ca891908ca60725ac5284;
+
+  form->create_coordinate_mapping = create_coordinate_mapping_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_finite_element = create_finite_element_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_dofmap = create_dofmap_form_22773257fd423ef95a7ca891908ca60725ac5284;
+
+  form->get_cell_integral_ids = get_cell_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->get_exterior_facet_integral_ids = get_exterior_facet_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->get_interior_facet_integral_ids = get_interior_facet_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->get_vertex_integral_ids = get_vertex_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->get_custom_integral_ids = get_custom_integral_ids_form_22773257fd423ef95a7ca891908ca60725ac5284;
+
+  form->num_cell_integrals = 1;
+  form->num_exterior_facet_integrals = 0;
+  form->num_interior_facet_integrals = 0;
+  form->num_vertex_integrals = 0;
+  form->num_custom_integrals = 0;
+
+  form->create_cell_integral = create_cell_integral_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_exterior_facet_integral = create_exterior_facet_integral_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_interior_facet_integral = create_interior_facet_integral_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_vertex_integral = create_vertex_integral_form_22773257fd423ef95a7ca891908ca60725ac5284;
+  form->create_custom_integral = create_custom_integral_form_22773257fd423ef95a7ca891908ca60725ac5284;
+
+  form->tabulate_cell_integrals = NULL;
+
+  return form;
+}
+
+ufc_form* create_form_JIT_0(void)
+{
+  return create_form_22773257fd423ef95a7ca891908ca60725ac5284();
+}
+
+ufc_function_space* create_functionspace_form_JIT_0(const char* function_name)
+{
+  if (strcmp(function_name, "v_0") == 0)
+{
+    ufc_function_space* space = (ufc_function_space*)malloc(sizeof(*space));
+    space->create_element = create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+    space->create_dofmap = create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+    space->create_coordinate_mapping = create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645;
+    return space;
+}
+else if (strcmp(function_name, "v_1") == 0)
+{
+    ufc_function_space* space = (ufc_function_space*)malloc(sizeof(*space));
+    space->create_element = create_element_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+    space->create_dofmap = create_dofmap_bcfd4ddbff8c762ffd230166cb1499f5959c487d;
+    space->create_coordinate_mapping = create_coordinate_mapping_a1ab721839fc99ca35dfeea7190d723578159645;
+    return space;
+}
+return NULL;
+
+}
+
+// End of code for form form_22773257fd423ef95a7ca891908ca60725ac5284
@@ -58,10 +58,14 @@ def analyze_ufl_objects(ufl_objects: typing.Union[typing.List[ufl.form.Form], ty
     unique_coordinate_elements = set()
     expressions = []
 
-    # FIXME: This assumes that forms come before elements in
-    # ufl_objects? Is this reasonable?
+    # Forms come before elements in ufl_objects, which may contain
+    # both when several files are compiled together
     if isinstance(ufl_objects[0], ufl.form.Form):
-        forms = ufl_objects
+        forms = [obj for obj in ufl_objects if isinstance(obj, ufl.form.Form)]
+        elements = [obj for obj in ufl_objects if isinstance(obj, ufl.FiniteElementBase)]
+        if len(forms) + len(elements) != len(ufl_objects):
+            raise TypeError("UFL objects not recognised.")
+        unique_elements.update(ufl.algorithms.analysis.extract_sub_elements(elements))
         form_data = tuple(_analyze_form(form, parameters) for form in forms)
 
         # Extract unique elements across forms
@@ -203,6 +207,17 @@ def _analyze_form(form: ufl.form.Form, parameters: typing.Dict) -> ufl.algorithm
 
         integral_data.metadata["precision"] = p
 
+        # ----- Extract block modes
+        #
+        # Preintegration and premultiplication specified in metadata of
+        # integrals override the parameters
+        for mode in ("enable_preintegration", "enable_premultiplication"):
+            modes = set(integral.metadata().get(mode) for integral in integral_data.integrals)
+            modes.discard(None)
+            if len(modes) > 1:
+                raise RuntimeError("Only one value of {} allowed within integrals grouped by subdomain.".format(mode))
+            integral_data.metadata[mode] = modes.pop() if modes else None
+
         qd_default = parameters["quadrature_degree"]
         qr_default = parameters["quadrature_rule"]
 
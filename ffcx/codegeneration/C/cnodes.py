@@ -10,8 +10,8 @@ import numbers
 import numpy
 
 from ffcx.codegeneration.C.format_lines import Indented, format_indented_lines
-from ffcx.codegeneration.C.format_value import (format_float, format_int,
-                                                format_value)
+from ffcx.codegeneration.C.format_value import (format_float, format_hexfloat,
+                                                format_int, format_value)
 from ffcx.codegeneration.C.precedence import PRECEDENCE
 
 logger = logging.getLogger("ffcx")
@@ -980,6 +980,15 @@ class CStatement(CNode):
         """Return S: string | list(S) | Indented(S)."""
         raise NotImplementedError("Missing implementation of cs_format() in CStatement.")
 
+    def cs_format_iter(self, precision=None):
+        """Iterate over pairs of indentation level and S, which together give cs_format().
+
+        Statements containing other statements format these one by one,
+        such that a large statement is never formatted at once.
+
+        """
+        yield 0, self.cs_format(precision)
+
     def __str__(self):
         try:
             s = self.cs_format()
@@ -1043,6 +1052,10 @@ class StatementList(CStatement):
     def cs_format(self, precision=None):
         return [st.cs_format(precision) for st in self.statements]
 
+    def cs_format_iter(self, precision=None):
+        for st in self.statements:
+            yield from st.cs_format_iter(precision)
+
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.statements == other.statements)
 
@@ -1277,14 +1290,15 @@ class ArrayDecl(CStatement):
     entire array to zero.
 
     Otherwise use nested lists of lists to represent multidimensional
-    array values to initialize to.
+    array values to initialize to. Float values are written as
+    hexadecimal literals if hexfloat is set.
 
     """
 
-    __slots__ = ("typename", "symbol", "sizes", "alignas", "padlen", "values")
+    __slots__ = ("typename", "symbol", "sizes", "alignas", "padlen", "values", "hexfloat")
     is_scoped = False
 
-    def __init__(self, typename, symbol, sizes=None, values=None, alignas=None, padlen=0):
+    def __init__(self, typename, symbol, sizes=None, values=None, alignas=None, padlen=0, hexfloat=False):
         assert isinstance(typename, str)
         self.typename = typename
 
@@ -1310,6 +1324,7 @@ class ArrayDecl(CStatement):
 
         self.alignas = alignas
         self.padlen = padlen
+        self.hexfloat = hexfloat
 
     def cs_format(self, precision=None):
         if not all(self.sizes):
@@ -1341,7 +1356,8 @@ class ArrayDecl(CStatement):
         else:
             # Construct initializer lists for arbitrary multidimensional array values
             if self.values.dtype.kind == "f":
-                formatter = format_float
+                # Hexadecimal literals are exact, so precision is ignored
+                formatter = format_hexfloat if self.hexfloat else format_float
             elif self.values.dtype.kind == "i":
                 formatter = format_int
             else:
@@ -1355,7 +1371,7 @@ class ArrayDecl(CStatement):
                 return (decl + " =", Indented(initializer_lists))
 
     def __eq__(self, other):
-        attributes = ("typename", "symbol", "sizes", "alignas", "padlen", "values")
+        attributes = ("typename", "symbol", "sizes", "alignas", "padlen", "values", "hexfloat")
         return (isinstance(other, type(self))
                 and all(getattr(self, name) == getattr(self, name) for name in attributes))
 
@@ -1373,10 +1389,21 @@ class Scope(CStatement):
     def cs_format(self, precision=None):
         return ("{", Indented(self.body.cs_format(precision)), "}")
 
+    def cs_format_iter(self, precision=None):
+        yield 0, "{"
+        yield from _indented_iter(self.body, precision)
+        yield 0, "}"
+
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.body == other.body)
 
 
+def _indented_iter(body, precision):
+    """Iterate over cs_format_iter() of a body, indented by one level."""
+    for level, code in body.cs_format_iter(precision):
+        yield level + 1, code
+
+
 def _is_simple_if_body(body):
     if isinstance(body, StatementList):
         if len(body.statements) > 1:
@@ -1401,6 +1428,15 @@ class If(CStatement):
         else:
             return (statement, "{", body_fmt, "}")
 
+    def cs_format_iter(self, precision=None):
+        if _is_simple_if_body(self.body):
+            yield 0, self.cs_format(precision)
+        else:
+            yield 0, "if (" + self.condition.ce_format(precision) + ")"
+            yield 0, "{"
+            yield from _indented_iter(self.body, precision)
+            yield 0, "}"
+
     def __eq__(self, other):
         return (isinstance(other, type(self)) and self.condition == other.condition
                 and self.body == other.body)
@@ -1517,7 +1553,7 @@ class ForRange(CStatement):
         self.body = as_cstatement(body)
         self.index_type = index_type
 
-    def cs_format(self, precision=None):
+    def cs_format_prelude(self, precision=None):
         indextype = self.index_type
         index = self.index.ce_format(precision)
         begin = self.begin.ce_format(precision)
@@ -1527,7 +1563,10 @@ class ForRange(CStatement):
         check = index + " < " + end
         update = "++" + index
 
-        prelude = "for (" + init + "; " + check + "; " + update + ")"
+        return "for (" + init + "; " + check + "; " + update + ")"
+
+    def cs_format(self, precision=None):
+        prelude = self.cs_format_prelude(precision)
         body = Indented(self.body.cs_format(precision))
 
         # Reduce size of code with lots of simple loops by dropping {} in obviously safe cases
@@ -1538,6 +1577,15 @@ class ForRange(CStatement):
 
         return code
 
+    def cs_format_iter(self, precision=None):
+        if is_simple_inner_loop(self.body):
+            yield 0, self.cs_format(precision)
+        else:
+            yield 0, self.cs_format_prelude(precision)
+            yield 0, "{"
+            yield from _indented_iter(self.body, precision)
+            yield 0, "}"
+
     def __eq__(self, other):
         attributes = ("index", "begin", "end", "body", "index_type")
         return (isinstance(other, type(self))
@@ -7,8 +7,15 @@ When formatting an AST into a string, it's better to collect lists of
 snippets and then join them than adding the pieces continually, which
 gives O(n^2) behaviour w.r.t. AST size n.
 
+Generated code may also be kept as a list of pieces, which are strings
+and formatted lines of syntax trees, see format_template. The lines of
+syntax trees are then only formatted when the code is written, such
+that the code of a kernel is never held in memory as one string.
+
 """
 
+from string import Formatter
+
 
 class Indented(object):
     """Class to mark a collection of snippets for indentation.
@@ -59,3 +66,65 @@ def format_indented_lines(snippets, level=0):
     """Format recursive sequences of indented lines as one string."""
 
     return "\n".join(iter_indented_lines(snippets, level))
+
+
+class FormattedLines(object):
+    """Class to mark a syntax tree for formatting when the code is written.
+
+    Stands for format_indented_lines(node.cs_format(precision), level),
+    with the statements of the node formatted one at a time.
+
+    """
+
+    __slots__ = ("node", "precision", "level")
+
+    def __init__(self, node, precision=None, level=0):
+        self.node = node
+        self.precision = precision
+        self.level = level
+
+    def __iter__(self):
+        """Iterate over the formatted lines, separated by newlines."""
+        separator = ""
+        for level, snippets in self.node.cs_format_iter(self.precision):
+            for line in iter_indented_lines(snippets, self.level + level):
+                yield separator + line
+                separator = "\n"
+
+
+def format_template(template, **values):
+    """Format a template as str.format, keeping formatted lines and lists of pieces as they are.
+
+    Returns the list of pieces of the code.
+
+    """
+    formatter = Formatter()
+    pieces = []
+    for literal, field, spec, conversion in formatter.parse(template):
+        if literal:
+            pieces.append(literal)
+        if field is not None:
+            value = values[field]
+            if isinstance(value, (FormattedLines, list)):
+                pieces.append(value)
+            else:
+                pieces.append(formatter.format_field(formatter.convert_field(value, conversion), spec))
+    return pieces
+
+
+def iter_code(code):
+    """Iterate over the strings of code given as a string, formatted lines or a list of pieces."""
+    if isinstance(code, str):
+        yield code
+    elif isinstance(code, FormattedLines):
+        yield from code
+    elif isinstance(code, list):
+        for piece in code:
+            yield from iter_code(piece)
+    else:
+        raise RuntimeError("Unexpected type %s:\n%s" % (type(code), str(code)))
+
+
+def join_code(code):
+    """Format code given as a string, formatted lines or a list of pieces as one string."""
+    return "".join(iter_code(code))
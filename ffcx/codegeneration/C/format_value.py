@@ -30,6 +30,11 @@ def format_float(x, precision=None):
     return s
 
 
+def format_hexfloat(x, precision=None):
+    """Format a float value exactly as a hexadecimal floating point literal."""
+    return float(x).hex()
+
+
 def format_int(x, precision=None):
     return str(x)
 
@@ -10,6 +10,7 @@ from ffcx.codegeneration.access import FFCXBackendAccess
 from ffcx.codegeneration.C.ufl_to_cnodes import UFL2CNodesTranslatorCpp
 from ffcx.codegeneration.definitions import FFCXBackendDefinitions
 from ffcx.codegeneration.symbols import FFCXBackendSymbols
+from ffcx.codegeneration.utils import kernel_types
 
 
 class FFCXBackend(object):
@@ -19,8 +20,8 @@ class FFCXBackend(object):
 
         # This is the seam where cnodes/C is chosen for the ffcx backend
         self.language = ffcx.codegeneration.C.cnodes
-        scalar_type = parameters.get("scalar_type", "double")
-        self.ufl_to_language = UFL2CNodesTranslatorCpp(self.language, scalar_type)
+        self.compute_type, self.intermediate_type, math_type = kernel_types(parameters)
+        self.ufl_to_language = UFL2CNodesTranslatorCpp(self.language, math_type)
 
         coefficient_numbering = ir.coefficient_numbering
         coefficient_offsets = ir.coefficient_offsets
@@ -0,0 +1,264 @@
+# Copyright (C) 2020 The FEniCS Project
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Transformation of single-cell kernel bodies into batched multi-cell kernel bodies.
+
+The batched kernels process cells in batches of a fixed size. All
+per-cell data is passed in structure-of-arrays layout, i.e. entry k of
+cell e of an input array x is found at x[k * num_cells + e]. Every
+temporary of the single-cell kernel gets an additional innermost
+dimension of batch size, and every statement is wrapped in a loop over
+the cells in the batch. The cell index is thereby the fastest varying
+index of all data touched in the innermost loops, which lets the C
+compiler vectorize across the cells of a batch. Cells beyond the last
+full batch are processed by a copy of the batch body with a shorter
+loop over the cells.
+"""
+
+import itertools
+import logging
+
+import numpy
+
+logger = logging.getLogger("ffcx")
+
+
+def _is_static_declaration(L, statement):
+    return isinstance(statement, L.ArrayDecl) and statement.typename.startswith("static")
+
+
+def _strip_const(typename):
+    return " ".join(t for t in typename.split() if t != "const")
+
+
+class CellBatcher(object):
+    """Rewrite a single-cell kernel body into the body of a batched kernel.
+
+    Parameters
+    ----------
+    language
+        The CNodes language module.
+    batch_size
+        Number of cells processed together in the innermost loops.
+    arrays
+        Names of the per-cell input and output arrays which are passed
+        in structure-of-arrays layout.
+    scalars
+        Names of the per-cell scalar inputs, passed as arrays with one
+        entry per cell.
+    """
+
+    def __init__(self, language, batch_size, arrays, scalars=()):
+        L = language
+        self.L = L
+        self.batch_size = batch_size
+        self.arrays = set(arrays)
+        self.scalars = set(scalars)
+
+        self.num_cells = L.Symbol("num_cells")
+        self.batch_index = L.Symbol("ibatch")
+        self.lane_index = L.Symbol("ilane")
+        self.num_tail = L.Symbol("num_tail_cells")
+        self.cell = L.Mul(batch_size, self.batch_index) + self.lane_index
+
+        # Number of cells processed by the cell loops being generated
+        self.num_lanes = batch_size
+
+        # Temporaries which have been given an extra batch dimension
+        self.batched = set()
+
+    def generate(self, body):
+        """Return the batched kernel body for the single-cell kernel body."""
+        L = self.L
+
+        # Alignment hints and static tables are shared by all cells and
+        # stay outside the loop over batches, along with their comments
+        preamble = []
+        statements = []
+        comments = []
+        for s in self._flatten(body):
+            if isinstance(s, L.Comment):
+                comments.append(s)
+                continue
+            if isinstance(s, L.VerbatimStatement) or _is_static_declaration(L, s):
+                preamble += comments + [s]
+            else:
+                statements += comments + [s]
+            comments = []
+        statements += comments
+
+        num_batches = L.Div(self.num_cells, self.batch_size)
+        self.num_lanes = self.batch_size
+        loop = L.ForRange(self.batch_index, 0, num_batches, body=self._batch_statements(statements))
+
+        # The remaining cells, if num_cells is not a multiple of the batch
+        # size, form a last partial batch
+        self.num_lanes = self.num_tail
+        tail = L.If(L.GT(self.num_tail, 0),
+                    [L.VariableDecl("const int", self.batch_index, num_batches)]
+                    + self._batch_statements(statements))
+        self.num_lanes = self.batch_size
+
+        num_tail = L.VariableDecl("const int", self.num_tail, L.Mod(self.num_cells, self.batch_size))
+        return L.StatementList(preamble + [num_tail, loop, tail])
+
+    def _flatten(self, statement):
+        L = self.L
+        if isinstance(statement, L.StatementList):
+            flat = []
+            for s in statement.statements:
+                flat.extend(self._flatten(s))
+            return flat
+        elif isinstance(statement, (list, tuple)):
+            flat = []
+            for s in statement:
+                flat.extend(self._flatten(s))
+            return flat
+        return [L.as_cstatement(statement)]
+
+    def _lane_loop(self, body):
+        return self.L.ForRange(self.lane_index, 0, self.num_lanes, body=body)
+
+    def _batch_statements(self, statements):
+        """Batch a list of statements, fusing consecutive per-cell statements into a single cell loop."""
+        L = self.L
+        parts = []
+        lane_body = []
+
+        def flush():
+            if lane_body:
+                parts.append(self._lane_loop(list(lane_body)))
+                lane_body.clear()
+
+        statements = self._flatten(statements)
+        i = 0
+        while i < len(statements):
+            s = statements[i]
+            i += 1
+            if isinstance(s, (L.Comment, L.Pragma, L.VerbatimStatement)):
+                flush()
+                parts.append(s)
+            elif isinstance(s, L.ArrayDecl):
+                if _is_static_declaration(L, s):
+                    flush()
+                    parts.append(s)
+                    continue
+                decl, assignments = self._batch_array_declaration(s)
+                # Declarations are placed before the fused cell loop,
+                # as they do not depend on the cell
+                parts.append(decl)
+                lane_body.extend(assignments)
+            elif isinstance(s, L.VariableDecl):
+                self.batched.add(s.symbol.name)
+                parts.append(L.ArrayDecl(_strip_const(s.typename), s.symbol, (self.batch_size, )))
+                if s.value is not None:
+                    lane_body.append(L.Assign(s.symbol[self.lane_index], self._expr(s.value)))
+            elif isinstance(s, L.ForRange):
+                flush()
+                parts.append(L.ForRange(s.index, self._expr(s.begin), self._expr(s.end),
+                                        body=self._batch_statements(s.body)))
+            elif isinstance(s, L.Scope):
+                flush()
+                parts.append(L.Scope(self._batch_statements(s.body)))
+            elif isinstance(s, L.If):
+                # Conditions depend on the cell, so a full if-else chain is
+                # moved inside the cell loop
+                chain = [s]
+                while i < len(statements) and isinstance(statements[i], (L.ElseIf, L.Else)):
+                    chain.append(statements[i])
+                    i += 1
+                lane_body.extend(self._statement(c) for c in chain)
+            else:
+                lane_body.append(self._statement(s))
+        flush()
+        return parts
+
+    def _batch_array_declaration(self, decl):
+        """Add a batch dimension to an array declaration.
+
+        Returns the new declaration and the per-cell assignments of
+        the initial values.
+        """
+        L = self.L
+        self.batched.add(decl.symbol.name)
+        sizes = decl.sizes + (self.batch_size, )
+        values = decl.values
+        if not isinstance(values, numpy.ndarray):
+            # Undefined or zero initial values
+            return L.ArrayDecl(decl.typename, decl.symbol, sizes, values, alignas=decl.alignas), []
+        elif values.dtype.kind in "biuf":
+            # Same initial values for all cells
+            values = numpy.repeat(values[..., numpy.newaxis], self.batch_size, axis=-1)
+            return L.ArrayDecl(decl.typename, decl.symbol, sizes, values, alignas=decl.alignas,
+                               hexfloat=decl.hexfloat), []
+
+        # Values depend on the cell, initialise them entry by entry
+        assignments = []
+        for index in itertools.product(*[range(n) for n in values.shape]):
+            target = decl.symbol[index + (self.lane_index, )]
+            assignments.append(L.Assign(target, self._expr(L.as_cexpr(values[index]))))
+        return L.ArrayDecl(_strip_const(decl.typename), decl.symbol, sizes, alignas=decl.alignas), assignments
+
+    def _statement(self, s):
+        """Rewrite a statement to be executed for the current cell of the batch."""
+        L = self.L
+        s = L.as_cstatement(s)
+        if isinstance(s, L.StatementList):
+            return L.StatementList([self._statement(t) for t in s.statements])
+        elif isinstance(s, L.Statement):
+            return L.Statement(self._expr(s.expr))
+        elif isinstance(s, L.VariableDecl):
+            value = None if s.value is None else self._expr(s.value)
+            return L.VariableDecl(s.typename, s.symbol, value)
+        elif isinstance(s, L.ForRange):
+            return L.ForRange(s.index, self._expr(s.begin), self._expr(s.end),
+                              body=self._statement(s.body), index_type=s.index_type)
+        elif isinstance(s, L.If):
+            return L.If(self._expr(s.condition), self._statement(s.body))
+        elif isinstance(s, L.ElseIf):
+            return L.ElseIf(self._expr(s.condition), self._statement(s.body))
+        elif isinstance(s, L.Else):
+            return L.Else(self._statement(s.body))
+        elif isinstance(s, L.Scope):
+            return L.Scope(self._statement(s.body))
+        elif isinstance(s, (L.Comment, L.Pragma, L.VerbatimStatement)):
+            return s
+        raise RuntimeError("Cannot batch statement of type {}.".format(type(s).__name__))
+
+    def _soa_index(self, index):
+        return index * self.num_cells + self.cell
+
+    def _expr(self, e):
+        """Rewrite an expression to access the data of the current cell of the batch."""
+        L = self.L
+        if isinstance(e, L.Symbol):
+            if e.name in self.batched:
+                return e[self.lane_index]
+            elif e.name in self.scalars:
+                return e[self.cell]
+            return e
+        elif isinstance(e, L.ArrayAccess):
+            indices = [self._expr(i) for i in e.indices]
+            name = e.array.name
+            if name in self.batched:
+                return L.ArrayAccess(e.array, indices + [self.lane_index])
+            elif name in self.arrays:
+                if len(indices) != 1:
+                    raise RuntimeError("Expecting flattened access to {}.".format(name))
+                return L.ArrayAccess(e.array, self._soa_index(indices[0]))
+            return L.ArrayAccess(e.array, indices)
+        elif isinstance(e, L.CExprTerminal):
+            return e
+        elif isinstance(e, L.BinOp):
+            return type(e)(self._expr(e.lhs), self._expr(e.rhs))
+        elif isinstance(e, L.NaryOp):
+            return type(e)([self._expr(arg) for arg in e.args])
+        elif isinstance(e, L.UnaryOp):
+            return type(e)(self._expr(e.arg))
+        elif isinstance(e, L.Conditional):
+            return L.Conditional(self._expr(e.condition), self._expr(e.true), self._expr(e.false))
+        elif isinstance(e, L.Call):
+            return L.Call(e.function, [self._expr(arg) for arg in e.arguments])
+        raise RuntimeError("Cannot batch expression of type {}.".format(type(e).__name__))
@@ -42,7 +42,9 @@ def generate_code(ir, parameters):
     code_dofmaps = [dofmap_generator(dofmap_ir, parameters) for dofmap_ir in ir.dofmaps]
     code_coordinate_mappings = [coordinate_mapping_generator(cmap_ir, parameters) for cmap_ir in ir.coordinate_mappings]
     code_integrals = [integral_generator(integral_ir, parameters) for integral_ir in ir.integrals]
-    code_forms = [form_generator(form_ir, parameters) for form_ir in ir.forms]
+    integral_irs = {integral_ir.name: integral_ir for integral_ir in ir.integrals}
+    code_forms = [form_generator(form_ir, parameters, [integral_irs[name] for name in form_ir.create_cell_integral[1]])
+                  for form_ir in ir.forms]
     code_expressions = [expression_generator(expression_ir, parameters) for expression_ir in ir.expressions]
 
     return code_blocks(elements=code_finite_elements, dofmaps=code_dofmaps,
@@ -25,7 +25,11 @@ def generator(ir, parameters):
 
     # Attributes
     d["factory_name"] = ir.name
-    d["prefix"] = ir.prefix
+    # Only the first coordinate mapping has the helper named by the prefix
+    if ir.prefix is None:
+        d["prefix_factory"] = ""
+    else:
+        d["prefix_factory"] = ufc_coordinate_mapping.prefix_factory.format(prefix=ir.prefix, factory_name=ir.name)
     d["signature"] = "\"{}\"".format(ir.signature)
     d["geometric_dimension"] = ir.geometric_dimension
     d["topological_dimension"] = ir.topological_dimension
@@ -46,6 +50,11 @@ def generator(ir, parameters):
     implementation = ufc_coordinate_mapping.factory.format_map(d)
 
     # Format declaration
-    declaration = ufc_coordinate_mapping.declaration.format(factory_name=ir.name, prefix=ir.prefix)
+    if ir.prefix is None:
+        prefix_declaration = ""
+    else:
+        prefix_declaration = ufc_coordinate_mapping.prefix_declaration.format(prefix=ir.prefix)
+    declaration = ufc_coordinate_mapping.declaration.format(factory_name=ir.name,
+                                                            prefix_declaration=prefix_declaration)
 
     return declaration, implementation
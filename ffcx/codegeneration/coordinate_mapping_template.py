@@ -5,7 +5,9 @@
 
 declaration = """
 ufc_coordinate_mapping* create_{factory_name}(void);
+{prefix_declaration}"""
 
+prefix_declaration = """
 // Helper used to create coordinate map using name given to the
 // UFL file.
 // This helper is called in user c++ code.
@@ -33,12 +35,14 @@ ufc_coordinate_mapping* create_{factory_name}(void)
   cmap->evaluate_basis_derivatives = evaluate_reference_basis_derivatives_{coord_element_factory_name};
   return cmap;
 }}
+{prefix_factory}
 
+// End of code for coordinate mapping {factory_name}
+"""
+
+prefix_factory = """
 ufc_coordinate_mapping* create_coordinate_map_{prefix}(void)
 {{
   return create_{factory_name}();
 }}
-
-
-// End of code for coordinate mapping {factory_name}
 """
@@ -9,6 +9,7 @@ import logging
 
 import ufl
 
+from ffcx.codegeneration.utils import kernel_types
 from ffcx.fiatinterface import create_element
 
 logger = logging.getLogger("ffcx")
@@ -35,6 +36,7 @@ class FFCXBackendDefinitions(object):
         self.language = language
         self.symbols = symbols
         self.parameters = parameters
+        self.compute_type, self.intermediate_type, _ = kernel_types(parameters)
 
         self.ir = ir
 
@@ -104,13 +106,13 @@ class FFCXBackendDefinitions(object):
                 for i, idof in enumerate(tabledata.dofmap)
             ]
             value = L.Sum(values)
-            code = [L.VariableDecl("const ufc_scalar_t", access, value)]
+            code = [L.VariableDecl("const " + self.intermediate_type, access, value)]
         else:
             # Loop to accumulate linear combination of dofs and tables
             ic = self.symbols.coefficient_dof_sum_index()
             dof_access = self.symbols.coefficient_dof_access(mt.terminal, ic + begin)
             code = [
-                L.VariableDecl("ufc_scalar_t", access, 0.0),
+                L.VariableDecl(self.intermediate_type, access, 0.0),
                 L.ForRange(ic, 0, end - begin, body=[L.AssignAdd(access, dof_access * FE[ic])])
             ]
         return code
@@ -146,7 +148,7 @@ class FFCXBackendDefinitions(object):
         # Inlined version (we know this is bounded by a small number)
         dof_access = self.symbols.domain_dofs_access(gdim, num_scalar_dofs, mt.restriction)
         value = L.Sum([dof_access[idof] * FE[i] for i, idof in enumerate(tabledata.dofmap)])
-        code = [L.VariableDecl("const double", access, value)]
+        code = [L.VariableDecl("const " + self.compute_type, access, value)]
 
         return code
 
@@ -60,7 +60,7 @@ def create_sub_dofmap(L, ir):
 
 
 def sub_dofmap_declaration(L, ir):
-    classnames = set(ir.create_sub_dofmap)
+    classnames = sorted(set(ir.create_sub_dofmap))
     code = ""
     for name in classnames:
         code += "ufc_dofmap* create_{name}(void);\n".format(name=name)
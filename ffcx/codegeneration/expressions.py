@@ -10,7 +10,8 @@ import logging
 import ufl
 from ffcx.codegeneration import expressions_template
 from ffcx.codegeneration.backend import FFCXBackend
-from ffcx.codegeneration.C.format_lines import format_indented_lines
+from ffcx.codegeneration.cellbatch import CellBatcher
+from ffcx.codegeneration.C.format_lines import FormattedLines, format_indented_lines, format_template
 from ffcx.ir.representation import ir_expression
 
 logger = logging.getLogger("ffcx")
@@ -35,8 +36,7 @@ def generator(ir, parameters):
     code["name"] = "{}_expression".format(ir.name)
     parts = eg.generate()
 
-    body = format_indented_lines(parts.cs_format(), 1)
-    code["tabulate_expression"] = body
+    code["tabulate_expression"] = FormattedLines(parts, None, 1)
 
     code["original_coefficient_positions"] = format_indented_lines(
         eg.generate_original_coefficient_positions().cs_format(), 1)
@@ -44,10 +44,27 @@ def generator(ir, parameters):
     code["points"] = format_indented_lines(eg.generate_points().cs_format(), 1)
     code["value_shape"] = format_indented_lines(eg.generate_value_shape().cs_format(), 1)
 
+    # Generate batched kernel
+    batch_size = parameters["batch_size"]
+    if batch_size > 0:
+        eg = ExpressionGenerator(ir, FFCXBackend(ir, parameters))
+        parts = eg.generate(batch_size=batch_size)
+        code["tabulate_expression_batch"] = format_template(
+            expressions_template.tabulate_batch_implementation, factory_name=factory_name,
+            tabulate_expression=FormattedLines(parts, None, 1))
+        tabulate_expression_batch_name = "tabulate_expression_batch_" + factory_name
+    else:
+        code["tabulate_expression_batch"] = ""
+        tabulate_expression_batch_name = "NULL"
+
     # Format implementation code
-    implementation = expressions_template.factory.format(
+    implementation = format_template(
+        expressions_template.factory,
         factory_name=factory_name,
         tabulate_expression=code["tabulate_expression"],
+        tabulate_expression_batch=code["tabulate_expression_batch"],
+        tabulate_expression_batch_name=tabulate_expression_batch_name,
+        batch_size=batch_size,
         original_coefficient_positions=code["original_coefficient_positions"],
         num_coefficients=len(ir.coefficient_numbering),
         num_points=ir.points.shape[0],
@@ -74,7 +91,12 @@ class ExpressionGenerator:
         self.shared_symbols = {}
         self.quadrature_rule = list(self.ir.integrand.keys())[0]
 
-    def generate(self):
+    def generate(self, batch_size=0):
+        """Generate body of tabulate_expression.
+
+        If batch_size is positive, the body of tabulate_expression_batch
+        is generated instead.
+        """
         L = self.backend.language
 
         parts = []
@@ -93,6 +115,11 @@ class ExpressionGenerator:
         parts += all_preparts
         parts += all_quadparts
 
+        if batch_size > 0:
+            symbols = self.backend.symbols
+            batcher = CellBatcher(L, batch_size, symbols.cell_batch_arrays(), symbols.cell_batch_scalars())
+            return batcher.generate(parts)
+
         return L.StatementList(parts)
 
     def generate_element_tables(self):
@@ -109,7 +136,8 @@ class ExpressionGenerator:
         for name in table_names:
             table = tables[name]
             decl = L.ArrayDecl(
-                "static const ufc_scalar_t", name, table.shape, table, alignas=alignas, padlen=padlen)
+                "static const " + self.backend.compute_type, name, table.shape, table, alignas=alignas,
+                padlen=padlen, hexfloat=self.ir.params["hexfloat_tables"])
             parts += [decl]
 
         # Add leading comment if there are any tables
@@ -401,7 +429,7 @@ class ExpressionGenerator:
                         intermediates.append(L.Assign(vaccess, vexpr))
                     else:
                         vaccess = L.Symbol("%s_%d" % (symbol.name, j))
-                        intermediates.append(L.VariableDecl("const ufc_scalar_t", vaccess, vexpr))
+                        intermediates.append(L.VariableDecl("const " + self.backend.intermediate_type, vaccess, vexpr))
 
             # Store access node for future reference
             self.scope[v] = vaccess
@@ -414,7 +442,7 @@ class ExpressionGenerator:
         if intermediates:
             if use_symbol_array:
                 alignas = self.ir.params["alignas"]
-                parts += [L.ArrayDecl("ufc_scalar_t", symbol, len(intermediates), alignas=alignas)]
+                parts += [L.ArrayDecl(self.backend.intermediate_type, symbol, len(intermediates), alignas=alignas)]
             parts += intermediates
         return parts
 
@@ -8,6 +8,17 @@ declaration = """
 ufc_expression* create_expression_{factory_name}(void);
 """
 
+tabulate_batch_implementation = """
+void tabulate_expression_batch_{factory_name}(int num_cells,
+                                              ufc_scalar_t* restrict A,
+                                              const ufc_scalar_t* restrict w,
+                                              const ufc_scalar_t* restrict c,
+                                              const double* restrict coordinate_dofs)
+{{
+{tabulate_expression}
+}}
+"""
+
 factory = """
 // Code for expression {factory_name}
 
@@ -18,6 +29,7 @@ void tabulate_expression_{factory_name}(ufc_scalar_t* restrict A,
 {{
 {tabulate_expression}
 }}
+{tabulate_expression_batch}
 
 ufc_expression* create_{factory_name}(void)
 {{
@@ -29,6 +41,8 @@ ufc_expression* create_{factory_name}(void)
   {value_shape}
 
   expression->tabulate_expression = tabulate_expression_{factory_name};
+  expression->tabulate_expression_batch = {tabulate_expression_batch_name};
+  expression->batch_size = {batch_size};
   expression->num_coefficients = {num_coefficients};
   expression->num_points = {num_points};
   expression->topological_dimension = {topological_dimension};
@@ -73,7 +73,7 @@ def reference_value_dimension(L, reference_value_shape):
 
 
 def sub_element_declaration(L, ir):
-    classnames = set(ir.create_sub_element)
+    classnames = sorted(set(ir.create_sub_element))
     code = ""
     for name in classnames:
         code += "ufc_finite_element* create_{name}(void);\n".format(name=name)
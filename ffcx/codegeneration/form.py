@@ -9,6 +9,8 @@
 import logging
 
 from ffcx.codegeneration import form_template as ufc_form
+from ffcx.codegeneration.C.format_lines import format_template
+from ffcx.codegeneration.integrals import fused_generator
 from ffcx.codegeneration.utils import (generate_return_new,
                                        generate_return_new_switch)
 from ffcx.ir.representation import ufc_integral_types
@@ -123,7 +125,7 @@ class UFCForm:
         return generate_return_new_switch(L, i, classnames)
 
     def finite_element_declaration(self, L, ir):
-        classnames = set(ir.create_finite_element)
+        classnames = sorted(set(ir.create_finite_element))
         code = ""
         for name in classnames:
             code += "ufc_finite_element* create_{name}(void);\n".format(name=name)
@@ -135,7 +137,7 @@ class UFCForm:
         return generate_return_new_switch(L, i, classnames)
 
     def dofmap_declaration(self, L, ir):
-        classnames = set(ir.create_dofmap)
+        classnames = sorted(set(ir.create_dofmap))
         code = ""
         for name in classnames:
             code += "ufc_dofmap* create_{name}(void);\n".format(name=name)
@@ -187,8 +189,13 @@ class UFCForm:
         return generate_return_new_switch(L, subdomain_id, classnames, subdomain_ids)
 
 
-def generator(ir, parameters):
-    """Generate UFC code for a form."""
+def generator(ir, parameters, cell_integrals=()):
+    """Generate UFC code for a form.
+
+    The intermediate representations of the cell integrals of the form,
+    in the order of ir.create_cell_integral, are only needed for the
+    kernel tabulating them at once.
+    """
 
     logger.info("Generating code for form:")
     logger.info("--- rank: {}".format(ir.rank))
@@ -240,13 +247,20 @@ def generator(ir, parameters):
     d["create_vertex_integral"] = generator.create_vertex_integral(L, ir, parameters)
     d["create_custom_integral"] = generator.create_custom_integral(L, ir, parameters)
 
+    if parameters["fused_cell_integrals"] and cell_integrals:
+        d["tabulate_cell_integrals"] = fused_generator(ir.name, cell_integrals, parameters)
+        d["tabulate_cell_integrals_name"] = "tabulate_cell_integrals_" + ir.name
+    else:
+        d["tabulate_cell_integrals"] = ""
+        d["tabulate_cell_integrals_name"] = "NULL"
+
     # Check that no keys are redundant or have been missed
     from string import Formatter
     fields = [fname for _, fname, _, _ in Formatter().parse(ufc_form.factory) if fname]
     assert set(fields) == set(d.keys()), "Mismatch between keys in template and in formattting dict"
 
     # Format implementation code
-    implementation = ufc_form.factory.format_map(d)
+    implementation = format_template(ufc_form.factory, **d)
 
     # Format declaration
     declaration = ufc_form.declaration.format(factory_name=d["factory_name"],
@@ -109,7 +109,7 @@ void get_custom_integral_ids_{factory_name}(int *ids)
 {{
   {get_custom_integral_ids}
 }}
-
+{tabulate_cell_integrals}
 ufc_form* create_{factory_name}(void)
 {{
   ufc_form* form = (ufc_form*)malloc(sizeof(*form));
@@ -145,6 +145,8 @@ ufc_form* create_{factory_name}(void)
   form->create_vertex_integral = create_vertex_integral_{factory_name};
   form->create_custom_integral = create_custom_integral_{factory_name};
 
+  form->tabulate_cell_integrals = {tabulate_cell_integrals_name};
+
   return form;
 }}
 
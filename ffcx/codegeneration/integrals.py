@@ -7,6 +7,8 @@
 import collections
 import itertools
 import logging
+import re
+import textwrap
 import warnings
 
 import numpy
@@ -14,19 +16,29 @@ import numpy
 import ufl
 from ffcx.codegeneration import integrals_template as ufc_integrals
 from ffcx.codegeneration.backend import FFCXBackend
-from ffcx.codegeneration.C.format_lines import format_indented_lines
+from ffcx.codegeneration.cellbatch import CellBatcher
+from ffcx.codegeneration.C.format_lines import FormattedLines, format_indented_lines, format_template
 from ffcx.ir.elementtables import piecewise_ttypes
 
 logger = logging.getLogger("ffcx")
 
+# Size in bytes of the values of GCC vector extension types
+_vector_value_sizes = {"double": 8, "float": 4}
 
-def generator(ir, parameters):
 
+def generator(ir, parameters, kernels=None):
+    """Generate code for an integral.
+
+    If kernels is a dict, the syntax trees of the bodies of the
+    generated kernels are stored in it by the names of the kernel
+    functions in ufc_integral, e.g. tabulate_tensor.
+    """
     logger.info("Generating code for integral:")
     logger.info("--- type: {}".format(ir.integral_type))
     logger.info("--- name: {}".format(ir.name))
 
-    """Generate code for an integral."""
+    if kernels is None:
+        kernels = {}
     factory_name = ir.name
     integral_type = ir.integral_type
 
@@ -44,9 +56,10 @@ def generator(ir, parameters):
 
     # Generate code ast for the tabulate_tensor body
     parts = ig.generate()
+    kernels["tabulate_tensor"] = parts
 
-    # Format code as string
-    body = format_indented_lines(parts.cs_format(ir.precision), 1)
+    # Format code when it is written
+    body = FormattedLines(parts, ir.precision, 1)
 
     # Generate generic ffcx code snippets and add specific parts
     code = {}
@@ -76,27 +89,175 @@ def generator(ir, parameters):
     # Format tabulate tensor body
     tabulate_tensor_declaration = ufc_integrals.tabulate_implementation[
         integral_type]
-    tabulate_tensor_fn = tabulate_tensor_declaration.format(
-        factory_name=factory_name, tabulate_tensor=code["tabulate_tensor"])
+    tabulate_tensor_fn = format_template(
+        tabulate_tensor_declaration, factory_name=factory_name, tabulate_tensor=code["tabulate_tensor"])
+
+    # Generate batched kernel
+    batch_size = parameters["batch_size"]
+    if batch_size > 0 and integral_type != "custom":
+        ig = IntegralGenerator(ir, FFCXBackend(ir, parameters))
+        parts = ig.generate(batch_size=batch_size)
+        kernels["tabulate_tensor_batch"] = parts
+        body = FormattedLines(parts, ir.precision, 1)
+        if parameters["tabulate_tensor_void"]:
+            body = ""
+        entity_local_index = {"cell": "unused_local_index", "vertex": "vertex"}.get(integral_type, "facet")
+        tabulate_tensor_batch_fn = format_template(
+            ufc_integrals.tabulate_batch_implementation, factory_name=factory_name, tabulate_tensor=body,
+            entity_local_index=entity_local_index)
+        tabulate_tensor_batch_name = "tabulate_tensor_batch_" + factory_name
+    else:
+        batch_size = 0
+        tabulate_tensor_batch_fn = ""
+        tabulate_tensor_batch_name = "NULL"
+
+    # Generate action kernel
+    if parameters["tabulate_action"] and ir.rank == 2 and integral_type != "custom":
+        ig = IntegralGenerator(ir, FFCXBackend(ir, parameters))
+        parts = ig.generate(kernel="action")
+        kernels["tabulate_action"] = parts
+        body = FormattedLines(parts, ir.precision, 1)
+        if parameters["tabulate_tensor_void"]:
+            body = ""
+        entity_local_index = {"cell": "unused_local_index", "vertex": "vertex"}.get(integral_type, "facet")
+        tabulate_action_fn = format_template(
+            ufc_integrals.tabulate_action_implementation, factory_name=factory_name, tabulate_action=body,
+            entity_local_index=entity_local_index)
+        tabulate_action_name = "tabulate_action_" + factory_name
+    else:
+        tabulate_action_fn = ""
+        tabulate_action_name = "NULL"
+
+    # Generate diagonal kernel
+    if (parameters["tabulate_diagonal"] and ir.rank == 2 and ir.tensor_shape[0] == ir.tensor_shape[1]
+            and integral_type != "custom"):
+        ig = IntegralGenerator(ir, FFCXBackend(ir, parameters))
+        parts = ig.generate(kernel="diagonal")
+        kernels["tabulate_diagonal"] = parts
+        body = FormattedLines(parts, ir.precision, 1)
+        if parameters["tabulate_tensor_void"]:
+            body = ""
+        entity_local_index = {"cell": "unused_local_index", "vertex": "vertex"}.get(integral_type, "facet")
+        tabulate_diagonal_fn = format_template(
+            ufc_integrals.tabulate_diagonal_implementation, factory_name=factory_name, tabulate_diagonal=body,
+            entity_local_index=entity_local_index)
+        tabulate_diagonal_name = "tabulate_diagonal_" + factory_name
+    else:
+        tabulate_diagonal_fn = ""
+        tabulate_diagonal_name = "NULL"
+
+    # Ranges of the dofs of the nonzero blocks of the element tensor
+    if ir.rank > 0 and ir.nonzero_blocks:
+        L = backend.language
+        nonzero_blocks = L.ArrayDecl("static const int", "nonzero_blocks", (len(ir.nonzero_blocks), ir.rank, 2),
+                                     values=numpy.array(ir.nonzero_blocks, dtype=numpy.intc))
+        code["nonzero_blocks"] = textwrap.indent(format_indented_lines(nonzero_blocks.cs_format()), "  ") + "\n"
+        nonzero_blocks_name = "&nonzero_blocks[0][0][0]"
+    else:
+        code["nonzero_blocks"] = ""
+        nonzero_blocks_name = "NULL"
 
     # Format implementation code
 
     if integral_type == "custom":
-        implementation = ufc_integrals.custom_factory.format(
+        implementation = format_template(
+            ufc_integrals.custom_factory,
             factory_name=factory_name,
             enabled_coefficients=code["enabled_coefficients"],
             tabulate_tensor=tabulate_tensor_fn,
             needs_permutation_data=ir.needs_permutation_data)
     else:
-        implementation = ufc_integrals.factory.format(
+        implementation = format_template(
+            ufc_integrals.factory,
             factory_name=factory_name,
             enabled_coefficients=code["enabled_coefficients"],
             tabulate_tensor=tabulate_tensor_fn,
-            needs_permutation_data=ir.needs_permutation_data)
+            needs_permutation_data=ir.needs_permutation_data,
+            tabulate_tensor_batch=tabulate_tensor_batch_fn,
+            tabulate_tensor_batch_name=tabulate_tensor_batch_name,
+            batch_size=batch_size,
+            tabulate_action=tabulate_action_fn,
+            tabulate_action_name=tabulate_action_name,
+            tabulate_diagonal=tabulate_diagonal_fn,
+            tabulate_diagonal_name=tabulate_diagonal_name,
+            nonzero_blocks=code["nonzero_blocks"],
+            num_nonzero_blocks=len(ir.nonzero_blocks),
+            nonzero_blocks_name=nonzero_blocks_name,
+            sets_nonzero_blocks="true" if parameters["sparse_element_tensor"] else "false")
 
     return declaration, implementation
 
 
+def fused_generator(factory_name, irs, parameters):
+    """Generate code for a kernel tabulating several cell integrals of a form.
+
+    The body of each integral is generated as for tabulate_tensor and
+    placed in a scope, which is skipped if its element tensor is NULL.
+    Constant declarations at the top of the bodies which only depend
+    on other such declarations, e.g. tables and the piecewise constant
+    Jacobian, its determinant and inverse, are moved in front of the
+    scopes, and declarations with the same type and value are shared
+    by the integrals.
+    """
+    logger.info("Generating code for fused cell integrals:")
+    logger.info("--- name: {}".format(factory_name))
+
+    L = FFCXBackend(irs[0], parameters).language
+    element_tensors = L.Symbol("element_tensors")
+    A = L.Symbol("A")
+
+    shared_parts = []
+    shared_names = {}
+    scopes = []
+    for i, ir in enumerate(irs):
+        statements = _flatten_statements(L, [IntegralGenerator(ir, FFCXBackend(ir, parameters)).generate()])
+        statements = _remove_unused_declarations(L, _scalarize_arrays(L, statements))
+        declared = set()
+        _collect_symbols(L, statements, declared, set(), [])
+
+        renames = {}
+        local_parts = []
+        for s in statements:
+            used = set()
+            _collect_symbols(L, s, set(), used, [])
+            if (isinstance(s, (L.VariableDecl, L.ArrayDecl)) and "const" in s.typename.split()
+                    and (used & declared) <= set(renames)):
+                # Declarations are compared by their code with the
+                # renamed dependencies and without their own name
+                s = _rename_symbols(L, s, renames)
+                key = _rename_symbols(L, s, {s.symbol.name: ""}).cs_format(ir.precision)
+                name = shared_names.get(key)
+                if name is None:
+                    name = s.symbol.name
+                    if name in shared_names.values():
+                        name = _unique_name(name, declared | set(shared_names.values()), i)
+                    shared_names[key] = name
+                    shared_parts.append(format_indented_lines(
+                        _rename_symbols(L, s, {s.symbol.name: name}).cs_format(ir.precision), 1))
+                renames[s.symbol.name] = name
+            else:
+                local_parts.append(s)
+
+        # Local declarations must not hide shared declarations the
+        # integral refers to
+        for name in sorted(declared - set(renames)):
+            if name in shared_names.values():
+                renames[name] = _unique_name(name, declared | set(shared_names.values()), i)
+
+        body = [L.VariableDecl("ufc_scalar_t* restrict", A, element_tensors[i])]
+        body += [_rename_symbols(L, s, renames) for s in local_parts]
+        scopes.append(FormattedLines(L.If(element_tensors[i], body), ir.precision, 1))
+
+    if parameters["tabulate_tensor_void"]:
+        shared_parts, scopes = [], []
+
+    tabulate_cell_integrals = []
+    for part in shared_parts + scopes:
+        tabulate_cell_integrals += ["\n", part] if tabulate_cell_integrals else [part]
+    return format_template(ufc_integrals.tabulate_cell_integrals_implementation,
+                           factory_name=factory_name, tabulate_cell_integrals=tabulate_cell_integrals)
+
+
 class IntegralGenerator(object):
     def __init__(self, ir, backend):
         # Store ir
@@ -119,6 +280,15 @@ class IntegralGenerator(object):
         # Cache
         self.shared_symbols = {}
 
+        # Number of cells of the batched kernel being generated
+        self.batch_size = 0
+
+        # Kernel being generated, "tensor", "action" or "diagonal"
+        self.kernel = "tensor"
+
+        # Whether the vector type for simd_width values is used
+        self.uses_vector_type = False
+
         # Set of counters used for assigning names to intermediate variables
         self.symbol_counters = collections.defaultdict(int)
 
@@ -174,30 +344,38 @@ class IntegralGenerator(object):
             self.shared_symbols[key] = s
         return s, defined
 
-    def generate(self):
+    def generate(self, batch_size=0, kernel="tensor"):
         """Generate entire tabulate_tensor body.
 
         Assumes that the code returned from here will be wrapped in a context
         that matches a suitable version of the UFC tabulate_tensor signatures.
+
+        If batch_size is positive, the body of the batched kernel is
+        generated instead, see ufc_tabulate_tensor_batch. If kernel is
+        "action" or "diagonal", the body of the action kernel or of
+        the diagonal kernel of a bilinear form is generated instead,
+        see ufc_tabulate_action and ufc_integral.tabulate_diagonal.
         """
         L = self.backend.language
 
         # Assert that scopes are empty: expecting this to be called only once
         assert not any(d for d in self.scopes.values())
+        assert kernel == "tensor" or batch_size == 0, "Only element tensor kernels are batched"
+        self.batch_size = batch_size
+        self.kernel = kernel
 
         parts = []
 
         alignment = self.ir.params['assume_aligned']
         if alignment != -1:
-            parts += [L.VerbatimStatement("A = (ufc_scalar_t*)__builtin_assume_aligned(A, {});"
-                                          .format(alignment)),
-                      L.VerbatimStatement("w = (const ufc_scalar_t*)__builtin_assume_aligned(w, {});"
-                                          .format(alignment)),
-                      L.VerbatimStatement("c = (const ufc_scalar_t*)__builtin_assume_aligned(c, {});"
-                                          .format(alignment)),
-                      L.VerbatimStatement(
-                          "coordinate_dofs = (const double*)__builtin_assume_aligned(coordinate_dofs, {});"
-                          .format(alignment))]
+            if kernel == "action":
+                pointers = [("y", "ufc_scalar_t"), ("x", "const ufc_scalar_t")]
+            else:
+                pointers = [("A", "ufc_scalar_t")]
+            pointers += [("w", "const ufc_scalar_t"), ("c", "const ufc_scalar_t"), ("coordinate_dofs", "const double")]
+            parts += [L.VerbatimStatement("{0} = ({1}*)__builtin_assume_aligned({0}, {2});"
+                                          .format(name, typename, alignment))
+                      for name, typename in pointers]
 
         # Generate the tables of quadrature points and weights
         parts += self.generate_quadrature_tables()
@@ -209,22 +387,61 @@ class IntegralGenerator(object):
         # to define the quadloops, and to go after the quadloops
         all_preparts = []
         all_quadparts = []
+        all_postparts = []
 
         for rule in self.ir.integrand.keys():
             # Generate code to compute piecewise constant scalar factors
             all_preparts += self.generate_piecewise_partition(rule)
 
             # Generate code to integrate reusable blocks of final element tensor
-            preparts, quadparts = self.generate_quadrature_loop(rule)
+            preparts, quadparts, postparts = self.generate_quadrature_loop(rule)
             all_preparts += preparts
             all_quadparts += quadparts
+            all_postparts += postparts
+
+        if (self.ir.params["sparse_element_tensor"] and self.ir.integral_type not in ufl.custom_integral_types
+                and kernel == "tensor"):
+            # Callers do not zero the element tensor
+            parts += self.generate_nonzero_block_initialization()
 
         # Collect parts before, during, and after quadrature loops
         parts += all_preparts
         parts += all_quadparts
+        parts += all_postparts
+
+        if self.uses_vector_type:
+            scalar_type = self.ir.params["scalar_type"]
+            vector_bytes = _vector_value_sizes[scalar_type] * self.ir.params["simd_width"]
+            parts.insert(0, L.VerbatimStatement(
+                "typedef {} ufc_vec_t __attribute__((vector_size({})));".format(scalar_type, vector_bytes)))
+
+        if batch_size > 0:
+            symbols = self.backend.symbols
+            batcher = CellBatcher(L, batch_size, symbols.cell_batch_arrays(), symbols.cell_batch_scalars())
+            return batcher.generate(parts)
+
+        if kernel == "diagonal":
+            # Values only used by blocks off the diagonal are left out
+            parts = _remove_unused_declarations(L, parts)
 
         return L.StatementList(parts)
 
+    def generate_nonzero_block_initialization(self):
+        """Generate code setting the entries of the nonzero blocks of the element tensor to zero."""
+        L = self.backend.language
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+        if self.ir.rank == 0:
+            return [L.Assign(A[0], 0.0)] if self.ir.nonzero_blocks else []
+
+        indices = [self.backend.symbols.argument_loop_index(i) for i in range(self.ir.rank)]
+        parts = []
+        for block in self.ir.nonzero_blocks:
+            body = L.Assign(A[indices], 0.0)
+            for index, (begin, end) in reversed(list(zip(indices, block))):
+                body = L.ForRange(index, begin, end, body=body)
+            parts.append(body)
+        return L.commented_code_list(parts, "Set nonzero blocks of the element tensor to zero")
+
     def generate_quadrature_tables(self):
         """Generate static tables of quadrature points and weights."""
         L = self.backend.language
@@ -243,13 +460,20 @@ class IntegralGenerator(object):
         # Loop over quadrature rules
         for quadrature_rule, integrand in self.ir.integrand.items():
 
+            # Preintegrated blocks do not use the weights
+            blocks = [blockdata for contributions in integrand["block_contributions"].values()
+                      for blockdata in contributions]
+            if blocks and all(blockdata.block_mode == "preintegrated" for blockdata in blocks):
+                continue
+
             num_points = quadrature_rule.weights.shape[0]
             # Generate quadrature weights array
             wsym = self.backend.symbols.weights_table(quadrature_rule)
             parts += [
                 L.ArrayDecl(
-                    "static const double", wsym, num_points,
-                    quadrature_rule.weights, alignas=alignas, padlen=padlen)
+                    "static const " + self.backend.compute_type, wsym, num_points,
+                    quadrature_rule.weights, alignas=alignas, padlen=padlen,
+                    hexfloat=self.ir.params["hexfloat_tables"])
             ]
 
         # Add leading comment if there are any tables
@@ -283,6 +507,24 @@ class IntegralGenerator(object):
             "Precomputed values of basis functions and precomputations",
             "FE* dimensions: [permutation][entities][points][dofs]",
         ])
+
+        # Define 1D tables of sum factorized blocks
+        factor_tables = {}
+        for integrand in self.ir.integrand.values():
+            for contributions in integrand["block_contributions"].values():
+                for blockdata in contributions:
+                    if blockdata.is_sum_factorized:
+                        for mad in blockdata.ma_data:
+                            factors = mad.tabledata.tensor_factors
+                            factor_tables.update(zip(factors.names, factors.tables))
+        factor_parts = [L.ArrayDecl("static const " + self.backend.compute_type, name, factor_tables[name].shape,
+                                    factor_tables[name], alignas=alignas, padlen=padlen,
+                                    hexfloat=self.ir.params["hexfloat_tables"])
+                        for name in sorted(factor_tables)]
+        parts += L.commented_code_list(factor_parts, [
+            "Precomputed values of basis functions in each reference direction for sum factorization",
+            "FE*_L* dimensions: [points][dofs]",
+        ])
         return parts
 
     def get_entity_reflection_conditions(self, table, name):
@@ -326,7 +568,8 @@ class IntegralGenerator(object):
         # If the space has no vector-valued dofs, return the static table
         if not has_reflections and not has_rotations:
             return [L.ArrayDecl(
-                "static const double", name, table.shape, table, alignas=alignas, padlen=padlen)]
+                "static const " + self.backend.compute_type, name, table.shape, table, alignas=alignas,
+                padlen=padlen, hexfloat=self.ir.params["hexfloat_tables"])]
 
         dofmap = self.ir.table_dofmaps[name]
         index_names = ["ind_" + str(i) if j > 1 else 0 for i, j in enumerate(table.shape[:-1])]
@@ -345,7 +588,7 @@ class IntegralGenerator(object):
         # If the table has no rotations, then we are done
         if not has_rotations:
             return [L.ArrayDecl(
-                "const double", name, table.shape, table, alignas=alignas, padlen=padlen)]
+                "const " + self.backend.compute_type, name, table.shape, table, alignas=alignas, padlen=padlen)]
 
         # Apply reflections (for FaceTangent dofs)
         for entity, dofs in rot:
@@ -375,7 +618,7 @@ class IntegralGenerator(object):
         parts = []
         # Define the table; do not make it const, as it may be changed by rotations
         parts.append(L.ArrayDecl(
-            "double", name, table.shape, table, alignas=alignas, padlen=padlen))
+            self.backend.compute_type, name, table.shape, table, alignas=alignas, padlen=padlen))
 
         # Apply rotations (for FaceTangent dofs)
         t = self.backend.symbols.named_table(name)
@@ -397,14 +640,14 @@ class IntegralGenerator(object):
             indices0 = index_names + [dofmap.index(dofs[0])]
             indices1 = index_names + [dofmap.index(dofs[1])]
             body0 = [
-                L.VariableDecl("const double", temp0, t[indices0]),
-                L.VariableDecl("const double", temp1, t[indices1]),
+                L.VariableDecl("const " + self.backend.compute_type, temp0, t[indices0]),
+                L.VariableDecl("const " + self.backend.compute_type, temp1, t[indices1]),
                 L.Assign(t[indices0], -temp0 - temp1),
                 L.Assign(t[indices1], temp0)
             ]
             body1 = [
-                L.VariableDecl("const double", temp0, t[indices0]),
-                L.VariableDecl("const double", temp1, t[indices1]),
+                L.VariableDecl("const " + self.backend.compute_type, temp0, t[indices0]),
+                L.VariableDecl("const " + self.backend.compute_type, temp1, t[indices1]),
                 L.Assign(t[indices0], temp1),
                 L.Assign(t[indices1], -temp0 - temp1)
             ]
@@ -432,7 +675,7 @@ class IntegralGenerator(object):
 
         # Generate dofblock parts, some of this
         # will be placed before or after quadloop
-        preparts, quadparts = \
+        preparts, quadparts, postparts = \
             self.generate_dofblock_partition(quadrature_rule)
         body += quadparts
 
@@ -445,7 +688,7 @@ class IntegralGenerator(object):
             iq = self.backend.symbols.quadrature_loop_index()
             quadparts = [L.ForRange(iq, 0, num_points, body=body)]
 
-        return preparts, quadparts
+        return preparts, quadparts, postparts
 
     def generate_runtime_quadrature_loop(self):
         """Generate quadrature loop for custom integrals, with physical points given runtime."""
@@ -474,7 +717,7 @@ class IntegralGenerator(object):
 
         # Generate dofblock parts, some of this
         # will be placed before or after quadloop
-        preparts, quadparts = \
+        preparts, quadparts, postparts = \
             self.generate_dofblock_partition(num_points)
         body += quadparts
 
@@ -508,7 +751,7 @@ class IntegralGenerator(object):
                 cwsym = self.backend.symbols.custom_quadrature_weights()
                 wsym = self.backend.symbols.custom_weights_table()
                 rule_parts += [
-                    L.ArrayDecl("ufc_scalar_t", wsym, chunk_size, 0, alignas=alignas),
+                    L.ArrayDecl(self.backend.compute_type, wsym, chunk_size, 0, alignas=alignas),
                     L.ForRange(
                         iq,
                         0,
@@ -521,7 +764,7 @@ class IntegralGenerator(object):
                 cpsym = self.backend.symbols.custom_quadrature_points()
                 psym = self.backend.symbols.custom_points_table()
                 rule_parts += [
-                    L.ArrayDecl("ufc_scalar_t", psym, chunk_size * gdim, 0, alignas=alignas),
+                    L.ArrayDecl(self.backend.compute_type, psym, chunk_size * gdim, 0, alignas=alignas),
                     L.ForRange(
                         iq,
                         0,
@@ -546,7 +789,7 @@ class IntegralGenerator(object):
             for name in non_piecewise_tables:
                 table = tables[name]
                 decl = L.ArrayDecl(
-                    "ufc_scalar_t", name, (1, chunk_size, table.shape[2]), 0,
+                    self.backend.compute_type, name, (1, chunk_size, table.shape[2]), 0,
                     alignas=alignas)  # padlen=padlen)
                 table_parts += [decl]
 
@@ -554,7 +797,7 @@ class IntegralGenerator(object):
 
             # Gather all in chunk loop
             chunk_body = rule_parts + table_parts + [iq_body]
-            quadparts = [L.ForRange(iq_chunk, 0, num_point_blocks, body=chunk_body)]
+            quadparts = [L.ForRange(iq_chunk, 0, num_point_blocks, body=chunk_body)] + postparts
 
         return preparts, quadparts
 
@@ -651,7 +894,8 @@ class IntegralGenerator(object):
                             intermediates.append(L.Assign(vaccess, vexpr))
                         else:
                             vaccess = L.Symbol("%s_%d" % (symbol.name, j))
-                            intermediates.append(L.VariableDecl("const ufc_scalar_t", vaccess, vexpr))
+                            intermediates.append(
+                                L.VariableDecl("const " + self.backend.intermediate_type, vaccess, vexpr))
 
                 # Store access node for future reference
                 self.set_var(quadrature_rule, v, vaccess)
@@ -665,7 +909,8 @@ class IntegralGenerator(object):
             if use_symbol_array:
                 alignas = self.ir.params["alignas"]
                 padlen = self.ir.params["padlen"]
-                parts += [L.ArrayDecl("ufc_scalar_t", symbol, len(intermediates), alignas=alignas, padlen=padlen)]
+                parts += [L.ArrayDecl(self.backend.intermediate_type, symbol, len(intermediates), alignas=alignas,
+                                      padlen=padlen)]
             parts += intermediates
         return parts
 
@@ -673,6 +918,7 @@ class IntegralGenerator(object):
         block_contributions = self.ir.integrand[quadrature_rule]["block_contributions"]
         preparts = []
         quadparts = []
+        postparts = []
         blocks = [(blockmap, blockdata)
                   for blockmap, contributions in sorted(block_contributions.items())
                   for blockdata in contributions]
@@ -680,7 +926,7 @@ class IntegralGenerator(object):
         for blockmap, blockdata in blocks:
 
             # Define code for block depending on mode
-            block_preparts, block_quadparts = \
+            block_preparts, block_quadparts, block_postparts = \
                 self.generate_block_parts(quadrature_rule, blockmap, blockdata)
 
             # Add definitions
@@ -688,8 +934,9 @@ class IntegralGenerator(object):
 
             # Add computations
             quadparts.extend(block_quadparts)
+            postparts.extend(block_postparts)
 
-        return preparts, quadparts
+        return preparts, quadparts, postparts
 
     def get_entities(self, blockdata):
         L = self.backend.language
@@ -769,6 +1016,7 @@ class IntegralGenerator(object):
         # The parts to return
         preparts = []
         quadparts = []
+        postparts = []
 
         block_rank = len(blockmap)
         blockdims = tuple(len(dofmap) for dofmap in blockmap)
@@ -799,6 +1047,21 @@ class IntegralGenerator(object):
         v = F.nodes[factor_index]['expression']
         f = self.get_var(quadrature_rule, v)
 
+        if self.kernel == "diagonal" and not set(blockmap[0]) & set(blockmap[1]):
+            # The block has no entries on the diagonal
+            return preparts, quadparts, postparts
+
+        if blockdata.block_mode == "preintegrated":
+            # Scale block integrated at compile time by the piecewise
+            # constant factor after the quadrature loop
+            if self.kernel == "action":
+                postparts += self.generate_precomputed_action(blockmap, blockdata, f, preparts)
+            elif self.kernel == "diagonal":
+                postparts += self.generate_precomputed_diagonal(blockmap, blockdata, f, preparts)
+            else:
+                postparts += self.generate_precomputed_block(blockmap, blockdata, f)
+            return preparts, quadparts, postparts
+
         # Quadrature weight was removed in representation, add it back now
         if self.ir.integral_type in ufl.custom_integral_types:
             weights = self.backend.symbols.custom_weights_table()
@@ -818,7 +1081,50 @@ class IntegralGenerator(object):
             key = (quadrature_rule, factor_index, blockdata.all_factors_piecewise)
             fw, defined = self.get_temp_symbol("fw", key)
             if not defined:
-                quadparts.append(L.VariableDecl("const ufc_scalar_t", fw, fw_rhs))
+                quadparts.append(L.VariableDecl("const " + self.backend.intermediate_type, fw, fw_rhs))
+
+        if blockdata.block_mode == "premultiplied":
+            # Integrate the factor in the quadrature loop and scale
+            # block multiplied at compile time after it
+            key = (quadrature_rule, factor_index)
+            fi, defined = self.get_temp_symbol("fi", key)
+            if not defined:
+                preparts.append(L.VariableDecl("ufc_scalar_t", fi, 0.0))
+                quadparts.append(L.AssignAdd(fi, fw))
+            if self.kernel == "action":
+                postparts += self.generate_precomputed_action(blockmap, blockdata, fi, preparts)
+            elif self.kernel == "diagonal":
+                postparts += self.generate_precomputed_diagonal(blockmap, blockdata, fi, preparts)
+            else:
+                postparts += self.generate_precomputed_block(blockmap, blockdata, fi)
+            return preparts, quadparts, postparts
+
+        if blockdata.is_sum_factorized:
+            # Store fw in all quadrature points and contract with the 1D
+            # tables of the arguments after the quadrature loop
+            key = (quadrature_rule, factor_index, blockdata.all_factors_piecewise)
+            fw_values = self.store_fw_values("sf_fw", key, quadrature_rule, fw, preparts, quadparts)
+            if self.kernel == "action":
+                postparts += self.generate_sum_factorized_action(blockmap, blockdata, fw_values)
+            elif self.kernel == "diagonal":
+                postparts += self.generate_sum_factorized_diagonal(blockmap, blockdata, fw_values)
+            else:
+                postparts += self.generate_sum_factorization(blockmap, blockdata, fw_values)
+            return preparts, quadparts, postparts
+
+        if self.kernel == "action":
+            # Evaluate the vector in the quadrature point and integrate
+            # it against the test functions
+            action_parts = self.generate_action_block(quadrature_rule, blockmap, blockdata, fw)
+            preparts += action_parts[0]
+            quadparts += action_parts[1]
+            return preparts, quadparts, postparts
+        elif self.kernel == "diagonal":
+            # Accumulate only the entries of the block on the diagonal
+            diagonal_parts = self.generate_diagonal_block(quadrature_rule, blockmap, blockdata, fw)
+            preparts += diagonal_parts[0]
+            quadparts += diagonal_parts[1]
+            return preparts, quadparts, postparts
 
         # Naively accumulate integrand for this block in the innermost loop
         assert not blockdata.transposed
@@ -838,7 +1144,36 @@ class IntegralGenerator(object):
                 continue
             break
 
-        if expand_loop:
+        # Blocks accumulated after the quadrature loop need the number
+        # of points, which custom integrals only know at runtime
+        num_points = quadrature_rule.points.shape[0]
+        accumulate_after = block_rank == 2 and self.ir.integral_type not in ufl.custom_integral_types
+
+        block_gemm = self.ir.params["block_gemm"]
+        tile_size = self.ir.params["tile_size"]
+        if (accumulate_after and block_gemm != "none"
+                and blockdims[0] * blockdims[1] * num_points >= self.ir.params["gemm_threshold"]):
+            # Store scaled argument tables in all quadrature points and
+            # compute the block as their matrix product after the
+            # quadrature loop
+            gemm_parts = self.generate_gemm_block(quadrature_rule, blockmap, blockdata, fw, block_gemm)
+            preparts += gemm_parts[0]
+            quadparts += gemm_parts[1]
+            postparts += gemm_parts[2]
+        elif accumulate_after and tile_size > 0:
+            # Store fw in all quadrature points and accumulate tiles of
+            # the block over all points after the quadrature loop
+            key = (quadrature_rule, factor_index, blockdata.all_factors_piecewise)
+            fw_values = self.store_fw_values("tile_fw", key, quadrature_rule, fw, preparts, quadparts)
+            postparts += self.generate_tiled_block(quadrature_rule, blockmap, blockdata, fw_values, tile_size,
+                                                   preparts)
+        elif self.is_vectorizable(blockmap, blockdata):
+            # Accumulate the innermost dofs of the block in vectors
+            vector_parts = self.generate_vectorized_block(quadrature_rule, blockmap, blockdata, fw)
+            preparts += vector_parts[0]
+            quadparts += vector_parts[1]
+            postparts += vector_parts[2]
+        elif expand_loop:
             # If DOFs in dofrange are not equally spaced, then expand out the for loop
             for A_indices, B_indices in zip(itertools.product(*blockmap),
                                             itertools.product(*[range(len(b)) for b in blockmap])):
@@ -873,4 +1208,736 @@ class IntegralGenerator(object):
                 body = L.ForRange(B_indices[i], 0, blockdims[i], body=body)
             quadparts += [body]
 
+        return preparts, quadparts, postparts
+
+    def generate_action_block(self, quadrature_rule, blockmap, blockdata, fw):
+        """Generate code adding the action of a rank 2 block on the vector in a quadrature point.
+
+        The trial function with the entries of the vector as dofs is
+        evaluated in the quadrature point, once for all blocks with the
+        same trial function table, and its product with fw is
+        integrated against the test functions. Returns parts before and
+        inside the quadrature loop.
+        """
+        L = self.backend.language
+        y = self.backend.symbols.action_result()
+        x = self.backend.symbols.action_vector()
+        iq = self.backend.symbols.quadrature_loop_index()
+        i, j = (self.backend.symbols.argument_loop_index(k) for k in range(2))
+        m, n = (len(bm) for bm in blockmap)
+
+        preparts = []
+        quadparts = []
+        dof_maps = self.get_block_dof_maps(blockmap, preparts)
+        test_factor, trial_factor = self.get_arg_factors(blockdata, 2, quadrature_rule, iq, (i, j))
+
+        trial_value = L.float_product([trial_factor, x[dof_maps[1](j)]])
+        xq, defined = self.get_temp_symbol("xq", (quadrature_rule, L.as_cexpr(trial_value).ce_format()))
+        if not defined:
+            quadparts += [L.VariableDecl("ufc_scalar_t", xq, 0.0),
+                          L.ForRange(j, 0, n, body=L.AssignAdd(xq, trial_value))]
+        quadparts.append(L.ForRange(i, 0, m, body=L.AssignAdd(y[dof_maps[0](i)],
+                                                              L.float_product([fw, xq, test_factor]))))
         return preparts, quadparts
+
+    def get_block_diagonal(self, blockmap):
+        """Return the positions in the block of the dofs of both arguments on the diagonal, and the dofs."""
+        dofs = tuple(sorted(set(blockmap[0]) & set(blockmap[1])))
+        return (tuple(blockmap[0].index(dof) for dof in dofs), tuple(blockmap[1].index(dof) for dof in dofs), dofs)
+
+    def generate_diagonal_block(self, quadrature_rule, blockmap, blockdata, fw):
+        """Generate code accumulating the entries of a rank 2 block on the diagonal in a quadrature point.
+
+        Returns parts before and inside the quadrature loop.
+        """
+        L = self.backend.language
+        A = self.backend.symbols.element_tensor()
+        iq = self.backend.symbols.quadrature_loop_index()
+        k = self.backend.symbols.argument_loop_index(0)
+
+        preparts = []
+        diagonal = self.get_block_diagonal(blockmap)
+        test_position, trial_position, dof = self.get_block_dof_maps(diagonal, preparts)
+        arg_factors = self.get_arg_factors(blockdata, 2, quadrature_rule, iq, (test_position(k), trial_position(k)))
+        body = L.AssignAdd(A[dof(k)], L.float_product([fw] + arg_factors))
+        return preparts, [L.ForRange(k, 0, len(diagonal[2]), body=body)]
+
+    def is_vectorizable(self, blockmap, blockdata):
+        """Check if a block can be accumulated with vectors of simd_width values."""
+        width = self.ir.params["simd_width"]
+        if (width == 0 or self.batch_size > 0 or self.ir.params["scalar_type"] not in _vector_value_sizes
+                or self.backend.compute_type != self.ir.params["scalar_type"]):
+            # Batched kernels are vectorized over cells instead, and
+            # vector extensions have no complex or mixed types
+            return False
+        return (len(blockmap[-1]) >= width
+                and blockdata.ma_data[-1].tabledata.ttype not in ("ones", "quadrature"))
+
+    def generate_vectorized_block(self, quadrature_rule, blockmap, blockdata, fw):
+        """Generate code accumulating a block with GCC vector extensions.
+
+        The block is accumulated over all quadrature points in a local
+        array, whose rows are padded to a multiple of simd_width values
+        and aligned, such that the dofs of the innermost argument are
+        updated in whole vectors. The table rows are read with
+        unaligned vector loads. When they are not padded to a multiple
+        of the vector width by padlen, the last vector of a row is
+        filled lane by lane. The local array is added to the element
+        tensor after the quadrature loop. Returns parts before, inside
+        and after the quadrature loop.
+        """
+        L = self.backend.language
+        width = self.ir.params["simd_width"]
+        vector_bytes = _vector_value_sizes[self.ir.params["scalar_type"]] * width
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+        iq = self.backend.symbols.quadrature_loop_index()
+        block_rank = len(blockmap)
+        indices = [self.backend.symbols.argument_loop_index(i) for i in range(block_rank)]
+        vector_index = L.Symbol(indices[-1].name + "v")
+        lane = L.Symbol("lane")
+        A_vec = L.Symbol("A_vec")
+        B_vec = L.Symbol("B_vec")
+        self.uses_vector_type = True
+
+        blockdims = [len(bm) for bm in blockmap]
+        num_vectors = -(-blockdims[-1] // width)
+        row_size = width * num_vectors
+        A_block = self.new_temp_symbol("A_block")
+        A_block_shape = blockdims[:-1] + [row_size]
+        A_block_flat = L.FlattenedArray(A_block, dims=A_block_shape)
+
+        arg_factors = self.get_arg_factors(blockdata, block_rank, quadrature_rule, iq,
+                                           indices[:-1] + [width * vector_index])
+        A_block_vector = L.AddressOf(A_block_flat[indices[:-1] + [width * vector_index]])
+
+        def update_vectors(begin, end, table_values):
+            return L.ForRange(vector_index, begin, end, body=table_values + [
+                L.VariableDecl("ufc_vec_t", A_vec),
+                L.Call("memcpy", [L.AddressOf(A_vec), A_block_vector, vector_bytes]),
+                L.AssignAdd(A_vec, L.float_product([fw] + arg_factors[:-1] + [B_vec])),
+                L.Call("memcpy", [A_block_vector, L.AddressOf(A_vec), vector_bytes])])
+
+        full_vectors = num_vectors
+        padlen = self.ir.params["padlen"]
+        if blockdims[-1] % width > 0 and not (padlen > 0 and padlen % width == 0):
+            # The table rows end within the last vector, which is
+            # filled lane by lane. Otherwise they are zero padded,
+            # padlen=0 meaning no padding.
+            full_vectors -= 1
+        quadrature_body = []
+        if full_vectors > 0:
+            quadrature_body.append(update_vectors(0, full_vectors, [
+                L.VariableDecl("ufc_vec_t", B_vec),
+                L.Call("memcpy", [L.AddressOf(B_vec), L.AddressOf(arg_factors[-1]), vector_bytes])]))
+        if full_vectors < num_vectors:
+            lane_factors = self.get_arg_factors(blockdata, block_rank, quadrature_rule, iq,
+                                                indices[:-1] + [width * full_vectors + lane])
+            quadrature_body.append(update_vectors(full_vectors, num_vectors, [
+                L.VariableDecl("ufc_vec_t", B_vec),
+                L.Call("memset", [L.AddressOf(B_vec), 0, vector_bytes]),
+                L.ForRange(lane, 0, blockdims[-1] % width, body=L.Assign(B_vec[lane], lane_factors[-1]))]))
+        for i in reversed(range(block_rank - 1)):
+            quadrature_body = [L.ForRange(indices[i], 0, blockdims[i], body=quadrature_body)]
+
+        alignas = max(vector_bytes, self.ir.params["alignas"])
+        preparts = [L.ArrayDecl("ufc_scalar_t", A_block, int(numpy.prod(A_block_shape)), values=0, alignas=alignas)]
+
+        dof_maps = self.get_block_dof_maps(blockmap, preparts)
+        postparts = L.AssignAdd(A[[dof_map(index) for dof_map, index in zip(dof_maps, indices)]],
+                                A_block_flat[indices])
+        for i in reversed(range(block_rank)):
+            postparts = L.ForRange(indices[i], 0, blockdims[i], body=postparts)
+
+        return preparts, quadrature_body, [postparts]
+
+    def store_fw_values(self, basename, key, quadrature_rule, fw, preparts, quadparts):
+        """Return array of the values of fw in all quadrature points, adding the code filling it."""
+        L = self.backend.language
+        fw_values, defined = self.get_temp_symbol(basename, key)
+        if not defined:
+            num_points = quadrature_rule.points.shape[0]
+            iq = self.backend.symbols.quadrature_loop_index()
+            preparts.append(L.ArrayDecl(self.backend.intermediate_type, fw_values, num_points,
+                                        alignas=self.ir.params["alignas"]))
+            quadparts.append(L.Assign(fw_values[iq], fw))
+        return fw_values
+
+    def generate_tiled_block(self, quadrature_rule, blockmap, blockdata, fw_values, tile_size, preparts):
+        """Generate code accumulating a rank 2 block tile by tile from values of fw in all quadrature points.
+
+        Each tile of the block is accumulated over all quadrature
+        points in a local array, and added to the element tensor once.
+        The products of fw and the test function values in a tile are
+        computed once per quadrature point. Tiles of dofs which are not
+        equally spaced are added through a table of the dofs.
+        """
+        L = self.backend.language
+        alignas = self.ir.params["alignas"]
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+        iq = self.backend.symbols.quadrature_loop_index()
+        i, j = (self.backend.symbols.argument_loop_index(k) for k in range(2))
+        A_tile = L.Symbol("A_tile")
+        fw_tile = L.Symbol("fw_tile")
+        num_points = quadrature_rule.points.shape[0]
+
+        # Ranges of the tiles along each argument, full tiles are
+        # looped over and the remaining dofs form a smaller tile
+        tile_ranges = []
+        for index, bm in zip((i, j), blockmap):
+            tile_index = L.Symbol("t" + index.name)
+            num_tiles, remainder = divmod(len(bm), tile_size)
+            ranges = []
+            if num_tiles == 1:
+                ranges.append((0, tile_size, None))
+            elif num_tiles > 1:
+                ranges.append((tile_size * tile_index, tile_size, (tile_index, num_tiles)))
+            if remainder > 0:
+                ranges.append((num_tiles * tile_size, remainder, None))
+            tile_ranges.append(ranges)
+
+        dof_maps = self.get_block_dof_maps(blockmap, preparts)
+
+        parts = []
+        for (begin_i, size_i, loop_i), (begin_j, size_j, loop_j) in itertools.product(*tile_ranges):
+            arg_factors = self.get_arg_factors(blockdata, 2, quadrature_rule, iq, (begin_i + i, begin_j + j))
+            A_indices = [dof_map(begin + index) for dof_map, begin, index in zip(dof_maps, (begin_i, begin_j), (i, j))]
+
+            quadrature_body = [
+                L.ArrayDecl(self.backend.intermediate_type, fw_tile, size_i, alignas=alignas),
+                L.ForRange(i, 0, size_i, body=L.Assign(fw_tile[i], L.float_product([fw_values[iq], arg_factors[0]]))),
+                L.ForRange(i, 0, size_i, body=L.ForRange(
+                    j, 0, size_j, body=L.AssignAdd(A_tile[size_j * i + j],
+                                                   L.float_product([fw_tile[i], arg_factors[1]]))))]
+            body = [
+                L.ArrayDecl("ufc_scalar_t", A_tile, size_i * size_j, values=0, alignas=alignas),
+                L.ForRange(iq, 0, num_points, body=quadrature_body),
+                L.ForRange(i, 0, size_i, body=L.ForRange(
+                    j, 0, size_j, body=L.AssignAdd(A[A_indices], A_tile[size_j * i + j])))]
+
+            for loop in (loop_j, loop_i):
+                if loop is not None:
+                    body = L.ForRange(loop[0], 0, loop[1], body=body)
+            if loop_i is None and loop_j is None:
+                body = L.Scope(body)
+            parts.append(body)
+
+        return parts
+
+    def generate_gemm_block(self, quadrature_rule, blockmap, blockdata, fw, block_gemm):
+        """Generate code computing a rank 2 block as a matrix product of scaled argument tables.
+
+        The block is A_ij = sum_q fw_q B_qi C_qj. The tables fw_q B_qi
+        and C_qj are stored in all quadrature points in the quadrature
+        loop, and multiplied after it, either in generated loops or by
+        a call to CBLAS. Returns parts before, inside and after the
+        quadrature loop.
+        """
+        L = self.backend.language
+        alignas = self.ir.params["alignas"]
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+        iq = self.backend.symbols.quadrature_loop_index()
+        i, j = (self.backend.symbols.argument_loop_index(k) for k in range(2))
+        num_points = quadrature_rule.points.shape[0]
+        m, n = (len(bm) for bm in blockmap)
+
+        # The batched kernel stores temporaries of all cells in a batch
+        # interleaved, which CBLAS can not multiply
+        scalar_type = self.ir.params["scalar_type"]
+        gemm_functions = {"double": "cblas_dgemm", "float": "cblas_sgemm"}
+        if block_gemm == "cblas" and (self.batch_size > 0 or scalar_type not in gemm_functions):
+            block_gemm = "loops"
+
+        # Tables are shared by all blocks with the same values
+        arg_factors = self.get_arg_factors(blockdata, 2, quadrature_rule, iq, (i, j))
+        preparts = []
+        quadparts = []
+        tables = []
+        for name, index, size, value in (("gemm_B", i, m, L.float_product([fw, arg_factors[0]])),
+                                         ("gemm_C", j, n, arg_factors[1])):
+            table, defined = self.get_temp_symbol(name, (quadrature_rule, size, L.as_cexpr(value).ce_format()))
+            if not defined:
+                preparts.append(L.ArrayDecl("ufc_scalar_t", table, num_points * size, alignas=alignas))
+                quadparts.append(L.ForRange(index, 0, size, body=L.Assign(table[size * iq + index], value)))
+            tables.append(table)
+        B, C = tables
+        A_block = self.new_temp_symbol("gemm_A")
+
+        if block_gemm == "cblas":
+            postparts = [L.ArrayDecl("ufc_scalar_t", A_block, m * n, alignas=alignas),
+                         L.Call(gemm_functions[scalar_type],
+                                [L.Symbol("CblasRowMajor"), L.Symbol("CblasTrans"), L.Symbol("CblasNoTrans"),
+                                 m, n, num_points, 1.0, B, m, C, n, 0.0, A_block, n])]
+        else:
+            postparts = [L.ArrayDecl("ufc_scalar_t", A_block, m * n, values=0, alignas=alignas),
+                         L.ForRange(i, 0, m, body=L.ForRange(iq, 0, num_points, body=L.ForRange(
+                             j, 0, n, body=L.AssignAdd(A_block[n * i + j], B[m * iq + i] * C[n * iq + j]))))]
+
+        dof_maps = self.get_block_dof_maps(blockmap, preparts)
+        postparts.append(L.ForRange(i, 0, m, body=L.ForRange(
+            j, 0, n, body=L.AssignAdd(A[dof_maps[0](i), dof_maps[1](j)], A_block[n * i + j]))))
+        return preparts, quadparts, [L.Scope(postparts)]
+
+    def get_block_dof_maps(self, blockmap, preparts):
+        """Return functions mapping the dofs of a block to the dofs of the element tensor.
+
+        Dofs which are not equally spaced are mapped through a static
+        table, which is declared in preparts.
+        """
+        L = self.backend.language
+        dof_maps = []
+        for bm in blockmap:
+            if len(bm) == 1:
+                dof_maps.append(lambda index, bm=bm: index + bm[0])
+            elif all(b - a == bm[1] - bm[0] for a, b in zip(bm[:-1], bm[1:])):
+                dof_maps.append(lambda index, bm=bm: (bm[1] - bm[0]) * index + bm[0])
+            else:
+                dofs, defined = self.get_temp_symbol("block_dofs", (bm, ))
+                if not defined:
+                    preparts.append(L.ArrayDecl("static const int", dofs, len(bm), values=bm))
+                dof_maps.append(lambda index, dofs=dofs: dofs[index])
+        return dof_maps
+
+    def generate_precomputed_block(self, blockmap, blockdata, factor):
+        """Generate code accumulating a block computed at compile time, scaled by a factor."""
+        L = self.backend.language
+        block_rank = len(blockmap)
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+        P = self.backend.symbols.named_table(blockdata.name)
+        entity, = self.get_entities(blockdata)
+        perm = self.get_permutations(blockdata)[0]
+
+        arg_indices = tuple(self.backend.symbols.argument_loop_index(i) for i in range(block_rank))
+        A_indices = []
+        for bm, index in zip(blockmap, arg_indices):
+            if len(bm) == 1:
+                A_indices.append(index + bm[0])
+            elif all(b - a == bm[1] - bm[0] for a, b in zip(bm[:-1], bm[1:])):
+                A_indices.append((bm[1] - bm[0]) * index + bm[0])
+            else:
+                # If DOFs in dofrange are not equally spaced, then expand out the for loop
+                return [L.AssignAdd(A[A_idx], L.float_product([factor, P[(perm, entity) + B_idx]]))
+                        for A_idx, B_idx in zip(itertools.product(*blockmap),
+                                                itertools.product(*[range(len(b)) for b in blockmap]))]
+
+        body = L.AssignAdd(A[A_indices], L.float_product([factor, P[(perm, entity) + arg_indices]]))
+        for i in reversed(range(block_rank)):
+            body = L.ForRange(arg_indices[i], 0, len(blockmap[i]), body=body)
+        return [body]
+
+    def generate_precomputed_action(self, blockmap, blockdata, factor, preparts):
+        """Generate code adding the action of a rank 2 block computed at compile time, scaled by a factor."""
+        L = self.backend.language
+        y = self.backend.symbols.action_result()
+        x = self.backend.symbols.action_vector()
+        P = self.backend.symbols.named_table(blockdata.name)
+        entity, = self.get_entities(blockdata)
+        perm = self.get_permutations(blockdata)[0]
+        i, j = (self.backend.symbols.argument_loop_index(k) for k in range(2))
+        m, n = (len(bm) for bm in blockmap)
+
+        dof_maps = self.get_block_dof_maps(blockmap, preparts)
+        value = L.float_product([factor, P[perm, entity, i, j], x[dof_maps[1](j)]])
+        return [L.ForRange(i, 0, m, body=L.ForRange(j, 0, n, body=L.AssignAdd(y[dof_maps[0](i)], value)))]
+
+    def generate_precomputed_diagonal(self, blockmap, blockdata, factor, preparts):
+        """Generate code accumulating the diagonal of a rank 2 block computed at compile time, scaled by a factor."""
+        L = self.backend.language
+        A = self.backend.symbols.element_tensor()
+        P = self.backend.symbols.named_table(blockdata.name)
+        entity, = self.get_entities(blockdata)
+        perm = self.get_permutations(blockdata)[0]
+        k = self.backend.symbols.argument_loop_index(0)
+
+        diagonal = self.get_block_diagonal(blockmap)
+        test_position, trial_position, dof = self.get_block_dof_maps(diagonal, preparts)
+        value = L.float_product([factor, P[perm, entity, test_position(k), trial_position(k)]])
+        return [L.ForRange(k, 0, len(diagonal[2]), body=L.AssignAdd(A[dof(k)], value))]
+
+    def get_sum_factorization_dofmaps(self, blockmap, factors, parts):
+        """Return tables mapping the 1D dof indices of each argument to the element tensor, declared in parts."""
+        L = self.backend.language
+        dofmaps = []
+        for i, tf in enumerate(factors):
+            dofs = numpy.array(blockmap[i])[tf.dofs]
+            dofmap, defined = self.get_temp_symbol("sf_dofs", tuple(dofs.flatten()) + dofs.shape)
+            if not defined:
+                parts.append(L.ArrayDecl("static const int", dofmap, dofs.shape, dofs))
+            dofmaps.append(dofmap)
+        return dofmaps
+
+    def generate_sum_factorization(self, blockmap, blockdata, fw_values):
+        """Generate code accumulating a block from values of fw in all quadrature points.
+
+        The quadrature points form a tensor product grid and the table
+        of each argument is a product of 1D tables. The sum over the
+        quadrature points is computed one reference direction at a
+        time, starting from the last. The intermediate result after
+        summing over direction d has dimensions
+        [iq0]...[iq(d-1)][i(d)][j(d)]...[i(tdim-1)][j(tdim-1)].
+        """
+        L = self.backend.language
+        alignas = self.ir.params["alignas"]
+        block_rank = len(blockmap)
+        factors = [mad.tabledata.tensor_factors for mad in blockdata.ma_data]
+        tdim = len(factors[0].names)
+
+        iq = self.backend.symbols.quadrature_loop_index()
+        q_indices = [L.Symbol("{}{}".format(iq.name, d)) for d in range(tdim)]
+        num_points = [factors[0].tables[d].shape[0] for d in range(tdim)]
+        arg_indices = [[L.Symbol("{}{}".format(self.backend.symbols.argument_loop_index(i).name, d))
+                        for d in range(tdim)] for i in range(block_rank)]
+        num_dofs = [[tf.tables[d].shape[1] for d in range(tdim)] for tf in factors]
+
+        parts = []
+        dofmaps = self.get_sum_factorization_dofmaps(blockmap, factors, parts)
+
+        A = L.FlattenedArray(self.backend.symbols.element_tensor(), dims=self.ir.tensor_shape)
+
+        scope = []
+        source = L.FlattenedArray(fw_values, dims=num_points)
+        rest_indices = []
+        rest_dims = []
+        for d in reversed(range(tdim)):
+            indices = [arg_indices[i][d] for i in range(block_rank)]
+            dims = [num_dofs[i][d] for i in range(block_rank)]
+            tables = [L.Symbol(tf.names[d])[q_indices[d], index] for tf, index in zip(factors, indices)]
+            value = L.float_product([source[q_indices[:d + 1] + rest_indices]] + tables)
+
+            rest_indices = indices + rest_indices
+            rest_dims = dims + rest_dims
+            if d > 0:
+                dims = num_points[:d] + rest_dims
+                target = L.FlattenedArray(self.new_temp_symbol("sf_t"), dims=dims)
+                scope.append(L.ArrayDecl("ufc_scalar_t", target.array, int(numpy.prod(dims)), values=0,
+                                         alignas=alignas))
+                body = L.AssignAdd(target[q_indices[:d] + rest_indices], value)
+                source = target
+            else:
+                A_indices = [dofmap[arg_indices[i]] for i, dofmap in enumerate(dofmaps)]
+                body = L.AssignAdd(A[A_indices], value)
+
+            loops = list(zip(q_indices[:d + 1], num_points[:d + 1])) + list(zip(rest_indices, rest_dims))
+            for index, n in reversed(loops):
+                body = L.ForRange(index, 0, n, body=body)
+            scope.append(body)
+
+        parts.append(L.Scope(scope))
+        return parts
+
+    def generate_sum_factorized_diagonal(self, blockmap, blockdata, fw_values):
+        """Generate code accumulating the diagonal of a rank 2 block from values of fw in all quadrature points.
+
+        The diagonal is a product of the diagonals of the 1D blocks,
+        and the sum over the quadrature points is computed one
+        reference direction at a time as in generate_sum_factorization,
+        with a single dof index per direction.
+        """
+        L = self.backend.language
+        alignas = self.ir.params["alignas"]
+        A = self.backend.symbols.element_tensor()
+        factors = [mad.tabledata.tensor_factors for mad in blockdata.ma_data]
+        tdim = len(factors[0].names)
+
+        iq = self.backend.symbols.quadrature_loop_index()
+        q_indices = [L.Symbol("{}{}".format(iq.name, d)) for d in range(tdim)]
+        num_points = [factors[0].tables[d].shape[0] for d in range(tdim)]
+        i_indices = [L.Symbol("{}{}".format(self.backend.symbols.argument_loop_index(0).name, d))
+                     for d in range(tdim)]
+        fw = L.FlattenedArray(fw_values, dims=num_points)
+
+        # Blocks with entries on the diagonal belong to a single subelement
+        assert blockmap[0] == blockmap[1], "Expecting the same dofs for both arguments"
+        num_dofs = [factors[0].tables[d].shape[1] for d in range(tdim)]
+
+        parts = []
+        dofmap, = self.get_sum_factorization_dofmaps(blockmap[:1], factors[:1], parts)
+
+        scope = []
+        source = fw
+        rest_indices = []
+        rest_dims = []
+        for d in reversed(range(tdim)):
+            tables = [L.Symbol(tf.names[d])[q_indices[d], i_indices[d]] for tf in factors]
+            value = L.float_product([source[q_indices[:d + 1] + rest_indices]] + tables)
+
+            rest_indices = [i_indices[d]] + rest_indices
+            rest_dims = [num_dofs[d]] + rest_dims
+            if d > 0:
+                dims = num_points[:d] + rest_dims
+                target = L.FlattenedArray(self.new_temp_symbol("sf_t"), dims=dims)
+                scope.append(L.ArrayDecl("ufc_scalar_t", target.array, int(numpy.prod(dims)), values=0,
+                                         alignas=alignas))
+                body = L.AssignAdd(target[q_indices[:d] + rest_indices], value)
+                source = target
+            else:
+                body = L.AssignAdd(A[dofmap[i_indices]], value)
+
+            loops = list(zip(q_indices[:d + 1], num_points[:d + 1])) + list(zip(rest_indices, rest_dims))
+            for index, n in reversed(loops):
+                body = L.ForRange(index, 0, n, body=body)
+            scope.append(body)
+
+        parts.append(L.Scope(scope))
+        return parts
+
+    def generate_sum_factorized_action(self, blockmap, blockdata, fw_values):
+        """Generate code adding the action of a rank 2 block from values of fw in all quadrature points.
+
+        The vector is evaluated in the quadrature points by summing
+        over the dofs of the trial function one reference direction at
+        a time, starting from the last, multiplied by fw, and integrated
+        against the test functions by summing over the quadrature
+        points in the same way. The intermediate results after summing
+        over direction d have dimensions
+        [j0]...[j(d-1)][iq(d)]...[iq(tdim-1)] and
+        [iq0]...[iq(d-1)][i(d)]...[i(tdim-1)].
+        """
+        L = self.backend.language
+        alignas = self.ir.params["alignas"]
+        y = self.backend.symbols.action_result()
+        x = self.backend.symbols.action_vector()
+        factors = [mad.tabledata.tensor_factors for mad in blockdata.ma_data]
+        tdim = len(factors[0].names)
+
+        iq = self.backend.symbols.quadrature_loop_index()
+        q_indices = [L.Symbol("{}{}".format(iq.name, d)) for d in range(tdim)]
+        num_points = [factors[0].tables[d].shape[0] for d in range(tdim)]
+        i_indices, j_indices = ([L.Symbol("{}{}".format(self.backend.symbols.argument_loop_index(k).name, d))
+                                 for d in range(tdim)] for k in range(2))
+        test_dofs, trial_dofs = ([tf.tables[d].shape[1] for d in range(tdim)] for tf in factors)
+
+        parts = []
+        test_dofmap, trial_dofmap = self.get_sum_factorization_dofmaps(blockmap, factors, parts)
+
+        def sum_over(index, size, table, value, target_indices, target_dims, target):
+            body = L.AssignAdd(target, L.float_product([table, value]))
+            for loop_index, n in reversed(list(zip(target_indices, target_dims)) + [(index, size)]):
+                body = L.ForRange(loop_index, 0, n, body=body)
+            return body
+
+        # Evaluate the vector in the quadrature points, once for all
+        # blocks with the same trial function
+        xq, defined = self.get_temp_symbol("sf_xq", (trial_dofmap.name, ) + factors[1].names)
+        if not defined:
+            value = x[trial_dofmap[j_indices]]
+            for d in reversed(range(tdim)):
+                indices = j_indices[:d] + q_indices[d:]
+                dims = trial_dofs[:d] + num_points[d:]
+                target = L.FlattenedArray(xq if d == 0 else self.new_temp_symbol("sf_x"), dims=dims)
+                parts.append(L.ArrayDecl("ufc_scalar_t", target.array, int(numpy.prod(dims)), values=0,
+                                         alignas=alignas))
+                table = L.Symbol(factors[1].names[d])[q_indices[d], j_indices[d]]
+                parts.append(sum_over(j_indices[d], trial_dofs[d], table, value, indices, dims, target[indices]))
+                value = target[indices]
+
+        # Integrate its product with fw against the test functions
+        scope = []
+        value = L.FlattenedArray(xq, dims=num_points)[q_indices]
+        value = L.float_product([L.FlattenedArray(fw_values, dims=num_points)[q_indices], value])
+        for d in reversed(range(tdim)):
+            indices = q_indices[:d] + i_indices[d:]
+            dims = num_points[:d] + test_dofs[d:]
+            if d > 0:
+                target = L.FlattenedArray(self.new_temp_symbol("sf_y"), dims=dims)
+                scope.append(L.ArrayDecl("ufc_scalar_t", target.array, int(numpy.prod(dims)), values=0,
+                                         alignas=alignas))
+                target = target[indices]
+            else:
+                target = y[test_dofmap[i_indices]]
+            table = L.Symbol(factors[0].names[d])[q_indices[d], i_indices[d]]
+            scope.append(sum_over(q_indices[d], num_points[d], table, value, indices, dims, target))
+            value = target
+
+        parts.append(L.Scope(scope))
+        return parts
+
+
+def _remove_unused_declarations(L, statements):
+    """Remove declarations of variables which are never read, and the statements assigning to them."""
+    statements = _flatten_statements(L, statements)
+    while True:
+        declared = set()
+        used = set()
+        verbatim = []
+        _collect_symbols(L, statements, declared, used, verbatim)
+        unused = {name for name in declared - used
+                  if not any(re.search(r"\b{}\b".format(name), code) for code in verbatim)}
+        if not unused:
+            return statements
+        statements = _prune_statements(L, statements, unused)
+
+
+def _flatten_statements(L, statements):
+    flat = []
+    for s in statements:
+        if isinstance(s, L.StatementList):
+            flat.extend(_flatten_statements(L, s.statements))
+        elif isinstance(s, (list, tuple)):
+            flat.extend(_flatten_statements(L, s))
+        else:
+            flat.append(L.as_cstatement(s))
+    return flat
+
+
+def _assignment_target(L, s):
+    """Return the name of the variable assigned to by a statement, or None."""
+    if isinstance(s, L.Statement) and isinstance(s.expr, L.AssignOp):
+        lhs = s.expr.lhs
+        if isinstance(lhs, L.ArrayAccess):
+            lhs = lhs.array
+        if isinstance(lhs, L.Symbol):
+            return lhs.name
+    return None
+
+
+def _collect_symbols(L, node, declared, used, verbatim):
+    """Collect the names of the variables declared and read in a statement or expression."""
+    if isinstance(node, (list, tuple)):
+        for n in node:
+            _collect_symbols(L, n, declared, used, verbatim)
+    elif isinstance(node, numpy.ndarray):
+        if node.dtype == object:
+            _collect_symbols(L, list(node.flat), declared, used, verbatim)
+    elif isinstance(node, L.Symbol):
+        used.add(node.name)
+    elif isinstance(node, L.VerbatimStatement):
+        verbatim.append(node.codestring)
+    elif isinstance(node, L.VariableDecl):
+        declared.add(node.symbol.name)
+        _collect_symbols(L, node.value, declared, used, verbatim)
+    elif isinstance(node, L.ArrayDecl):
+        declared.add(node.symbol.name)
+        _collect_symbols(L, node.values, declared, used, verbatim)
+    elif isinstance(node, L.Statement) and _assignment_target(L, node) is not None:
+        # Writing to a variable is not a use of it
+        lhs = node.expr.lhs
+        if isinstance(lhs, L.ArrayAccess):
+            _collect_symbols(L, lhs.indices, declared, used, verbatim)
+        _collect_symbols(L, node.expr.rhs, declared, used, verbatim)
+    elif isinstance(node, L.CNode):
+        for cls in type(node).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                _collect_symbols(L, getattr(node, slot), declared, used, verbatim)
+
+
+def _prune_statements(L, statements, unused):
+    """Return the statements without the declarations of and assignments to unused variables."""
+    pruned = []
+    for s in _flatten_statements(L, statements):
+        if isinstance(s, (L.VariableDecl, L.ArrayDecl)):
+            if s.symbol.name not in unused:
+                pruned.append(s)
+        elif isinstance(s, L.Statement):
+            if _assignment_target(L, s) not in unused:
+                pruned.append(s)
+        elif isinstance(s, L.ForRange):
+            body = _prune_statements(L, [s.body], unused)
+            if body:
+                pruned.append(L.ForRange(s.index, s.begin, s.end, body=body, index_type=s.index_type))
+        elif isinstance(s, L.Scope):
+            body = _prune_statements(L, [s.body], unused)
+            if body:
+                pruned.append(L.Scope(body))
+        elif isinstance(s, L.If):
+            pruned.append(L.If(s.condition, _prune_statements(L, [s.body], unused)))
+        elif isinstance(s, L.ElseIf):
+            pruned.append(L.ElseIf(s.condition, _prune_statements(L, [s.body], unused)))
+        elif isinstance(s, L.Else):
+            pruned.append(L.Else(_prune_statements(L, [s.body], unused)))
+        else:
+            pruned.append(s)
+    return pruned
+
+
+def _unique_name(name, names, i):
+    """Return name with a suffix which is not in names."""
+    suffix = 0
+    while "{}_{}_{}".format(name, i, suffix) in names:
+        suffix += 1
+    return "{}_{}_{}".format(name, i, suffix)
+
+
+def _rename_symbols(L, node, renames):
+    """Return a copy of a statement or expression with renamed variables."""
+    def rename(n):
+        if isinstance(n, L.Symbol) and n.name in renames:
+            return L.Symbol(renames[n.name])
+        return None
+    return _substitute(L, node, rename)
+
+
+def _substitute(L, node, substitute):
+    """Return a copy of a statement or expression with the nodes for which substitute does not return None replaced."""
+    if isinstance(node, (list, tuple)):
+        return type(node)(_substitute(L, n, substitute) for n in node)
+    elif isinstance(node, numpy.ndarray) and node.dtype == object:
+        return numpy.array([_substitute(L, n, substitute) for n in node.flat], dtype=object).reshape(node.shape)
+    elif isinstance(node, L.CNode):
+        replacement = substitute(node)
+        if replacement is not None:
+            return replacement
+        copy = object.__new__(type(node))
+        for cls in type(node).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                object.__setattr__(copy, slot, _substitute(L, getattr(node, slot), substitute))
+        return copy
+    return node
+
+
+def _scalarize_arrays(L, statements):
+    """Replace local arrays which are only assigned to at the top level by a constant for each entry.
+
+    This lets values such as the determinant and inverse of a piecewise
+    constant Jacobian be compared and shared like other declarations.
+    """
+    arrays = {s.symbol.name: s for s in statements
+              if isinstance(s, L.ArrayDecl) and not {"const", "static"} & set(s.typename.split())
+              and len(s.sizes) == 1 and s.values is None}
+    invalid = set()
+    num_assignments = collections.Counter()
+
+    def check(n):
+        if isinstance(n, L.Statement) and _assignment_target(L, n) in arrays:
+            # Assigned to inside a loop or conditional
+            invalid.add(_assignment_target(L, n))
+        elif isinstance(n, L.ArrayAccess) and isinstance(n.array, L.Symbol) and n.array.name in arrays:
+            if len(n.indices) == 1 and isinstance(n.indices[0], L.LiteralInt):
+                return n
+            invalid.add(n.array.name)
+        elif isinstance(n, L.Symbol) and n.name in arrays:
+            invalid.add(n.name)
+        return None
+
+    for s in statements:
+        target = _assignment_target(L, s)
+        if isinstance(s, L.ArrayDecl) and s.symbol.name in arrays:
+            continue
+        elif target in arrays:
+            lhs = s.expr.lhs
+            if (isinstance(s.expr, L.Assign) and isinstance(lhs, L.ArrayAccess) and len(lhs.indices) == 1
+                    and isinstance(lhs.indices[0], L.LiteralInt)):
+                num_assignments[(target, lhs.indices[0].value)] += 1
+                _substitute(L, s.expr.rhs, check)
+            else:
+                invalid.add(target)
+        else:
+            _substitute(L, s, check)
+    invalid.update(name for (name, _), n in num_assignments.items() if n > 1)
+
+    def entry(n):
+        if isinstance(n, L.ArrayAccess) and isinstance(n.array, L.Symbol) and n.array.name in arrays:
+            return L.Symbol("{}_{}".format(n.array.name, n.indices[0].value))
+        return None
+
+    arrays = {name: decl for name, decl in arrays.items() if name not in invalid}
+    scalarized = []
+    for s in statements:
+        target = _assignment_target(L, s)
+        if isinstance(s, L.ArrayDecl) and s.symbol.name in arrays:
+            continue
+        elif target in arrays:
+            scalarized.append(L.VariableDecl("const " + arrays[target].typename, entry(s.expr.lhs),
+                                             _substitute(L, s.expr.rhs, entry)))
+        else:
+            scalarized.append(_substitute(L, s, entry))
+    return scalarized
@@ -80,10 +80,64 @@ void tabulate_tensor_{factory_name}(ufc_scalar_t* restrict A,
 """
 }
 
+tabulate_batch_implementation = """
+void tabulate_tensor_batch_{factory_name}(int num_cells,
+                                          ufc_scalar_t* restrict A,
+                                          const ufc_scalar_t* restrict w,
+                                          const ufc_scalar_t* restrict c,
+                                          const double* restrict coordinate_dofs,
+                                          const int* restrict {entity_local_index},
+                                          const uint8_t* restrict quadrature_permutation,
+                                          const uint32_t* restrict cell_permutation)
+{{
+{tabulate_tensor}
+}}
+"""
+
+tabulate_action_implementation = """
+void tabulate_action_{factory_name}(ufc_scalar_t* restrict y,
+                                    const ufc_scalar_t* restrict x,
+                                    const ufc_scalar_t* restrict w,
+                                    const ufc_scalar_t* restrict c,
+                                    const double* restrict coordinate_dofs,
+                                    const int* restrict {entity_local_index},
+                                    const uint8_t* restrict quadrature_permutation,
+                                    const uint32_t cell_permutation)
+{{
+{tabulate_action}
+}}
+"""
+
+tabulate_diagonal_implementation = """
+void tabulate_diagonal_{factory_name}(ufc_scalar_t* restrict A,
+                                      const ufc_scalar_t* restrict w,
+                                      const ufc_scalar_t* restrict c,
+                                      const double* restrict coordinate_dofs,
+                                      const int* restrict {entity_local_index},
+                                      const uint8_t* restrict quadrature_permutation,
+                                      const uint32_t cell_permutation)
+{{
+{tabulate_diagonal}
+}}
+"""
+
+tabulate_cell_integrals_implementation = """
+void tabulate_cell_integrals_{factory_name}(ufc_scalar_t* restrict* restrict element_tensors,
+                                            const ufc_scalar_t* restrict w,
+                                            const ufc_scalar_t* restrict c,
+                                            const double* restrict coordinate_dofs,
+                                            const int* restrict unused_local_index,
+                                            const uint8_t* restrict quadrature_permutation,
+                                            const uint32_t cell_permutation)
+{{
+{tabulate_cell_integrals}
+}}
+"""
+
 factory = """
 // Code for integral {factory_name}
 
-{tabulate_tensor}
+{tabulate_tensor}{tabulate_tensor_batch}{tabulate_action}{tabulate_diagonal}
 
 ufc_integral* create_{factory_name}(void)
 {{
@@ -92,6 +146,13 @@ ufc_integral* create_{factory_name}(void)
   integral->enabled_coefficients = enabled;
   integral->tabulate_tensor = tabulate_tensor_{factory_name};
   integral->needs_permutation_data = {needs_permutation_data};
+  integral->tabulate_tensor_batch = {tabulate_tensor_batch_name};
+  integral->batch_size = {batch_size};
+  integral->tabulate_action = {tabulate_action_name};
+  integral->tabulate_diagonal = {tabulate_diagonal_name};
+{nonzero_blocks}  integral->num_nonzero_blocks = {num_nonzero_blocks};
+  integral->nonzero_blocks = {nonzero_blocks_name};
+  integral->sets_nonzero_blocks = {sets_nonzero_blocks};
   return integral;
 }}
 
@@ -5,18 +5,28 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
 from contextlib import redirect_stdout
+import collections
+import hashlib
 import importlib
 import io
+import json
 import logging
 import os
 import re
+import shlex
+import shutil
+import socket
+import subprocess
+import sysconfig
 import tempfile
 import time
 from pathlib import Path
 
 import cffi
 import ffcx
+import ffcx.formatting
 import ffcx.naming
+from ffcx.codegeneration.C.format_lines import iter_code
 
 logger = logging.getLogger("ffcx")
 
@@ -39,6 +49,9 @@ UFC_FORM_DECL = '\n'.join(re.findall('typedef struct ufc_form.*?ufc_form;', ufc_
 
 UFC_INTEGRAL_DECL = '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor\).*?\);', ufc_h, re.DOTALL))
 UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_custom\).*?\);', ufc_h, re.DOTALL))
+UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_tensor_batch\).*?\);', ufc_h, re.DOTALL))
+UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_action\).*?\);', ufc_h, re.DOTALL))
+UFC_INTEGRAL_DECL += '\n'.join(re.findall(r'typedef void ?\(ufc_tabulate_cell_integrals\).*?\);', ufc_h, re.DOTALL))
 UFC_INTEGRAL_DECL += '\n'.join(re.findall('typedef struct ufc_integral.*?ufc_integral;',
                                           ufc_h, re.DOTALL))
 UFC_INTEGRAL_DECL += '\n'.join(re.findall('typedef struct ufc_custom_integral.*?ufc_custom_integral;',
@@ -46,46 +59,188 @@ UFC_INTEGRAL_DECL += '\n'.join(re.findall('typedef struct ufc_custom_integral.*?
 UFC_EXPRESSION_DECL = '\n'.join(re.findall('typedef struct ufc_expression.*?ufc_expression;', ufc_h, re.DOTALL))
 
 
+# Modules loaded in this process and the objects created from them, by
+# module name and cache directory
+_loaded_modules = {}
+
+# Module names of recently compiled lists of forms, by the ids of the
+# forms, to avoid recomputing signatures when the same forms are compiled
+# again. The forms are kept alive, such that their ids are not reused.
+_form_module_names = collections.OrderedDict()
+_form_module_names_maxsize = 128
+
+
 def _compute_parameter_signature(parameters):
     """Return parameters signature (some parameters should not affect signature)."""
-    return str(sorted(parameters.items()))
+    return str(sorted((k, v) for k, v in parameters.items() if k != "ir_cache_dir"))
+
+
+def _forms_module_name(forms, tag):
+    """Return the module name of a list of forms, reusing the name computed for the same form objects."""
+    key = (tuple(id(form) for form in forms), tag)
+    entry = _form_module_names.get(key)
+    if entry is not None and all(a is b for a, b in zip(entry[0], forms)):
+        _form_module_names.move_to_end(key)
+        return entry[1]
+
+    module_name = 'libffcx_forms_' + ffcx.naming.compute_signature(forms, tag)
+    _form_module_names[key] = (tuple(forms), module_name)
+    if len(_form_module_names) > _form_module_names_maxsize:
+        _form_module_names.popitem(last=False)
+    return module_name
 
 
 def get_cached_module(module_name, object_names, cache_dir, timeout):
-    """Look for an existing C file and wait for compilation, or if it does not exist, create it."""
+    """Load a module from the cache, waiting while another process compiles it.
+
+    Returns the objects and the module if found in the cache. Otherwise,
+    the lock of the module is acquired and None, None is returned. The
+    caller must then compile the module and release the lock with
+    _release_lock.
+
+    Compiled modules are moved into the cache directory with an atomic
+    rename, so a module found in the cache is always complete. The
+    process compiling a module holds an exclusive lock file, which
+    records its process id and host. Other processes wait for the
+    module with exponentially increasing polling intervals. A lock is
+    taken over if its process has died on the same host, or if it is
+    older than timeout seconds. Taking over a lock is atomic, so a
+    stale lock is removed by a single process, and a lock which has
+    been replaced in the meantime is left alone.
+    """
     cache_dir = Path(cache_dir)
-    c_filename = cache_dir.joinpath(module_name).with_suffix(".c")
-    ready_name = c_filename.with_suffix(".c.cached")
+    lock_name = cache_dir.joinpath(module_name).with_suffix(".lock")
 
     # Ensure cache dir exists
     cache_dir.mkdir(exist_ok=True, parents=True)
 
+    t0 = time.time()
+    delay = 0.01
+    while True:
+        if _find_module_spec(cache_dir, module_name) is not None:
+            return _load_objects(cache_dir, module_name, object_names)
+
+        if _acquire_lock(lock_name):
+            # The module may have been installed since it was looked for
+            if _find_module_spec(cache_dir, module_name) is not None:
+                _release_lock(cache_dir, module_name)
+                return _load_objects(cache_dir, module_name, object_names)
+            return None, None
+
+        stale = _stale_lock(lock_name, timeout)
+        if stale is not None:
+            if _take_over_lock(lock_name, stale):
+                logger.warning("Took over stale lock {}".format(lock_name))
+            continue
+
+        if time.time() - t0 > timeout:
+            raise TimeoutError("""JIT compilation timed out, waiting for lock {} held by another process.
+        Try cleaning cache (e.g. remove {}) or increase timeout parameter.""".format(lock_name, lock_name))
+
+        logger.info("Waiting for {} to be compiled.".format(module_name))
+        time.sleep(delay)
+        delay = min(2 * delay, 1.0)
+
+
+def _lock_info():
+    return {"pid": os.getpid(), "host": socket.gethostname()}
+
+
+def _acquire_lock(lock_name):
+    """Create the lock file, returns False if it exists."""
     try:
-        # Create C file with exclusive access
-        open(c_filename, "x")
-        return None, None
+        fd = os.open(lock_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
     except FileExistsError:
-        logger.info("Cached C file already exists: " + str(c_filename))
-        finder = importlib.machinery.FileFinder(
-            str(cache_dir), (importlib.machinery.ExtensionFileLoader, importlib.machinery.EXTENSION_SUFFIXES))
-        finder.invalidate_caches()
+        return False
+    with os.fdopen(fd, "w") as f:
+        json.dump(_lock_info(), f)
+    return True
+
+
+def _release_lock(cache_dir, module_name):
+    """Remove the lock file of a module, if held by this process."""
+    lock_name = Path(cache_dir).joinpath(module_name).with_suffix(".lock")
+    try:
+        with open(lock_name, "r") as f:
+            info = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return
+    if info == _lock_info():
+        os.remove(lock_name)
 
-        # Now, wait for ready
-        for i in range(timeout):
-            if os.path.exists(ready_name):
-                spec = finder.find_spec(module_name)
-                if spec is None:
-                    raise ModuleNotFoundError("Unable to find JIT module.")
-                compiled_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(compiled_module)
 
-                compiled_objects = [getattr(compiled_module.lib, "create_" + name)() for name in object_names]
-                return compiled_objects, compiled_module
+def _lock_signature(lock_name):
+    """Return the inode, modification time and contents identifying a lock file."""
+    st = os.stat(lock_name)
+    with open(lock_name, "rb") as f:
+        return (st.st_ino, st.st_mtime_ns, f.read())
 
-            logger.info("Waiting for {} to appear.".format(str(ready_name)))
-            time.sleep(1)
-        raise TimeoutError("""JIT compilation timed out, probably due to a failed previous compile.
-        Try cleaning cache (e.g. remove {}) or increase timeout parameter.""".format(c_filename))
+
+def _stale_lock(lock_name, timeout):
+    """Check if the process holding a lock has died, or the lock is older than timeout seconds on another host.
+
+    Returns the signature of the lock if it is stale, otherwise None.
+    """
+    try:
+        signature = _lock_signature(lock_name)
+    except FileNotFoundError:
+        # Released in the meantime
+        return None
+    age = time.time() - signature[1] * 1e-9
+    try:
+        info = json.loads(signature[2])
+    except ValueError:
+        # Lock information not yet written
+        info = None
+
+    if info is not None and info["host"] == socket.gethostname():
+        try:
+            os.kill(info["pid"], 0)
+        except ProcessLookupError:
+            return signature
+        except PermissionError:
+            pass
+        return None
+
+    # Processes on other hosts cannot be checked
+    return signature if age > timeout else None
+
+
+def _take_over_lock(lock_name, signature):
+    """Remove a stale lock, returns False if it has been replaced since it was found stale.
+
+    The lock is first renamed to a name unique to this process, so only
+    one of several processes taking over the same lock gets it. If the
+    renamed lock is not the stale lock, another process has taken over
+    the stale lock and acquired a new one in the meantime, and the new
+    lock is put back unless yet another lock has been created.
+    """
+    taken_name = lock_name.with_name("{}.{}.{}".format(lock_name.name, socket.gethostname(), os.getpid()))
+    try:
+        os.rename(lock_name, taken_name)
+    except FileNotFoundError:
+        return False
+    try:
+        if _lock_signature(taken_name) == signature:
+            return True
+        try:
+            os.link(taken_name, lock_name)
+        except FileExistsError:
+            pass
+        return False
+    finally:
+        os.remove(taken_name)
+
+
+def _find_module_spec(cache_dir, module_name):
+    # Create module finder that searches the compile path
+    finder = importlib.machinery.FileFinder(
+        str(cache_dir), (importlib.machinery.ExtensionFileLoader, importlib.machinery.EXTENSION_SUFFIXES))
+
+    # Find module. Clear search cache to be sure dynamically created
+    # (new) modules are found
+    finder.invalidate_caches()
+    return finder.find_spec(module_name)
 
 
 def compile_elements(elements, parameters=None, cache_dir=None, timeout=10, cffi_extra_compile_args=None,
@@ -99,6 +254,9 @@ def compile_elements(elements, parameters=None, cache_dir=None, timeout=10, cffi
     module_name = 'libffcx_elements_' + \
         ffcx.naming.compute_signature(elements, _compute_parameter_signature(p)
                                       + str(cffi_extra_compile_args) + str(cffi_debug))
+    registry_key = (module_name, None if cache_dir is None else os.path.abspath(cache_dir))
+    if registry_key in _loaded_modules:
+        return _loaded_modules[registry_key]
 
     names = []
     for e in elements:
@@ -113,6 +271,7 @@ def compile_elements(elements, parameters=None, cache_dir=None, timeout=10, cffi
         if obj is not None:
             # Pair up elements with dofmaps
             obj = list(zip(obj[::2], obj[1::2]))
+            _loaded_modules[registry_key] = (obj, mod)
             return obj, mod
     else:
         cache_dir = Path(tempfile.mkdtemp())
@@ -128,15 +287,14 @@ def compile_elements(elements, parameters=None, cache_dir=None, timeout=10, cffi
 
         _compile_objects(decl, elements, names, module_name, p, cache_dir,
                          cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
-    except Exception:
-        # remove c file so that it will not timeout next time
-        c_filename = cache_dir.joinpath(module_name + ".c")
-        os.replace(c_filename, c_filename.with_suffix(".c.failed"))
-        raise
+    finally:
+        # Let processes waiting for this module proceed
+        _release_lock(cache_dir, module_name)
 
     objects, module = _load_objects(cache_dir, module_name, names)
     # Pair up elements with dofmaps
     objects = list(zip(objects[::2], objects[1::2]))
+    _loaded_modules[registry_key] = (objects, module)
     return objects, module
 
 
@@ -148,9 +306,11 @@ def compile_forms(forms, parameters=None, cache_dir=None, timeout=10, cffi_extra
         p.update(parameters)
 
     # Get a signature for these forms
-    module_name = 'libffcx_forms_' + \
-        ffcx.naming.compute_signature(forms, _compute_parameter_signature(p)
-                                      + str(cffi_extra_compile_args) + str(cffi_debug))
+    module_name = _forms_module_name(forms, _compute_parameter_signature(p)
+                                     + str(cffi_extra_compile_args) + str(cffi_debug))
+    registry_key = (module_name, None if cache_dir is None else os.path.abspath(cache_dir))
+    if registry_key in _loaded_modules:
+        return _loaded_modules[registry_key]
 
     form_names = [ffcx.naming.form_name(form, i) for i, form in enumerate(forms)]
 
@@ -158,6 +318,7 @@ def compile_forms(forms, parameters=None, cache_dir=None, timeout=10, cffi_extra
         cache_dir = Path(cache_dir)
         obj, mod = get_cached_module(module_name, form_names, cache_dir, timeout)
         if obj is not None:
+            _loaded_modules[registry_key] = (obj, mod)
             return obj, mod
     else:
         cache_dir = Path(tempfile.mkdtemp())
@@ -173,13 +334,12 @@ def compile_forms(forms, parameters=None, cache_dir=None, timeout=10, cffi_extra
 
         _compile_objects(decl, forms, form_names, module_name, p, cache_dir,
                          cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
-    except Exception:
-        # remove c file so that it will not timeout next time
-        c_filename = cache_dir.joinpath(module_name + ".c")
-        os.replace(c_filename, c_filename.with_suffix(".c.failed"))
-        raise
+    finally:
+        # Let processes waiting for this module proceed
+        _release_lock(cache_dir, module_name)
 
     obj, module = _load_objects(cache_dir, module_name, form_names)
+    _loaded_modules[registry_key] = (obj, module)
     return obj, module
 
 
@@ -199,6 +359,9 @@ def compile_expressions(expressions, parameters=None, cache_dir=None, timeout=10
 
     # Get a signature for these forms
     module_name = 'libffcx_expressions_' + ffcx.naming.compute_signature(expressions, '', p)
+    registry_key = (module_name, None if cache_dir is None else os.path.abspath(cache_dir))
+    if registry_key in _loaded_modules:
+        return _loaded_modules[registry_key]
 
     expr_names = ["expression_{!s}".format(ffcx.naming.compute_signature([expression], "", p))
                   for expression in expressions]
@@ -207,6 +370,7 @@ def compile_expressions(expressions, parameters=None, cache_dir=None, timeout=10
         cache_dir = Path(cache_dir)
         obj, mod = get_cached_module(module_name, expr_names, cache_dir, timeout)
         if obj is not None:
+            _loaded_modules[registry_key] = (obj, mod)
             return obj, mod
     else:
         cache_dir = Path(tempfile.mkdtemp())
@@ -222,13 +386,12 @@ def compile_expressions(expressions, parameters=None, cache_dir=None, timeout=10
 
         _compile_objects(decl, expressions, expr_names, module_name, p, cache_dir,
                          cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
-    except Exception:
-        # remove c file so that it will not timeout next time
-        c_filename = cache_dir.joinpath(module_name + ".c")
-        os.replace(c_filename, c_filename.with_suffix(".c.failed"))
-        raise
+    finally:
+        # Let processes waiting for this module proceed
+        _release_lock(cache_dir, module_name)
 
     obj, module = _load_objects(cache_dir, module_name, expr_names)
+    _loaded_modules[registry_key] = (obj, module)
     return obj, module
 
 
@@ -243,6 +406,9 @@ def compile_coordinate_maps(meshes, parameters=None, cache_dir=None, timeout=10,
     module_name = 'libffcx_cmaps_' + \
         ffcx.naming.compute_signature(meshes, _compute_parameter_signature(
             p) + str(cffi_extra_compile_args) + str(cffi_debug), True)
+    registry_key = (module_name, None if cache_dir is None else os.path.abspath(cache_dir))
+    if registry_key in _loaded_modules:
+        return _loaded_modules[registry_key]
 
     cmap_names = [ffcx.naming.coordinate_map_name(
         mesh.ufl_coordinate_element(), "JIT") for mesh in meshes]
@@ -251,6 +417,7 @@ def compile_coordinate_maps(meshes, parameters=None, cache_dir=None, timeout=10,
         cache_dir = Path(cache_dir)
         obj, mod = get_cached_module(module_name, cmap_names, cache_dir, timeout)
         if obj is not None:
+            _loaded_modules[registry_key] = (obj, mod)
             return obj, mod
     else:
         cache_dir = Path(tempfile.mkdtemp())
@@ -265,13 +432,12 @@ def compile_coordinate_maps(meshes, parameters=None, cache_dir=None, timeout=10,
 
         _compile_objects(decl, meshes, cmap_names, module_name, p, cache_dir,
                          cffi_extra_compile_args, cffi_verbose, cffi_debug, cffi_libraries)
-    except Exception:
-        # remove c file so that it will not timeout next time
-        c_filename = cache_dir.joinpath(module_name + ".c")
-        os.replace(c_filename, c_filename.with_suffix(".c.failed"))
-        raise
+    finally:
+        # Let processes waiting for this module proceed
+        _release_lock(cache_dir, module_name)
 
     obj, module = _load_objects(cache_dir, module_name, cmap_names)
+    _loaded_modules[registry_key] = (obj, module)
     return obj, module
 
 
@@ -280,51 +446,125 @@ def _compile_objects(decl, ufl_objects, object_names, module_name, parameters, c
 
     import ffcx.compiler
 
-    _, code_body = ffcx.compiler.compile_ufl_objects(ufl_objects, prefix="JIT", parameters=parameters)
-
-    ffibuilder = cffi.FFI()
-    ffibuilder.set_source(module_name, code_body, include_dirs=[ffcx.codegeneration.get_include_path()],
-                          extra_compile_args=cffi_extra_compile_args, libraries=cffi_libraries)
-    ffibuilder.cdef(decl)
-
     c_filename = cache_dir.joinpath(module_name + ".c")
+    code_filename = cache_dir.joinpath(module_name + "_code.c")
     ready_name = c_filename.with_suffix(".c.cached")
 
-    # Compile (ensuring that compile dir exists)
+    # Compile in a private directory (ensuring that compile dir exists)
     cache_dir.mkdir(exist_ok=True, parents=True)
+    build_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix=module_name + ".build."))
 
-    logger.info(79 * "#")
-    logger.info("Calling JIT C compiler")
-    logger.info(79 * "#")
+    try:
+        # The code is written to a file as it is formatted, which is
+        # included by the source of the module. With a code cache, the
+        # integrals are compiled into object files of their own, which
+        # are reused when the same integral is part of another module.
+        integral_code = {} if parameters["code_cache_dir"] else None
+        extra_objects = []
+        with open(build_dir.joinpath(code_filename.name), "w") as file_c:
+            ffcx.compiler.compile_ufl_objects(ufl_objects, prefix="JIT", parameters=parameters,
+                                              integral_code=integral_code, files=(io.StringIO(), file_c))
+            for name, code in (integral_code or {}).items():
+                object_name = _compile_integral_object(name, code, parameters, cffi_extra_compile_args, cffi_debug)
+                if object_name is None:
+                    file_c.writelines(iter_code(code[1]))
+                else:
+                    extra_objects.append(str(object_name))
+
+        ffibuilder = cffi.FFI()
+        ffibuilder.set_source(module_name, '#include "{}"\n'.format(code_filename.name),
+                              include_dirs=[ffcx.codegeneration.get_include_path()],
+                              extra_compile_args=cffi_extra_compile_args, libraries=cffi_libraries,
+                              extra_objects=extra_objects)
+        ffibuilder.cdef(decl)
+
+        logger.info(79 * "#")
+        logger.info("Calling JIT C compiler")
+        logger.info(79 * "#")
+
+        t0 = time.time()
+        f = io.StringIO()
+        with redirect_stdout(f):
+            library = Path(ffibuilder.compile(tmpdir=build_dir, verbose=True, debug=cffi_debug))
+        s = f.getvalue()
+        if (cffi_verbose):
+            print(s)
+
+        logger.info("JIT C compiler finished in {:.4f}".format(time.time() - t0))
+
+        # Keep the C files and the verbose output of the build, and move the
+        # module into the cache with an atomic rename, so that other
+        # processes never load an incomplete module
+        os.replace(build_dir.joinpath(code_filename.name), code_filename)
+        os.replace(build_dir.joinpath(c_filename.name), c_filename)
+        with open(build_dir.joinpath(ready_name.name), "w") as fd:
+            fd.write(s)
+        os.replace(build_dir.joinpath(ready_name.name), ready_name)
+        os.replace(library, cache_dir.joinpath(library.name))
+    except Exception:
+        # Keep the C files for inspection
+        for filename in (c_filename, code_filename):
+            if build_dir.joinpath(filename.name).exists():
+                os.replace(build_dir.joinpath(filename.name), filename.with_suffix(".c.failed"))
+        raise
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
 
-    t0 = time.time()
-    f = io.StringIO()
-    with redirect_stdout(f):
-        ffibuilder.compile(tmpdir=cache_dir, verbose=True, debug=cffi_debug)
-    s = f.getvalue()
-    if (cffi_verbose):
-        print(s)
 
-    logger.info("JIT C compiler finished in {:.4f}".format(time.time() - t0))
+def _compile_integral_object(name, code, parameters, cffi_extra_compile_args, cffi_debug):
+    """Compile the code of an integral into an object file in the code cache, reusing a previously built one.
 
-    # Create a "status ready" file. If this fails, it is an error,
-    # because it should not exist yet.
-    # Copy the stdout verbose output of the build into the ready file
-    fd = open(ready_name, "x")
-    fd.write(s)
-    fd.close()
+    The C compiler is called directly, with the compiler and flags
+    Python was built with unless overridden by the CC and CFLAGS
+    environment variables. Returns the path of the object file, or None
+    if the compilation fails, in which case the code must be compiled as
+    part of the module.
+    """
+    # The code is determined by the name of the integral in the cache
+    signature = hashlib.sha1((str(cffi_extra_compile_args) + str(cffi_debug)).encode('utf-8')).hexdigest()
+    cache_dir = Path(parameters["code_cache_dir"])
+    object_name = cache_dir.joinpath("{}_{}.o".format(name, signature))
+    if object_name.exists():
+        logger.info("Reusing object file {}".format(object_name))
+        return object_name
 
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    build_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix=name + ".build."))
+    try:
+        c_filename = build_dir.joinpath(name + ".c")
+        with open(c_filename, "w") as f:
+            ffcx.formatting.stream_code([[code]], parameters, io.StringIO(), f)
+
+        # Compile with the compiler and flags Python was built with,
+        # as CFFI does for the module
+        cc = os.environ.get("CC") or sysconfig.get_config_var("CC") or "cc"
+        cflags = os.environ.get("CFLAGS", sysconfig.get_config_var("CFLAGS") or "")
+        cmd = shlex.split(cc) + shlex.split(cflags) + shlex.split(sysconfig.get_config_var("CCSHARED") or "")
+        if cffi_debug:
+            cmd.append("-g")
+        cmd += ["-I", ffcx.codegeneration.get_include_path(), "-c", str(c_filename),
+                "-o", str(build_dir.joinpath(name + ".o"))] + list(cffi_extra_compile_args or [])
+        logger.info("Compiling integral {}: {}".format(name, " ".join(cmd)))
+        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True)
+
+        # Move the object file into the cache with an atomic rename, so
+        # that other processes never link an incomplete file
+        os.replace(build_dir.joinpath(name + ".o"), object_name)
+        return object_name
+    except subprocess.CalledProcessError as e:
+        logger.warning("Failed to compile integral {} separately, compiling it with the module: {}\n{}".format(
+            name, e, e.stdout.decode(errors="replace")))
+        return None
+    except Exception as e:
+        logger.warning("Failed to compile integral {} separately, compiling it with the module: {}".format(name, e))
+        return None
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
 
-def _load_objects(cache_dir, module_name, object_names):
 
-    # Create module finder that searches the compile path
-    finder = importlib.machinery.FileFinder(
-        str(cache_dir), (importlib.machinery.ExtensionFileLoader, importlib.machinery.EXTENSION_SUFFIXES))
+def _load_objects(cache_dir, module_name, object_names):
 
-    # Find module. Clear search cache to be sure dynamically created
-    # (new) modules are found
-    finder.invalidate_caches()
-    spec = finder.find_spec(module_name)
+    spec = _find_module_spec(cache_dir, module_name)
     if spec is None:
         raise ModuleNotFoundError("Unable to find JIT module.")
 
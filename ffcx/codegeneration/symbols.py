@@ -72,21 +72,37 @@ class FFCXBackendSymbols(object):
         """Symbol for the element tensor itself."""
         return self.S("A")
 
+    def action_result(self):
+        """Symbol for the result of applying the element tensor to a vector."""
+        return self.S("y")
+
+    def action_vector(self):
+        """Symbol for the vector the element tensor is applied to."""
+        return self.S("x")
+
     def entity(self, entitytype, restriction):
         """Entity index for lookup in element tables."""
         if entitytype == "cell":
             # Always 0 for cells (even with restriction)
             return self.L.LiteralInt(0)
         elif entitytype == "facet":
-            postfix = "[0]"
             if restriction == "-":
-                postfix = "[1]"
-            return self.S("facet" + postfix)
+                return self.S("facet")[1]
+            return self.S("facet")[0]
         elif entitytype == "vertex":
-            return self.S("vertex[0]")
+            return self.S("vertex")[0]
         else:
             logging.exception("Unknown entitytype {}".format(entitytype))
 
+    def cell_batch_arrays(self):
+        """Names of kernel arguments holding per-cell arrays, passed in structure-of-arrays layout to batched
+        kernels."""
+        return ("A", "w", "coordinate_dofs", "facet", "vertex", "quadrature_permutation")
+
+    def cell_batch_scalars(self):
+        """Names of kernel arguments holding per-cell scalars, passed as arrays to batched kernels."""
+        return ("cell_permutation", )
+
     def argument_loop_index(self, iarg):
         """Loop index for argument #iarg."""
         indices = ["i", "j", "k", "l"]
@@ -298,6 +298,79 @@ extern "C"
       const uint8_t* restrict quadrature_permutation,
       const uint32_t cell_permutation);
 
+  /// Tabulate integral into tensors A for a batch of cells
+  ///
+  /// All per-cell data is stored in structure-of-arrays layout, i.e.
+  /// entry k of cell e is found at index k * num_cells + e. The
+  /// arguments are otherwise as for ufc_tabulate_tensor.
+  ///
+  /// @param[in] num_cells Number of cells. Need not be a multiple of
+  ///         the batch size of the integral.
+  /// @param[out] A Dimensions: A[entry][num_cells].
+  /// @param[in] w Dimensions: w[coefficient][restriction][dof][num_cells].
+  /// @param[in] c Constants, shared by all cells.
+  ///         Dimensions: c[constant][dim].
+  /// @param[in] coordinate_dofs
+  ///         Dimensions: coordinate_dofs[restriction][num_dofs][gdim][num_cells].
+  /// @param[in] entity_local_index
+  ///         Dimensions: entity_local_index[restriction][num_cells].
+  /// @param[in] quadrature_permutation
+  ///         Dimensions: quadrature_permutation[restriction][num_cells].
+  /// @param[in] cell_permutation Dimensions: cell_permutation[num_cells].
+  ///
+  /// @see ufc_tabulate_tensor
+  ///
+  typedef void(ufc_tabulate_tensor_batch)(
+      int num_cells, ufc_scalar_t* restrict A,
+      const ufc_scalar_t* restrict w, const ufc_scalar_t* restrict c,
+      const double* restrict coordinate_dofs,
+      const int* restrict entity_local_index,
+      const uint8_t* restrict quadrature_permutation,
+      const uint32_t* restrict cell_permutation);
+
+  /// Apply the element tensor of a bilinear form to a vector without
+  /// forming it, i.e. add A x to y where A is the element tensor
+  /// tabulated by ufc_tabulate_tensor. The vector x is evaluated in
+  /// the quadrature points, multiplied by the integrand, and
+  /// integrated against the test functions.
+  ///
+  /// @param[in,out] y Result, added to.
+  ///         Dimensions: y[restriction][num_dofs0].
+  /// @param[in] x Vector of the dofs of the trial function.
+  ///         Dimensions: x[restriction][num_dofs1].
+  ///
+  /// The other arguments are as for ufc_tabulate_tensor.
+  ///
+  /// @see ufc_tabulate_tensor
+  ///
+  typedef void(ufc_tabulate_action)(
+      ufc_scalar_t* restrict y, const ufc_scalar_t* restrict x,
+      const ufc_scalar_t* restrict w, const ufc_scalar_t* restrict c,
+      const double* restrict coordinate_dofs,
+      const int* restrict entity_local_index,
+      const uint8_t* restrict quadrature_permutation,
+      const uint32_t cell_permutation);
+
+  /// Tabulate the element tensors of several cell integrals of a form
+  /// on the same cell, computing the geometry shared by the integrals
+  /// only once.
+  ///
+  /// @param[out] element_tensors Element tensors of the integrals, in
+  ///         the order of the ids of ufc_form.get_cell_integral_ids.
+  ///         Integrals with a NULL element tensor are skipped.
+  ///
+  /// The other arguments are as for ufc_tabulate_tensor.
+  ///
+  /// @see ufc_tabulate_tensor
+  ///
+  typedef void(ufc_tabulate_cell_integrals)(
+      ufc_scalar_t* restrict* restrict element_tensors,
+      const ufc_scalar_t* restrict w, const ufc_scalar_t* restrict c,
+      const double* restrict coordinate_dofs,
+      const int* restrict entity_local_index,
+      const uint8_t* restrict quadrature_permutation,
+      const uint32_t cell_permutation);
+
   /// Tabulate integral into tensor A with runtime quadrature rule
   ///
   /// @see ufc_tabulate_tensor
@@ -314,6 +387,38 @@ extern "C"
     const bool* enabled_coefficients;
     ufc_tabulate_tensor* tabulate_tensor;
     bool needs_permutation_data;
+
+    /// Batched tabulation kernel, or NULL if not generated
+    ufc_tabulate_tensor_batch* tabulate_tensor_batch;
+
+    /// Number of cells processed together by tabulate_tensor_batch
+    int batch_size;
+
+    /// Action kernel of bilinear forms, or NULL if not generated
+    ufc_tabulate_action* tabulate_action;
+
+    /// Kernel adding the diagonal of the element tensor of bilinear
+    /// forms with equal test and trial spaces to A, with dimensions
+    /// A[num_dofs], without computing the entries off the diagonal.
+    /// NULL if not generated.
+    ufc_tabulate_tensor* tabulate_diagonal;
+
+    /// Number of blocks of the element tensor with nonzero entries
+    int num_nonzero_blocks;
+
+    /// Ranges of the dofs of the blocks of the element tensor with
+    /// nonzero entries, or NULL for functionals. The blocks are
+    /// products of the dofs of sub-elements of mixed arguments, and
+    /// hold all nonzero entries of the element tensor. Block b covers
+    /// the dofs d of argument k with
+    /// nonzero_blocks[b][k][0] <= d < nonzero_blocks[b][k][1].
+    /// Dimensions: nonzero_blocks[num_nonzero_blocks][rank][2].
+    const int* nonzero_blocks;
+
+    /// True if tabulate_tensor sets the entries of the nonzero blocks
+    /// of A instead of adding to them, such that A need not be zeroed.
+    /// Entries outside the nonzero blocks are then not written.
+    bool sets_nonzero_blocks;
   } ufc_integral;
 
   typedef struct ufc_custom_integral
@@ -345,6 +450,31 @@ extern "C"
                                 const ufc_scalar_t* restrict c,
                                 const double* restrict coordinate_dofs);
 
+    /// Evaluate expression into tensors A for a batch of cells, or
+    /// NULL if not generated
+    ///
+    /// All per-cell data is stored in structure-of-arrays layout, i.e.
+    /// entry k of cell e is found at index k * num_cells + e. The
+    /// arguments are otherwise as for tabulate_expression.
+    ///
+    /// @param[in] num_cells Number of cells. Need not be a multiple of
+    ///         batch_size.
+    /// @param[out] A Dimensions: A[entry][num_cells].
+    /// @param[in] w Dimensions: w[coefficient][dof][num_cells].
+    /// @param[in] c Constants, shared by all cells.
+    ///         Dimensions: c[constant][dim].
+    /// @param[in] coordinate_dofs
+    ///         Dimensions: coordinate_dofs[num_dofs][gdim][num_cells].
+    ///
+    void (*tabulate_expression_batch)(int num_cells,
+                                      ufc_scalar_t* restrict A,
+                                      const ufc_scalar_t* restrict w,
+                                      const ufc_scalar_t* restrict c,
+                                      const double* restrict coordinate_dofs);
+
+    /// Number of cells processed together by tabulate_expression_batch
+    int batch_size;
+
     /// Positions of coefficients in original expression
     const int* original_coefficient_positions;
 
@@ -496,6 +626,10 @@ extern "C"
     /// calling free().
     ufc_custom_integral* (*create_custom_integral)(int subdomain_id);
 
+    /// Kernel tabulating all cell integrals of the form at once, or
+    /// NULL if not generated
+    ufc_tabulate_cell_integrals* tabulate_cell_integrals;
+
   } ufc_form;
 
   // FIXME: Formalise a UFC 'function space'.
@@ -6,6 +6,33 @@
 
 # TODO: Move these to ffcx.language utils?
 
+# Real floating-point types of tables and intermediate values in kernels
+compute_types = ("float", "double", "long double")
+
+
+def kernel_types(parameters):
+    """Return the type of tables, the type of intermediate values and the math function type of kernels.
+
+    Element tensors are accumulated in the scalar type, while tables,
+    quadrature weights and geometry, and the intermediate values
+    computed from them, use the compute type. It defaults to the real
+    type of the scalar type. Intermediate values are complex when the
+    scalar type is, and are declared as ufc_scalar_t when the types
+    agree.
+    """
+    scalar_type = parameters.get("scalar_type", "double")
+    real_type = scalar_type.replace("complex", "").strip()
+    compute_type = parameters.get("compute_type") or real_type
+    if compute_type not in compute_types:
+        raise RuntimeError("Compute type must be one of {}, not '{}'.".format(compute_types, compute_type))
+
+    if compute_type == real_type:
+        return compute_type, "ufc_scalar_t", scalar_type
+    elif "complex" in scalar_type:
+        return compute_type, compute_type + " _Complex", compute_type + " complex"
+    else:
+        return compute_type, compute_type, compute_type
+
 
 def generate_return_new(L, classname):
     return L.Return(L.Call("create_" + classname))
@@ -61,60 +61,340 @@ Compiler stages:
    to the UFC format, generating as output one or more .h/.c files
    conforming to the UFC format.
 
+Stages 2 and 3 can be run in parallel for each group of integrals and
+for each form, see compile_ufl_objects. The code of integral groups is
+reused from previous runs if the code_cache_dir parameter is set, such
+that only the integrals changed by an edit of a form are generated
+again. The times of the stages and the
+estimated cost of the generated kernels can be reported, see
+ffcx.report.
+
 """
 
+import concurrent.futures
+import json
 import logging
+import multiprocessing
 import os
+import tempfile
 import typing
+from pathlib import Path
 from time import time
 
+from ffcx import fiatinterface, naming
 from ffcx.analysis import analyze_ufl_objects
 from ffcx.codegeneration.codegeneration import generate_code
-from ffcx.formatting import format_code
-from ffcx.ir.representation import compute_ir
+from ffcx.codegeneration.form import generator as form_generator
+from ffcx.codegeneration.integrals import generator as integral_generator
+from ffcx.codegeneration.C.format_lines import join_code
+from ffcx.formatting import format_code, format_library_index, stream_code
+from ffcx.ir.representation import (compute_form_ir, compute_integral_group_ir, compute_ir,
+                                    integral_group_name, integral_group_names)
+from ffcx.report import form_report, integral_report
 
 logger = logging.getLogger("ffcx")
 
+# Input of the worker processes, which inherit it when forked
+_worker_input = None
+
 
 def _print_timing(stage, timing):
     logger.info("Compiler stage {stage} finished in {time:.4f} seconds.".format(
         stage=stage, time=timing))
 
 
+def _print_cache_info():
+    for name, info in fiatinterface.cache_info().items():
+        logger.info("FIAT {name} cache: {hits} hits, {misses} misses, {size} of {maxsize} entries used.".format(
+            name=name, hits=info.hits, misses=info.misses, size=info.currsize, maxsize=info.maxsize))
+
+
 def compile_ufl_objects(ufl_objects: typing.Union[typing.List, typing.Tuple],
                         object_names: typing.Dict = {},
                         prefix: str = None,
                         parameters: typing.Dict = None,
-                        visualise: bool = False):
+                        visualise: bool = False,
+                        num_workers: int = 1,
+                        report: typing.Dict = None,
+                        integral_code: typing.Dict = None,
+                        files: typing.Tuple = None,
+                        extra_code: typing.Tuple = None):
     """Generate UFC code for a given UFL objects.
 
     Parameters
     ----------
     @param ufl_objects:
         Objects to be compiled. Accepts elements, forms, integrals or coordinate mappings.
+    @param num_workers:
+        Number of processes computing the intermediate representation and code of
+        the integral groups and forms in parallel. The generated code is the same for
+        any number of processes.
+    @param report:
+        Dictionary filled with the times of the compiler stages, forms and integrals,
+        and the sizes and estimated costs of the integrals, see ffcx.report. Times
+        of stages 2 and 3 are summed over the processes.
+    @param integral_code:
+        Dictionary filled with the declaration and implementation of each integral
+        group by name. The implementations are then left out of the returned source,
+        which declares them only, such that they can be compiled separately.
+    @param files:
+        Pair of header and source files opened for writing. If given, the code is
+        written to them as it is formatted, without building it as strings in memory,
+        and None, None is returned.
+    @param extra_code:
+        Pair of declarations and definitions written after the code of the objects,
+        such as the index of a library.
 
     """
     if prefix != os.path.basename(prefix):
         raise RuntimeError("Invalid prefix, looks like a full path? prefix='{}'.".format(prefix))
 
+    wall_time = time()
+    stage_times = {}
+
     # Stage 1: analysis
     cpu_time = time()
     analysis = analyze_ufl_objects(ufl_objects, parameters)
-    _print_timing(1, time() - cpu_time)
+    stage_times[1] = time() - cpu_time
+    _print_timing(1, stage_times[1])
 
-    # Stage 2: intermediate representation
+    if num_workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Parallel compilation requires forking processes, compiling serially.")
+        num_workers = 1
+    if visualise:
+        num_workers = 1
+
+    # Stage 2: intermediate representation of all objects except
+    # integrals and forms
     cpu_time = time()
-    ir = compute_ir(analysis, object_names, prefix, parameters, visualise)
-    _print_timing(2, time() - cpu_time)
+    ir = compute_ir(analysis._replace(form_data=()), object_names, prefix, parameters, visualise)
+    stage_times[2] = time() - cpu_time
 
-    # Stage 3: code generation
+    # Stage 3: code generation of all objects except integrals and forms
     cpu_time = time()
     code = generate_code(ir, parameters)
-    _print_timing(3, time() - cpu_time)
+    stage_times[3] = time() - cpu_time
+
+    # Stages 2 and 3: integrals and forms
+    integrals, forms = _generate_integral_and_form_code(analysis, object_names, prefix, parameters, visualise,
+                                                        num_workers, report is not None)
+    code = code._replace(integrals=[c for c, _, _, _ in integrals], forms=[c for c, _, _, _ in forms])
+    if integral_code is not None:
+        names = [name for form_index, fd in enumerate(analysis.form_data)
+                 for name in integral_group_names(fd, form_index, parameters)]
+        integral_code.update(zip(names, code.integrals))
+        code = code._replace(integrals=[(declaration, declaration) for declaration, _ in code.integrals])
+    stage_times[2] += sum(ir_time for _, ir_time, _, _ in integrals + forms)
+    stage_times[3] += sum(code_time for _, _, code_time, _ in integrals + forms)
+    _print_timing(2, stage_times[2])
+    _print_timing(3, stage_times[3])
+
+    _print_cache_info()
+
+    if extra_code is not None:
+        code = list(code) + [[extra_code]]
 
     # Stage 4: format code
     cpu_time = time()
-    code_h, code_c = format_code(code, parameters)
-    _print_timing(4, time() - cpu_time)
+    if files is None:
+        code_h, code_c = format_code(code, parameters)
+    else:
+        code_h, code_c = None, None
+        stream_code(code, parameters, *files)
+    stage_times[4] = time() - cpu_time
+    _print_timing(4, stage_times[4])
+
+    if report is not None:
+        report["time"] = {"analysis": stage_times[1], "representation": stage_times[2],
+                          "code_generation": stage_times[3], "formatting": stage_times[4],
+                          "total": time() - wall_time}
+        # Integral groups are ordered by form
+        report["forms"] = [r for _, _, _, r in forms]
+        integral_reports = iter(r for _, _, _, r in integrals)
+        for fd, r in zip(analysis.form_data, report["forms"]):
+            r["integrals"] = [next(integral_reports) for _ in fd.integral_data]
 
     return code_h, code_c
+
+
+def compile_ufl_library(ufl_files: typing.List,
+                        prefix: str,
+                        parameters: typing.Dict = None,
+                        num_workers: int = 1,
+                        report: typing.Dict = None,
+                        files: typing.Tuple = None):
+    """Generate UFC code for the objects of several UFL files, with an index of their factories.
+
+    Parameters
+    ----------
+    @param ufl_files:
+        List of pairs of the prefix and the loaded UFL file data of
+        each file. The forms of each file are compiled, or its
+        elements if it has no forms.
+    @param prefix:
+        Prefix of the names of the shared elements and of the index.
+    @param num_workers:
+        Number of processes computing the intermediate representation
+        and code of the integral groups and forms in parallel.
+    @param report:
+        Dictionary filled with the report of the compilation, see
+        compile_ufl_objects.
+    @param files:
+        Pair of header and source files the code is written to as it is
+        formatted, see compile_ufl_objects.
+
+    All objects are compiled together, so elements, dofmaps and
+    coordinate mappings used by several files are generated only once.
+    The form factories are named create_form_{prefix}_{file prefix}_{name}.
+    The index lists the factories of the forms, and of the elements and
+    dofmaps of files without forms, by "{file prefix}.{name}".
+
+    """
+    forms = []
+    elements = []
+    object_names = {}
+    form_index = []
+    element_index = []
+    for file_prefix, ufd in ufl_files:
+        object_names.update(ufd.object_names)
+        if len(ufd.forms) > 0:
+            for i, form in enumerate(ufd.forms):
+                name = "{}_{}".format(file_prefix, ufd.object_names.get(id(form), i))
+                object_names[id(form)] = name
+                forms.append(form)
+                form_index.append(("{}.{}".format(file_prefix, ufd.object_names.get(id(form), i)),
+                                   "create_form_{}_{}".format(prefix, name)))
+        else:
+            for i, element in enumerate(ufd.elements):
+                elements.append(element)
+                element_index.append(("{}.{}".format(file_prefix, ufd.object_names.get(id(element), i)),
+                                      "create_" + naming.finite_element_name(element, prefix),
+                                      "create_" + naming.dofmap_name(element, prefix)))
+
+    index_code = format_library_index(prefix, form_index, element_index)
+    return compile_ufl_objects(forms + elements, object_names, prefix=prefix, parameters=parameters,
+                               num_workers=num_workers, report=report, files=files, extra_code=index_code)
+
+
+def _generate_integral_and_form_code(analysis, object_names, prefix, parameters, visualise, num_workers,
+                                     report):
+    """Compute intermediate representation and generate code of all integral groups and forms.
+
+    Returns the code of the integrals and forms in the same order as
+    generate_code, with the times spent on the intermediate
+    representation and code generation of each, and their reports if
+    requested. The work is shared by num_workers processes.
+    """
+    global _worker_input
+
+    integral_groups = [(form_index, itg_data_index)
+                       for form_index, fd in enumerate(analysis.form_data)
+                       for itg_data_index in range(len(fd.integral_data))]
+    form_indices = range(len(analysis.form_data))
+
+    # The analysis is not sent to the worker processes, they access
+    # their copy of it inherited on forking
+    _worker_input = (analysis, object_names, prefix, parameters, visualise, report)
+    try:
+        if num_workers > 1:
+            context = multiprocessing.get_context("fork")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+                # Results are collected in the order of submission,
+                # independent of the order the workers finish in
+                integrals = executor.map(_generate_in_worker, [(_generate_integral_group_code, indices)
+                                                               for indices in integral_groups])
+                forms = executor.map(_generate_in_worker, [(_generate_form_code, form_index)
+                                                           for form_index in form_indices])
+                integrals, forms = list(integrals), list(forms)
+        else:
+            integrals = [_generate_integral_group_code(indices) for indices in integral_groups]
+            forms = [_generate_form_code(form_index) for form_index in form_indices]
+    finally:
+        _worker_input = None
+
+    return integrals, forms
+
+
+def _generate_in_worker(task):
+    """Run a task in a worker process, returning its code as strings, which are cheaper to send than syntax trees."""
+    generate, arguments = task
+    code, ir_time, code_time, report = generate(arguments)
+    return tuple(join_code(c) for c in code), ir_time, code_time, report
+
+
+def _generate_integral_group_code(indices):
+    analysis, object_names, prefix, parameters, visualise, report = _worker_input
+    form_index, itg_data_index = indices
+    cache_dir = parameters["code_cache_dir"]
+    if cache_dir and not (report or visualise):
+        # The report is computed from the intermediate representation
+        cpu_time = time()
+        name = integral_group_name(analysis.form_data[form_index], form_index, itg_data_index, parameters)
+        code = _load_integral_code(cache_dir, name)
+        if code is not None:
+            return code, 0.0, time() - cpu_time, None
+    cpu_time = time()
+    ir = compute_integral_group_ir(analysis, form_index, itg_data_index, prefix, parameters, visualise)
+    ir_time = time() - cpu_time
+    cpu_time = time()
+    kernels = {}
+    code = integral_generator(ir, parameters, kernels)
+    if cache_dir:
+        _store_integral_code(cache_dir, ir.name, code)
+    code_time = time() - cpu_time
+    if report:
+        report = integral_report(ir, kernels, ir_time, code_time)
+    return code, ir_time, code_time, report
+
+
+def _generate_form_code(form_index):
+    analysis, object_names, prefix, parameters, visualise, report = _worker_input
+    cpu_time = time()
+    ir = compute_form_ir(analysis, form_index, object_names, prefix, parameters)
+    cell_integrals = []
+    if parameters["fused_cell_integrals"]:
+        # The representation of the cell integrals is computed again
+        # for the kernel tabulating them at once
+        integral_data = analysis.form_data[form_index].integral_data
+        cell_integrals = [compute_integral_group_ir(analysis, form_index, i, prefix, parameters, False)
+                          for i, itg_data in enumerate(integral_data) if itg_data.integral_type == "cell"]
+        names = ir.create_cell_integral[1]
+        cell_integrals.sort(key=lambda integral_ir: names.index(integral_ir.name))
+    ir_time = time() - cpu_time
+    cpu_time = time()
+    code = form_generator(ir, parameters, cell_integrals)
+    code_time = time() - cpu_time
+    if report:
+        report = form_report(ir, ir_time, code_time)
+    return code, ir_time, code_time, report
+
+
+def _load_integral_code(cache_dir, name):
+    """Load the declaration and implementation of an integral group from the code cache, or return None."""
+    filename = Path(cache_dir).joinpath(name + ".json")
+    if not filename.exists():
+        return None
+    try:
+        with open(filename, "r") as f:
+            code = json.load(f)
+        logger.info("Loaded code of integral {} from {}".format(name, filename))
+        return code["declaration"], code["implementation"]
+    except Exception as e:
+        logger.warning("Failed to load code of integral {} from {}: {}".format(name, filename, e))
+        return None
+
+
+def _store_integral_code(cache_dir, name, code):
+    """Store the declaration and implementation of an integral group in the code cache."""
+    # Write to a temporary file first, such that other processes
+    # never find an incomplete file
+    filename = Path(cache_dir).joinpath(name + ".json")
+    filename.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmpname = tempfile.mkstemp(dir=filename.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"declaration": join_code(code[0]), "implementation": join_code(code[1])}, f)
+        os.replace(tmpname, filename)
+    except Exception:
+        os.remove(tmpname)
+        raise
@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import collections
 import functools
 import logging
 import types
@@ -22,8 +23,7 @@ supported_families = ("Brezzi-Douglas-Marini", "Brezzi-Douglas-Fortin-Marini", "
                       "Radau", "Raviart-Thomas", "Real", "Bubble", "Quadrature", "Regge",
                       "Hellan-Herrmann-Johnson", "Q", "DQ", "TensorProductElement", "Gauss-Lobatto-Legendre")
 
-# Cache for computed elements
-_cache = {}
+cache_info_t = collections.namedtuple("cache_info_t", ["hits", "misses", "maxsize", "currsize"])
 
 _tpc_quadrilateral = ufl.TensorProductCell(ufl.interval, ufl.interval)
 _tpc_hexahedron = ufl.TensorProductCell(ufl.quadrilateral, ufl.interval)
@@ -33,6 +33,45 @@ class SpaceOfReals(object):
     """Constant over the entire domain, rather than just cellwise."""
 
 
+class _LRUCache(object):
+    """Mapping with a maximum number of entries, evicting the least recently used entry."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+
+    def get(self, key):
+        """Return value for key, or None if not in the cache."""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return cache_info_t(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+# Caches for created elements and tabulated basis functions
+_element_cache = _LRUCache(maxsize=256)
+_tabulation_cache = _LRUCache(maxsize=2048)
+
+
 def reference_cell_vertices(cellname):
     """Return dict of coordinates of reference cell vertices for this 'cellname'."""
     return FIAT.ufc_cell(cellname).get_vertices()
@@ -179,17 +218,68 @@ def create_element(ufl_element: ufl.finiteelement) -> FIAT.FiniteElement:
     """Create a FIAT finite element for a given UFL element."""
 
     # Use UFL element as cache key
-    element_signature = ufl_element
-    if element_signature in _cache:
-        return _cache[element_signature]
+    element = _element_cache.get(ufl_element)
+    if element is not None:
+        return element
 
     # Create element and add to cache
     element = _create_element(ufl_element)
-    _cache[element_signature] = element
+    _element_cache.put(ufl_element, element)
 
     return element
 
 
+def tabulate(fiat_element: FIAT.FiniteElement, order: int, points, entity=None):
+    """Tabulate basis functions and derivatives of a FIAT element in points.
+
+    Same as fiat_element.tabulate, but the tables are cached. The
+    returned arrays are shared and therefore not writeable.
+    """
+    points = numpy.asarray(points, dtype=numpy.float64)
+    key = (fiat_element, order, points.shape, points.tobytes(), entity)
+    tables = _tabulation_cache.get(key)
+    if tables is not None:
+        return tables
+
+    tables = fiat_element.tabulate(order, points, entity=entity)
+    for tbl in tables.values():
+        tbl.setflags(write=False)
+    _tabulation_cache.put(key, tables)
+
+    return tables
+
+
+def cache_info():
+    """Return hits, misses and sizes of the caches of elements and tabulated basis functions."""
+    return {"elements": _element_cache.info(), "tabulations": _tabulation_cache.info()}
+
+
+def clear_cache():
+    """Remove all elements and tabulated basis functions from the caches and reset the statistics."""
+    _element_cache.clear()
+    _tabulation_cache.clear()
+
+
+def tensor_product_factors(fiat_element: FIAT.FiniteElement):
+    """Return the scalar interval elements of which a FIAT element is the tensor product.
+
+    The factors are ordered by the reference direction they act in.
+    Returns None if the element is not a tensor product of scalar
+    interval elements.
+    """
+    if isinstance(fiat_element, FIAT.tensor_product.FlattenedDimensions):
+        return tensor_product_factors(fiat_element.element)
+    elif isinstance(fiat_element, FIAT.TensorProductElement):
+        factors_A = tensor_product_factors(fiat_element.A)
+        factors_B = tensor_product_factors(fiat_element.B)
+        if factors_A is None or factors_B is None:
+            return None
+        return factors_A + factors_B
+    elif fiat_element.get_reference_element().get_spatial_dimension() == 1 and fiat_element.value_shape() == ():
+        return [fiat_element]
+    return None
+
+
 def create_quadrature(shape, degree: int, scheme: str = "default"):
     """Generate quadrature rule.
 
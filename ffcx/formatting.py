@@ -13,6 +13,8 @@ ufc_utils.
 
 """
 
+import contextlib
+import io
 import logging
 import os
 import pprint
@@ -21,6 +23,7 @@ from collections import namedtuple
 
 from ffcx import __version__ as FFCX_VERSION
 from ffcx.codegeneration import __version__ as UFC_VERSION
+from ffcx.codegeneration.C.format_lines import iter_code
 
 logger = logging.getLogger("ffcx")
 
@@ -61,7 +64,17 @@ c_extern_post = """
 
 def format_code(code: namedtuple, parameters):
     """Format given code in UFC format. Returns two strings with header and source file contents."""
+    file_h, file_c = io.StringIO(), io.StringIO()
+    stream_code(code, parameters, file_h, file_c)
+    return file_h.getvalue(), file_c.getvalue()
 
+
+def stream_code(code: namedtuple, parameters, file_h, file_c):
+    """Write given code in UFC format to the header and source files.
+
+    The code is written piece by piece as it is formatted, without
+    joining the code of all objects into one string.
+    """
     logger.info(79 * "*")
     logger.info("Compiler stage 5: Formatting code")
     logger.info(79 * "*")
@@ -88,30 +101,83 @@ def format_code(code: namedtuple, parameters):
     code_h_pre += c_extern_pre
     code_h_post = c_extern_post
 
-    code_h = ""
-    code_c = ""
-
+    file_h.write(code_h_pre)
+    file_c.write(code_c_pre)
     for parts_code in code:
-        code_h += "".join([c[0] for c in parts_code])
-        code_c += "".join([c[1] for c in parts_code])
+        for c in parts_code:
+            file_h.writelines(iter_code(c[0]))
+            file_c.writelines(iter_code(c[1]))
+    file_h.write(code_h_post)
+
 
-    # Add headers to body
-    code_h = code_h_pre + code_h + code_h_post
-    code_c = code_c_pre + code_c
+def format_library_index(prefix, forms, elements):
+    """Generate code for the index of the factories of a library.
+
+    The forms are given as pairs of name and factory function, the
+    elements as triplets of name, element factory and dofmap factory.
+    Returns the declarations for the header and the definitions.
+    """
+    arrays = [("const char*", "{}_form_names", ['"{}"'.format(f[0]) for f in forms]),
+              ("ufc_form* (*{})(void)", "{}_form_factories", [f[1] for f in forms]),
+              ("const char*", "{}_element_names", ['"{}"'.format(e[0]) for e in elements]),
+              ("ufc_finite_element* (*{})(void)", "{}_element_factories", [e[1] for e in elements]),
+              ("ufc_dofmap* (*{})(void)", "{}_dofmap_factories", [e[2] for e in elements])]
+
+    code_h = "\n// Index of the factories of library {}\n".format(prefix)
+    code_c = "\n// Index of the factories of library {}\n".format(prefix)
+    code_h += "extern const int {}_num_forms;\n".format(prefix)
+    code_h += "extern const int {}_num_elements;\n".format(prefix)
+    code_c += "const int {}_num_forms = {};\n".format(prefix, len(forms))
+    code_c += "const int {}_num_elements = {};\n".format(prefix, len(elements))
+    for typename, name, values in arrays:
+        # Arrays are terminated by NULL
+        declarator = "const " + name.format(prefix) + "[]"
+        if "{}" in typename:
+            declaration = typename.format(declarator)
+        else:
+            declaration = typename + " " + declarator
+        code_h += "extern {};\n".format(declaration)
+        code_c += "{} = {{{}}};\n".format(declaration, ", ".join(values + ["NULL"]))
 
     return code_h, code_c
 
 
 def write_code(code_h, code_c, prefix, output_dir):
-    _write_file(code_h, prefix, ".h", output_dir)
-    _write_file(code_c, prefix, ".c", output_dir)
+    with open_code_files(prefix, output_dir) as (file_h, file_c):
+        file_h.write(code_h)
+        file_c.write(code_c)
 
 
-def _write_file(output, prefix, postfix, output_dir):
-    """Write generated code to file."""
-    filename = os.path.join(output_dir, prefix + postfix)
-    with open(filename, "w") as hfile:
-        hfile.write(output)
+@contextlib.contextmanager
+def open_code_files(prefix, output_dir):
+    """Open the header and source files of generated code for writing.
+
+    The code is written to temporary files in the output directory,
+    which replace the header and source files with an atomic rename
+    when the code has been written, such that existing files are kept
+    if generating the code fails and are never seen incomplete.
+    """
+    filenames = [os.path.join(output_dir, prefix + suffix) for suffix in (".h", ".c")]
+    tmp_filenames = []
+    files = []
+    try:
+        for filename in filenames:
+            # Create a new file with the permissions of a file created by
+            # open, not the private ones of mkstemp
+            tmp_filename = "{}.{}.tmp".format(filename, os.urandom(8).hex())
+            fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            tmp_filenames.append(tmp_filename)
+            files.append(os.fdopen(fd, "w"))
+        with files[0] as file_h, files[1] as file_c:
+            yield file_h, file_c
+        for tmp_filename, filename in zip(tmp_filenames, filenames):
+            os.replace(tmp_filename, filename)
+    finally:
+        for f in files:
+            f.close()
+        for tmp_filename in tmp_filenames:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
 
 
 def _generate_comment(parameters):
@@ -148,6 +214,9 @@ def _generate_includes(parameters):
     s_h = set(default_h_includes)
     s_c = set(default_c_includes)
 
+    if parameters.get("block_gemm") == "cblas":
+        s_c.add("#include <cblas.h>")
+
     includes_h = "\n".join(sorted(s_h)) + "\n" if s_h else ""
     includes_c = "\n".join(sorted(s_c)) + "\n" if s_c else ""
 
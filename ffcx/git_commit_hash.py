@@ -0,0 +1,10 @@
+# Copyright (C) 2016 Jan Blechta
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+
+def git_commit_hash():
+    """Return git changeset hash (returns "unknown" if changeset is not known)."""
+    return "877891cfc326cb0d05e682b5279e54d718a10043"
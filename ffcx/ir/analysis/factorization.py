@@ -8,6 +8,8 @@
 import logging
 from functools import singledispatch
 
+import numpy
+
 from ffcx.ir.analysis.graph import ExpressionGraph
 from ffcx.ir.analysis.modified_terminals import (analyse_modified_terminal,
                                                  strip_modified_terminal)
@@ -21,9 +23,10 @@ logger = logging.getLogger("ffcx")
 def build_argument_indices(S):
     """Build ordered list of indices to modified arguments."""
 
+    expressions = S.column("expression")
     arg_indices = []
-    for i, v in S.nodes.items():
-        arg = strip_modified_terminal(v['expression'])
+    for i, v in enumerate(expressions):
+        arg = strip_modified_terminal(v)
         if isinstance(arg, Argument):
             arg_indices.append(i)
 
@@ -31,7 +34,7 @@ def build_argument_indices(S):
     def arg_ordering_key(i):
         """Return a key for sorting argument vertex indices.
         Key is based on the properties of the modified terminal."""
-        mt = analyse_modified_terminal(S.nodes[i]['expression'])
+        mt = analyse_modified_terminal(expressions[i])
         return mt.argument_ordering_key()
 
     ordered_arg_indices = sorted(arg_indices, key=arg_ordering_key)
@@ -43,7 +46,7 @@ def graph_insert(F, expr):
     fi = F.e2i.get(expr)
     if fi is None:
         fi = F.number_of_nodes()
-        F.add_node(fi, expression=expr)
+        F.add_nodes([expr])
         F.e2i[expr] = fi
     return fi
 
@@ -87,8 +90,8 @@ def handle_sum(v, fac, sf, F):
             elif fi1 is None:
                 fisum = fi0
             else:
-                f0 = F.nodes[fi0]['expression']
-                f1 = F.nodes[fi1]['expression']
+                f0 = F.column("expression")[fi0]
+                f1 = F.column("expression")[fi1]
                 fisum = graph_insert(F, f0 + f1)
             factors[argkey] = fisum
 
@@ -113,7 +116,7 @@ def handle_product(v, fac, sf, F):
         f0 = sf[0]
         factors = {}
         for k1 in sorted(fac1):
-            f1 = F.nodes[fac1[k1]]['expression']
+            f1 = F.column("expression")[fac1[k1]]
             factors[k1] = graph_insert(F, f0 * f1)
 
     elif not fac1:  # arg * non-arg
@@ -121,16 +124,16 @@ def handle_product(v, fac, sf, F):
         f1 = sf[1]
         factors = {}
         for k0 in sorted(fac0):
-            f0 = F.nodes[fac0[k0]]['expression']
+            f0 = F.column("expression")[fac0[k0]]
             factors[k0] = graph_insert(F, f1 * f0)
 
     else:  # arg * arg
         # Record products of each factor of arg-dependent operand
         factors = {}
         for k0 in sorted(fac0):
-            f0 = F.nodes[fac0[k0]]['expression']
+            f0 = F.column("expression")[fac0[k0]]
             for k1 in sorted(fac1):
-                f1 = F.nodes[fac1[k1]]['expression']
+                f1 = F.column("expression")[fac1[k1]]
                 argkey = tuple(sorted(k0 + k1))  # sort key for canonical representation
                 factors[argkey] = graph_insert(F, f0 * f1)
 
@@ -144,7 +147,7 @@ def handle_conj(v, fac, sf, F):
     if fac:
         factors = {}
         for k in fac:
-            f0 = F.nodes[fac[k]]['expression']
+            f0 = F.column("expression")[fac[k]]
             factors[k] = graph_insert(F, Conj(f0))
     else:
         raise RuntimeError("No arguments")
@@ -163,7 +166,7 @@ def handle_division(v, fac, sf, F):
         f1 = sf[1]
         factors = {}
         for k0 in sorted(fac0):
-            f0 = F.nodes[fac0[k0]]['expression']
+            f0 = F.column("expression")[fac0[k0]]
             factors[k0] = graph_insert(F, f0 / f1)
 
     else:  # non-arg / non-arg
@@ -201,8 +204,8 @@ def handle_conditional(v, fac, sf, F):
         for k in mas:
             fi1 = fac1.get(k)
             fi2 = fac2.get(k)
-            f1 = z if fi1 is None else F.nodes[fi1]['expression']
-            f2 = z if fi2 is None else F.nodes[fi2]['expression']
+            f1 = z if fi1 is None else F.column("expression")[fi1]
+            f2 = z if fi2 is None else F.column("expression")[fi2]
             factors[k] = graph_insert(F, conditional(f0, f1, f2))
 
     return factors
@@ -239,9 +242,14 @@ def compute_argument_factorization(S, rank):
         of course in a different technical representation.
 
     """
+    S_expressions = S.column("expression")
+    S_factors = S.column("factors")
+    S_offsets, S_deps = S.out_csr()
+
     # Extract argument component subgraph
     arg_indices = build_argument_indices(S)
-    AV = [S.nodes[i]['expression'] for i in arg_indices]
+    AV = [S_expressions[i] for i in arg_indices]
+    arg_positions = {si: ai for ai, si in enumerate(arg_indices)}
 
     # Data structure for building non-argument factors
     F = ExpressionGraph()
@@ -267,16 +275,15 @@ def compute_argument_factorization(S, rank):
     # is a linear combination of multiple argkey configurations
 
     # Factorize each subexpression in order:
-    for si, attr in S.nodes.items():
-        deps = S.out_edges[si]
-        v = attr['expression']
+    for si, v in enumerate(S_expressions):
+        deps = S_deps[S_offsets[si]:S_offsets[si + 1]].tolist()
 
-        if si in arg_indices:
+        if si in arg_positions:
             assert len(deps) == 0
             # v is a modified Argument
             factors = {(si, ): one_index}
         else:
-            fac = [S.nodes[d]['factors'] for d in deps]
+            fac = [S_factors[d] for d in deps]
             if not any(fac):
                 # Entirely scalar (i.e. no arg factors)
                 # Just add unchanged to F
@@ -290,25 +297,26 @@ def compute_argument_factorization(S, rank):
                     if fac[i]:
                         sf.append(None)
                     else:
-                        sf.append(S.nodes[d]['expression'])
+                        sf.append(S_expressions[d])
                 # Use appropriate handler to deal with Sum, Product, etc.
                 factors = handler(v, fac, sf, F)
 
-        attr['factors'] = factors
+        S_factors[si] = factors
 
-    assert len(F.nodes) == len(F.e2i)
+    assert F.number_of_nodes() == len(F.e2i)
 
     # Prepare a mapping from component of expression to factors
     factors = {}
-    S_targets = [i for i, v in S.nodes.items() if v.get('target', False)]
+    S_components = S.column("component")
+    S_targets = numpy.flatnonzero(S.column("target")).tolist()
 
     for S_target in S_targets:
         # Get the factorizations of the target values
-        if S.nodes[S_target]['factors'] == {}:
+        if S_factors[S_target] == {}:
             if rank == 0:
                 # Functionals and expressions: store as no args * factor
-                for comp in S.nodes[S_target]["component"]:
-                    factors[comp] = {(): F.e2i[S.nodes[S_target]['expression']]}
+                for comp in S_components[S_target]:
+                    factors[comp] = {(): F.e2i[S_expressions[S_target]]}
             else:
                 # Zero form of arity 1 or higher: make factors empty
                 pass
@@ -316,28 +324,33 @@ def compute_argument_factorization(S, rank):
             # Forms of arity 1 or higher:
             # Map argkeys from indices into SV to indices into AV,
             # and resort keys for canonical representation
-            for argkey, fi in S.nodes[S_target]['factors'].items():
-                ai_fi = {tuple(sorted(arg_indices.index(si) for si in argkey)): fi}
-                for comp in S.nodes[S_target]["component"]:
+            for argkey, fi in S_factors[S_target].items():
+                ai_fi = {tuple(sorted(arg_positions[si] for si in argkey)): fi}
+                for comp in S_components[S_target]:
                     if factors.get(comp):
                         factors[comp].update(ai_fi)
                     else:
                         factors[comp] = ai_fi
 
     # Indices into F that are needed for final result
+    F_targets = F.column("target")
+    F_components = F.column("component")
     for comp, target in factors.items():
         for argkey, fi in target.items():
-            F.nodes[fi]["target"] = F.nodes[fi].get("target", [])
-            F.nodes[fi]["target"].append(argkey)
-
-            F.nodes[fi]["component"] = F.nodes[fi].get("component", [])
-            F.nodes[fi]["component"].append(comp)
+            if F_targets[fi] is None:
+                F_targets[fi] = []
+                F_components[fi] = []
+            F_targets[fi].append(argkey)
+            F_components[fi].append(comp)
 
     # Compute dependencies in FV
-    for i, v in F.nodes.items():
-        expr = v['expression']
+    sources = []
+    targets = []
+    for i, expr in enumerate(F.column("expression")):
         if not expr._ufl_is_terminal_ and not expr._ufl_is_terminal_modifier_:
             for o in expr.ufl_operands:
-                F.add_edge(i, F.e2i[o])
+                sources.append(i)
+                targets.append(F.e2i[o])
+    F.add_edges(sources, targets)
 
     return F
@@ -5,14 +5,17 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Linearized data structure for the computational graph."""
 
+import collections.abc
 import logging
 
 import numpy
 
 import ufl
+from ffcx.ir.analysis.indexing import map_component_tensor_arg_components, map_indexed_arg_components
 from ffcx.ir.analysis.modified_terminals import is_modified_terminal
-from ffcx.ir.analysis.reconstruct import reconstruct
-from ffcx.ir.analysis.valuenumbering import ValueNumberer
+from ffcx.ir.analysis.reconstruct import reconstruct, scalar_operands
+from ffcx.ir.analysis.valuenumbering import symmetric_components
+from ufl.utils.indexflattening import shape_to_strides, unflatten_index
 
 logger = logging.getLogger("ffcx")
 
@@ -20,31 +23,255 @@ logger = logging.getLogger("ffcx")
 class ExpressionGraph(object):
     """A directed multi-edge graph.
     ExpressionGraph allows multiple edges between the same nodes,
-    and respects the insertion order of nodes and edges."""
+    and respects the insertion order of nodes and edges.
+
+    Nodes are numbered contiguously from zero in the order they are
+    added. Each node property is stored in a column with one entry per
+    node. Properties with a fixed size value per node, such as the
+    boolean "target" marker of scalar graphs and the "status" of
+    factorization graphs, are stored in typed NumPy arrays. Properties
+    with values of varying size, such as the lists of components and
+    argument keys of the "component" and "target" of factorization
+    graphs and the "factors" dicts, and the expressions themselves, are
+    stored in lists of Python objects with None for nodes without the
+    property. Edges are stored as two NumPy arrays of node indices and
+    compressed to sparse row format when first traversed. The dict
+    interface of nodes and edges is provided by views of the columns
+    and compressed arrays."""
 
     def __init__(self):
 
         # Data structures for directed multi-edge graph
-        self.nodes = {}
-        self.out_edges = {}
-        self.in_edges = {}
+        self.columns = {"expression": []}
+        self._num_nodes = 0
+        self._num_edges = 0
+        self._sources = numpy.zeros(0, dtype=numpy.int64)
+        self._targets = numpy.zeros(0, dtype=numpy.int64)
+        self._compressed = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_sources"] = self._sources[:self._num_edges]
+        state["_targets"] = self._targets[:self._num_edges]
+        state["_compressed"] = {}
+        return state
+
+    def __setstate__(self, state):
+        if "_num_edges" not in state:
+            raise RuntimeError("Graph was stored in an outdated format.")
+        self.__dict__.update(state)
+
+    @property
+    def nodes(self):
+        """Mapping from node index to a dict-like view of its properties."""
+        return _NodeMap(self)
+
+    @property
+    def out_edges(self):
+        """Mapping from node index to the list of nodes its edges point to."""
+        return _Adjacency(*self.out_csr())
+
+    @property
+    def in_edges(self):
+        """Mapping from node index to the list of nodes with edges pointing to it."""
+        return _Adjacency(*self.in_csr())
 
     def number_of_nodes(self):
-        return len(self.nodes)
+        return self._num_nodes
 
     def add_node(self, key, **kwargs):
         """Add a node with optional properties."""
-        self.nodes[key] = kwargs
-        self.out_edges[key] = []
-        self.in_edges[key] = []
+        if key != self._num_nodes:
+            raise KeyError("Nodes must be added in order of their index")
+        self.add_nodes([kwargs.get("expression")])
+        for name, value in kwargs.items():
+            if name != "expression":
+                self.column(name)[key] = value
+
+    def add_nodes(self, expressions):
+        """Add a node for each expression, without further properties."""
+        n = len(expressions)
+        for name, column in self.columns.items():
+            if name == "expression":
+                column.extend(expressions)
+            elif isinstance(column, numpy.ndarray):
+                self.columns[name] = numpy.concatenate((column, numpy.zeros(n, dtype=column.dtype)))
+            else:
+                column.extend([None] * n)
+        self._num_nodes += n
+
+    def column(self, name):
+        """Return the list of values of a property, creating it if it does not exist."""
+        column = self.columns.get(name)
+        if column is None:
+            column = [None] * self._num_nodes
+            self.columns[name] = column
+        return column
+
+    def set_column(self, name, values):
+        """Set the values of a property for all nodes, e.g. from a typed array."""
+        if len(values) != self._num_nodes:
+            raise RuntimeError("Expecting one value for each node.")
+        self.columns[name] = values
 
     def add_edge(self, node1, node2):
         """Add a directed edge from node1 to node2."""
-        if node1 not in self.nodes or node2 not in self.nodes:
+        self.add_edges([node1], [node2])
+
+    def add_edges(self, nodes1, nodes2):
+        """Add directed edges from each node of nodes1 to the corresponding node of nodes2."""
+        nodes1 = numpy.asarray(nodes1, dtype=numpy.int64)
+        nodes2 = numpy.asarray(nodes2, dtype=numpy.int64)
+        assert nodes1.shape == nodes2.shape
+        n = nodes1.size
+        if n == 0:
+            return
+        if min(nodes1.min(), nodes2.min()) < 0 or max(nodes1.max(), nodes2.max()) >= self._num_nodes:
+            raise KeyError("Adding edge to unknown node")
+
+        # Grow the edge arrays geometrically, such that adding edges
+        # one at a time takes amortized constant time
+        end = self._num_edges + n
+        if end > self._sources.size:
+            capacity = max(end, 2 * self._sources.size)
+            self._sources = numpy.resize(self._sources, capacity)
+            self._targets = numpy.resize(self._targets, capacity)
+        self._sources[self._num_edges:end] = nodes1
+        self._targets[self._num_edges:end] = nodes2
+        self._num_edges = end
+        self._compressed = {}
+
+    def set_out_csr(self, offsets, indices):
+        """Set the edges of all nodes from their outgoing edges in compressed sparse row format."""
+        offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        indices = numpy.asarray(indices, dtype=numpy.int64)
+        if offsets.shape != (self._num_nodes + 1, ) or offsets[-1] != indices.size:
+            raise RuntimeError("Expecting offsets of the edges of each node.")
+        if indices.size and (indices.min() < 0 or indices.max() >= self._num_nodes):
             raise KeyError("Adding edge to unknown node")
+        self._sources = numpy.repeat(numpy.arange(self._num_nodes, dtype=numpy.int64), numpy.diff(offsets))
+        self._targets = indices
+        self._num_edges = indices.size
+        self._compressed = {"out": (offsets, indices)}
+
+    def out_csr(self):
+        """Return offsets and indices of the outgoing edges in compressed sparse row format."""
+        return self._compress(self._sources, self._targets, "out")
+
+    def in_csr(self):
+        """Return offsets and indices of the incoming edges in compressed sparse row format."""
+        return self._compress(self._targets, self._sources, "in")
+
+    def _compress(self, rows, cols, key):
+        if key not in self._compressed:
+            rows = rows[:self._num_edges]
+            cols = cols[:self._num_edges]
+            # A stable sort keeps the insertion order of the edges of each node
+            order = numpy.argsort(rows, kind="stable")
+            offsets = numpy.zeros(self._num_nodes + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(rows, minlength=self._num_nodes), out=offsets[1:])
+            self._compressed[key] = (offsets, cols[order])
+        return self._compressed[key]
+
+    def reachable(self, start, reverse=False, where=None):
+        """Return a boolean array marking the nodes reachable from the start nodes.
+
+        Edges are followed backwards if reverse is true. If a boolean
+        array where is given, only nodes marked in it are visited.
+        """
+        offsets, indices = self.in_csr() if reverse else self.out_csr()
+        visited = numpy.zeros(self._num_nodes, dtype=bool)
+        frontier = numpy.unique(numpy.asarray(start, dtype=numpy.int64))
+        while frontier.size:
+            keep = ~visited[frontier]
+            if where is not None:
+                keep &= where[frontier]
+            frontier = frontier[keep]
+            visited[frontier] = True
+
+            # Gather the edges of all nodes of the frontier at once
+            counts = offsets[frontier + 1] - offsets[frontier]
+            first = numpy.repeat(offsets[frontier] - (numpy.cumsum(counts) - counts), counts)
+            frontier = numpy.unique(indices[first + numpy.arange(first.size)])
+        return visited
+
+
+class _NodeMap(collections.abc.Mapping):
+    """Read-only mapping from node index to a view of the node properties."""
+
+    __slots__ = ("graph", )
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, numpy.integer)) or not 0 <= key < self.graph._num_nodes:
+            raise KeyError(key)
+        return _NodeView(self.graph, int(key))
+
+    def __iter__(self):
+        return iter(range(self.graph._num_nodes))
+
+    def __len__(self):
+        return self.graph._num_nodes
+
+
+class _NodeView(collections.abc.MutableMapping):
+    """Dict-like view of the properties of a single node."""
 
-        self.out_edges[node1] += [node2]
-        self.in_edges[node2] += [node1]
+    __slots__ = ("graph", "index")
+
+    def __init__(self, graph, index):
+        self.graph = graph
+        self.index = index
+
+    def __getitem__(self, name):
+        column = self.graph.columns.get(name)
+        if column is None:
+            raise KeyError(name)
+        value = column[self.index]
+        if isinstance(column, numpy.ndarray):
+            return value.item()
+        elif value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.graph.column(name)[self.index] = value
+
+    def __delitem__(self, name):
+        column = self.graph.columns.get(name)
+        if column is None or isinstance(column, numpy.ndarray) or column[self.index] is None:
+            raise KeyError(name)
+        column[self.index] = None
+
+    def __iter__(self):
+        return (name for name, column in self.graph.columns.items()
+                if isinstance(column, numpy.ndarray) or column[self.index] is not None)
+
+    def __len__(self):
+        return sum(1 for name in self)
+
+
+class _Adjacency(collections.abc.Mapping):
+    """Read-only mapping from node index to the list of its adjacent nodes."""
+
+    __slots__ = ("offsets", "indices")
+
+    def __init__(self, offsets, indices):
+        self.offsets = offsets
+        self.indices = indices
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, numpy.integer)) or not 0 <= key < len(self):
+            raise KeyError(key)
+        return self.indices[self.offsets[key]:self.offsets[key + 1]].tolist()
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
 
 
 def build_graph_vertices(expressions, skip_terminal_modifiers=False):
@@ -56,146 +283,199 @@ def build_graph_vertices(expressions, skip_terminal_modifiers=False):
     GV = sorted(G.e2i, key=G.e2i.get)
 
     # Add nodes to 'new' graph structure
-    for i, v in enumerate(GV):
-        G.add_node(i, expression=v)
+    G.add_nodes(GV)
 
+    target = numpy.zeros(G.number_of_nodes(), dtype=bool)
+    component = G.column("component")
     for comp, expr in enumerate(expressions):
         # Get vertex index representing input expression root
         V_target = G.e2i[expr]
-        G.nodes[V_target]['target'] = True
-        G.nodes[V_target]['component'] = G.nodes[V_target].get("component", [])
-        G.nodes[V_target]['component'].append(comp)
-
-    return G
-
-
-def build_scalar_graph(expression):
-    """Build list representation of expression graph covering the given expressions."""
-
-    # Populate with vertices
-    G = build_graph_vertices([expression], skip_terminal_modifiers=False)
-
-    # Build more fine grained computational graph of scalar subexpressions
-    scalar_expressions = rebuild_with_scalar_subexpressions(G)
-
-    # Build new list representation of graph where all
-    # vertices of V represent single scalar operations
-    G = build_graph_vertices(scalar_expressions, skip_terminal_modifiers=True)
-
-    # Compute graph edges
-    V_deps = []
-    for i, v in G.nodes.items():
-        expr = v['expression']
-        if expr._ufl_is_terminal_ or expr._ufl_is_terminal_modifier_:
-            V_deps.append(())
-        else:
-            V_deps.append([G.e2i[o] for o in expr.ufl_operands])
-
-    for i, edges in enumerate(V_deps):
-        for j in edges:
-            if i == j:
-                continue
-            G.add_edge(i, j)
+        target[V_target] = True
+        if component[V_target] is None:
+            component[V_target] = []
+        component[V_target].append(comp)
+    G.set_column("target", target)
 
     return G
 
 
-def rebuild_with_scalar_subexpressions(G):
-    """Build a new expression2index mapping where each subexpression is scalar valued.
-
-    Input:
-    - G.e2i
-    - G.V
-    - G.V_symbols
-    - G.total_unique_symbols
-
-    Output:
-    - NV   - Array with reverse mapping from index to expression
-    - nvs  - Tuple of ne2i indices corresponding to the last vertex of G.V
+def build_scalar_graph(expression, max_cached_operands=2**20):
+    """Build the graph of the scalar subexpressions of the components of an expression.
+
+    The graph is built in a single traversal of the expression, which
+    maps the scalar components of its nodes directly to nodes of the
+    scalar graph. Starting from the components of the expression, only
+    the scalar subexpressions these depend on are built. Components of
+    indexing and tensor construction nodes are mapped to the components
+    of their operands they are taken from, and symmetric components of
+    modified terminals to the same scalar node. The expression of each
+    scalar node is built once from the expressions of its operand nodes,
+    and the node is added after these along with its edges, which are
+    thereby added in compressed sparse row format. Scalar nodes with
+    equal expressions are merged.
+
+    The operand components of each component of a node are computed
+    once and kept for at most max_cached_operands components. They are
+    recomputed when needed again after that, which bounds the memory
+    used for very large integrands.
     """
+    # Expressions, outgoing edges in compressed sparse row format and
+    # index of each expression of the scalar graph
+    expressions = []
+    offsets = [0]
+    indices = []
+    e2i = {}
 
-    # Compute symbols over graph and rebuild scalar expression
-    #
-    # New expression which represents usually an algebraic operation
-    # generates a new symbol
-    value_numberer = ValueNumberer(G)
-
-    # V_symbols maps an index of a node to a list of
-    # symbols which are present in that node
-    V_symbols = value_numberer.compute_symbols()
-    total_unique_symbols = value_numberer.symbol_count
-
-    # Array to store the scalar subexpression in for each symbol
-    W = numpy.empty(total_unique_symbols, dtype=object)
-
-    # Iterate over each graph node in order
-    for i, v in G.nodes.items():
-        expr = v['expression']
-        # Find symbols of v components
-        vs = V_symbols[i]
-
-        # Skip if there's nothing new here (should be the case for indexing types)
-        # New symbols are not given to indexing types, so W[symbol] already equals
-        # an expression, since it was assigned to the symbol in a previous loop
-        # cycle
-        if all(W[s] is not None for s in vs):
-            continue
-
-        if is_modified_terminal(expr):
-            sh = expr.ufl_shape
-            if sh:
-                # Store each terminal expression component. We may not
-                # actually need all of these later, but that will be
-                # optimized away.
-                # Note: symmetries will be dealt with in the value numbering.
-                ws = [expr[c] for c in ufl.permutation.compute_indices(sh)]
+    def add_node(w):
+        """Add the scalar expression w and its missing subexpressions, returns the index of w."""
+        stack = [w]
+        while stack:
+            e = stack[-1]
+            if e in e2i:
+                stack.pop()
+                continue
+            if not (e._ufl_is_terminal_ or is_modified_terminal(e)):
+                missing = [o for o in e.ufl_operands
+                           if o not in e2i and not isinstance(o, (ufl.classes.MultiIndex, ufl.classes.Label))]
+                if missing:
+                    stack.extend(reversed(missing))
+                    continue
+            e2i[e] = len(expressions)
+            expressions.append(e)
+            if not (e._ufl_is_terminal_ or e._ufl_is_terminal_modifier_):
+                indices.extend(e2i[o] for o in e.ufl_operands)
+            offsets.append(len(indices))
+            stack.pop()
+        return e2i[w]
+
+    component_maps = {}
+
+    def resolve(v, k):
+        """Return the node and its component defining the value of component k of v."""
+        while True:
+            t = type(v)
+            if t is ufl.classes.Variable:
+                v = v.ufl_operands[0]
+            elif t is ufl.classes.ListTensor:
+                rows = v.ufl_operands
+                n = ufl.product(v.ufl_shape + v.ufl_index_dimensions) // len(rows)
+                r, k = divmod(k, n)
+                v = rows[r]
+            elif t is ufl.classes.Indexed or t is ufl.classes.ComponentTensor:
+                m = component_maps.get(v)
+                if m is None:
+                    if t is ufl.classes.Indexed:
+                        m = map_indexed_arg_components(v)
+                    else:
+                        m = map_component_tensor_arg_components(v)
+                    component_maps[v] = m
+                v, k = v.ufl_operands[0], m[k]
             else:
-                # Store single modified terminal expression component
-                if len(vs) != 1:
-                    raise RuntimeError("Expecting single symbol for scalar valued modified terminal.")
-                ws = [expr]
-            # FIXME: Replace ws[:] with 0's if its table is empty
-            # Possible redesign: loop over modified terminals only first,
-            # then build tables for them, set W[s] = 0.0 for modified terminals with zero table,
-            # then loop over non-(modified terminal)s to reconstruct expression.
-        else:
-            # Find symbols of operands
+                if v not in component_maps:
+                    component_maps[v] = symmetric_components(v)
+                m = component_maps[v]
+                return v, k if m is None else m[k]
+
+    cached_operands = {}
+    num_cached = 0
+
+    def operands(v):
+        """Return the operand node components of each component of v."""
+        nonlocal num_cached
+        ops = cached_operands.get(v)
+        if ops is None:
             sops = []
-            for j, vop in enumerate(expr.ufl_operands):
+            for vop in v.ufl_operands:
                 if isinstance(vop, ufl.classes.MultiIndex):
                     # TODO: Store MultiIndex in G.V and allocate a symbol to it for this to work
-                    if not isinstance(expr, ufl.classes.IndexSum):
-                        raise RuntimeError("Not expecting a %s." % type(expr))
+                    if not isinstance(v, ufl.classes.IndexSum):
+                        raise RuntimeError("Not expecting a %s." % type(v))
                     sops.append(())
                 else:
-                    # TODO: Build edge datastructure and use instead?
-                    # k = G.E[i][j]
-                    k = G.e2i[vop]
-                    sops.append(V_symbols[k])
+                    sops.append([resolve(vop, c) for c in range(ufl.product(vop.ufl_shape
+                                                                            + vop.ufl_index_dimensions))])
 
-            # Fetch reconstructed operand expressions
-            wops = [tuple(W[k] for k in so) for so in sops]
-
-            # Reconstruct scalar subexpressions of v
-            ws = reconstruct(expr, wops)
-
-            # Store all scalar subexpressions for v symbols
-            if len(vs) != len(ws):
+            ops = scalar_operands(v, sops)
+            if len(ops) != ufl.product(v.ufl_shape + v.ufl_index_dimensions):
                 raise RuntimeError("Expecting one symbol for each expression.")
 
-        # Store each new scalar subexpression in W at the index of its symbol
-        handled = set()
-        for s, w in zip(vs, ws):
-            if W[s] is None:
-                W[s] = w
-                handled.add(s)
+            # Drop all cached operands if the cache grows too large
+            if num_cached + len(ops) > max_cached_operands:
+                cached_operands.clear()
+                num_cached = 0
+            cached_operands[v] = ops
+            num_cached += len(ops)
+        return ops
+
+    # Scalar node of each built component of the nodes defining values
+    nodes = {}
+
+    def scalar_node(v, k):
+        """Return the scalar node of component k of v, building it and the nodes it depends on."""
+        v, k = resolve(v, k)
+        stack = [(v, k)]
+        while stack:
+            u, c = stack[-1]
+            built = nodes.setdefault(u, {})
+            if c in built:
+                stack.pop()
+                continue
+
+            if is_modified_terminal(u):
+                # Note: symmetries have been dealt with in the value numbering.
+                if u.ufl_shape:
+                    w = u[unflatten_index(c, shape_to_strides(u.ufl_shape))]
+                else:
+                    w = u
+                # FIXME: Replace w with 0 if its table is empty
             else:
-                assert s in handled  # Result of symmetry! - but I think this never gets reached anyway (CNR)
+                ops = operands(u)[c]
+                missing = [op for op in ops if op[1] not in nodes.get(op[0], ())]
+                if missing:
+                    stack.extend(reversed(missing))
+                    continue
+                w = reconstruct(u, [expressions[nodes[d][j]] for d, j in ops])
+
+            built[c] = add_node(w)
+            stack.pop()
+        return nodes[v][k]
+
+    # Build the scalar nodes of the components of the expression
+    targets = [scalar_node(expression, comp)
+               for comp in range(ufl.product(expression.ufl_shape + expression.ufl_index_dimensions))]
 
-    # Find symbols of final v from input graph
-    vs = V_symbols[-1]
-    scalar_expressions = W[vs]
-    return scalar_expressions
+    G = ExpressionGraph()
+    G.add_nodes(expressions)
+    G.set_out_csr(offsets, indices)
+
+    # Drop the nodes of operands which UFL has simplified away when
+    # building an expression, e.g. the factors of products with zero
+    keep = G.reachable(targets)
+    if not keep.all():
+        offsets, indices = G.out_csr()
+        renumbering = numpy.cumsum(keep) - 1
+        edge_counts = numpy.diff(offsets)
+        indices = renumbering[indices[numpy.repeat(keep, edge_counts)]]
+        offsets = numpy.concatenate(([0], numpy.cumsum(edge_counts[keep])))
+        expressions = [e for e, k in zip(expressions, keep) if k]
+        e2i = {e: i for i, e in enumerate(expressions)}
+        targets = renumbering[targets].tolist()
+
+        G = ExpressionGraph()
+        G.add_nodes(expressions)
+        G.set_out_csr(offsets, indices)
+    G.e2i = e2i
+
+    target = numpy.zeros(G.number_of_nodes(), dtype=bool)
+    component = G.column("component")
+    for comp, i in enumerate(targets):
+        target[i] = True
+        if component[i] is None:
+            component[i] = []
+        component[i].append(comp)
+    G.set_column("target", target)
+
+    return G
 
 
 def _count_nodes_with_unique_post_traversal(expressions, skip_terminal_modifiers=False):
@@ -3,6 +3,14 @@
 # This file is part of FFCX.(https://www.fenicsproject.org)
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Reconstruction of scalar components of tensor valued expressions.
+
+The scalar components of an expression o are numbered by flattening
+its shape and free index dimensions. Each of them is computed from a
+few components of the operands of o, given by scalar_operands, and is
+rebuilt from the scalar subexpressions of these by reconstruct. This
+allows building only the components of an expression that are used.
+"""
 
 import ufl
 
@@ -10,28 +18,21 @@ import ufl
 def handle_scalar_nary(o, ops):
     if o.ufl_shape != ():
         raise RuntimeError("Expecting scalar.")
-    sops = [op[0] for op in ops]
-    return [o._ufl_expr_reconstruct_(*sops)]
+    return [tuple(op[0] for op in ops)]
 
 
 def handle_condition(o, ops):
     # A condition is always scalar, so len(op) == 1
-    sops = [op[0] for op in ops]
-    return [o._ufl_expr_reconstruct_(*sops)]
+    return [tuple(op[0] for op in ops)]
 
 
 def handle_conditional(o, ops):
     # A condition can be non scalar
-    symbols = []
-    n = len(ops[1])
     if len(ops[0]) != 1:
         raise RuntimeError("Condition should be scalar.")
-    if n != len(ops[2]):
+    if len(ops[1]) != len(ops[2]):
         raise RuntimeError("Conditional branches should have same shape.")
-    for i in range(len(ops[1])):
-        sops = (ops[0][0], ops[1][i], ops[2][i])
-        symbols.append(o._ufl_expr_reconstruct_(*sops))
-    return symbols
+    return [(ops[0][0], t, f) for t, f in zip(ops[1], ops[2])]
 
 
 def handle_conj(o, ops):
@@ -39,7 +40,7 @@ def handle_conj(o, ops):
         raise RuntimeError("Expecting one operand")
     if o.ufl_shape != ():
         raise RuntimeError("Expecting scalar.")
-    return [o._ufl_expr_reconstruct_(x) for x in ops[0]]
+    return [(x, ) for x in ops[0]]
 
 
 def handle_division(o, ops):
@@ -48,7 +49,7 @@ def handle_division(o, ops):
     if len(ops[1]) != 1:
         raise RuntimeError("Expecting scalar divisor.")
     b, = ops[1]
-    return [o._ufl_expr_reconstruct_(a, b) for a in ops[0]]
+    return [(a, b) for a in ops[0]]
 
 
 def handle_sum(o, ops):
@@ -56,7 +57,7 @@ def handle_sum(o, ops):
         raise RuntimeError("Expecting two operands.")
     if len(ops[0]) != len(ops[1]):
         raise RuntimeError("Expecting scalar divisor.")
-    return [o._ufl_expr_reconstruct_(a, b) for a, b in zip(ops[0], ops[1])]
+    return list(zip(ops[0], ops[1]))
 
 
 def handle_product(o, ops):
@@ -66,10 +67,10 @@ def handle_product(o, ops):
     # Get the simple cases out of the way
     if len(ops[0]) == 1:  # True scalar * something
         a, = ops[0]
-        return [ufl.classes.Product(a, b) for b in ops[1]]
+        return [(a, b) for b in ops[1]]
     elif len(ops[1]) == 1:  # Something * true scalar
         b, = ops[1]
-        return [ufl.classes.Product(a, b) for a in ops[0]]
+        return [(a, b) for a in ops[0]]
 
     # Neither of operands are true scalars, this is the tricky part
     o0, o1 = o.ufl_operands
@@ -97,9 +98,8 @@ def handle_product(o, ops):
               ufl.utils.indexflattening.flatten_multiindex([ind[i] for i in indmap1], ist1))
              for ind in indices]
 
-    # Build products for scalar components
-    results = [ufl.classes.Product(ops[0][k0], ops[1][k1]) for k0, k1 in indks]
-    return results
+    # Pair operand components for scalar products
+    return [(ops[0][k0], ops[1][k1]) for k0, k1 in indks]
 
 
 def handle_index_sum(o, ops):
@@ -125,13 +125,8 @@ def handle_index_sum(o, ops):
         iind = i * (postdim * d)
         for k in range(postdim):
             ind = iind + k
-            sops.append([ss[ind + j * postdim] for j in range(d)])
-
-    # For each scalar output component, sum over collected subcomponents
-    # TODO: Need to split this into binary additions to work with future CRSArray format,
-    #       i.e. emitting more expressions than there are symbols for this node.
-    results = [sum(sop) for sop in sops]
-    return results
+            sops.append(tuple(ss[ind + j * postdim] for j in range(d)))
+    return sops
 
 # TODO: To implement compound tensor operators such as dot and inner,
 # we need to identify which index to do the contractions over,
@@ -156,15 +151,33 @@ _reconstruct_call_lookup = {ufl.classes.MathFunction: handle_scalar_nary,
                             ufl.classes.Condition: handle_condition}
 
 
-def reconstruct(o, *args):
+def scalar_operands(o, ops):
+    """Return the operand components each scalar component of o is computed from.
+
+    ops holds a list of the scalar components of each operand of o,
+    which may be scalar subexpressions or symbols representing them.
+    """
     # First look for exact match
     f = _reconstruct_call_lookup.get(type(o), False)
     if f:
-        return f(o, *args)
+        return f(o, ops)
     else:
         # Look for parent class types instead
         for k in _reconstruct_call_lookup.keys():
             if isinstance(o, k):
-                return _reconstruct_call_lookup[k](o, *args)
+                return _reconstruct_call_lookup[k](o, ops)
         # Nothing found
         raise RuntimeError("Not expecting expression of type %s in here." % type(o))
+
+
+def reconstruct(o, scalars):
+    """Rebuild a scalar component of o from the operand components it is computed from."""
+    if isinstance(o, ufl.classes.IndexSum):
+        # For each scalar output component, sum over collected subcomponents
+        # TODO: Need to split this into binary additions to work with future CRSArray format,
+        #       i.e. emitting more expressions than there are symbols for this node.
+        return sum(scalars)
+    elif isinstance(o, ufl.classes.Product):
+        return ufl.classes.Product(*scalars)
+    else:
+        return o._ufl_expr_reconstruct_(*scalars)
@@ -0,0 +1,206 @@
+# Copyright (C) 2020 The FEniCS Project
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Persistent on-disk cache for the intermediate representation of integrals.
+
+The representation of an integral computed by compute_integral_ir
+depends only on the integrands, quadrature rules, cell, integral type,
+shape of the element tensor and a few parameters. It is stored in a
+file named by a hash of these, such that it is found again when the
+same integral is compiled as part of a different form, with different
+code generation parameters or in a different process.
+
+The representation refers to form arguments, coefficients, constants
+and domains of the integrand. These are not stored, but referred to by
+their position in a canonical numbering, and the references are
+resolved to the objects of the integrand being compiled when loaded.
+
+The generated code of integral groups is cached by ffcx.compiler in a
+similar way if the code_cache_dir parameter is set, keyed by the
+signature computed by compute_integral_group_signature.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy
+
+import ffcx
+import ffcx.codegeneration
+import ufl
+from ffcx.ir.integral import compute_integral_ir
+from ufl.algorithms.signature import compute_expression_hashdata, compute_terminal_hashdata
+from ufl.corealg.traversal import traverse_unique_terminals
+
+logger = logging.getLogger("ffcx")
+
+# Parameters which affect the intermediate representation of integrals
+# and are therefore part of the cache key
+_ir_parameters = ("epsilon", "table_rtol", "table_atol", "sum_factorization", "enable_preintegration",
+                  "enable_premultiplication")
+
+# Parameters which only affect the generated code, or how and where it
+# is generated. Every parameter must be in exactly one of these lists.
+_codegeneration_parameters = ("precision", "scalar_type", "compute_type", "tabulate_tensor_void", "alignas",
+                              "assume_aligned", "padlen", "batch_size", "tile_size", "block_gemm", "gemm_threshold",
+                              "simd_width", "sparse_element_tensor", "tabulate_action", "tabulate_diagonal",
+                              "fused_cell_integrals", "quadrature_rule", "quadrature_degree", "ir_cache_dir",
+                              "code_cache_dir", "hexfloat_tables")
+
+
+def _form_arguments(integrands):
+    """Return canonically numbered objects of the integrands which are not stored in the cache."""
+    expressions = list(integrands.values())
+    coefficients = ufl.algorithms.analysis.unique_tuple(
+        [c for e in expressions for c in ufl.algorithms.extract_coefficients(e)])
+    constants = ufl.algorithms.analysis.unique_tuple(
+        [c for e in expressions for c in ufl.algorithms.analysis.extract_constants(e)])
+    arguments = ufl.algorithms.analysis.unique_tuple(
+        [a for e in expressions for a in ufl.algorithms.analysis.extract_arguments(e)])
+
+    domains = []
+    for e in expressions:
+        for t in traverse_unique_terminals(e):
+            domains.extend(t.ufl_domains())
+    domains = ufl.algorithms.analysis.unique_tuple(domains)
+
+    numbering = {}
+    for kind, objects in (("coefficient", coefficients), ("constant", constants),
+                          ("argument", arguments), ("domain", domains)):
+        numbering.update({obj: (kind, i) for i, obj in enumerate(objects)})
+    return numbering
+
+
+def compute_signature(cell, integral_type, entitytype, integrands, argument_shape, parameters, numbering):
+    """Compute the cache key of the representation of an integral."""
+    renumbering = {obj: i for obj, (kind, i) in numbering.items()}
+
+    signatures = [cell.cellname(), integral_type, entitytype, str(list(argument_shape))]
+    for rule, integrand in integrands.items():
+        signatures.append(_integrand_signature(integrand, renumbering))
+        signatures.append(hashlib.sha1(numpy.ascontiguousarray(rule.points, dtype=numpy.float64)).hexdigest())
+        signatures.append(hashlib.sha1(numpy.ascontiguousarray(rule.weights, dtype=numpy.float64)).hexdigest())
+    signatures.append(str([(k, parameters[k]) for k in _ir_parameters]))
+    signatures += [str(ffcx.__version__), str(ufl.__version__)]
+
+    string = ";".join(signatures)
+    return hashlib.sha1(string.encode('utf-8')).hexdigest()
+
+
+def compute_integral_group_signature(form_data, form_index, itg_data_index, parameters):
+    """Compute the signature of the code of an integral group of a form.
+
+    The code depends on the integrands and quadrature rules of the
+    group, and on the elements of the arguments and the numbering of
+    the coefficients and constants of the form, but not on the other
+    integrals of the form.
+    """
+    itg_data = form_data.integral_data[itg_data_index]
+    renumbering = {}
+    for objects in (form_data.reduced_coefficients, form_data.original_form.constants(),
+                    form_data.original_form.ufl_domains()):
+        renumbering.update((obj, i) for i, obj in enumerate(objects))
+
+    signatures = [str(form_index), itg_data.integral_type, str(itg_data.subdomain_id),
+                  itg_data.domain.ufl_cell().cellname(), str(form_data.rank), str(form_data.geometric_dimension)]
+    # Offsets of the coefficients and constants in the kernel arguments
+    signatures += [repr(e) for e in form_data.argument_elements + form_data.coefficient_elements]
+    signatures.append(str([c.ufl_shape for c in form_data.original_form.constants()]))
+    signatures.append(str(list(itg_data.enabled_coefficients)))
+    signatures.append(str(sorted(itg_data.metadata.items())))
+    for integral in itg_data.integrals:
+        signatures.append(_integrand_signature(integral.integrand(), renumbering))
+        for key, value in sorted(integral.metadata().items()):
+            if key in ("quadrature_points", "quadrature_weights"):
+                value = hashlib.sha1(numpy.ascontiguousarray(value, dtype=numpy.float64)).hexdigest()
+            signatures.append("{}={!r}".format(key, value))
+    signatures.append(str(sorted((k, v) for k, v in parameters.items() if k not in ("ir_cache_dir", "code_cache_dir"))))
+    signatures += [str(ffcx.__version__), str(ufl.__version__), ffcx.codegeneration.get_signature()]
+
+    string = ";".join(signatures)
+    return hashlib.sha1(string.encode('utf-8')).hexdigest()
+
+
+def _integrand_signature(integrand, renumbering):
+    """Compute the signature of an integrand with renumbered form arguments."""
+    terminal_hashdata = compute_terminal_hashdata([integrand], renumbering)
+    for t in terminal_hashdata:
+        if isinstance(t, ufl.Constant):
+            # The signature data of constants is not renumbered by UFL
+            terminal_hashdata[t] = ("Constant", renumbering[t], renumbering[t.ufl_domain()], t.ufl_shape)
+    return compute_expression_hashdata(integrand, terminal_hashdata).hex()
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler storing references to form arguments instead of the objects."""
+
+    def __init__(self, file, numbering):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.numbering = numbering
+
+    def persistent_id(self, obj):
+        if isinstance(obj, (ufl.Coefficient, ufl.Constant, ufl.Argument, ufl.Mesh)):
+            return self.numbering.get(obj)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler replacing references to form arguments by the objects."""
+
+    def __init__(self, file, objects):
+        super().__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[tuple(pid)]
+
+
+def compute_cached_integral_ir(cache_dir, cell, integral_type, entitytype, integrands, argument_shape, p,
+                               visualise):
+    """Compute intermediate representation of an integral, reusing a representation found in the cache.
+
+    Takes the same arguments as compute_integral_ir, and the directory
+    of the cache.
+    """
+    if visualise:
+        # Visualisation is a side effect of computing the representation
+        return compute_integral_ir(cell, integral_type, entitytype, integrands, argument_shape, p, visualise)
+
+    numbering = _form_arguments(integrands)
+    signature = compute_signature(cell, integral_type, entitytype, integrands, argument_shape, p, numbering)
+    filename = Path(cache_dir).joinpath("ir_{}.pickle".format(signature))
+
+    if filename.exists():
+        objects = {pid: obj for obj, pid in numbering.items()}
+        try:
+            with open(filename, "rb") as f:
+                ir = _Unpickler(f, objects).load()
+            logger.info("Loaded intermediate representation from {}".format(filename))
+            ir["params"] = p
+            return ir
+        except Exception as e:
+            logger.warning("Failed to load intermediate representation from {}: {}".format(filename, e))
+
+    ir = compute_integral_ir(cell, integral_type, entitytype, integrands, argument_shape, p, visualise)
+
+    # Parameters are passed on to code generation and not cached.
+    # Write to a temporary file first, such that other processes
+    # never find an incomplete file.
+    cached = {key: value for key, value in ir.items() if key != "params"}
+    filename.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmpname = tempfile.mkstemp(dir=filename.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _Pickler(f, numbering).dump(cached)
+        os.replace(tmpname, filename)
+    except Exception:
+        os.remove(tmpname)
+        raise
+
+    return ir
@@ -5,14 +5,16 @@
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 """Tools for precomputed tables of terminal values."""
 
+import bisect
 import collections
+import itertools
 import logging
 
 import numpy
 
 import ufl
 import ufl.utils.derivativetuples
-from ffcx.fiatinterface import create_element
+from ffcx.fiatinterface import create_element, tabulate, tensor_product_factors
 from ffcx.ir.representationutils import (create_quadrature_points_and_weights,
                                          integral_type_to_entity_dim,
                                          map_integral_points)
@@ -24,7 +26,7 @@ default_rtol = 1e-5
 default_atol = 1e-8
 
 table_origin_t = collections.namedtuple(
-    "table_origin", ["element", "avg", "derivatives", "flat_component", "dofrange", "dofmap"])
+    "table_origin_t", ["element", "avg", "derivatives", "flat_component", "dofrange", "dofmap"])
 
 piecewise_ttypes = ("piecewise", "fixed", "ones", "zeros")
 uniform_ttypes = ("fixed", "ones", "zeros", "uniform")
@@ -32,9 +34,14 @@ uniform_ttypes = ("fixed", "ones", "zeros", "uniform")
 valid_ttypes = set(("quadrature", )) | set(piecewise_ttypes) | set(uniform_ttypes)
 
 unique_table_reference_t = collections.namedtuple(
-    "unique_table_reference",
+    "unique_table_reference_t",
     ["name", "values", "dofrange", "dofmap", "original_dim", "ttype", "is_piecewise", "is_uniform",
-     "is_permuted"])
+     "is_permuted", "tensor_factors"])
+
+# Factorization of a table of a tensor product element into one table per
+# reference direction with dimensions [points][dofs], and the table column
+# for each tuple of 1D dof indices
+tensor_factors_t = collections.namedtuple("tensor_factors_t", ["names", "tables", "dofs"])
 
 
 # TODO: Get restriction postfix from somewhere central
@@ -60,7 +67,7 @@ def clamp_table_small_numbers(table,
                               numbers=(-1.0, -0.5, 0.0, 0.5, 1.0)):
     """Clamp almost 0,1,-1 values to integers. Returns new table."""
     # Get shape of table and number of columns, defined as the last axis
-    table = numpy.asarray(table)
+    table = numpy.array(table)
     for n in numbers:
         table[numpy.where(numpy.isclose(table, n, rtol=rtol, atol=atol))] = n
     return table
@@ -91,6 +98,89 @@ def strip_table_zeros(table, rtol=default_rtol, atol=default_atol):
     return dofrange, dofmap, stripped_table
 
 
+class TableIndex(object):
+    """Index of tables for finding the tables possibly equal to a given table.
+
+    Tables are equal as defined by equal_tables. The tables of each
+    shape are sorted by a random projection of their values, which
+    differs by at most a known bound for equal tables. Only tables with
+    projections within this bound are candidates for equality, so
+    finding equal tables takes near constant instead of linear time in
+    the number of tables.
+    """
+
+    def __init__(self, rtol=default_rtol, atol=default_atol):
+        self.rtol = rtol
+        self.atol = atol
+        self._buckets = {}
+        self._keys = []
+        self._orders = {}
+
+    def _bucket(self, shape):
+        bucket = self._buckets.get(shape)
+        if bucket is None:
+            size = int(numpy.prod(shape, dtype=int))
+            weights = numpy.random.RandomState(0).uniform(-1.0, 1.0, size)
+            bucket = {"weights": weights, "weights_norm": numpy.abs(weights).sum(), "max_abs": 0.0,
+                      "projections": [], "unsorted": []}
+            self._buckets[shape] = bucket
+        return bucket
+
+    def add(self, key, table):
+        """Add a table to the index."""
+        table = numpy.asarray(table)
+        bucket = self._bucket(table.shape)
+        order = len(self._keys)
+        self._keys.append(key)
+        self._orders[key] = order
+
+        projection = numpy.dot(bucket["weights"], table.ravel())
+        if numpy.isfinite(projection):
+            bisect.insort(bucket["projections"], (projection, order))
+            bucket["max_abs"] = max(bucket["max_abs"], numpy.abs(table).max(initial=0.0))
+        else:
+            # Tables with non-finite values are candidates for all tables
+            bucket["unsorted"].append(order)
+
+    def remove(self, key, table):
+        """Remove a table, which has been added with the given key, from the index."""
+        table = numpy.asarray(table)
+        bucket = self._buckets[table.shape]
+        order = self._orders.pop(key)
+        projection = numpy.dot(bucket["weights"], table.ravel())
+        if numpy.isfinite(projection):
+            del bucket["projections"][bisect.bisect_left(bucket["projections"], (projection, order))]
+        else:
+            bucket["unsorted"].remove(order)
+
+    def candidates(self, table):
+        """Return keys of the tables possibly equal to the given table, in the order they were added.
+
+        All tables equal to the given table are included, in either
+        order of the arguments of equal_tables.
+        """
+        table = numpy.asarray(table)
+        bucket = self._buckets.get(table.shape)
+        if bucket is None:
+            return []
+
+        projections = bucket["projections"]
+        projection = numpy.dot(bucket["weights"], table.ravel())
+        if numpy.isfinite(projection):
+            # Bound on the difference of projections of equal tables,
+            # including rounding errors of the projections
+            max_abs = max(bucket["max_abs"], numpy.abs(table).max(initial=0.0))
+            eps = table.size * numpy.finfo(numpy.float64).eps
+            bound = bucket["weights_norm"] * (self.atol + (self.rtol + 4 * eps) * max_abs) * (1.0 + 1e-8)
+            begin = bisect.bisect_left(projections, (projection - bound, -1))
+            end = bisect.bisect_right(projections, (projection + bound, len(self._keys)))
+            orders = [order for _, order in projections[begin:end]] + bucket["unsorted"]
+        else:
+            orders = [order for _, order in projections] + bucket["unsorted"]
+
+        return [self._keys[order] for order in sorted(orders)]
+
+
 def build_unique_tables(tables, rtol=default_rtol, atol=default_atol):
     """Return list of unique tables.
 
@@ -98,6 +188,7 @@ def build_unique_tables(tables, rtol=default_rtol, atol=default_atol):
     and a dict of unique table indices for each input table key."""
     unique = []
     mapping = {}
+    index = TableIndex(rtol=rtol, atol=atol)
 
     if isinstance(tables, list):
         keys = list(range(len(tables)))
@@ -107,13 +198,14 @@ def build_unique_tables(tables, rtol=default_rtol, atol=default_atol):
     for k in keys:
         t = tables[k]
         found = -1
-        for i, u in enumerate(unique):
-            if equal_tables(u, t, rtol=rtol, atol=atol):
+        for i in index.candidates(t):
+            if equal_tables(unique[i], t, rtol=rtol, atol=atol):
                 found = i
                 break
         if found == -1:
             i = len(unique)
             unique.append(t)
+            index.add(i, t)
         mapping[k] = i
 
     return unique, mapping
@@ -172,7 +264,7 @@ def get_ffcx_table_values(points, cell, integral_type, ufl_element, avg, entityt
         # Scalar valued element
         for entity in range(num_entities):
             entity_points = map_integral_points(points, integral_type, cell, entity)
-            tbl = fiat_element.tabulate(deriv_order, entity_points)[derivative_counts]
+            tbl = tabulate(fiat_element, deriv_order, entity_points)[derivative_counts]
             component_tables.append(tbl)
     elif len(sh) > 0 and ufl_element.num_sub_elements() == 0:
         # 2-tensor-valued elements, not a tensor product
@@ -182,7 +274,7 @@ def get_ffcx_table_values(points, cell, integral_type, ufl_element, avg, entityt
 
         for entity in range(num_entities):
             entity_points = map_integral_points(points, integral_type, cell, entity)
-            tbl = fiat_element.tabulate(deriv_order, entity_points)[derivative_counts]
+            tbl = tabulate(fiat_element, deriv_order, entity_points)[derivative_counts]
             if len(sh) == 1:
                 component_tables.append(tbl[:, t_comp[0], :])
             elif len(sh) == 2:
@@ -225,7 +317,7 @@ def get_ffcx_table_values(points, cell, integral_type, ufl_element, avg, entityt
             entity_points = map_integral_points(points, integral_type, cell, entity)
 
             # Tabulate subelement, this is dense nonzero table, [a, b, c]
-            tbl = component_element.tabulate(deriv_order, entity_points)[derivative_counts]
+            tbl = tabulate(component_element, deriv_order, entity_points)[derivative_counts]
 
             # Prepare a padded table with zeros
             padded_shape = (fiat_element.space_dimension(),) + fiat_element.value_shape() + (len(entity_points), )
@@ -650,6 +742,83 @@ def analyse_table_types(unique_tables, rtol=default_rtol, atol=default_atol):
     }
 
 
+def get_tensor_product_points(points, rtol=default_rtol, atol=default_atol):
+    """Split points into the points of a tensor product grid along each axis.
+
+    Returns a list of 1D point arrays if the points form a tensor product
+    grid in lexicographic order (first axis slowest), otherwise None.
+    """
+    points = numpy.asarray(points)
+    points1d = []
+    for axis in range(points.shape[1]):
+        p = []
+        for x in points[:, axis]:
+            if not any(numpy.isclose(x, y, rtol=rtol, atol=atol) for y in p):
+                p.append(x)
+        points1d.append(numpy.array(p))
+
+    grid = numpy.array(list(itertools.product(*points1d)))
+    if grid.shape != points.shape or not numpy.allclose(grid, points, rtol=rtol, atol=atol):
+        return None
+    return points1d
+
+
+def get_tensor_factors(points, cell, integral_type, ufl_element, avg, derivative_counts, flat_component,
+                       table, dofmap, rtol=default_rtol, atol=default_atol):
+    """Factorize a table of a Q or DQ element on a quadrilateral or hexahedron into 1D tables.
+
+    The table must be a compressed cell table with dimensions
+    [permutation][entities][points][dofs] and dofmap the element dof
+    for each column.
+
+    Returns the list of 1D tables, one for each reference direction
+    with dimensions [points][dofs], and an array with the table column
+    for each tuple of 1D dof indices. Returns None if the table can not
+    be factorized.
+    """
+    if integral_type != "cell" or avg or cell.cellname() not in ("quadrilateral", "hexahedron"):
+        return None
+
+    # Find scalar component element and its position in the element
+    if ufl_element.value_shape() == ():
+        scalar_element = ufl_element
+        block_size, offset = 1, 0
+    elif isinstance(ufl_element, (ufl.VectorElement, ufl.TensorElement)) and not ufl_element.symmetry():
+        scalar_element = ufl_element.sub_elements()[0]
+        block_size, offset = ufl_element.num_sub_elements(), flat_component
+    else:
+        return None
+    if scalar_element.family() not in ("Q", "DQ"):
+        return None
+
+    factors = tensor_product_factors(create_element(scalar_element))
+    points1d = get_tensor_product_points(points, rtol=rtol, atol=atol)
+    if factors is None or points1d is None or len(factors) != len(points1d):
+        return None
+
+    tables1d = []
+    for factor, p, n in zip(factors, points1d, derivative_counts):
+        tbl = tabulate(factor, n, p.reshape(-1, 1))[(n, )]
+        tables1d.append(clamp_table_small_numbers(numpy.transpose(tbl), rtol=rtol, atol=atol))
+
+    # Values of all tensor product basis functions, FIAT numbers the
+    # dofs of tensor product elements lexicographically
+    values = tables1d[0]
+    for tbl in tables1d[1:]:
+        values = numpy.kron(values, tbl)
+
+    num_dofs = values.shape[1]
+    element_dofs = [block_size * i + offset for i in range(num_dofs)]
+    if table.shape[:2] != (1, 1) or sorted(element_dofs) != sorted(dofmap):
+        return None
+    columns = [dofmap.index(dof) for dof in element_dofs]
+    if not equal_tables(table[0, 0][:, columns], values, rtol=rtol, atol=atol):
+        return None
+
+    dofs = numpy.array(columns).reshape([tbl.shape[1] for tbl in tables1d])
+    return tables1d, dofs
+
+
 def build_optimized_tables(quadrature_rule,
                            cell,
                            integral_type,
@@ -657,7 +826,8 @@ def build_optimized_tables(quadrature_rule,
                            modified_terminals,
                            existing_tables,
                            rtol=default_rtol,
-                           atol=default_atol):
+                           atol=default_atol,
+                           tensor_factorization=False):
 
     # Build tables needed by all modified terminals
     tables, mt_table_names, table_origins = build_element_tables(
@@ -679,6 +849,36 @@ def build_optimized_tables(quadrature_rule,
     # Analyze tables for properties useful for optimization
     unique_table_ttypes = analyse_table_types(unique_tables, rtol=rtol, atol=atol)
 
+    # Factorize tables of arguments into 1D tables where possible,
+    # sharing equal 1D tables
+    tensor_factors = {}
+    factor_tables = {}
+    factor_index = TableIndex(rtol=rtol, atol=atol)
+    for mt, name in mt_table_names.items():
+        if not tensor_factorization or not isinstance(mt.terminal, ufl.classes.Argument) \
+                or name in tensor_factors:
+            continue
+        element, avg, local_derivatives, flat_component = table_origins[name]
+        res = get_tensor_factors(quadrature_rule.points, cell, integral_type, element, avg, local_derivatives,
+                                 flat_component, unique_tables[table_unames[name]], table_dofmaps[name],
+                                 rtol=rtol, atol=atol)
+        if res is None:
+            tensor_factors[name] = None
+            continue
+        tables1d, dofs = res
+        names = []
+        for d, tbl in enumerate(tables1d):
+            fname = "{}_L{}".format(name, d)
+            for ename in factor_index.candidates(tbl):
+                if equal_tables(tbl, factor_tables[ename], rtol=rtol, atol=atol):
+                    fname = ename
+                    break
+            if fname not in factor_tables:
+                factor_tables[fname] = tbl
+                factor_index.add(fname, tbl)
+            names.append(fname)
+        tensor_factors[name] = tensor_factors_t(tuple(names), tuple(factor_tables[n] for n in names), dofs)
+
     # Compress tables that are constant along num_entities or num_points
     for uname, tabletype in unique_table_ttypes.items():
         if tabletype in piecewise_ttypes:
@@ -701,16 +901,18 @@ def build_optimized_tables(quadrature_rule,
     # Change tables to point to existing optimized tables
     # (i.e. tables from other contexts that have been compressed to look the same)
     name_map = {}
-    existing_names = sorted(existing_tables)
+    existing_index = TableIndex(rtol=rtol, atol=atol)
+    for ename in sorted(existing_tables):
+        existing_index.add(ename, existing_tables[ename])
     for uname in sorted(unique_tables):
         utbl = unique_tables[uname]
-        for i, ename in enumerate(existing_names):
+        for ename in existing_index.candidates(utbl):
             etbl = existing_tables[ename]
             if equal_tables(utbl, etbl, rtol=rtol, atol=atol):
                 # Setup table name mapping
                 name_map[uname] = ename
                 # Don't visit this table again (just to avoid the processing)
-                existing_names.pop(i)
+                existing_index.remove(ename, etbl)
                 break
 
     # Replace unique table names
@@ -756,7 +958,7 @@ def build_optimized_tables(quadrature_rule,
         # Store reference to unique table for this mt
         mt_unique_table_reference[mt] = unique_table_reference_t(
             ename, unique_tables[ename], dofrange, dofmap, original_dim, ttype,
-            ttype in piecewise_ttypes, ttype in uniform_ttypes, is_permuted)
+            ttype in piecewise_ttypes, ttype in uniform_ttypes, is_permuted, tensor_factors.get(name))
 
     return (unique_tables, unique_table_ttypes, unique_table_num_dofs,
             mt_unique_table_reference, table_origins, needs_permutation_data)
@@ -18,7 +18,7 @@ from ffcx.ir.analysis.graph import build_scalar_graph
 from ffcx.ir.analysis.modified_terminals import (
     analyse_modified_terminal, is_modified_terminal)
 from ffcx.ir.analysis.visualise import visualise_graph
-from ffcx.ir.elementtables import build_optimized_tables
+from ffcx.ir.elementtables import build_optimized_tables, clamp_table_small_numbers, piecewise_ttypes
 from ufl.algorithms.balancing import balance_modifiers
 from ufl.checks import is_cellwise_constant
 from ufl.classes import QuadratureWeight
@@ -39,9 +39,14 @@ block_data_t = collections.namedtuple("block_data_t",
                                        "name",  # used in "preintegrated" and "premultiplied"
                                        "ma_data",  # used in "full", "safe" and "partial"
                                        "piecewise_ma_index",  # used in "partial"
-                                       "is_permuted"  # Do quad points on facets need to be permuted?
+                                       "is_permuted",  # Do quad points on facets need to be permuted?
+                                       "is_sum_factorized",  # Is block computed from 1D tables of arguments?
+                                       "block_mode"  # "full", "preintegrated" or "premultiplied"
                                        ])
 
+# Integral types supporting blocks computed at compile time
+preintegrated_integral_types = ("cell", "exterior_facet")
+
 
 def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_shape,
                         p, visualise):
@@ -64,6 +69,9 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
     ir["needs_permutation_data"] = 0
 
+    # Names of blocks computed at compile time, shared by quadrature rules
+    precomputed_blocks = {}
+
     for quadrature_rule, integrand in integrands.items():
 
         expression = integrand
@@ -83,9 +91,9 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         # efficiently before argument factorization. We can build
         # terminal_data again after factorization if that's necessary.
 
-        initial_terminals = {i: analyse_modified_terminal(v['expression'])
-                             for i, v in S.nodes.items()
-                             if is_modified_terminal(v['expression'])}
+        initial_terminals = {i: analyse_modified_terminal(v)
+                             for i, v in enumerate(S.column("expression"))
+                             if is_modified_terminal(v)}
 
         (unique_tables, unique_table_types, unique_table_num_dofs,
          mt_unique_table_reference, table_origins,
@@ -97,11 +105,17 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
             initial_terminals.values(),
             ir["unique_tables"],
             rtol=p["table_rtol"],
-            atol=p["table_atol"])
+            atol=p["table_atol"],
+            tensor_factorization=p["sum_factorization"])
 
         if needs_permutation_data:
             ir["needs_permutation_data"] = 1
 
+        # Sizes of the tables and graphs, for reporting
+        statistics = {"num_tables": len(unique_tables),
+                      "table_values": sum(int(numpy.prod(t.shape)) for t in unique_tables.values()),
+                      "graph_size": len(S.nodes)}
+
         for k, v in table_origins.items():
             ir["table_dof_face_tangents"][k] = dof_permutations.face_tangents(v[0])
             ir["table_dof_reflection_entities"][k] = dof_permutations.reflection_entities(v[0])
@@ -114,28 +128,30 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         for td in mt_unique_table_reference.values():
             ir["table_dofmaps"][td.name] = td.dofmap
 
-        S_targets = [i for i, v in S.nodes.items() if v.get('target', False)]
+        S_targets = numpy.flatnonzero(S.column("target")).tolist()
 
         if 'zeros' in unique_table_types.values() and len(S_targets) == 1:
             # If there are any 'zero' tables, replace symbolically and rebuild graph
             #
             # TODO: Implement zero table elimination for non-scalar graphs
+            S_expressions = S.column("expression")
             for i, mt in initial_terminals.items():
                 # Set modified terminals with zero tables to zero
                 tr = mt_unique_table_reference.get(mt)
                 if tr is not None and tr.ttype == "zeros":
-                    S.nodes[i]['expression'] = ufl.as_ufl(0.0)
+                    S_expressions[i] = ufl.as_ufl(0.0)
 
             # Propagate expression changes using dependency list
-            for i, v in S.nodes.items():
-                deps = [S.nodes[j]['expression'] for j in S.out_edges[i]]
+            offsets, indices = S.out_csr()
+            for i, v in enumerate(S_expressions):
+                deps = [S_expressions[j] for j in indices[offsets[i]:offsets[i + 1]]]
                 if deps:
-                    v['expression'] = v['expression']._ufl_expr_reconstruct_(*deps)
+                    S_expressions[i] = v._ufl_expr_reconstruct_(*deps)
 
             # Rebuild scalar target expressions and graph (this may be
             # overkill and possible to optimize away if it turns out to be
             # costly)
-            expression = S.nodes[S_targets[0]]['expression']
+            expression = S_expressions[S_targets[0]]
 
             # Rebuild scalar list-based graph representation
             S = build_scalar_graph(expression)
@@ -147,6 +163,8 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         # Compute factorization of arguments
         rank = len(argument_shape)
         F = compute_argument_factorization(S, rank)
+        statistics["simplified_graph_size"] = len(S.nodes)
+        statistics["factorized_graph_size"] = len(F.nodes)
 
         # Get the 'target' nodes that are factors of arguments, and insert in dict
         FV_targets = [i for i, v in F.nodes.items() if v.get('target', False)]
@@ -179,14 +197,13 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
         # Build set of modified_terminals for each mt factorized vertex in F
         # and attach tables, if appropriate
-        for i, v in F.nodes.items():
-            expr = v['expression']
+        F_mts = F.column("mt")
+        F_trs = F.column("tr")
+        for i, expr in enumerate(F.column("expression")):
             if is_modified_terminal(expr):
                 mt = analyse_modified_terminal(expr)
-                F.nodes[i]['mt'] = mt
-                tr = mt_unique_table_reference.get(mt)
-                if tr is not None:
-                    F.nodes[i]['tr'] = tr
+                F_mts[i] = mt
+                F_trs[i] = mt_unique_table_reference.get(mt)
 
         # Attach 'status' to each node: 'inactive', 'piecewise' or 'varying'
         analyse_dependencies(F, mt_unique_table_reference)
@@ -229,11 +246,51 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
 
             block_is_transposed = False  # FIXME: Handle transposes for these block types
 
+            # Blocks can be computed at compile time from the tables of
+            # the arguments if these are not modified at runtime
+            block_is_precomputable = (rank > 0 and integral_type in preintegrated_integral_types
+                                      and "quadrature" not in ttypes
+                                      and not any(_table_is_permuted(ir, name) for name in unames))
+            if block_is_precomputable and all_factors_piecewise and p["enable_preintegration"]:
+                # Integrate product of arguments and weights here, scale
+                # by the factor in the kernel
+                block_mode = "preintegrated"
+            elif (block_is_precomputable and all(tt in piecewise_ttypes for tt in ttypes)
+                  and p["enable_premultiplication"]):
+                # Multiply arguments here, integrate factor in the kernel
+                block_mode = "premultiplied"
+            else:
+                block_mode = "full"
+
+            block_name = None
+            if block_mode != "full":
+                key = (block_mode, quadrature_rule if block_mode == "preintegrated" else None, unames)
+                block_name = precomputed_blocks.get(key)
+                if block_name is None:
+                    tables = [unique_tables[name] for name in unames]
+                    if block_mode == "preintegrated":
+                        block_name = "PI{}".format(len(precomputed_blocks))
+                        ptable = integrate_block(quadrature_rule.weights, tables)
+                    else:
+                        block_name = "PM{}".format(len(precomputed_blocks))
+                        ptable = multiply_block(tables)
+                    ptable = clamp_table_small_numbers(ptable, rtol=p["table_rtol"], atol=p["table_atol"])
+                    precomputed_blocks[key] = block_name
+                    unique_tables[block_name] = ptable
+                    unique_table_types[block_name] = block_mode
+                    ir["table_dof_face_tangents"][block_name] = []
+                    ir["table_dof_reflection_entities"][block_name] = []
+
+            # Use sum factorization if the tables of all arguments factorize
+            block_is_sum_factorized = (block_mode == "full" and rank > 0
+                                       and all(tr.tensor_factors is not None for tr in trs))
+
             block_unames = unames
             blockdata = block_data_t(ttypes, fi_ci,
                                      all_factors_piecewise, block_unames,
                                      block_restrictions, block_is_transposed,
-                                     block_is_uniform, None, tuple(ma_data), None, block_is_permuted)
+                                     block_is_uniform, block_name, tuple(ma_data), None, block_is_permuted,
+                                     block_is_sum_factorized, block_mode)
 
             # Insert in expr_ir for this quadrature loop
             block_contributions[blockmap].append(blockdata)
@@ -245,10 +302,17 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
             if tr is not None and F.nodes[i]['status'] != 'inactive':
                 active_table_names.add(tr.name)
 
-        # Figure out which table names are referenced in blocks
+        # Figure out which table names are referenced in blocks,
+        # sum factorized blocks only use the 1D tables and
+        # precomputed blocks only their own table
         for blockmap, contributions in itertools.chain(
                 block_contributions.items()):
             for blockdata in contributions:
+                if blockdata.is_sum_factorized:
+                    continue
+                if blockdata.block_mode != "full":
+                    active_table_names.add(blockdata.name)
+                    continue
                 for mad in blockdata.ma_data:
                     active_table_names.add(mad.tabledata.name)
 
@@ -285,10 +349,48 @@ def compute_integral_ir(cell, integral_type, entitytype, integrands, argument_sh
         # Store final ir for this num_points
         ir["integrand"][quadrature_rule] = {"factorization": F,
                                             "modified_arguments": [F.nodes[i]['mt'] for i in argkeys],
-                                            "block_contributions": block_contributions}
+                                            "block_contributions": block_contributions,
+                                            "statistics": statistics}
     return ir
 
 
+def _table_is_permuted(ir, name):
+    """Check if dofs of a table are reflected or rotated at runtime."""
+    reflections = ir["table_dof_reflection_entities"].get(name, [])
+    return (len(ir["table_dof_face_tangents"].get(name, [])) > 0
+            or any(entities is not None for entities in reflections))
+
+
+def integrate_block(weights, tables):
+    """Integrate the product of the tables of the arguments of a block over the reference entity.
+
+    The tables have dimensions [permutation][entities][points][dofs],
+    the result has dimensions [permutation][entities][dofs0]...[dofsN].
+    """
+    num_perms = max(table.shape[0] for table in tables)
+    num_entities = max(table.shape[1] for table in tables)
+    shape = (num_perms, num_entities, len(weights))
+    indices = "abcdefghijklmnopqrstuvwxyz"[:len(tables)]
+    operands = [numpy.broadcast_to(table, shape + table.shape[3:]) for table in tables]
+    subscripts = ",".join(["q"] + ["peq" + i for i in indices]) + "->pe" + indices
+    return numpy.einsum(subscripts, weights, *operands)
+
+
+def multiply_block(tables):
+    """Multiply the piecewise constant tables of the arguments of a block.
+
+    The tables have dimensions [permutation][entities][points][dofs],
+    the result has dimensions [permutation][entities][dofs0]...[dofsN].
+    """
+    num_perms = max(table.shape[0] for table in tables)
+    num_entities = max(table.shape[1] for table in tables)
+    shape = (num_perms, num_entities)
+    indices = "abcdefghijklmnopqrstuvwxyz"[:len(tables)]
+    operands = [numpy.broadcast_to(table[:, :, 0], shape + table.shape[3:]) for table in tables]
+    subscripts = ",".join("pe" + i for i in indices) + "->pe" + indices
+    return numpy.einsum(subscripts, *operands)
+
+
 def analyse_dependencies(F, mt_unique_table_reference):
     # Sets 'status' of all nodes to either: 'inactive', 'piecewise' or 'varying'
     # Children of 'target' nodes are either 'piecewise' or 'varying'.
@@ -297,24 +399,15 @@ def analyse_dependencies(F, mt_unique_table_reference):
     # nodes are also set to 'varying' - any remaining active nodes are 'piecewise'.
 
     # Set targets, and dependencies to 'active'
-    targets = [i for i, v in F.nodes.items() if v.get('target')]
-    for i, v in F.nodes.items():
-        v['status'] = 'inactive'
-
-    while targets:
-        s = targets.pop()
-        F.nodes[s]['status'] = 'active'
-        for j in F.out_edges[s]:
-            if F.nodes[j]['status'] == 'inactive':
-                targets.append(j)
+    targets = [i for i, t in enumerate(F.column("target")) if t]
+    active = F.reachable(targets)
 
     # Build piecewise/varying markers for factorized_vertices
     varying_ttypes = ("varying", "quadrature", "uniform")
     varying_indices = []
-    for i, v in F.nodes.items():
-        if v.get('mt') is None:
+    for i, (expr, mt, tr) in enumerate(zip(F.column("expression"), F.column("mt"), F.column("tr"))):
+        if mt is None:
             continue
-        tr = v.get('tr')
         if tr is not None:
             ttype = tr.ttype
             # Check if table computations have revealed values varying over points
@@ -324,24 +417,20 @@ def analyse_dependencies(F, mt_unique_table_reference):
                 if ttype not in ("fixed", "piecewise", "ones", "zeros"):
                     raise RuntimeError("Invalid ttype %s" % (ttype, ))
 
-        elif not is_cellwise_constant(v['expression']):
+        elif not is_cellwise_constant(expr):
             raise RuntimeError("Error")
             # Keeping this check to be on the safe side,
             # not sure which cases this will cover (if any)
             # varying_indices.append(i)
 
     # Set all parents of active varying nodes to 'varying'
-    while varying_indices:
-        s = varying_indices.pop()
-        if F.nodes[s]['status'] == 'active':
-            F.nodes[s]['status'] = 'varying'
-            for j in F.in_edges[s]:
-                varying_indices.append(j)
+    varying = F.reachable(varying_indices, reverse=True, where=active)
 
     # Any remaining active nodes must be 'piecewise'
-    for i, v in F.nodes.items():
-        if v['status'] == 'active':
-            v['status'] = 'piecewise'
+    status = numpy.full(F.number_of_nodes(), 'inactive', dtype="U9")
+    status[active] = 'piecewise'
+    status[varying] = 'varying'
+    F.set_column("status", status)
 
 
 def replace_quadratureweight(expression):
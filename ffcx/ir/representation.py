@@ -28,6 +28,7 @@ import ufl
 from ffcx import naming
 from ffcx.fiatinterface import SpaceOfReals, create_element
 from ffcx.ir import dof_permutations
+from ffcx.ir.cache import compute_cached_integral_ir, compute_integral_group_signature
 from ffcx.ir.integral import compute_integral_ir
 from ffcx.ir.representationutils import (QuadratureRule,
                                          create_quadrature_points_and_weights)
@@ -82,7 +83,8 @@ ir_integral = namedtuple('ir_integral', ['integral_type', 'subdomain_id',
                                          'coefficient_offsets', 'original_constant_offsets', 'params', 'cell_shape',
                                          'unique_tables', 'unique_table_types', 'table_dofmaps',
                                          'table_dof_face_tangents', 'table_dof_reflection_entities',
-                                         'integrand', 'name', 'precision', 'needs_permutation_data'])
+                                         'integrand', 'name', 'precision', 'needs_permutation_data',
+                                         'nonzero_blocks'])
 ir_tabulate_dof_coordinates = namedtuple('ir_tabulate_dof_coordinates', ['tdim', 'gdim', 'points', 'cell_shape'])
 ir_evaluate_dof = namedtuple('ir_evaluate_dof', ['mappings', 'reference_value_size', 'physical_value_size',
                                                  'geometric_dimension', 'topological_dimension', 'dofs',
@@ -110,15 +112,11 @@ def compute_ir(analysis: namedtuple, object_names, prefix, parameters, visualise
     # Compute object names
     # NOTE: This is done here for performance reasons, because repeated calls
     # within each IR computation would be expensive due to UFL signature computations
-    finite_element_names = {e: naming.finite_element_name(e, prefix) for e in analysis.unique_elements}
-    dofmap_names = {e: naming.dofmap_name(e, prefix) for e in analysis.unique_elements}
-    coordinate_mapping_names = {cmap: naming.coordinate_map_name(
-        cmap, prefix) for cmap in analysis.unique_coordinate_elements}
+    finite_element_names, dofmap_names, coordinate_mapping_names = _compute_object_names(analysis, prefix)
     integral_names = {}
     for fd_index, fd in enumerate(analysis.form_data):
-        for itg_index, itg_data in enumerate(fd.integral_data):
-            integral_names[(fd_index, itg_index)] = naming.integral_name(itg_data.integral_type, fd.original_form,
-                                                                         fd_index, itg_data.subdomain_id)
+        for itg_index, name in enumerate(integral_group_names(fd, fd_index, parameters)):
+            integral_names[(fd_index, itg_index)] = name
 
     ir_elements = [
         _compute_element_ir(e, analysis.element_numbers, finite_element_names, parameters["epsilon"])
@@ -129,10 +127,13 @@ def compute_ir(analysis: namedtuple, object_names, prefix, parameters, visualise
         _compute_dofmap_ir(e, analysis.element_numbers, dofmap_names) for e in analysis.unique_elements
     ]
 
+    # The helper named by the prefix is only defined for the first
+    # coordinate mapping, as several are generated for meshes of
+    # different cells
     ir_coordinate_mappings = [
-        _compute_coordinate_mapping_ir(e, prefix, analysis.element_numbers,
+        _compute_coordinate_mapping_ir(e, prefix if i == 0 else None, analysis.element_numbers,
                                        coordinate_mapping_names, dofmap_names, finite_element_names)
-        for e in analysis.unique_coordinate_elements
+        for i, e in enumerate(analysis.unique_coordinate_elements)
     ]
 
     irs = [
@@ -143,7 +144,8 @@ def compute_ir(analysis: namedtuple, object_names, prefix, parameters, visualise
 
     ir_forms = [
         _compute_form_ir(fd, i, prefix, analysis.element_numbers, finite_element_names,
-                         dofmap_names, coordinate_mapping_names, object_names)
+                         dofmap_names, coordinate_mapping_names, object_names,
+                         [integral_names[(i, j)] for j in range(len(fd.integral_data))])
         for (i, fd) in enumerate(analysis.form_data)
     ]
 
@@ -156,6 +158,58 @@ def compute_ir(analysis: namedtuple, object_names, prefix, parameters, visualise
                    expressions=ir_expressions)
 
 
+def compute_integral_group_ir(analysis: namedtuple, form_index, itg_data_index, prefix, parameters, visualise):
+    """Compute intermediate representation of a single group of integrals of a form.
+
+    The result is the same as the corresponding entry of the integrals
+    computed by compute_ir.
+    """
+    fd = analysis.form_data[form_index]
+    integral_names = {(form_index, itg_data_index): integral_group_name(fd, form_index, itg_data_index, parameters)}
+    return _compute_integral_group_ir(fd, form_index, itg_data_index, prefix, analysis.element_numbers,
+                                      integral_names, parameters, visualise)
+
+
+def compute_form_ir(analysis: namedtuple, form_index, object_names, prefix, parameters):
+    """Compute intermediate representation of a single form.
+
+    The result is the same as the corresponding entry of the forms
+    computed by compute_ir.
+    """
+    fd = analysis.form_data[form_index]
+    finite_element_names, dofmap_names, coordinate_mapping_names = _compute_object_names(analysis, prefix)
+    return _compute_form_ir(fd, form_index, prefix, analysis.element_numbers, finite_element_names, dofmap_names,
+                            coordinate_mapping_names, object_names, integral_group_names(fd, form_index, parameters))
+
+
+def integral_group_name(form_data, form_index, itg_data_index, parameters):
+    """Compute the name of a group of integrals of a form.
+
+    With a code cache, the name is computed from the signature of the
+    code of the integral group instead of the whole form, such that it
+    does not change when other integrals of the form are changed.
+    """
+    itg_data = form_data.integral_data[itg_data_index]
+    if parameters["code_cache_dir"]:
+        signature = compute_integral_group_signature(form_data, form_index, itg_data_index, parameters)
+        return "integral_{}_{}_{}".format(itg_data.integral_type, itg_data.subdomain_id, signature)
+    return naming.integral_name(itg_data.integral_type, form_data.original_form, form_index, itg_data.subdomain_id)
+
+
+def integral_group_names(form_data, form_index, parameters):
+    """Compute the names of all groups of integrals of a form."""
+    return [integral_group_name(form_data, form_index, i, parameters) for i in range(len(form_data.integral_data))]
+
+
+def _compute_object_names(analysis, prefix):
+    """Compute names of finite elements, dofmaps and coordinate mappings."""
+    finite_element_names = {e: naming.finite_element_name(e, prefix) for e in analysis.unique_elements}
+    dofmap_names = {e: naming.dofmap_name(e, prefix) for e in analysis.unique_elements}
+    coordinate_mapping_names = {cmap: naming.coordinate_map_name(
+        cmap, prefix) for cmap in analysis.unique_coordinate_elements}
+    return finite_element_names, dofmap_names, coordinate_mapping_names
+
+
 def _compute_element_ir(ufl_element, element_numbers, finite_element_names, epsilon):
     """Compute intermediate representation of element."""
 
@@ -371,6 +425,15 @@ def _num_global_support_dofs(fiat_element):
 def _compute_integral_ir(form_data, form_index, prefix, element_numbers, integral_names,
                          parameters, visualise):
     """Compute intermediate represention for form integrals."""
+    # Iterate over groups of integrals
+    return [_compute_integral_group_ir(form_data, form_index, itg_data_index, prefix, element_numbers,
+                                       integral_names, parameters, visualise)
+            for itg_data_index in range(len(form_data.integral_data))]
+
+
+def _compute_integral_group_ir(form_data, form_index, itg_data_index, prefix, element_numbers, integral_names,
+                               parameters, visualise):
+    """Compute intermediate represention for a group of form integrals."""
 
     _entity_types = {
         "cell": "cell",
@@ -380,168 +443,213 @@ def _compute_integral_ir(form_data, form_index, prefix, element_numbers, integra
         "custom": "cell"
     }
 
-    # Iterate over groups of integrals
-    irs = []
-    for itg_data_index, itg_data in enumerate(form_data.integral_data):
-
-        logger.info("Computing IR for integral in integral group {}".format(itg_data_index))
-
-        # Compute representation
-        entitytype = _entity_types[itg_data.integral_type]
-        cell = itg_data.domain.ufl_cell()
-        cellname = cell.cellname()
-        tdim = cell.topological_dimension()
-        assert all(tdim == itg.ufl_domain().topological_dimension() for itg in itg_data.integrals)
-
-        ir = {
-            "integral_type": itg_data.integral_type,
-            "subdomain_id": itg_data.subdomain_id,
-            "rank": form_data.rank,
-            "geometric_dimension": form_data.geometric_dimension,
-            "topological_dimension": tdim,
-            "entitytype": entitytype,
-            "num_facets": cell.num_facets(),
-            "num_vertices": cell.num_vertices(),
-            "needs_oriented": form_needs_oriented_jacobian(form_data),
-            "enabled_coefficients": itg_data.enabled_coefficients,
-            "cell_shape": cellname
-        }
+    itg_data = form_data.integral_data[itg_data_index]
 
-        # Get element space dimensions
-        unique_elements = element_numbers.keys()
-        ir["element_dimensions"] = {
-            ufl_element: create_element(ufl_element).space_dimension()
-            for ufl_element in unique_elements
-        }
+    logger.info("Computing IR for integral in integral group {}".format(itg_data_index))
 
-        ir["element_ids"] = {
-            ufl_element: i
-            for i, ufl_element in enumerate(unique_elements)
-        }
+    # Compute representation
+    entitytype = _entity_types[itg_data.integral_type]
+    cell = itg_data.domain.ufl_cell()
+    cellname = cell.cellname()
+    tdim = cell.topological_dimension()
+    assert all(tdim == itg.ufl_domain().topological_dimension() for itg in itg_data.integrals)
+
+    ir = {
+        "integral_type": itg_data.integral_type,
+        "subdomain_id": itg_data.subdomain_id,
+        "rank": form_data.rank,
+        "geometric_dimension": form_data.geometric_dimension,
+        "topological_dimension": tdim,
+        "entitytype": entitytype,
+        "num_facets": cell.num_facets(),
+        "num_vertices": cell.num_vertices(),
+        "needs_oriented": form_needs_oriented_jacobian(form_data),
+        "enabled_coefficients": itg_data.enabled_coefficients,
+        "cell_shape": cellname
+    }
+
+    # Get element space dimensions
+    unique_elements = element_numbers.keys()
+    ir["element_dimensions"] = {
+        ufl_element: create_element(ufl_element).space_dimension()
+        for ufl_element in unique_elements
+    }
 
-        # Create dimensions of primary indices, needed to reset the argument
-        # 'A' given to tabulate_tensor() by the assembler.
-        argument_dimensions = [
-            ir["element_dimensions"][ufl_element] for ufl_element in form_data.argument_elements
-        ]
+    ir["element_ids"] = {
+        ufl_element: i
+        for i, ufl_element in enumerate(unique_elements)
+    }
+
+    # Create dimensions of primary indices, needed to reset the argument
+    # 'A' given to tabulate_tensor() by the assembler.
+    argument_dimensions = [
+        ir["element_dimensions"][ufl_element] for ufl_element in form_data.argument_elements
+    ]
 
-        # Compute shape of element tensor
-        if ir["integral_type"] == "interior_facet":
-            ir["tensor_shape"] = [2 * dim for dim in argument_dimensions]
+    # Compute shape of element tensor
+    if ir["integral_type"] == "interior_facet":
+        ir["tensor_shape"] = [2 * dim for dim in argument_dimensions]
+    else:
+        ir["tensor_shape"] = argument_dimensions
+
+    integral_type = itg_data.integral_type
+    cell = itg_data.domain.ufl_cell()
+
+    # Group integrands with the same quadrature rule
+    grouped_integrands = {}
+    for integral in itg_data.integrals:
+        md = integral.metadata() or {}
+        scheme = md["quadrature_rule"]
+        degree = md["quadrature_degree"]
+
+        if scheme == "custom":
+            points = md["quadrature_points"]
+            weights = md["quadrature_weights"]
+        elif scheme == "vertex":
+            # FIXME: Could this come from FIAT?
+            #
+            # The vertex scheme, i.e., averaging the function value in the
+            # vertices and multiplying with the simplex volume, is only of
+            # order 1 and inferior to other generic schemes in terms of
+            # error reduction. Equation systems generated with the vertex
+            # scheme have some properties that other schemes lack, e.g., the
+            # mass matrix is a simple diagonal matrix. This may be
+            # prescribed in certain cases.
+            if degree > 1:
+                warnings.warn(
+                    "Explicitly selected vertex quadrature (degree 1), but requested degree is {}.".
+                    format(degree))
+            if cellname == "tetrahedron":
+                points, weights = (numpy.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0],
+                                                [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]),
+                                   numpy.array([1.0 / 24.0, 1.0 / 24.0, 1.0 / 24.0, 1.0 / 24.0]))
+            elif cellname == "triangle":
+                points, weights = (numpy.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]]),
+                                   numpy.array([1.0 / 6.0, 1.0 / 6.0, 1.0 / 6.0]))
+            elif cellname == "interval":
+                # Trapezoidal rule
+                return (numpy.array([[0.0], [1.0]]), numpy.array([1.0 / 2.0, 1.0 / 2.0]))
         else:
-            ir["tensor_shape"] = argument_dimensions
-
-        integral_type = itg_data.integral_type
-        cell = itg_data.domain.ufl_cell()
-
-        # Group integrands with the same quadrature rule
-        grouped_integrands = {}
-        for integral in itg_data.integrals:
-            md = integral.metadata() or {}
-            scheme = md["quadrature_rule"]
-            degree = md["quadrature_degree"]
-
-            if scheme == "custom":
-                points = md["quadrature_points"]
-                weights = md["quadrature_weights"]
-            elif scheme == "vertex":
-                # FIXME: Could this come from FIAT?
-                #
-                # The vertex scheme, i.e., averaging the function value in the
-                # vertices and multiplying with the simplex volume, is only of
-                # order 1 and inferior to other generic schemes in terms of
-                # error reduction. Equation systems generated with the vertex
-                # scheme have some properties that other schemes lack, e.g., the
-                # mass matrix is a simple diagonal matrix. This may be
-                # prescribed in certain cases.
-                if degree > 1:
-                    warnings.warn(
-                        "Explicitly selected vertex quadrature (degree 1), but requested degree is {}.".
-                        format(degree))
-                if cellname == "tetrahedron":
-                    points, weights = (numpy.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0],
-                                                    [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]),
-                                       numpy.array([1.0 / 24.0, 1.0 / 24.0, 1.0 / 24.0, 1.0 / 24.0]))
-                elif cellname == "triangle":
-                    points, weights = (numpy.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]]),
-                                       numpy.array([1.0 / 6.0, 1.0 / 6.0, 1.0 / 6.0]))
-                elif cellname == "interval":
-                    # Trapezoidal rule
-                    return (numpy.array([[0.0], [1.0]]), numpy.array([1.0 / 2.0, 1.0 / 2.0]))
-            else:
-                (points, weights) = create_quadrature_points_and_weights(integral_type, cell, degree,
-                                                                         scheme)
+            (points, weights) = create_quadrature_points_and_weights(integral_type, cell, degree,
+                                                                     scheme)
 
-            points = numpy.asarray(points)
-            weights = numpy.asarray(weights)
+        points = numpy.asarray(points)
+        weights = numpy.asarray(weights)
 
-            rule = QuadratureRule(points, weights)
+        rule = QuadratureRule(points, weights)
 
-            if rule not in grouped_integrands:
-                grouped_integrands[rule] = []
+        if rule not in grouped_integrands:
+            grouped_integrands[rule] = []
 
-            grouped_integrands[rule].append(integral.integrand())
+        grouped_integrands[rule].append(integral.integrand())
 
-        sorted_integrals = {}
-        for rule, integrands in grouped_integrands.items():
-            integrands_summed = sorted_expr_sum(integrands)
+    sorted_integrals = {}
+    for rule, integrands in grouped_integrands.items():
+        integrands_summed = sorted_expr_sum(integrands)
 
-            integral_new = Integral(integrands_summed, itg_data.integral_type, itg_data.domain,
-                                    itg_data.subdomain_id, {}, None)
-            sorted_integrals[rule] = integral_new
+        integral_new = Integral(integrands_summed, itg_data.integral_type, itg_data.domain,
+                                itg_data.subdomain_id, {}, None)
+        sorted_integrals[rule] = integral_new
 
-        # TODO: See if coefficient_numbering can be removed
-        # Build coefficient numbering for UFC interface here, to avoid
-        # renumbering in UFL and application of replace mapping
-        coefficient_numbering = {}
-        for i, f in enumerate(form_data.reduced_coefficients):
-            coefficient_numbering[f] = i
+    # TODO: See if coefficient_numbering can be removed
+    # Build coefficient numbering for UFC interface here, to avoid
+    # renumbering in UFL and application of replace mapping
+    coefficient_numbering = {}
+    for i, f in enumerate(form_data.reduced_coefficients):
+        coefficient_numbering[f] = i
 
-        # Add coefficient numbering to IR
-        ir["coefficient_numbering"] = coefficient_numbering
+    # Add coefficient numbering to IR
+    ir["coefficient_numbering"] = coefficient_numbering
 
-        index_to_coeff = sorted([(v, k) for k, v in coefficient_numbering.items()])
-        offsets = {}
-        width = 2 if integral_type in ("interior_facet") else 1
-        _offset = 0
-        for k, el in zip(index_to_coeff, form_data.coefficient_elements):
-            offsets[k[1]] = _offset
-            _offset += width * ir["element_dimensions"][el]
+    index_to_coeff = sorted([(v, k) for k, v in coefficient_numbering.items()])
+    offsets = {}
+    width = 2 if integral_type in ("interior_facet") else 1
+    _offset = 0
+    for k, el in zip(index_to_coeff, form_data.coefficient_elements):
+        offsets[k[1]] = _offset
+        _offset += width * ir["element_dimensions"][el]
 
-        # Copy offsets also into IR
-        ir["coefficient_offsets"] = offsets
+    # Copy offsets also into IR
+    ir["coefficient_offsets"] = offsets
+
+    # Build offsets for Constants
+    original_constant_offsets = {}
+    _offset = 0
+    for constant in form_data.original_form.constants():
+        original_constant_offsets[constant] = _offset
+        _offset += numpy.product(constant.ufl_shape, dtype=numpy.int)
 
-        # Build offsets for Constants
-        original_constant_offsets = {}
-        _offset = 0
-        for constant in form_data.original_form.constants():
-            original_constant_offsets[constant] = _offset
-            _offset += numpy.product(constant.ufl_shape, dtype=numpy.int)
+    ir["original_constant_offsets"] = original_constant_offsets
 
-        ir["original_constant_offsets"] = original_constant_offsets
+    ir["precision"] = itg_data.metadata["precision"]
 
-        ir["precision"] = itg_data.metadata["precision"]
+    # Create map from number of quadrature points -> integrand
+    integrands = {rule: integral.integrand() for rule, integral in sorted_integrals.items()}
 
-        # Create map from number of quadrature points -> integrand
-        integrands = {rule: integral.integrand() for rule, integral in sorted_integrals.items()}
+    # Block modes specified in metadata of the integrals override the
+    # parameters
+    parameters = dict(parameters)
+    for mode in ("enable_preintegration", "enable_premultiplication"):
+        if itg_data.metadata.get(mode) is not None:
+            parameters[mode] = itg_data.metadata[mode]
 
-        # Build more specific intermediate representation
+    # Build more specific intermediate representation
+    if parameters["ir_cache_dir"]:
+        integral_ir = compute_cached_integral_ir(parameters["ir_cache_dir"], itg_data.domain.ufl_cell(),
+                                                 itg_data.integral_type, ir["entitytype"], integrands,
+                                                 ir["tensor_shape"], parameters, visualise)
+    else:
         integral_ir = compute_integral_ir(itg_data.domain.ufl_cell(), itg_data.integral_type,
                                           ir["entitytype"], integrands, ir["tensor_shape"],
                                           parameters, visualise)
 
-        ir.update(integral_ir)
+    ir.update(integral_ir)
+
+    ir["nonzero_blocks"] = _compute_nonzero_blocks(form_data.argument_elements, ir)
+
+    # Fetch name
+    ir["name"] = integral_names[(form_index, itg_data_index)]
+
+    return ir_integral(**ir)
 
-        # Fetch name
-        ir["name"] = integral_names[(form_index, itg_data_index)]
 
-        irs.append(ir_integral(**ir))
+def _sub_element_ranges(ufl_element, dim):
+    """Compute the ranges of dofs of the sub-elements of an argument element."""
+    if isinstance(ufl_element, ufl.MixedElement):
+        dims = [create_element(sub_element).space_dimension() for sub_element in ufl_element.sub_elements()]
+        if sum(dims) == dim:
+            offsets = numpy.cumsum([0] + dims)
+            return [(int(begin), int(end)) for begin, end in zip(offsets[:-1], offsets[1:]) if end > begin]
+    return [(0, dim)]
+
 
-    return irs
+def _compute_nonzero_blocks(argument_elements, ir):
+    """Compute the blocks of the element tensor with nonzero entries.
+
+    The blocks are products of dof ranges of the sub-elements of the
+    arguments, and of their restrictions for interior facet integrals.
+    A block is nonzero if any block contribution of the integral
+    touches it.
+    """
+    ranges = []
+    for ufl_element, dim in zip(argument_elements, ir["tensor_shape"]):
+        num_restrictions = 2 if ir["integral_type"] == "interior_facet" else 1
+        element_dim = dim // num_restrictions
+        ranges.append([(r * element_dim + begin, r * element_dim + end)
+                       for r in range(num_restrictions)
+                       for begin, end in _sub_element_ranges(ufl_element, element_dim)])
+
+    nonzero_blocks = set()
+    for integrand in ir["integrand"].values():
+        for blockmap in integrand["block_contributions"]:
+            touched = [[r for r in axis_ranges if any(r[0] <= dof < r[1] for dof in bm)]
+                       for axis_ranges, bm in zip(ranges, blockmap)]
+            nonzero_blocks.update(itertools.product(*touched))
+    return sorted(nonzero_blocks)
 
 
 def _compute_form_ir(form_data, form_id, prefix, element_numbers, finite_element_names,
-                     dofmap_names, coordinate_mapping_names, object_names):
+                     dofmap_names, coordinate_mapping_names, object_names, integral_names):
     """Compute intermediate representation of form."""
 
     logger.info("Computing IR for form {}".format(form_id))
@@ -596,7 +704,7 @@ def _compute_form_ir(form_data, form_id, prefix, element_numbers, finite_element
     # Create integral ids and names using form prefix (integrals are
     # always generated as part of form so don't get their own prefix)
     for integral_type in ufc_integral_types:
-        irdata = _create_foo_integral(prefix, form_id, integral_type, form_data)
+        irdata = _create_foo_integral(integral_type, form_data, integral_names)
         ir["create_{}_integral".format(integral_type)] = irdata
         ir["get_{}_integral_ids".format(integral_type)] = irdata
 
@@ -988,28 +1096,26 @@ def _tabulate_dof_coordinates(ufl_element, element):
         cell_shape=cell.cellname())
 
 
-def _create_foo_integral(prefix, form_id, integral_type, form_data):
+def _create_foo_integral(integral_type, form_data, integral_names):
     """Compute intermediate representation of create_foo_integral."""
     subdomain_ids = []
     classnames = []
-    itg_data = [itg_data for itg_data in form_data.integral_data
-                if (itg_data.integral_type == integral_type and itg_data.subdomain_id == "otherwise")]
+    default_indices = [i for i, itg_data in enumerate(form_data.integral_data)
+                       if (itg_data.integral_type == integral_type and itg_data.subdomain_id == "otherwise")]
 
-    if len(itg_data) > 1:
+    if len(default_indices) > 1:
         raise RuntimeError("Expecting at most one default integral of each type.")
-    elif len(itg_data) == 1:
+    elif len(default_indices) == 1:
         subdomain_ids += [-1]
-        classnames += [naming.integral_name(integral_type, form_data.original_form,
-                                            form_id, "otherwise")]
+        classnames += [integral_names[default_indices[0]]]
 
-    for itg_data in form_data.integral_data:
+    for i, itg_data in enumerate(form_data.integral_data):
         if isinstance(itg_data.subdomain_id, int):
             if itg_data.subdomain_id < 0:
                 raise ValueError("Integral subdomain ID must be non-negative, not {}".format(itg_data.subdomain_id))
             if (itg_data.integral_type == integral_type):
                 subdomain_ids += [itg_data.subdomain_id]
-                classnames += [naming.integral_name(integral_type, form_data.original_form,
-                                                    form_id, itg_data.subdomain_id)]
+                classnames += [integral_names[i]]
 
     return subdomain_ids, classnames
 
@@ -32,6 +32,13 @@ class QuadratureRule:
     def __eq__(self, other):
         return numpy.allclose(self.points, other.points) and numpy.allclose(self.weights, other.weights)
 
+    def __getstate__(self):
+        # The hash object cannot be pickled, it is recreated on demand
+        return {"points": self.points, "weights": self.weights}
+
+    def __setstate__(self, state):
+        self.__init__(state["points"], state["weights"])
+
     def id(self):
         """Returns unique deterministic identifier.
 
@@ -41,6 +48,7 @@ class QuadratureRule:
         in generated code.
 
         """
+        hash(self)
         return self.hash_obj.hexdigest()[-3:]
 
 
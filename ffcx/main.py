@@ -10,14 +10,17 @@ Parse command-line arguments and generate code from input UFL form files.
 
 import argparse
 import cProfile
+import json
 import logging
+import os
 import pathlib
 import re
 import string
+import subprocess
 
 import ufl
 from ffcx import __version__ as FFCX_VERSION
-from ffcx import compiler, formatting
+from ffcx import codegeneration, compiler, formatting
 from ffcx.parameters import FFCX_PARAMETERS, default_parameters
 
 logger = logging.getLogger("ffcx")
@@ -30,6 +33,18 @@ parser.add_argument("-v", "--verbosity", action="count", help="verbose output (-
 parser.add_argument("-o", "--output-directory", type=str, default=".", help="output directory")
 parser.add_argument("--visualise", action="store_true", help="visualise the IR graph")
 parser.add_argument("-p", "--profile", action='store_true', help="enable profiling")
+parser.add_argument("-j", "--num-workers", type=int, default=1,
+                    help="number of processes compiling integrals and forms in parallel")
+parser.add_argument("--report", type=str, default=None,
+                    help="write a JSON report of compile times and estimated kernel costs to this file")
+parser.add_argument("--library", type=str, default=None,
+                    help="compile all files into one shared library lib<LIBRARY>.so with an index of the forms")
+parser.add_argument("--cc", type=str, default=os.environ.get("CC", "cc"),
+                    help="C compiler building the shared library")
+parser.add_argument("--cflags", type=str, default="-O2", help="flags of the C compiler building the shared library")
+parser.add_argument("--blas-flags", type=str, default="-lblas",
+                    help="compiler and linker flags of the CBLAS library, used by the shared library if block_gemm "
+                    "is 'cblas'")
 
 # Add all parameters from FFC parameter system
 for param_name, (param_val, param_desc) in FFCX_PARAMETERS.items():
@@ -53,18 +68,23 @@ def main(args=None):
     for param_name, param_val in parameters.items():
         parameters[param_name] = xargs.__dict__.get(param_name)
 
-    # Call parser and compiler for each file
     for filename in xargs.ufl_file:
-        file = pathlib.Path(filename)
-        if file.suffix != ".ufl":
+        if pathlib.Path(filename).suffix != ".ufl":
             logger.error("Expecting a UFL form file (.ufl).")
             return 1
 
-        # Remove weird characters (file system allows more than the C
-        # preprocessor)
-        prefix = file.stem
-        prefix = re.subn("[^{}]".format(string.ascii_letters + string.digits + "_"), "!", prefix)[0]
-        prefix = re.subn("!+", "_", prefix)[0]
+    # Reports of each file, or of the library
+    reports = {}
+
+    if xargs.library is not None:
+        status = _compile_library(xargs, parameters, reports)
+        _write_report(xargs, reports)
+        return status
+
+    # Call parser and compiler for each file
+    for filename in xargs.ufl_file:
+        prefix = _file_prefix(filename)
+        report = reports.setdefault(prefix, {}) if xargs.report else None
 
         # Turn on profiling
         if xargs.profile:
@@ -74,16 +94,12 @@ def main(args=None):
         # Load UFL file
         ufd = ufl.algorithms.load_ufl_file(filename)
 
-        # Generate code
-        if len(ufd.forms) > 0:
-            code_h, code_c = compiler.compile_ufl_objects(
-                ufd.forms, ufd.object_names, prefix=prefix, parameters=parameters, visualise=xargs.visualise)
-        else:
-            code_h, code_c = compiler.compile_ufl_objects(
-                ufd.elements, ufd.object_names, prefix=prefix, parameters=parameters, visualise=xargs.visualise)
-
-        # Write to file
-        formatting.write_code(code_h, code_c, prefix, xargs.output_directory)
+        # Generate code and write it to file as it is formatted
+        ufl_objects = ufd.forms if len(ufd.forms) > 0 else ufd.elements
+        with formatting.open_code_files(prefix, xargs.output_directory) as files:
+            compiler.compile_ufl_objects(
+                ufl_objects, ufd.object_names, prefix=prefix, parameters=parameters, visualise=xargs.visualise,
+                num_workers=xargs.num_workers, report=report, files=files)
 
         # Turn off profiling and write status to file
         if xargs.profile:
@@ -91,4 +107,54 @@ def main(args=None):
             pfn = "ffcx_{0}.profile".format(prefix)
             pr.dump_stats(pfn)
 
+    _write_report(xargs, reports)
+
+    return 0
+
+
+def _file_prefix(filename):
+    """Return the prefix of the code generated for a UFL file."""
+    # Remove weird characters (file system allows more than the C
+    # preprocessor)
+    prefix = pathlib.Path(filename).stem
+    prefix = re.subn("[^{}]".format(string.ascii_letters + string.digits + "_"), "!", prefix)[0]
+    prefix = re.subn("!+", "_", prefix)[0]
+    return prefix
+
+
+def _write_report(xargs, reports):
+    """Write reports of the compilation to file."""
+    if xargs.report:
+        with open(xargs.report, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+def _compile_library(xargs, parameters, reports):
+    """Compile all UFL files into one shared library."""
+    ufl_files = [(_file_prefix(filename), ufl.algorithms.load_ufl_file(filename)) for filename in xargs.ufl_file]
+    prefixes = [prefix for prefix, _ in ufl_files]
+    if len(set(prefixes)) != len(prefixes):
+        logger.error("UFL files of a library must have distinct names.")
+        return 1
+
+    report = reports.setdefault(xargs.library, {}) if xargs.report else None
+    with formatting.open_code_files(xargs.library, xargs.output_directory) as files:
+        compiler.compile_ufl_library(ufl_files, xargs.library, parameters=parameters,
+                                     num_workers=xargs.num_workers, report=report, files=files)
+
+    # Build shared library
+    output_dir = pathlib.Path(xargs.output_directory)
+    cmd = [xargs.cc, "-shared", "-fPIC"] + xargs.cflags.split() + [
+        "-I", codegeneration.get_include_path(),
+        "-o", str(output_dir.joinpath("lib{}.so".format(xargs.library))),
+        str(output_dir.joinpath(xargs.library + ".c"))]
+    if parameters["block_gemm"] == "cblas":
+        cmd += xargs.blas_flags.split()
+    logger.info("Building shared library: {}".format(" ".join(cmd)))
+    try:
+        subprocess.run(cmd, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.error("Failed to build shared library: {}".format(e))
+        return 1
+
     return 0
@@ -21,6 +21,10 @@ FFCX_PARAMETERS = {
         (1e-14, "Machine precision, used for dropping zero terms in tables"),
     "scalar_type":
         ("double", "Scalar type used in generated code. Any of real or complex C floating-point types."),
+    "compute_type":
+        ("", """Real floating-point type of tables, quadrature weights, geometry and intermediate values in
+                kernels, while element tensors are accumulated in scalar_type. Any of float, double and
+                long double. (empty means the real type of scalar_type)"""),
     "tabulate_tensor_void":
         (False, "True to generate empty tabulation kernels."),
     "table_rtol":
@@ -35,7 +39,55 @@ FFCX_PARAMETERS = {
                This value must be compatible with alignment of data structures allocated outside FFC.
                (-1 means no alignment assumed, safe option)"""),
     "padlen":
-        (1, "Pads every declared array in tabulation kernel such that its last dimension is divisible by given value.")
+        (1, "Pads every declared array in tabulation kernel such that its last dimension is divisible by given value."),
+    "sum_factorization":
+        (False, "Use sum factorization for arguments with Q or DQ elements on quadrilaterals and hexahedra."),
+    "enable_preintegration":
+        (False, """Compute blocks of the element tensor with piecewise constant factors at compile time,
+                such that kernels only scale them. Can be set per integral in its metadata."""),
+    "enable_premultiplication":
+        (False, """Compute products of piecewise constant argument tables at compile time, such that
+                kernels only integrate the factor. Can be set per integral in its metadata."""),
+    "tile_size":
+        (0, """Size of the tiles of rank 2 blocks of the element tensor which are accumulated over all
+                quadrature points in local arrays. (0 means no tiling)"""),
+    "block_gemm":
+        ("none", """Compute large rank 2 blocks of the element tensor as matrix products of argument tables
+                scaled by the integrand, in generated loops ('loops') or by calls to CBLAS ('cblas', the
+                generated code includes cblas.h and needs to be linked with a CBLAS library, see --blas-flags
+                for shared libraries built with --library). ('none' means no matrix products)"""),
+    "gemm_threshold":
+        (4096, """Minimum number of multiply-adds (block dimensions times number of quadrature points) of
+                blocks computed as matrix products with block_gemm."""),
+    "simd_width":
+        (0, """Number of values of the GCC vector extension types in which the innermost dofs of blocks
+                of the element tensor are accumulated. Setting padlen to a multiple of it lets the
+                remaining dofs of a block use vectors too. (0 means scalar code)"""),
+    "sparse_element_tensor":
+        (False, """Set the entries of the nonzero blocks of the element tensor in kernels instead of adding to
+                them, such that callers need not zero the element tensor. Other entries are not written."""),
+    "tabulate_action":
+        (False, """Generate kernels applying the element tensors of bilinear forms to vectors, which evaluate
+                the vector in the quadrature points instead of forming the element tensors."""),
+    "tabulate_diagonal":
+        (False, """Generate kernels computing only the diagonal of the element tensors of bilinear forms with
+                equal test and trial spaces, e.g. for Jacobi preconditioning."""),
+    "fused_cell_integrals":
+        (False, """Generate a kernel for each form tabulating all its cell integrals at once, which computes
+                tables and geometry shared by the integrals only once."""),
+    "hexfloat_tables":
+        (False, """Write the values of static tables of integrals and expressions as hexadecimal floating point
+                literals, which are exact and faster to format and to parse by C compilers than decimal literals."""),
+    "batch_size":
+        (0, """Number of cells processed together by batched tabulation kernels.
+                (0 means no batched kernels are generated)"""),
+    "ir_cache_dir":
+        ("", """Directory in which the intermediate representation of integrals is cached between runs.
+                (empty means no caching)"""),
+    "code_cache_dir":
+        ("", """Directory in which the generated code of integral groups is cached between runs. Integrals are
+                then named by a signature of their own code instead of the form, such that the code of
+                integral groups which are unchanged when a form is edited is reused. (empty means no caching)""")
 }
 
 
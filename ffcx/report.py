@@ -0,0 +1,163 @@
+# Copyright (C) 2020 The FEniCS Project
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+"""Report of compile times and of the cost of generated kernels.
+
+The report is a dictionary of plain Python types, which can be written
+as JSON. It contains the time spent in each compiler stage, and for
+each form and integral the time spent computing its intermediate
+representation and generating its code. For each integral it contains
+the sizes of the element tables and of the expression graphs, and
+static estimates of the cost of its tabulate_tensor function and of
+its batched, action and diagonal kernels if they are generated.
+
+The cost estimates count the operations of the C syntax tree of the
+kernel, multiplied by the trip counts of the loops around them:
+
+flops
+    Floating point additions, subtractions, multiplications and
+    divisions, and calls to math functions.
+memory_accesses
+    Reads and writes of array elements.
+table_bytes
+    Size of the static tables of the kernel.
+
+Both branches of conditionals are counted, and the most expensive case
+of switch statements, such that the estimates are upper bounds for the
+code executed per cell. Loops with trip counts unknown at compile time
+are counted once, so the cost of a batched kernel is that of a full
+batch of cells and of one cell of the last partial batch.
+"""
+
+import numpy
+
+import ffcx.codegeneration.C.cnodes as L
+
+# Size in bytes of the types of static tables
+_type_sizes = {"long double": 16, "double": 8, "float": 4, "int": 4, "bool": 1}
+
+
+def integral_report(ir, kernels, ir_time, code_time):
+    """Report the sizes of the intermediate representation and the cost of the kernels of an integral.
+
+    The kernels are the syntax trees of the kernel bodies by kernel
+    name, as returned by the integral code generator.
+    """
+    report = {"name": ir.name,
+              "integral_type": ir.integral_type,
+              "subdomain_id": ir.subdomain_id,
+              "time": {"representation": ir_time, "code_generation": code_time}}
+
+    report["quadrature_rules"] = []
+    for rule, integrand in ir.integrand.items():
+        rule_report = {"num_points": int(rule.points.shape[0])}
+        rule_report.update(integrand.get("statistics", {}))
+        report["quadrature_rules"].append(rule_report)
+
+    report["num_tables"] = len(ir.unique_tables)
+    report["table_values"] = sum(int(numpy.prod(t.shape)) for t in ir.unique_tables.values())
+
+    if ir.integral_type == "custom":
+        # Custom integrals tabulate at runtime points
+        report["cost"] = None
+        report["kernel_costs"] = {}
+    else:
+        report["cost"] = estimate_cost(kernels["tabulate_tensor"])
+        report["kernel_costs"] = {name: estimate_cost(parts) for name, parts in kernels.items()
+                                  if name != "tabulate_tensor"}
+
+    return report
+
+
+def form_report(ir, ir_time, code_time):
+    """Report the time spent on a form, excluding its integrals."""
+    return {"name": ir.name_from_uflfile,
+            "time": {"representation": ir_time, "code_generation": code_time}}
+
+
+def estimate_cost(node):
+    """Estimate the number of floating point operations, memory accesses and table bytes of C code."""
+    flops, memory_accesses, table_bytes = _statement_cost(node)
+    return {"flops": flops, "memory_accesses": memory_accesses, "table_bytes": table_bytes}
+
+
+def _statement_cost(node):
+    """Return the operation counts of a statement."""
+    if isinstance(node, (list, tuple)):
+        return _sum_costs(_statement_cost(s) for s in node)
+    elif isinstance(node, L.StatementList):
+        return _sum_costs(_statement_cost(s) for s in node.statements)
+    elif isinstance(node, (L.Scope, L.Else)):
+        return _statement_cost(node.body)
+    elif isinstance(node, (L.If, L.ElseIf)):
+        return _sum_costs([_expression_cost(node.condition), _statement_cost(node.body)])
+    elif isinstance(node, L.Switch):
+        cases = [_statement_cost(body) for _, body in node.cases]
+        if node.default is not None:
+            cases.append(_statement_cost(node.default))
+        return max(cases, default=(0, 0, 0))
+    elif isinstance(node, L.ForRange):
+        trip_count = _trip_count(node)
+        return tuple(trip_count * c for c in _statement_cost(node.body))
+    elif isinstance(node, L.Statement):
+        return _expression_cost(node.expr)
+    elif isinstance(node, L.VariableDecl):
+        return _expression_cost(node.value)
+    elif isinstance(node, L.ArrayDecl):
+        qualifiers = node.typename.split()
+        if "static" in qualifiers:
+            typename = " ".join(q for q in qualifiers if q not in ("static", "const"))
+            size = _type_sizes.get(typename, 8)
+            return (0, 0, size * int(numpy.prod(node.sizes)))
+        elif isinstance(node.values, (int, float)) or node.values is None:
+            return (0, 0, 0)
+        # Initialization of a local array
+        return (0, int(numpy.prod(node.sizes)), 0)
+    elif isinstance(node, L.Return):
+        return _expression_cost(node.value)
+    else:
+        # Comments, pragmas and verbatim code
+        return (0, 0, 0)
+
+
+def _expression_cost(expr):
+    """Return the operation counts of an expression."""
+    if expr is None or isinstance(expr, L.CExprTerminal) or not isinstance(expr, L.CNode):
+        return (0, 0, 0)
+    elif isinstance(expr, L.ArrayAccess):
+        # Index arithmetic is not counted as floating point operations
+        return (0, 1, 0)
+    elif isinstance(expr, L.Assign):
+        return _sum_costs([_expression_cost(expr.lhs), _expression_cost(expr.rhs)])
+    elif isinstance(expr, L.AssignOp):
+        # The target is read and written
+        lhs = _expression_cost(expr.lhs)
+        return _sum_costs([(1, 0, 0), lhs, lhs, _expression_cost(expr.rhs)])
+    elif isinstance(expr, (L.Add, L.Sub, L.Mul, L.Div)):
+        return _sum_costs([(1, 0, 0), _expression_cost(expr.lhs), _expression_cost(expr.rhs)])
+    elif isinstance(expr, L.BinOp):
+        return _sum_costs([_expression_cost(expr.lhs), _expression_cost(expr.rhs)])
+    elif isinstance(expr, L.NaryOp):
+        return _sum_costs([(len(expr.args) - 1, 0, 0)] + [_expression_cost(arg) for arg in expr.args])
+    elif isinstance(expr, L.UnaryOp):
+        return _expression_cost(expr.arg)
+    elif isinstance(expr, L.Conditional):
+        return _sum_costs([_expression_cost(expr.condition), _expression_cost(expr.true),
+                           _expression_cost(expr.false)])
+    elif isinstance(expr, L.Call):
+        return _sum_costs([(1, 0, 0)] + [_expression_cost(arg) for arg in expr.arguments])
+    return (0, 0, 0)
+
+
+def _trip_count(loop):
+    """Return the number of iterations of a loop, or 1 if it is not known."""
+    begin, end = loop.begin, loop.end
+    if isinstance(begin, L.LiteralInt) and isinstance(end, L.LiteralInt):
+        return max(end.value - begin.value, 0)
+    return 1
+
+
+def _sum_costs(costs):
+    return tuple(map(sum, zip((0, 0, 0), *costs)))
@@ -4,9 +4,14 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import json
+import socket
+import subprocess
 import sys
 
 import ffcx.codegeneration.jit
+import ffcx.naming
+import ffcx.parameters
 import ufl
 
 
@@ -33,3 +38,74 @@ def test_cache_modes(compile_args):
 
     assert(newname == tmpname)
     assert(newfile != tmpfile)
+
+
+def test_stale_lock(tmp_path, compile_args):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    forms = [ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx]
+
+    # Lock held by a process that has died
+    process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], stdout=subprocess.PIPE,
+                             check=True)
+    pid = int(process.stdout)
+    p = ffcx.parameters.default_parameters()
+    module_name = "libffcx_forms_" + ffcx.naming.compute_signature(
+        forms, ffcx.codegeneration.jit._compute_parameter_signature(p) + str(compile_args) + str(None))
+    lock_name = tmp_path.joinpath(module_name + ".lock")
+    lock_name.write_text(json.dumps({"pid": pid, "host": socket.gethostname()}))
+
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        forms, cache_dir=tmp_path, timeout=1, cffi_extra_compile_args=compile_args)
+    assert module.__name__ == module_name
+    assert not lock_name.exists()
+    assert not any(f.name.startswith(module_name + ".build") for f in tmp_path.iterdir())
+
+    # Load from cache
+    compiled_forms, cached_module = ffcx.codegeneration.jit.compile_forms(
+        forms, cache_dir=tmp_path, timeout=1, cffi_extra_compile_args=compile_args)
+    assert cached_module.__file__ == module.__file__
+
+
+def test_stale_lock_takeover(tmp_path):
+    process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], stdout=subprocess.PIPE,
+                             check=True)
+    lock_name = tmp_path.joinpath("module.lock")
+    lock_name.write_text(json.dumps({"pid": int(process.stdout), "host": socket.gethostname()}))
+    stale = ffcx.codegeneration.jit._stale_lock(lock_name, 10)
+    assert stale is not None
+
+    # A lock acquired by another process after the stale lock was
+    # found is not taken over
+    lock_name.unlink()
+    assert ffcx.codegeneration.jit._acquire_lock(lock_name)
+    assert not ffcx.codegeneration.jit._take_over_lock(lock_name, stale)
+    assert ffcx.codegeneration.jit._stale_lock(lock_name, 10) is None
+    assert sorted(tmp_path.iterdir()) == [lock_name]
+
+    lock_name.write_text(json.dumps({"pid": int(process.stdout), "host": socket.gethostname()}))
+    stale = ffcx.codegeneration.jit._stale_lock(lock_name, 10)
+    assert ffcx.codegeneration.jit._take_over_lock(lock_name, stale)
+    assert not ffcx.codegeneration.jit._take_over_lock(lock_name, stale)
+    assert not any(tmp_path.iterdir())
+
+
+def test_loaded_modules(compile_args):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    forms = [u * v * ufl.dx]
+
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(forms, cffi_extra_compile_args=compile_args)
+
+    # Modules loaded in this process are reused, for the same and for new form objects
+    compiled_forms2, module2 = ffcx.codegeneration.jit.compile_forms(forms, cffi_extra_compile_args=compile_args)
+    assert module2 is module
+    assert compiled_forms2 is compiled_forms
+    compiled_forms2, module2 = ffcx.codegeneration.jit.compile_forms([u * v * ufl.dx],
+                                                                     cffi_extra_compile_args=compile_args)
+    assert module2 is module
+
+    # Different parameters give a different module
+    compiled_forms2, module2 = ffcx.codegeneration.jit.compile_forms(
+        forms, parameters={"scalar_type": "float"}, cffi_extra_compile_args=compile_args)
+    assert module2 is not module
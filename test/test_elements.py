@@ -23,7 +23,7 @@
 import numpy
 import pytest
 
-from ffcx.fiatinterface import create_element
+from ffcx.fiatinterface import cache_info, clear_cache, create_element, tabulate
 from ufl import FiniteElement
 
 
@@ -54,6 +54,29 @@ def test_continuous_lagrange(degree, expected_dim):
     assert P.space_dimension() == expected_dim
 
 
+def test_element_cache():
+    "Test reuse of created elements and tabulated basis functions."
+    clear_cache()
+    ufl_element = FiniteElement("Lagrange", "triangle", 2)
+    P = create_element(ufl_element)
+    assert create_element(FiniteElement("Lagrange", "triangle", 2)) is P
+    assert cache_info()["elements"].hits == 1
+    assert cache_info()["elements"].misses == 1
+
+    points = numpy.array([[0.25, 0.25], [0.5, 0.25]])
+    table = tabulate(P, 1, points)
+    assert tabulate(P, 1, points.copy()) is table
+    assert cache_info()["tabulations"].hits == 1
+    for key, values in P.tabulate(1, points).items():
+        assert numpy.allclose(table[key], values)
+        assert not table[key].flags.writeable
+
+    clear_cache()
+    assert cache_info()["elements"].currsize == 0
+    assert cache_info()["tabulations"].currsize == 0
+    assert create_element(ufl_element) is not P
+
+
 @pytest.mark.parametrize("degree, expected_dim", [(1, 4), (2, 9), (3, 16)])
 def test_continuous_lagrange_quadrilateral(degree, expected_dim):
     "Test space dimensions of continuous TensorProduct elements (quadrilateral)."
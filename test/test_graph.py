@@ -0,0 +1,86 @@
+# Copyright (C) 2020 The FEniCS Project
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import pickle
+
+import numpy
+
+import ufl
+from ffcx.ir.analysis.factorization import compute_argument_factorization
+from ffcx.ir.analysis.graph import ExpressionGraph, build_scalar_graph
+
+
+def test_expression_graph():
+    G = ExpressionGraph()
+    for i in range(5):
+        G.add_node(i, expression=i)
+    G.nodes[2]["target"] = [(0, )]
+    G.add_edges([3, 0, 3, 1], [1, 2, 1, 2])
+    G.add_edge(2, 4)
+
+    # Multiple edges are kept in insertion order
+    assert G.out_edges[3] == [1, 1]
+    assert G.in_edges[2] == [0, 1]
+    assert dict(G.out_edges) == {0: [2], 1: [2], 2: [4], 3: [1, 1], 4: []}
+    assert dict(G.nodes[2]) == {"expression": 2, "target": [(0, )]}
+    assert G.nodes[1].get("target") is None
+
+    assert G.reachable([3]).tolist() == [False, True, True, True, True]
+    where = numpy.array([True, False, True, True, True])
+    assert G.reachable([4], reverse=True, where=where).tolist() == [True, False, True, False, True]
+
+    G.set_column("status", numpy.array(["a", "b", "c", "d", "e"]))
+    H = pickle.loads(pickle.dumps(G))
+    assert H.nodes[4]["status"] == "e"
+    assert H.out_edges[3] == [1, 1]
+
+
+def test_argument_factorization():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    expression = ufl.algorithms.expand_derivatives((f * u.dx(0) + u) * v.dx(1) + f * u * v)
+    S = build_scalar_graph(expression)
+    assert S.column("target").dtype == bool
+    F = compute_argument_factorization(S, 2)
+
+    # Each argument component and factor appears once in the factorization graph
+    expressions = F.column("expression")
+    assert len(set(expressions)) == F.number_of_nodes()
+    for i, expr in enumerate(expressions):
+        assert F.out_edges[i] == [F.e2i[o] for o in expr.ufl_operands
+                                  if not (expr._ufl_is_terminal_ or expr._ufl_is_terminal_modifier_)]
+    targets = [i for i, t in enumerate(F.column("target")) if t]
+    assert targets and all(len(F.nodes[i]["target"]) == len(F.nodes[i]["component"]) for i in targets)
+
+
+def test_scalar_subexpressions():
+    element = ufl.VectorElement("Lagrange", ufl.tetrahedron, 1)
+    u = ufl.Coefficient(element)
+    i, j, k = ufl.indices(3)
+    F = ufl.as_tensor(ufl.Identity(3)[i, j] + ufl.grad(u)[i, j], (i, j))
+    C = ufl.as_tensor(F[k, i] * F[k, j], (i, j))
+    expression = ufl.ln(F[0, 0] * F[1, 1] - F[0, 1] * F[1, 0]) * C[0, 1]
+    G = build_scalar_graph(expression)
+
+    # Only the needed component of C is built: two products and a
+    # negation in the determinant, three products in C[0, 1] and the
+    # final product
+    expressions = G.column("expression")
+    assert len(set(expressions)) == G.number_of_nodes()
+    assert numpy.flatnonzero(G.column("target")).tolist() == [G.number_of_nodes() - 1]
+    assert sum(isinstance(e, ufl.classes.Product) for e in expressions) == 2 + 1 + 3 + 1
+
+    # Operands precede their expressions, and edges follow the operands
+    for i, e in enumerate(expressions):
+        if not (e._ufl_is_terminal_ or e._ufl_is_terminal_modifier_):
+            assert G.out_edges[i] == [G.e2i[o] for o in e.ufl_operands]
+            assert max(G.out_edges[i]) < i
+
+    # Dropping the cached operands gives the same graph
+    H = build_scalar_graph(expression, max_cached_operands=1)
+    assert H.column("expression") == expressions
+    assert dict(H.out_edges) == dict(G.out_edges)
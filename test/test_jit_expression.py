@@ -135,3 +135,49 @@ def test_rank1(compile_args):
     u_correct = np.array([f[1], f[0]]) + gradf0
 
     assert np.allclose(u_ffcx, u_correct)
+
+
+def test_batched_expression(compile_args):
+    """Tests evaluation of an expression for a batch of cells.
+
+    Evaluates a nonlinear expression of a P2 function and its gradient
+    one cell at a time, and for all cells with the batched kernel.
+
+    """
+    e = ufl.VectorElement("P", "triangle", 1)
+    mesh = ufl.Mesh(e)
+    V = ufl.FunctionSpace(mesh, ufl.FiniteElement("P", "triangle", 2))
+    f = ufl.Coefficient(V)
+    expr = ufl.Constant(mesh) * ufl.exp(f) * ufl.grad(f) + ufl.SpatialCoordinate(mesh)
+
+    points = np.array([[0.0, 0.0], [0.5, 0.0], [1.0 / 3.0, 1.0 / 3.0], [0.0, 1.0]])
+    batch_size = 4
+    obj, module = ffcx.codegeneration.jit.compile_expressions(
+        [(expr, points)], parameters={"batch_size": batch_size}, cffi_extra_compile_args=compile_args)
+
+    ffi = cffi.FFI()
+    kernel = obj[0][0]
+    assert kernel.batch_size == batch_size
+
+    num_cells = 3 * batch_size + 1
+    np.random.seed(0)
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0]) + 0.1 * np.random.rand(num_cells, 6)
+    w = np.random.rand(num_cells, 6)
+    c = np.array([0.5])
+
+    # Reference values computed one cell at a time
+    A = np.zeros((num_cells, 2, 4))
+    for cell in range(num_cells):
+        kernel.tabulate_expression(
+            ffi.cast('double *', A[cell].ctypes.data), ffi.cast('double *', w[cell].ctypes.data),
+            ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords[cell].ctypes.data))
+
+    # Batched kernel takes all data with the cell as fastest varying index
+    A_batch = np.zeros((8, num_cells))
+    w_soa = np.ascontiguousarray(w.T)
+    coords_soa = np.ascontiguousarray(coords.T)
+    kernel.tabulate_expression_batch(
+        num_cells, ffi.cast('double *', A_batch.ctypes.data), ffi.cast('double *', w_soa.ctypes.data),
+        ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords_soa.ctypes.data))
+
+    assert np.allclose(A_batch.T.reshape(num_cells, 2, 4), A)
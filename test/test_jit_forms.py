@@ -4,12 +4,22 @@
 #
 # SPDX-License-Identifier:    LGPL-3.0-or-later
 
+import ctypes.util
+import subprocess
+
 import cffi
 import numpy as np
 import pytest
 
 import ffcx.codegeneration.jit
+import ffcx.compiler
+import ffcx.formatting
+import ffcx.ir.cache
+import ffcx.naming
+import ffcx.parameters
+import ffcx.report
 import ufl
+from ffcx.fiatinterface import create_element
 
 
 def float_to_type(name):
@@ -438,3 +448,711 @@ def test_custom_quadrature(compile_args):
 
     # Check that A is diagonal
     assert np.count_nonzero(A - np.diag(np.diagonal(A))) == 0
+
+
+@pytest.mark.parametrize("integral_type", ["cell", "exterior_facet"])
+def test_batched_tabulate_tensor(integral_type, compile_args):
+    cell = ufl.tetrahedron
+    element = ufl.FiniteElement("N1curl", cell, 1)
+    Q = ufl.FiniteElement("Lagrange", cell, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(Q)
+    measure = ufl.dx if integral_type == "cell" else ufl.ds
+    a = f * ufl.inner(u, v) * measure + ufl.inner(ufl.curl(u), ufl.curl(v)) * measure
+
+    batch_size = 4
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [a], parameters={"batch_size": batch_size}, cffi_extra_compile_args=compile_args)
+
+    ffi = cffi.FFI()
+    form0 = compiled_forms[0][0]
+    if integral_type == "cell":
+        integral0 = form0.create_cell_integral(-1)
+    else:
+        integral0 = form0.create_exterior_facet_integral(-1)
+    assert integral0.batch_size == batch_size
+
+    num_cells = 2 * batch_size + 3
+    np.random.seed(0)
+    reference = np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0])
+    coords = reference + 0.1 * np.random.rand(num_cells, 12)
+    w = np.random.rand(num_cells, 10)
+    facets = np.random.randint(0, 4, size=(num_cells, 1)).astype(np.intc)
+    perms = np.zeros((num_cells, 1), dtype=np.uint8)
+    cell_perms = np.random.randint(0, 64, size=num_cells).astype(np.uint32)
+
+    # Reference values computed one cell at a time
+    A = np.zeros((num_cells, 6, 6))
+    c = np.array([], dtype=np.float64)
+    for e in range(num_cells):
+        integral0.tabulate_tensor(
+            ffi.cast('double *', A[e].ctypes.data), ffi.cast('double *', w[e].ctypes.data),
+            ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords[e].ctypes.data),
+            ffi.cast('int *', facets[e].ctypes.data), ffi.cast('uint8_t *', perms[e].ctypes.data),
+            int(cell_perms[e]))
+
+    # Batched kernel takes all data with the cell as fastest varying index
+    A_batch = np.zeros((36, num_cells))
+    w_soa = np.ascontiguousarray(w.T)
+    coords_soa = np.ascontiguousarray(coords.T)
+    facets_soa = np.ascontiguousarray(facets.T)
+    perms_soa = np.ascontiguousarray(perms.T)
+    integral0.tabulate_tensor_batch(
+        num_cells, ffi.cast('double *', A_batch.ctypes.data), ffi.cast('double *', w_soa.ctypes.data),
+        ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords_soa.ctypes.data),
+        ffi.cast('int *', facets_soa.ctypes.data), ffi.cast('uint8_t *', perms_soa.ctypes.data),
+        ffi.cast('uint32_t *', cell_perms.ctypes.data))
+
+    assert np.allclose(A_batch.T.reshape(num_cells, 6, 6), A)
+
+
+@pytest.mark.parametrize("cell,degree", [(ufl.quadrilateral, 2), (ufl.hexahedron, 1), (ufl.hexahedron, 3)])
+def test_sum_factorization(cell, degree, compile_args):
+    element = ufl.FiniteElement("Q", cell, degree)
+    vector_element = ufl.VectorElement("DQ", cell, degree)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = (1 + f) * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx
+    L = f * v.dx(0) * ufl.dx
+    u, v = ufl.TrialFunction(vector_element), ufl.TestFunction(vector_element)
+    m = ufl.inner(u, v) * ufl.dx + ufl.div(u) * ufl.div(v) * ufl.dx
+    forms = [a, L, m]
+
+    ffi = cffi.FFI()
+    tdim = cell.topological_dimension()
+    num_vertices = 2**tdim
+    np.random.seed(0)
+    coords = np.array([[(k >> (tdim - 1 - d)) & 1 for d in range(tdim)] for k in range(num_vertices)],
+                      dtype=np.float64)
+    coords += 0.1 * np.random.rand(num_vertices, tdim)
+    c = np.array([], dtype=np.float64)
+
+    results = []
+    for sum_factorization in (False, True):
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            forms, parameters={"sum_factorization": sum_factorization}, cffi_extra_compile_args=compile_args)
+        tensors = []
+        for form, compiled_form in zip(forms, compiled_forms):
+            integral = compiled_form[0].create_cell_integral(-1)
+            shape = tuple(create_element(arg.ufl_element()).space_dimension() for arg in form.arguments())
+            A = np.zeros(shape)
+            w = np.linspace(0.0, 1.0, num=(degree + 1)**tdim)
+            integral.tabulate_tensor(
+                ffi.cast('double *', A.ctypes.data), ffi.cast('double *', w.ctypes.data),
+                ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords.ctypes.data),
+                ffi.NULL, ffi.NULL, 0)
+            tensors.append(A)
+        results.append(tensors)
+
+    for A, A_sf in zip(*results):
+        assert np.allclose(A, A_sf)
+
+
+@pytest.mark.parametrize("parameters", [{"tile_size": 2}, {"tile_size": 4},
+                                        {"block_gemm": "loops", "gemm_threshold": 0},
+                                        {"block_gemm": "cblas", "gemm_threshold": 0},
+                                        {"simd_width": 4}, {"simd_width": 4, "padlen": 4},
+                                        {"simd_width": 4, "padlen": 0}])
+def test_block_accumulation(parameters, compile_args):
+    libraries = None
+    if parameters.get("block_gemm") == "cblas":
+        if ctypes.util.find_library("blas") is None:
+            pytest.skip("No BLAS library found")
+        libraries = ["blas"]
+
+    cell = ufl.triangle
+    element = ufl.FiniteElement("Lagrange", cell, 3)
+    vector_element = ufl.VectorElement("Lagrange", cell, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = (1 + f) * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + u * v * ufl.dx + f * u * v * ufl.ds
+    u, v = ufl.TrialFunction(vector_element), ufl.TestFunction(vector_element)
+    m = ufl.inner(u, v) * ufl.dx + f * ufl.div(u) * ufl.div(v) * ufl.dx
+    forms = [a, m]
+
+    ffi = cffi.FFI()
+    num_cells = 4
+    np.random.seed(0)
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0]) + 0.1 * np.random.rand(num_cells, 6)
+    w = np.random.rand(num_cells, 10)
+    c = np.array([], dtype=np.float64)
+    facets = np.random.randint(0, 3, size=(num_cells, 1)).astype(np.intc)
+    perms = np.zeros((num_cells, 1), dtype=np.uint8)
+    cell_perms = np.zeros(num_cells, dtype=np.uint32)
+
+    results = []
+    for p in [{}, dict(parameters, batch_size=num_cells)]:
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            forms, parameters=p, cffi_extra_compile_args=compile_args, cffi_libraries=libraries)
+        tensors = []
+        for form, compiled_form in zip(forms, compiled_forms):
+            shape = tuple(create_element(arg.ufl_element()).space_dimension() for arg in form.arguments())
+            integrals = [compiled_form[0].create_cell_integral(-1)]
+            if compiled_form[0].num_exterior_facet_integrals > 0:
+                integrals.append(compiled_form[0].create_exterior_facet_integral(-1))
+            for integral in integrals:
+                A = np.zeros((num_cells, ) + shape)
+                for e in range(num_cells):
+                    integral.tabulate_tensor(
+                        ffi.cast('double *', A[e].ctypes.data), ffi.cast('double *', w[e].ctypes.data),
+                        ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords[e].ctypes.data),
+                        ffi.cast('int *', facets[e].ctypes.data), ffi.cast('uint8_t *', perms[e].ctypes.data), 0)
+                tensors.append(A)
+
+                if integral.batch_size > 0:
+                    A_batch = np.zeros((np.prod(shape), num_cells))
+                    w_soa = np.ascontiguousarray(w.T)
+                    coords_soa = np.ascontiguousarray(coords.T)
+                    facets_soa = np.ascontiguousarray(facets.T)
+                    perms_soa = np.ascontiguousarray(perms.T)
+                    integral.tabulate_tensor_batch(
+                        num_cells, ffi.cast('double *', A_batch.ctypes.data),
+                        ffi.cast('double *', w_soa.ctypes.data), ffi.cast('double *', c.ctypes.data),
+                        ffi.cast('double *', coords_soa.ctypes.data), ffi.cast('int *', facets_soa.ctypes.data),
+                        ffi.cast('uint8_t *', perms_soa.ctypes.data), ffi.cast('uint32_t *', cell_perms.ctypes.data))
+                    assert np.allclose(A_batch.T.reshape(A.shape), A)
+        results.append(tensors)
+
+    for A, A_blocked in zip(*results):
+        assert np.allclose(A, A_blocked)
+
+    if "simd_width" in parameters:
+        # Table rows of the P3 element are read in whole vectors only
+        # when they are zero padded to a multiple of the vector width
+        padlen = parameters.get("padlen", 1)
+        _, code = ffcx.compiler.compile_ufl_objects(
+            [a], prefix="test_block_accumulation",
+            parameters=dict(ffcx.parameters.default_parameters(), **parameters, batch_size=num_cells))
+        assert ("for (int lane = 0;" in code) == (padlen == 0 or padlen % 4 > 0)
+
+
+def test_nonzero_blocks(compile_args):
+    P2 = ufl.VectorElement("Lagrange", ufl.triangle, 2)
+    P1 = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    (u, p), (v, q) = ufl.TrialFunctions(ufl.MixedElement([P2, P1])), ufl.TestFunctions(ufl.MixedElement([P2, P1]))
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx - ufl.div(v) * p * ufl.dx - q * ufl.div(u) * ufl.dx
+
+    ffi = cffi.FFI()
+    np.random.seed(0)
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0]) + 0.1 * np.random.rand(6)
+    w = np.array([], dtype=np.float64)
+    c = np.array([], dtype=np.float64)
+
+    tensors = []
+    for sparse_element_tensor in (False, True):
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            [a], parameters={"sparse_element_tensor": sparse_element_tensor}, cffi_extra_compile_args=compile_args)
+        integral = compiled_forms[0][0].create_cell_integral(-1)
+        assert integral.sets_nonzero_blocks == sparse_element_tensor
+
+        # The pressure-pressure block is zero
+        num_blocks = integral.num_nonzero_blocks
+        blocks = np.frombuffer(ffi.buffer(integral.nonzero_blocks, num_blocks * 4 * ffi.sizeof("int")), np.intc)
+        assert blocks.reshape(num_blocks, 2, 2).tolist() == [[[0, 12], [0, 12]], [[0, 12], [12, 15]],
+                                                             [[12, 15], [0, 12]]]
+
+        # Kernels setting the nonzero blocks need no zeroed tensor
+        A = np.full((15, 15), np.nan if sparse_element_tensor else 0.0)
+        integral.tabulate_tensor(ffi.cast('double *', A.ctypes.data), ffi.cast('double *', w.ctypes.data),
+                                 ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords.ctypes.data),
+                                 ffi.NULL, ffi.NULL, 0)
+        tensors.append(A)
+
+    A, A_sparse = tensors
+    assert np.allclose(A[12:, 12:], 0.0)
+    assert np.isnan(A_sparse[12:, 12:]).all()
+    A_sparse[12:, 12:] = 0.0
+    assert np.allclose(A, A_sparse)
+
+
+@pytest.mark.parametrize("parameters", [{"scalar_type": "float"},
+                                        {"scalar_type": "float", "simd_width": 8},
+                                        {"scalar_type": "double", "compute_type": "float"},
+                                        {"scalar_type": "float", "compute_type": "double"},
+                                        {"scalar_type": "double complex", "compute_type": "float"}])
+def test_compute_type(parameters, compile_args):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 3)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = (1 + f**2) * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + ufl.sqrt(1 + f**2) * ufl.inner(u, v) * ufl.dx
+
+    ffi = cffi.FFI()
+    np.random.seed(0)
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0]) + 0.1 * np.random.rand(6)
+    w = np.random.rand(10)
+
+    tensors = []
+    for p in [{}, parameters]:
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            [a], parameters=p, cffi_extra_compile_args=compile_args)
+        integral = compiled_forms[0][0].create_cell_integral(-1)
+
+        c_type, np_type = float_to_type(p.get("scalar_type", "double"))
+        A = np.zeros((10, 10), dtype=np_type)
+        w_p = np.array(w, dtype=np_type)
+        c = np.array([], dtype=np_type)
+        integral.tabulate_tensor(
+            ffi.cast('{} *'.format(c_type), A.ctypes.data), ffi.cast('{} *'.format(c_type), w_p.ctypes.data),
+            ffi.cast('{} *'.format(c_type), c.ctypes.data), ffi.cast('double *', coords.ctypes.data),
+            ffi.NULL, ffi.NULL, 0)
+        tensors.append(A)
+
+    A, A_p = tensors
+    assert np.allclose(A_p, A, rtol=1e-5, atol=1e-6)
+
+    # Tables are declared in the compute type
+    _, code = ffcx.compiler.compile_ufl_objects(
+        [a], prefix="test_compute_type", parameters=dict(ffcx.parameters.default_parameters(), **parameters))
+    compute_type = parameters.get("compute_type", "float")
+    assert "static const {} weights".format(compute_type) in code
+    assert "static const {} FE".format(compute_type) in code
+
+
+@pytest.mark.parametrize("cell,parameters", [(ufl.triangle, {}),
+                                             (ufl.quadrilateral, {"sum_factorization": True})])
+def test_hexfloat_tables(cell, parameters, compile_args):
+    element = ufl.FiniteElement("Lagrange", cell, 3)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + u * v * ufl.dx
+
+    ffi = cffi.FFI()
+    num_dofs = create_element(element).space_dimension()
+    num_vertices = 3 if cell == ufl.triangle else 4
+    coords = np.array([0.0, 0.0, 1.0, 0.1, 0.2, 1.0, 1.3, 1.2])[:2 * num_vertices]
+    w = np.array([], dtype=np.float64)
+    c = np.array([], dtype=np.float64)
+    tensors = []
+    for hexfloat in (False, True):
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            [a], parameters=dict(parameters, hexfloat_tables=hexfloat), cffi_extra_compile_args=compile_args)
+        A = np.zeros((num_dofs, num_dofs))
+        compiled_forms[0][0].create_cell_integral(-1).tabulate_tensor(
+            ffi.cast('double *', A.ctypes.data), ffi.cast('double *', w.ctypes.data),
+            ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords.ctypes.data), ffi.NULL, ffi.NULL, 0)
+        tensors.append(A)
+
+    # Hexadecimal literals are exact, decimal literals are rounded to
+    # the precision
+    assert np.allclose(tensors[0], tensors[1], rtol=1e-14, atol=1e-14)
+
+    _, code = ffcx.compiler.compile_ufl_objects(
+        [a], prefix="test_hexfloat_tables",
+        parameters=dict(ffcx.parameters.default_parameters(), hexfloat_tables=True, **parameters))
+    assert "static const double FE" in code and "0x1." in code
+
+
+@pytest.mark.parametrize("cell,parameters", [(ufl.triangle, {}),
+                                             (ufl.triangle, {"enable_preintegration": True}),
+                                             (ufl.triangle, {"enable_premultiplication": True}),
+                                             (ufl.quadrilateral, {"sum_factorization": True})])
+def test_tabulate_action(cell, parameters, compile_args):
+    element = ufl.FiniteElement("Lagrange", cell, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = (1 + f) * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + u * v * ufl.dx \
+        + ufl.inner(ufl.avg(ufl.grad(u)), ufl.jump(ufl.grad(v))) * ufl.dS
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [a], parameters=dict(parameters, tabulate_action=True), cffi_extra_compile_args=compile_args)
+    form = compiled_forms[0][0]
+
+    ffi = cffi.FFI()
+    np.random.seed(0)
+    num_dofs = create_element(element).space_dimension()
+    num_vertices = 3 if cell == ufl.triangle else 4
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0])[:2 * num_vertices]
+    w = np.random.rand(2 * num_dofs)
+    c = np.array([], dtype=np.float64)
+    facets = np.array([0, 1], dtype=np.intc)
+    perms = np.array([0, 1], dtype=np.uint8)
+    for integral, r in [(form.create_cell_integral(-1), 1), (form.create_interior_facet_integral(-1), 2)]:
+        coords_r = np.tile(coords, r) + 0.1 * np.random.rand(r * coords.size)
+        args = [ffi.cast('double *', w.ctypes.data), ffi.cast('double *', c.ctypes.data),
+                ffi.cast('double *', coords_r.ctypes.data), ffi.cast('int *', facets.ctypes.data),
+                ffi.cast('uint8_t *', perms.ctypes.data), 0]
+        A = np.zeros((r * num_dofs, r * num_dofs))
+        integral.tabulate_tensor(ffi.cast('double *', A.ctypes.data), *args)
+
+        # The action is added to y
+        x = np.random.rand(r * num_dofs)
+        y = np.ones(r * num_dofs)
+        integral.tabulate_action(ffi.cast('double *', y.ctypes.data), ffi.cast('double *', x.ctypes.data), *args)
+        assert np.allclose(y, 1.0 + A @ x)
+
+    # Only bilinear forms have action kernels
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [f * v * ufl.dx], parameters={"tabulate_action": True}, cffi_extra_compile_args=compile_args)
+    assert compiled_forms[0][0].create_cell_integral(-1).tabulate_action == ffi.NULL
+
+
+@pytest.mark.parametrize("cell,parameters", [(ufl.triangle, {}),
+                                             (ufl.triangle, {"enable_preintegration": True}),
+                                             (ufl.triangle, {"enable_premultiplication": True}),
+                                             (ufl.quadrilateral, {"sum_factorization": True})])
+def test_tabulate_diagonal(cell, parameters, compile_args):
+    P2 = ufl.VectorElement("Lagrange", cell, 2)
+    P1 = ufl.FiniteElement("Lagrange", cell, 1)
+    element = ufl.MixedElement([P2, P1])
+    u, p = ufl.TrialFunctions(element)
+    v, q = ufl.TestFunctions(element)
+    f = ufl.Coefficient(P1)
+    a = (1 + f) * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx - p * ufl.div(v) * ufl.dx \
+        - q * ufl.div(u) * ufl.dx + ufl.inner(ufl.avg(ufl.grad(u)), ufl.jump(ufl.grad(v))) * ufl.dS
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [a], parameters=dict(parameters, tabulate_diagonal=True), cffi_extra_compile_args=compile_args)
+    form = compiled_forms[0][0]
+
+    ffi = cffi.FFI()
+    np.random.seed(0)
+    num_dofs = create_element(element).space_dimension()
+    num_vertices = 3 if cell == ufl.triangle else 4
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0])[:2 * num_vertices]
+    w = np.random.rand(2 * create_element(P1).space_dimension())
+    c = np.array([], dtype=np.float64)
+    facets = np.array([0, 1], dtype=np.intc)
+    perms = np.array([0, 1], dtype=np.uint8)
+    for integral, r in [(form.create_cell_integral(-1), 1), (form.create_interior_facet_integral(-1), 2)]:
+        coords_r = np.tile(coords, r) + 0.1 * np.random.rand(r * coords.size)
+        args = [ffi.cast('double *', w.ctypes.data), ffi.cast('double *', c.ctypes.data),
+                ffi.cast('double *', coords_r.ctypes.data), ffi.cast('int *', facets.ctypes.data),
+                ffi.cast('uint8_t *', perms.ctypes.data), 0]
+        A = np.zeros((r * num_dofs, r * num_dofs))
+        integral.tabulate_tensor(ffi.cast('double *', A.ctypes.data), *args)
+
+        # The diagonal is added to d
+        d = np.ones(r * num_dofs)
+        integral.tabulate_diagonal(ffi.cast('double *', d.ctypes.data), *args)
+        assert np.allclose(d, 1.0 + np.diag(A))
+
+    # Only bilinear forms have diagonal kernels
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [f * q * ufl.dx], parameters={"tabulate_diagonal": True}, cffi_extra_compile_args=compile_args)
+    assert compiled_forms[0][0].create_cell_integral(-1).tabulate_diagonal == ffi.NULL
+
+
+@pytest.mark.parametrize("cell", [ufl.triangle, ufl.quadrilateral])
+def test_fused_cell_integrals(cell, compile_args):
+    element = ufl.FiniteElement("Lagrange", cell, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + f * u * v * ufl.dx(1) \
+        + f**2 * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx(2) + u * v * ufl.ds
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [a], parameters={"fused_cell_integrals": True}, cffi_extra_compile_args=compile_args)
+    form = compiled_forms[0][0]
+    assert form.num_cell_integrals == 3
+
+    ffi = cffi.FFI()
+    np.random.seed(0)
+    num_dofs = create_element(element).space_dimension()
+    num_vertices = 3 if cell == ufl.triangle else 4
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0])[:2 * num_vertices] \
+        + 0.1 * np.random.rand(2 * num_vertices)
+    w = np.random.rand(num_dofs)
+    c = np.array([], dtype=np.float64)
+    entity_local_index = np.array([0], dtype=np.intc)
+    perm = np.array([0], dtype=np.uint8)
+    args = [ffi.cast('double *', w.ctypes.data), ffi.cast('double *', c.ctypes.data),
+            ffi.cast('double *', coords.ctypes.data), ffi.cast('int *', entity_local_index.ctypes.data),
+            ffi.cast('uint8_t *', perm.ctypes.data), 0]
+
+    ids = np.zeros(form.num_cell_integrals, dtype=np.intc)
+    form.get_cell_integral_ids(ffi.cast('int *', ids.ctypes.data))
+    expected = []
+    for subdomain_id in ids:
+        A = np.zeros((num_dofs, num_dofs))
+        integral = form.create_cell_integral(subdomain_id)
+        integral.tabulate_tensor(ffi.cast('double *', A.ctypes.data), *args)
+        expected.append(A)
+
+    # Integrals with a NULL element tensor are skipped
+    tensors = [np.zeros((num_dofs, num_dofs)) for _ in ids]
+    pointers = ffi.new("double*[]", [ffi.cast('double *', tensors[0].ctypes.data), ffi.NULL,
+                                     ffi.cast('double *', tensors[2].ctypes.data)])
+    form.tabulate_cell_integrals(pointers, *args)
+    assert np.allclose(tensors[0], expected[0])
+    assert np.allclose(tensors[1], 0.0)
+    assert np.allclose(tensors[2], expected[2])
+
+    # Only forms compiled with fused_cell_integrals have the kernel
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms([a], cffi_extra_compile_args=compile_args)
+    assert compiled_forms[0][0].tabulate_cell_integrals == ffi.NULL
+
+
+def test_parallel_compilation():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx(0) + f * u * v * ufl.dx(1) + u * v * ufl.ds
+    L = f * v * ufl.dx + v * ufl.ds
+    forms = [a, L]
+
+    parameters = ffcx.parameters.default_parameters()
+    serial = ffcx.compiler.compile_ufl_objects(forms, prefix="test_parallel", parameters=parameters)
+    parallel = ffcx.compiler.compile_ufl_objects(forms, prefix="test_parallel", parameters=parameters,
+                                                 num_workers=2)
+    assert serial == parallel
+
+
+def test_stream_code(tmp_path):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    forms = [ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + f * u * v * ufl.ds, f * v * ufl.dx]
+
+    parameters = ffcx.parameters.default_parameters()
+    parameters["fused_cell_integrals"] = True
+    code_h, code_c = ffcx.compiler.compile_ufl_objects(forms, prefix="test_stream", parameters=parameters)
+    with ffcx.formatting.open_code_files("test_stream", str(tmp_path)) as files:
+        assert ffcx.compiler.compile_ufl_objects(forms, prefix="test_stream", parameters=parameters,
+                                                 files=files) == (None, None)
+    assert tmp_path.joinpath("test_stream.h").read_text() == code_h
+    assert tmp_path.joinpath("test_stream.c").read_text() == code_c
+
+    # Files are only replaced when all code has been written
+    with pytest.raises(RuntimeError):
+        with ffcx.formatting.open_code_files("test_stream", str(tmp_path)) as (file_h, file_c):
+            file_h.write("incomplete")
+            raise RuntimeError("Failed to generate code")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test_stream.c", "test_stream.h"]
+    assert tmp_path.joinpath("test_stream.h").read_text() == code_h
+
+    # Files have the permissions of files created by open
+    tmp_path.joinpath("reference").write_text("")
+    mode = tmp_path.joinpath("reference").stat().st_mode
+    assert tmp_path.joinpath("test_stream.h").stat().st_mode == mode
+    assert tmp_path.joinpath("test_stream.c").stat().st_mode == mode
+
+
+def test_ir_cache(tmp_path):
+    def create_form():
+        element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+        u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+        f = ufl.Coefficient(element)
+        c = ufl.Constant(ufl.triangle)
+        return c * f * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + f * u * v * ufl.ds
+
+    # Populate the cache
+    parameters = ffcx.parameters.default_parameters()
+    parameters["ir_cache_dir"] = str(tmp_path)
+    ffcx.compiler.compile_ufl_objects([create_form()], prefix="test_ir_cache", parameters=parameters)
+    cached_files = sorted(tmp_path.iterdir())
+    assert len(cached_files) == 2
+
+    # Compile the same integrals with different coefficient and
+    # constant objects, with and without the cache
+    form = create_form()
+    _, code = ffcx.compiler.compile_ufl_objects([form], prefix="test_ir_cache", parameters=parameters)
+    assert sorted(tmp_path.iterdir()) == cached_files
+    parameters["ir_cache_dir"] = ""
+    _, reference = ffcx.compiler.compile_ufl_objects([form], prefix="test_ir_cache", parameters=parameters)
+
+    def strip_parameters(code):
+        return "\n".join(line for line in code.splitlines() if "ir_cache_dir" not in line)
+
+    assert strip_parameters(code) == strip_parameters(reference)
+
+
+def test_ir_cache_parameters():
+    # Every parameter must be classified as affecting the integral IR,
+    # and thereby the IR cache key, or as affecting the generated code only
+    ir_parameters = set(ffcx.ir.cache._ir_parameters)
+    codegeneration_parameters = set(ffcx.ir.cache._codegeneration_parameters)
+    assert not ir_parameters & codegeneration_parameters
+    assert ir_parameters | codegeneration_parameters == set(ffcx.parameters.default_parameters())
+
+
+def test_code_cache(tmp_path, compile_args):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    parameters = {"code_cache_dir": str(tmp_path)}
+
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + f * u * v * ufl.ds
+    ffcx.codegeneration.jit.compile_forms([a], parameters=parameters, cffi_extra_compile_args=compile_args)
+    cached_files = set(tmp_path.iterdir())
+    assert len([p for p in cached_files if p.suffix == ".o"]) == 2
+
+    # Changing the facet integral reuses the code and object file of
+    # the cell integral
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + 2 * f * u * v * ufl.ds
+    compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+        [a], parameters=parameters, cffi_extra_compile_args=compile_args)
+    new_files = set(tmp_path.iterdir()) - cached_files
+    assert sorted(p.suffix for p in new_files) == [".json", ".o"]
+    assert all("exterior_facet" in p.name for p in new_files)
+
+    ffi = cffi.FFI()
+    form0 = compiled_forms[0][0]
+    integral = form0.create_cell_integral(-1)
+    A = np.zeros((3, 3), dtype=np.float64)
+    w = np.zeros(3, dtype=np.float64)
+    coords = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0], dtype=np.float64)
+    integral.tabulate_tensor(ffi.cast('double *', A.ctypes.data), ffi.cast('double *', w.ctypes.data),
+                             ffi.NULL, ffi.cast('double *', coords.ctypes.data), ffi.NULL, ffi.NULL, 0)
+    assert np.allclose(A, [[1.0, -0.5, -0.5], [-0.5, 0.5, 0.0], [-0.5, 0.0, 0.5]])
+
+
+def test_compile_library(tmp_path, compile_args):
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+
+    poisson = ufl.algorithms.formfiles.FileData()
+    poisson.forms = [ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx, f * v * ufl.dx]
+    poisson.object_names = {id(poisson.forms[0]): "a", id(poisson.forms[1]): "L"}
+    # Forms of different files may be defined on different cells
+    element3 = ufl.FiniteElement("Lagrange", ufl.tetrahedron, 1)
+    u3, v3 = ufl.TrialFunction(element3), ufl.TestFunction(element3)
+    mass = ufl.algorithms.formfiles.FileData()
+    mass.forms = [u3 * v3 * ufl.dx]
+    mass.object_names = {id(mass.forms[0]): "a"}
+    elements = ufl.algorithms.formfiles.FileData()
+    elements.elements = [element, ufl.VectorElement("Lagrange", ufl.triangle, 2)]
+    elements.object_names = {id(element): "P1"}
+
+    parameters = ffcx.parameters.default_parameters()
+    code_h, code_c = ffcx.compiler.compile_ufl_library(
+        [("Poisson", poisson), ("Mass", mass), ("Elements", elements)], "test_library", parameters=parameters)
+
+    # Elements shared by the files are generated once
+    name = ffcx.naming.finite_element_name(element, "test_library")
+    assert code_c.count("// Code for element {}\n".format(name)) == 1
+    assert code_c.count("ufc_coordinate_mapping* create_coordinate_map_test_library(void)\n") == 1
+
+    # Streamed code is the same
+    with ffcx.formatting.open_code_files("test_library", str(tmp_path)) as files:
+        ffcx.compiler.compile_ufl_library([("Poisson", poisson), ("Mass", mass), ("Elements", elements)],
+                                          "test_library", parameters=parameters, files=files)
+    assert tmp_path.joinpath("test_library.h").read_text() == code_h
+    assert tmp_path.joinpath("test_library.c").read_text() == code_c
+
+    ffi = cffi.FFI()
+    ffi.cdef("""
+    int test_library_num_forms;
+    int test_library_num_elements;
+    const char* test_library_form_names[];
+    const char* test_library_element_names[];
+    """)
+    library = tmp_path.joinpath("libtest_library.so")
+    subprocess.run(["cc", "-shared", "-fPIC"] + compile_args + ["-I", ffcx.codegeneration.get_include_path(),
+                                                                "-o", str(library), str(tmp_path / "test_library.c")],
+                   check=True)
+    lib = ffi.dlopen(str(library))
+
+    assert lib.test_library_num_forms == 3
+    assert [ffi.string(lib.test_library_form_names[i]) for i in range(3)] == [b"Poisson.a", b"Poisson.L", b"Mass.a"]
+    assert lib.test_library_form_names[3] == ffi.NULL
+    assert lib.test_library_num_elements == 2
+    assert ffi.string(lib.test_library_element_names[0]) == b"Elements.P1"
+
+
+def test_report():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 2)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    a = ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + f * u * v * ufl.ds
+    L = f * v * ufl.dx
+
+    parameters = ffcx.parameters.default_parameters()
+    serial, parallel = {}, {}
+    ffcx.compiler.compile_ufl_objects([a, L], prefix="test_report", parameters=parameters, report=serial)
+    ffcx.compiler.compile_ufl_objects([a, L], prefix="test_report", parameters=parameters, num_workers=2,
+                                      report=parallel)
+
+    for report in (serial, parallel):
+        assert set(report["time"]) == {"analysis", "representation", "code_generation", "formatting", "total"}
+        assert [len(form["integrals"]) for form in report["forms"]] == [2, 1]
+        for form in report["forms"]:
+            for integral in form["integrals"]:
+                rule, = integral["quadrature_rules"]
+                assert rule["factorized_graph_size"] > 0
+                assert integral["cost"]["flops"] > 0
+                assert integral["cost"]["table_bytes"] >= 8 * integral["table_values"]
+
+    # Costs are independent of the number of processes
+    costs = [[integral["cost"] for form in report["forms"] for integral in form["integrals"]]
+             for report in (serial, parallel)]
+    assert costs[0] == costs[1]
+
+    # Costs of the optional kernels of the bilinear form
+    parameters.update(batch_size=4, tabulate_action=True, tabulate_diagonal=True)
+    report = {}
+    ffcx.compiler.compile_ufl_objects([a], prefix="test_report", parameters=parameters, report=report)
+    for integral in report["forms"][0]["integrals"]:
+        kernel_costs = integral["kernel_costs"]
+        assert set(kernel_costs) == {"tabulate_tensor_batch", "tabulate_action", "tabulate_diagonal"}
+        assert kernel_costs["tabulate_tensor_batch"]["flops"] > integral["cost"]["flops"]
+        assert 0 < kernel_costs["tabulate_diagonal"]["flops"] < integral["cost"]["flops"]
+
+    # Sum of a product over a loop
+    C = ffcx.codegeneration.C.cnodes
+    A, x, i = C.Symbol("A"), C.Symbol("x"), C.Symbol("i")
+    code = C.ForRange(i, 0, 4, C.AssignAdd(A[i], C.Mul(x, x[i])))
+    assert ffcx.report.estimate_cost(code) == {"flops": 8, "memory_accesses": 12, "table_bytes": 0}
+
+    # Sizes of static tables by type
+    for typename, size in [("double", 8), ("long double", 16), ("float", 4)]:
+        code = C.ArrayDecl("static const " + typename, "FE", (2, 3), values=np.zeros((2, 3)))
+        assert ffcx.report.estimate_cost(code)["table_bytes"] == 6 * size
+
+
+@pytest.mark.parametrize("cell", [ufl.triangle, ufl.tetrahedron])
+@pytest.mark.parametrize("degree", [1, 2])
+def test_preintegration(cell, degree, compile_args):
+    element = ufl.FiniteElement("Lagrange", cell, degree)
+    vector_element = ufl.VectorElement("Lagrange", cell, degree)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    f = ufl.Coefficient(element)
+    kappa = ufl.Constant(cell)
+    a = kappa * ufl.inner(ufl.grad(u), ufl.grad(v)) * ufl.dx + u * v * ufl.dx + kappa * u * v * ufl.ds
+    L = f * v * ufl.dx + f * v * ufl.ds
+    u, v = ufl.TrialFunction(vector_element), ufl.TestFunction(vector_element)
+    m = ufl.inner(u, v) * ufl.dx + (1 + f) * ufl.div(u) * ufl.div(v) * ufl.dx
+    forms = [a, L, m]
+
+    ffi = cffi.FFI()
+    tdim = cell.topological_dimension()
+    np.random.seed(0)
+    coords = np.vstack([np.zeros(tdim), np.eye(tdim)]) + 0.1 * np.random.rand(tdim + 1, tdim)
+    c = np.array([2.0])
+    w = np.random.rand(create_element(element).space_dimension())
+
+    results = []
+    for preintegration, premultiplication in [(False, False), (True, False), (False, True)]:
+        parameters = {"enable_preintegration": preintegration, "enable_premultiplication": premultiplication}
+        compiled_forms, module = ffcx.codegeneration.jit.compile_forms(
+            forms, parameters=parameters, cffi_extra_compile_args=compile_args)
+        tensors = []
+        for form, compiled_form in zip(forms, compiled_forms):
+            shape = tuple(create_element(arg.ufl_element()).space_dimension() for arg in form.arguments())
+            integrals = [(compiled_form[0].create_cell_integral(-1), 0)]
+            if compiled_form[0].num_exterior_facet_integrals > 0:
+                integrals += [(compiled_form[0].create_exterior_facet_integral(-1), facet)
+                              for facet in range(tdim + 1)]
+            for integral, facet in integrals:
+                A = np.zeros(shape)
+                facet = np.array([facet], dtype=np.intc)
+                perm = np.array([0], dtype=np.uint8)
+                integral.tabulate_tensor(
+                    ffi.cast('double *', A.ctypes.data), ffi.cast('double *', w.ctypes.data),
+                    ffi.cast('double *', c.ctypes.data), ffi.cast('double *', coords.ctypes.data),
+                    ffi.cast('int *', facet.ctypes.data), ffi.cast('uint8_t *', perm.ctypes.data), 0)
+                tensors.append(A)
+        results.append(tensors)
+
+    for A, A_pi, A_pm in zip(*results):
+        assert np.allclose(A, A_pi)
+        assert np.allclose(A, A_pm)
+
+
+def test_preintegration_metadata():
+    element = ufl.FiniteElement("Lagrange", ufl.triangle, 1)
+    u, v = ufl.TrialFunction(element), ufl.TestFunction(element)
+    a = u * v * ufl.dx(metadata={"enable_preintegration": True}) + u * v * ufl.ds
+
+    parameters = ffcx.parameters.default_parameters()
+    _, code = ffcx.compiler.compile_ufl_objects([a], prefix="test_preintegration", parameters=parameters)
+    cell_code = code[code.index("tabulate_tensor_integral_cell"):code.index("tabulate_tensor_integral_exterior")]
+    facet_code = code[code.index("tabulate_tensor_integral_exterior"):]
+    assert "PI0" in cell_code and "for (int iq" not in cell_code
+    assert "PI0" not in facet_code and "for (int iq" in facet_code
@@ -0,0 +1,49 @@
+# Copyright (C) 2020 The FEniCS Project
+#
+# This file is part of FFCX.(https://www.fenicsproject.org)
+#
+# SPDX-License-Identifier:    LGPL-3.0-or-later
+
+import numpy
+import pytest
+
+from ffcx.ir.elementtables import TableIndex, build_unique_tables, equal_tables
+
+
+@pytest.mark.parametrize("rtol,atol", [(1e-6, 1e-9), (1e-2, 1e-3), (0.0, 0.0)])
+def test_build_unique_tables(rtol, atol):
+    rng = numpy.random.RandomState(1)
+    base = [rng.uniform(-2.0, 2.0, (1, 2, 3, 4)) for i in range(10)] + [numpy.zeros((1, 2, 3, 4))]
+    base += [rng.uniform(-1.0, 1.0, (1, 1, 3, 4)), numpy.full((1, 2, 3, 4), numpy.nan)]
+
+    # Tables close to the base tables, within and beyond the tolerances
+    tables = []
+    for i in range(200):
+        t = base[rng.randint(len(base))]
+        scale = rng.choice([0.0, 0.5, 1.0, 2.0])
+        tables.append(t + scale * (atol + rtol * numpy.abs(t)) * rng.uniform(-1.0, 1.0, t.shape))
+
+    unique, mapping = build_unique_tables(tables, rtol=rtol, atol=atol)
+
+    # Compare to pairwise comparison with all unique tables
+    reference_unique = []
+    for i, t in enumerate(tables):
+        found = [j for j, u in enumerate(reference_unique) if equal_tables(u, t, rtol=rtol, atol=atol)]
+        if found:
+            assert mapping[i] == found[0]
+        else:
+            assert mapping[i] == len(reference_unique)
+            reference_unique.append(t)
+    assert len(unique) == len(reference_unique)
+
+
+def test_table_index_remove():
+    index = TableIndex()
+    a = numpy.ones((1, 1, 2, 2))
+    index.add("a", a)
+    index.add("b", a.copy())
+    index.add("c", 2 * a)
+    assert index.candidates(a) == ["a", "b"]
+    index.remove("a", a)
+    assert index.candidates(a) == ["b"]
+    assert index.candidates(numpy.ones((1, 1, 1, 2))) == []